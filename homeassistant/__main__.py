@@ -102,6 +102,14 @@ def get_arguments() -> argparse.Namespace:
     parser.add_argument(
         "--debug", action="store_true", help="Start Home Assistant in debug mode"
     )
+    parser.add_argument(
+        "--loop-stall-threshold",
+        type=float,
+        default=None,
+        metavar="seconds",
+        help="Log what is running when the event loop is blocked for longer than "
+        "the given number of seconds",
+    )
     parser.add_argument(
         "--open-ui", action="store_true", help="Open the webinterface in a browser"
     )
@@ -199,6 +207,7 @@ def main() -> int:
         skip_pip_packages=args.skip_pip_packages,
         recovery_mode=args.recovery_mode,
         debug=args.debug,
+        loop_stall_threshold=args.loop_stall_threshold,
         open_ui=args.open_ui,
         safe_mode=safe_mode,
     )
@@ -81,6 +81,7 @@ from .helpers import (
     floor_registry,
     issue_registry,
     label_registry,
+    loop_watchdog,
     recorder,
     restore_state,
     template,
@@ -302,6 +303,9 @@ async def async_setup_hass(
 
     block_async_io.enable()
 
+    if runtime_config.loop_stall_threshold:
+        loop_watchdog.async_start(hass, runtime_config.loop_stall_threshold)
+
     config_dict = None
     basic_setup_success = False
 
@@ -4,9 +4,12 @@ from __future__ import annotations
 
 from collections.abc import Iterable
 from datetime import datetime as dt
+import math
+from typing import Any
 
 from homeassistant.components.recorder import get_instance
 from homeassistant.components.recorder.models import process_timestamp
+from homeassistant.const import COMPRESSED_STATE_LAST_UPDATED, COMPRESSED_STATE_STATE
 from homeassistant.core import HomeAssistant
 
 
@@ -31,3 +34,74 @@ def has_recorder_run_after(hass: HomeAssistant, run_time: dt) -> bool:
     return run_time >= process_timestamp(
         get_instance(hass).recorder_runs_manager.first.start
     )
+
+
+def downsample_compressed_states(
+    states: dict[str, list[dict[str, Any]]], max_points: int
+) -> None:
+    """Downsample the series of compressed states in place.
+
+    The rows of numeric series after the first one are split in time
+    buckets and only the first, last, lowest and highest row of each
+    bucket are kept, which draws the same graph at the resolution of a
+    bucket. The first row is always kept since it is the state at the
+    start time and may be the only row with attributes. Rows without a
+    numeric state are kept as well and end the bucket they are in.
+    """
+    bucket_count = max(1, (max_points - 1) // 4)
+    for entity_id, rows in states.items():
+        if len(rows) > max_points:
+            states[entity_id] = _downsample_rows(rows, bucket_count)
+
+
+def _float_or_none(state: Any) -> float | None:
+    """Return the state as a float or None if it is not a finite number."""
+    try:
+        value = float(state)
+    except (TypeError, ValueError):
+        return None
+    return value if math.isfinite(value) else None
+
+
+def _downsample_rows(
+    rows: list[dict[str, Any]], bucket_count: int
+) -> list[dict[str, Any]]:
+    """Downsample the rows of a series to bucket_count buckets."""
+    first_ts: float = rows[1][COMPRESSED_STATE_LAST_UPDATED]
+    bucket_width = (rows[-1][COMPRESSED_STATE_LAST_UPDATED] - first_ts) / bucket_count
+    result = [rows[0]]
+    # The indexes of the first, lowest, highest and last row of the bucket
+    bucket_idxs: list[int] = []
+    bucket = -1
+    min_value = max_value = 0.0
+    for idx in range(1, len(rows)):
+        row = rows[idx]
+        if (value := _float_or_none(row[COMPRESSED_STATE_STATE])) is None:
+            result.extend(rows[bucket_idx] for bucket_idx in sorted(set(bucket_idxs)))
+            result.append(row)
+            bucket_idxs.clear()
+            bucket = -1
+            continue
+        row_bucket = (
+            min(
+                int((row[COMPRESSED_STATE_LAST_UPDATED] - first_ts) / bucket_width),
+                bucket_count - 1,
+            )
+            if bucket_width
+            else 0
+        )
+        if row_bucket != bucket:
+            result.extend(rows[bucket_idx] for bucket_idx in sorted(set(bucket_idxs)))
+            bucket_idxs = [idx, idx, idx, idx]
+            bucket = row_bucket
+            min_value = max_value = value
+            continue
+        if value < min_value:
+            bucket_idxs[1] = idx
+            min_value = value
+        elif value > max_value:
+            bucket_idxs[2] = idx
+            max_value = value
+        bucket_idxs[3] = idx
+    result.extend(rows[bucket_idx] for bucket_idx in sorted(set(bucket_idxs)))
+    return result
@@ -13,6 +13,10 @@ import voluptuous as vol
 
 from homeassistant.components import websocket_api
 from homeassistant.components.recorder import get_instance, history
+from homeassistant.components.recorder.const import (
+    DEFAULT_QUERY_ROW_BUDGET,
+    DEFAULT_QUERY_TIME_BUDGET,
+)
 from homeassistant.components.websocket_api import messages
 from homeassistant.components.websocket_api.connection import ActiveConnection
 from homeassistant.const import (
@@ -35,12 +39,15 @@ from homeassistant.helpers.event import (
     async_track_point_in_utc_time,
     async_track_state_change_event,
 )
-from homeassistant.helpers.json import json_bytes
 from homeassistant.util.async_ import create_eager_task
 import homeassistant.util.dt as dt_util
 
 from .const import EVENT_COALESCE_TIME, MAX_PENDING_HISTORY_STATES
-from .helpers import entities_may_have_state_changes_after, has_recorder_run_after
+from .helpers import (
+    downsample_compressed_states,
+    entities_may_have_state_changes_after,
+    has_recorder_run_after,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -73,25 +80,27 @@ def _ws_get_significant_states(
     significant_changes_only: bool,
     minimal_response: bool,
     no_attributes: bool,
+    max_points: int | None,
+    dumps: Callable[[Any], bytes],
 ) -> bytes:
-    """Fetch history significant_states and convert them to json in the executor."""
-    return json_bytes(
-        messages.result_message(
-            msg_id,
-            history.get_significant_states(
-                hass,
-                start_time,
-                end_time,
-                entity_ids,
-                None,
-                include_start_time_state,
-                significant_changes_only,
-                minimal_response,
-                no_attributes,
-                True,
-            ),
-        )
+    """Fetch history significant_states and serialize them in the executor."""
+    states = history.get_significant_states(
+        hass,
+        start_time,
+        end_time,
+        entity_ids,
+        None,
+        include_start_time_state,
+        significant_changes_only,
+        minimal_response,
+        no_attributes,
+        True,
     )
+    if max_points:
+        downsample_compressed_states(
+            cast(dict[str, list[dict[str, Any]]], states), max_points
+        )
+    return dumps(messages.result_message(msg_id, states))
 
 
 @websocket_api.websocket_command(
@@ -104,6 +113,7 @@ def _ws_get_significant_states(
         vol.Optional("significant_changes_only", default=True): bool,
         vol.Optional("minimal_response", default=False): bool,
         vol.Optional("no_attributes", default=False): bool,
+        vol.Optional("max_points"): vol.All(int, vol.Range(min=5)),
     }
 )
 @websocket_api.async_response
@@ -156,8 +166,12 @@ async def ws_get_history_during_period(
     significant_changes_only = msg["significant_changes_only"]
     minimal_response = msg["minimal_response"]
 
-    connection.send_message(
-        await get_instance(hass).async_add_executor_job(
+    # The query is cancelled when the connection is closed
+    # before the history is sent
+    cancel = cast(asyncio.Task, asyncio.current_task()).cancel
+    connection.subscriptions[msg["id"]] = cancel
+    try:
+        response = await get_instance(hass).async_run_query(
             _ws_get_significant_states,
             hass,
             msg["id"],
@@ -168,8 +182,15 @@ async def ws_get_history_during_period(
             significant_changes_only,
             minimal_response,
             no_attributes,
+            msg.get("max_points"),
+            connection.encoding.dumps,
+            timeout=DEFAULT_QUERY_TIME_BUDGET,
+            max_rows=DEFAULT_QUERY_ROW_BUDGET,
         )
-    )
+    finally:
+        if connection.subscriptions.get(msg["id"]) is cancel:
+            del connection.subscriptions[msg["id"]]
+    connection.send_encoded_message(response)
 
 
 def _generate_stream_message(
@@ -192,8 +213,10 @@ def _async_send_empty_response(
     """Send an empty response when we know all results are filtered away."""
     connection.send_result(msg_id)
     stream_end_time = end_time or dt_util.utcnow()
-    connection.send_message(
-        _generate_websocket_response(msg_id, start_time, stream_end_time, {})
+    connection.send_encoded_message(
+        _generate_websocket_response(
+            msg_id, start_time, stream_end_time, {}, connection.encoding.dumps
+        )
     )
 
 
@@ -202,9 +225,10 @@ def _generate_websocket_response(
     start_time: dt,
     end_time: dt,
     states: dict[str, list[dict[str, Any]]],
+    dumps: Callable[[Any], bytes],
 ) -> bytes:
     """Generate a websocket response."""
-    return json_bytes(
+    return dumps(
         messages.event_message(
             msg_id, _generate_stream_message(states, start_time, end_time)
         )
@@ -222,6 +246,8 @@ def _generate_historical_response(
     minimal_response: bool,
     no_attributes: bool,
     send_empty: bool,
+    max_points: int | None,
+    dumps: Callable[[Any], bytes],
 ) -> tuple[float, dt | None, bytes | None]:
     """Generate a historical response."""
     states = cast(
@@ -258,10 +284,13 @@ def _generate_historical_response(
     else:
         last_time_dt = dt_util.utc_from_timestamp(last_time_ts)
 
+    if max_points:
+        downsample_compressed_states(states, max_points)
+
     return (
         last_time_ts,
         last_time_dt,
-        _generate_websocket_response(msg_id, start_time, last_time_dt, states),
+        _generate_websocket_response(msg_id, start_time, last_time_dt, states, dumps),
     )
 
 
@@ -277,10 +306,11 @@ async def _async_send_historical_states(
     minimal_response: bool,
     no_attributes: bool,
     send_empty: bool,
+    max_points: int | None,
 ) -> dt | None:
     """Fetch history significant_states and send them to the client."""
     instance = get_instance(hass)
-    last_time_ts, last_time_dt, payload = await instance.async_add_executor_job(
+    last_time_ts, last_time_dt, payload = await instance.async_run_query(
         _generate_historical_response,
         hass,
         msg_id,
@@ -292,9 +322,13 @@ async def _async_send_historical_states(
         minimal_response,
         no_attributes,
         send_empty,
+        max_points,
+        connection.encoding.dumps,
+        timeout=DEFAULT_QUERY_TIME_BUDGET,
+        max_rows=DEFAULT_QUERY_ROW_BUDGET,
     )
     if payload:
-        connection.send_message(payload)
+        connection.send_encoded_message(payload)
     return last_time_dt if last_time_ts != 0 else None
 
 
@@ -349,8 +383,8 @@ async def _async_events_consumer(
             events.append(stream_queue.get_nowait())
 
         if history_states := _events_to_compressed_states(events, no_attributes):
-            connection.send_message(
-                json_bytes(
+            connection.send_encoded_message(
+                connection.encoding.dumps(
                     messages.event_message(
                         msg_id,
                         {"states": history_states},
@@ -405,6 +439,7 @@ def _async_subscribe_events(
         vol.Optional("significant_changes_only", default=True): bool,
         vol.Optional("minimal_response", default=False): bool,
         vol.Optional("no_attributes", default=False): bool,
+        vol.Optional("max_points"): vol.All(int, vol.Range(min=5)),
     }
 )
 @websocket_api.async_response
@@ -444,6 +479,7 @@ async def ws_stream(
     significant_changes_only = msg["significant_changes_only"]
     no_attributes = msg["no_attributes"]
     minimal_response = msg["minimal_response"]
+    max_points: int | None = msg.get("max_points")
 
     if end_time and end_time <= utc_now:
         if (
@@ -456,7 +492,11 @@ async def ws_stream(
             _async_send_empty_response(connection, msg_id, start_time, end_time)
             return
 
-        connection.subscriptions[msg_id] = callback(lambda: None)
+        # The query is cancelled when the client unsubscribes
+        # before the history is sent
+        connection.subscriptions[msg_id] = cast(
+            asyncio.Task, asyncio.current_task()
+        ).cancel
         connection.send_result(msg_id)
         await _async_send_historical_states(
             hass,
@@ -470,6 +510,7 @@ async def ws_stream(
             minimal_response,
             no_attributes,
             True,
+            max_points,
         )
         return
 
@@ -518,8 +559,16 @@ async def ws_stream(
         significant_changes_only=significant_changes_only,
         minimal_response=minimal_response,
     )
+    handler_task = cast(asyncio.Task, asyncio.current_task())
+
+    @callback
+    def _unsub_and_cancel() -> None:
+        """Unsubscribe and cancel the history queries of the stream."""
+        _unsub()
+        handler_task.cancel()
+
     subscriptions_setup_complete_time = dt_util.utcnow()
-    connection.subscriptions[msg_id] = _unsub
+    connection.subscriptions[msg_id] = _unsub_and_cancel
     connection.send_result(msg_id)
     # Fetch everything from history
     last_event_time = await _async_send_historical_states(
@@ -534,6 +583,7 @@ async def ws_stream(
         minimal_response,
         no_attributes,
         True,
+        max_points,
     )
 
     if msg_id not in connection.subscriptions:
@@ -578,4 +628,5 @@ async def ws_stream(
         minimal_response,
         no_attributes,
         send_empty=not last_event_time,
+        max_points=max_points,
     )
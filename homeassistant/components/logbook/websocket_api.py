@@ -7,17 +7,20 @@ from collections.abc import Callable
 from dataclasses import dataclass
 from datetime import datetime as dt, timedelta
 import logging
-from typing import Any
+from typing import Any, cast
 
 import voluptuous as vol
 
 from homeassistant.components import websocket_api
 from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.const import (
+    DEFAULT_QUERY_ROW_BUDGET,
+    DEFAULT_QUERY_TIME_BUDGET,
+)
 from homeassistant.components.websocket_api import messages
 from homeassistant.components.websocket_api.connection import ActiveConnection
 from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
 from homeassistant.helpers.event import async_track_point_in_utc_time
-from homeassistant.helpers.json import json_bytes
 from homeassistant.util.async_ import create_eager_task
 import homeassistant.util.dt as dt_util
 
@@ -72,7 +75,7 @@ def _async_send_empty_response(
     stream_end_time = end_time or dt_util.utcnow()
     empty_stream_message = _generate_stream_message([], start_time, stream_end_time)
     empty_response = messages.event_message(msg_id, empty_stream_message)
-    connection.send_message(json_bytes(empty_response))
+    connection.send_encoded_message(connection.encoding.dumps(empty_response))
 
 
 async def _async_send_historical_events(
@@ -112,6 +115,7 @@ async def _async_send_historical_events(
             formatter,
             event_processor,
             partial,
+            connection.encoding.dumps,
         )
         # If there is no last_event_time, there are no historical
         # results, but we still send an empty message
@@ -119,7 +123,7 @@ async def _async_send_historical_events(
         # consumers of the api know their request was
         # answered but there were no results
         if last_event_time or not partial or force_send:
-            connection.send_message(message)
+            connection.send_encoded_message(message)
         return last_event_time
 
     # This is a big query so we deliver
@@ -134,9 +138,10 @@ async def _async_send_historical_events(
         formatter,
         event_processor,
         partial=True,
+        dumps=connection.encoding.dumps,
     )
     if recent_query_last_event_time:
-        connection.send_message(recent_message)
+        connection.send_encoded_message(recent_message)
 
     older_message, older_query_last_event_time = await _async_get_ws_stream_events(
         hass,
@@ -146,6 +151,7 @@ async def _async_send_historical_events(
         formatter,
         event_processor,
         partial,
+        connection.encoding.dumps,
     )
     # If there is no last_event_time, there are no historical
     # results, but we still send an empty message
@@ -153,7 +159,7 @@ async def _async_send_historical_events(
     # consumers of the api know their request was
     # answered but there were no results
     if older_query_last_event_time or not partial or force_send:
-        connection.send_message(older_message)
+        connection.send_encoded_message(older_message)
 
     # Returns the time of the newest event
     return recent_query_last_event_time or older_query_last_event_time
@@ -167,9 +173,10 @@ async def _async_get_ws_stream_events(
     formatter: Callable[[int, Any], dict[str, Any]],
     event_processor: EventProcessor,
     partial: bool,
+    dumps: Callable[[Any], bytes],
 ) -> tuple[bytes, dt | None]:
     """Async wrapper around _ws_formatted_get_events."""
-    return await get_instance(hass).async_add_executor_job(
+    return await get_instance(hass).async_run_query(
         _ws_stream_get_events,
         msg_id,
         start_time,
@@ -177,6 +184,9 @@ async def _async_get_ws_stream_events(
         formatter,
         event_processor,
         partial,
+        dumps,
+        timeout=DEFAULT_QUERY_TIME_BUDGET,
+        max_rows=DEFAULT_QUERY_ROW_BUDGET,
     )
 
 
@@ -198,8 +208,9 @@ def _ws_stream_get_events(
     formatter: Callable[[int, Any], dict[str, Any]],
     event_processor: EventProcessor,
     partial: bool,
+    dumps: Callable[[Any], bytes],
 ) -> tuple[bytes, dt | None]:
-    """Fetch events and convert them to json in the executor."""
+    """Fetch events and serialize them in the executor."""
     events = event_processor.get_events(start_day, end_day)
     last_time = None
     if events:
@@ -211,7 +222,7 @@ def _ws_stream_get_events(
         # data in case the UI needs to show that historical
         # data is still loading in the future
         message["partial"] = True
-    return json_bytes(formatter(msg_id, message)), last_time
+    return dumps(formatter(msg_id, message)), last_time
 
 
 async def _async_events_consumer(
@@ -242,8 +253,8 @@ async def _async_events_consumer(
         if logbook_events := event_processor.humanify(
             async_event_to_row(e) for e in events
         ):
-            connection.send_message(
-                json_bytes(
+            connection.send_encoded_message(
+                connection.encoding.dumps(
                     messages.event_message(
                         msg_id,
                         {"events": logbook_events},
@@ -443,9 +454,10 @@ def _ws_formatted_get_events(
     start_time: dt,
     end_time: dt,
     event_processor: EventProcessor,
+    dumps: Callable[[Any], bytes],
 ) -> bytes:
-    """Fetch events and convert them to json in the executor."""
-    return json_bytes(
+    """Fetch events and serialize them in the executor."""
+    return dumps(
         messages.result_message(
             msg_id, event_processor.get_events(start_time, end_time)
         )
@@ -511,12 +523,22 @@ async def ws_get_events(
         include_entity_name=False,
     )
 
-    connection.send_message(
-        await get_instance(hass).async_add_executor_job(
+    # The query is cancelled when the connection is closed
+    # before the events are sent
+    cancel = cast(asyncio.Task, asyncio.current_task()).cancel
+    connection.subscriptions[msg["id"]] = cancel
+    try:
+        response = await get_instance(hass).async_run_query(
             _ws_formatted_get_events,
             msg["id"],
             start_time,
             end_time,
             event_processor,
+            connection.encoding.dumps,
+            timeout=DEFAULT_QUERY_TIME_BUDGET,
+            max_rows=DEFAULT_QUERY_ROW_BUDGET,
         )
-    )
+    finally:
+        if connection.subscriptions.get(msg["id"]) is cancel:
+            del connection.subscriptions[msg["id"]]
+    connection.send_encoded_message(response)
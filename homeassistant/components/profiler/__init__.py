@@ -17,11 +17,12 @@ from typing import Any, cast
 from lru import LRU
 import voluptuous as vol
 
-from homeassistant.components import persistent_notification
+from homeassistant.components import persistent_notification, websocket_api
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_SCAN_INTERVAL, CONF_TYPE
 from homeassistant.core import HomeAssistant, ServiceCall, callback
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import instrumentation
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.service import async_register_admin_service
@@ -40,6 +41,8 @@ SERVICE_LOG_THREAD_FRAMES = "log_thread_frames"
 SERVICE_LOG_EVENT_LOOP_SCHEDULED = "log_event_loop_scheduled"
 SERVICE_SET_ASYNCIO_DEBUG = "set_asyncio_debug"
 SERVICE_LOG_CURRENT_TASKS = "log_current_tasks"
+SERVICE_START_LISTENER_STATS = "start_listener_stats"
+SERVICE_STOP_LISTENER_STATS = "stop_listener_stats"
 
 _LRU_CACHE_WRAPPER_OBJECT = _lru_cache_wrapper.__name__
 _SQLALCHEMY_LRU_OBJECT = "LRUCache"
@@ -63,6 +66,8 @@ SERVICES = (
     SERVICE_LOG_EVENT_LOOP_SCHEDULED,
     SERVICE_SET_ASYNCIO_DEBUG,
     SERVICE_LOG_CURRENT_TASKS,
+    SERVICE_START_LISTENER_STATS,
+    SERVICE_STOP_LISTENER_STATS,
 )
 
 DEFAULT_SCAN_INTERVAL = timedelta(seconds=30)
@@ -72,6 +77,7 @@ DEFAULT_MAX_OBJECTS = 5
 CONF_ENABLED = "enabled"
 CONF_SECONDS = "seconds"
 CONF_MAX_OBJECTS = "max_objects"
+CONF_LIMIT = "limit"
 
 LOG_INTERVAL_SUB = "log_interval_subscription"
 
@@ -260,6 +266,24 @@ async def async_setup_entry(  # noqa: C901
                 if not handle.cancelled():
                     _LOGGER.critical("Scheduled: %s", handle)
 
+    @callback
+    def _async_start_listener_stats(call: ServiceCall) -> None:
+        """Start recording the run time of event listeners."""
+        if instrumentation.async_get(hass):
+            raise HomeAssistantError("Listener stats already started")
+        # Always log this at critical level so we know when
+        # it's been changed when reviewing logs
+        _LOGGER.critical("Starting listener stats")
+        instrumentation.async_enable(hass)
+
+    @callback
+    def _async_stop_listener_stats(call: ServiceCall) -> None:
+        """Stop recording the run time of event listeners."""
+        if not instrumentation.async_get(hass):
+            raise HomeAssistantError("Listener stats not running")
+        _LOGGER.critical("Stopping listener stats")
+        instrumentation.async_disable(hass)
+
     async def _async_asyncio_debug(call: ServiceCall) -> None:
         """Enable or disable asyncio debug."""
         enabled = call.data[CONF_ENABLED]
@@ -382,6 +406,22 @@ async def async_setup_entry(  # noqa: C901
         _async_dump_current_tasks,
     )
 
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_START_LISTENER_STATS,
+        _async_start_listener_stats,
+    )
+
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_STOP_LISTENER_STATS,
+        _async_stop_listener_stats,
+    )
+
+    websocket_api.async_register_command(hass, websocket_listener_stats)
+
     return True
 
 
@@ -391,10 +431,40 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         hass.services.async_remove(domain=DOMAIN, service=service)
     if LOG_INTERVAL_SUB in hass.data[DOMAIN]:
         hass.data[DOMAIN][LOG_INTERVAL_SUB]()
+    instrumentation.async_disable(hass)
     hass.data.pop(DOMAIN)
     return True
 
 
+@callback
+def async_listener_stats(
+    hass: HomeAssistant, limit: int = instrumentation.DEFAULT_LISTENER_LIMIT
+) -> dict[str, Any]:
+    """Return the event listener stats."""
+    if (bus_instrumentation := instrumentation.async_get(hass)) is None:
+        return {"enabled": False}
+    return {"enabled": True, **bus_instrumentation.async_as_dict(limit)}
+
+
+@websocket_api.require_admin
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "profiler/listener_stats",
+        vol.Optional(
+            CONF_LIMIT, default=instrumentation.DEFAULT_LISTENER_LIMIT
+        ): vol.All(int, vol.Range(min=1)),
+    }
+)
+@callback
+def websocket_listener_stats(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return the event listener stats."""
+    connection.send_result(msg["id"], async_listener_stats(hass, msg[CONF_LIMIT]))
+
+
 async def _async_generate_profile(hass: HomeAssistant, call: ServiceCall):
     # Imports deferred to avoid loading modules
     # in memory since usually only one part of this
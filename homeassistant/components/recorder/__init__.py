@@ -35,6 +35,7 @@ from .const import (  # noqa: F401
     INTEGRATION_PLATFORM_COMPILE_STATISTICS,
     INTEGRATION_PLATFORMS_LOAD_IN_RECORDER_THREAD,
     SQLITE_URL_PREFIX,
+    PartitionInterval,
     SupportedDialect,
 )
 from .core import Recorder
@@ -51,12 +52,17 @@ DEFAULT_DB_INTEGRITY_CHECK = True
 DEFAULT_DB_MAX_RETRIES = 10
 DEFAULT_DB_RETRY_WAIT = 3
 DEFAULT_COMMIT_INTERVAL = 5
+DEFAULT_DB_READER_THREADS = 4
 
+CONF_ARCHIVE_DAYS = "archive_days"
 CONF_AUTO_PURGE = "auto_purge"
 CONF_AUTO_REPACK = "auto_repack"
 CONF_DB_URL = "db_url"
 CONF_DB_MAX_RETRIES = "db_max_retries"
 CONF_DB_RETRY_WAIT = "db_retry_wait"
+CONF_DB_READER_URL = "db_reader_url"
+CONF_DB_READER_THREADS = "db_reader_threads"
+CONF_DB_PARTITION_INTERVAL = "db_partition_interval"
 CONF_PURGE_KEEP_DAYS = "purge_keep_days"
 CONF_PURGE_INTERVAL = "purge_interval"
 CONF_EVENT_TYPES = "event_types"
@@ -99,6 +105,9 @@ CONFIG_SCHEMA = vol.Schema(
                     vol.Optional(CONF_PURGE_KEEP_DAYS, default=10): vol.All(
                         vol.Coerce(int), vol.Range(min=1)
                     ),
+                    vol.Optional(CONF_ARCHIVE_DAYS): vol.All(
+                        vol.Coerce(int), vol.Range(min=1)
+                    ),
                     vol.Optional(CONF_PURGE_INTERVAL, default=1): cv.positive_int,
                     vol.Optional(CONF_DB_URL): vol.All(cv.string, validate_db_url),
                     vol.Optional(
@@ -113,6 +122,15 @@ CONFIG_SCHEMA = vol.Schema(
                     vol.Optional(
                         CONF_DB_INTEGRITY_CHECK, default=DEFAULT_DB_INTEGRITY_CHECK
                     ): cv.boolean,
+                    vol.Optional(CONF_DB_READER_URL): vol.All(
+                        cv.string, validate_db_url
+                    ),
+                    vol.Optional(
+                        CONF_DB_READER_THREADS, default=DEFAULT_DB_READER_THREADS
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=32)),
+                    vol.Optional(CONF_DB_PARTITION_INTERVAL): vol.Coerce(
+                        PartitionInterval
+                    ),
                 }
             ),
         )
@@ -139,9 +157,13 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     auto_purge = conf[CONF_AUTO_PURGE]
     auto_repack = conf[CONF_AUTO_REPACK]
     keep_days = conf[CONF_PURGE_KEEP_DAYS]
+    archive_days = conf.get(CONF_ARCHIVE_DAYS)
     commit_interval = conf[CONF_COMMIT_INTERVAL]
     db_max_retries = conf[CONF_DB_MAX_RETRIES]
     db_retry_wait = conf[CONF_DB_RETRY_WAIT]
+    db_reader_url = conf.get(CONF_DB_READER_URL)
+    db_reader_threads = conf[CONF_DB_READER_THREADS]
+    db_partition_interval = conf.get(CONF_DB_PARTITION_INTERVAL)
     db_url = conf.get(CONF_DB_URL) or DEFAULT_URL.format(
         hass_config_path=hass.config.path(DEFAULT_DB_FILE)
     )
@@ -157,10 +179,14 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         auto_purge=auto_purge,
         auto_repack=auto_repack,
         keep_days=keep_days,
+        archive_days=archive_days,
         commit_interval=commit_interval,
         uri=db_url,
         db_max_retries=db_max_retries,
         db_retry_wait=db_retry_wait,
+        db_reader_url=db_reader_url,
+        db_reader_threads=db_reader_threads,
+        db_partition_interval=db_partition_interval,
         entity_filter=entity_filter,
         exclude_event_types=exclude_event_types,
     )
@@ -0,0 +1,393 @@
+"""Archive of states that are too old to be kept in the database.
+
+Each UTC day of archived states is stored in its own gzip compressed
+file. The states are stored per entity_id in columns. The last_updated
+timestamps are delta encoded in microseconds and last_changed and
+last_reported are stored as offsets to last_updated (or null when they
+are the same). The shared attributes are deduplicated per file.
+
+The archive is keyed by entity_id and not by metadata_id since the
+states_meta rows of entities without states in the database are purged.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime, timedelta
+import gzip
+from itertools import accumulate
+import logging
+import os
+import threading
+from typing import Any, cast
+
+from homeassistant.helpers.json import json_bytes
+from homeassistant.util.file import write_utf8_file_atomic
+from homeassistant.util.json import json_loads_object
+
+_LOGGER = logging.getLogger(__name__)
+
+ARCHIVE_DIR = "recorder_archive"
+ARCHIVE_VERSION = 1
+
+_FILE_SUFFIX = ".json.gz"
+_DAY_CACHE_SIZE = 4
+_ONE_DAY = timedelta(days=1)
+
+
+@dataclass(slots=True)
+class ArchivedEntityStates:
+    """Columns of archived states of an entity ordered by last_updated_ts."""
+
+    last_updated_ts: list[float] = field(default_factory=list)
+    last_changed_ts: list[float | None] = field(default_factory=list)
+    last_reported_ts: list[float | None] = field(default_factory=list)
+    state: list[str | None] = field(default_factory=list)
+    attributes: list[str | None] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        """Return the number of states."""
+        return len(self.last_updated_ts)
+
+    def append(
+        self,
+        last_updated_ts: float,
+        last_changed_ts: float | None,
+        last_reported_ts: float | None,
+        state: str | None,
+        attributes: str | None,
+    ) -> None:
+        """Append a state, it must not be older than the last state."""
+        self.last_updated_ts.append(last_updated_ts)
+        self.last_changed_ts.append(last_changed_ts)
+        self.last_reported_ts.append(last_reported_ts)
+        self.state.append(state)
+        self.attributes.append(attributes)
+
+    def extend(self, other: ArchivedEntityStates) -> None:
+        """Extend with states that are not older than the last state."""
+        self.last_updated_ts.extend(other.last_updated_ts)
+        self.last_changed_ts.extend(other.last_changed_ts)
+        self.last_reported_ts.extend(other.last_reported_ts)
+        self.state.extend(other.state)
+        self.attributes.extend(other.attributes)
+
+    def rows(self) -> Iterable[tuple[Any, ...]]:
+        """Return the states as rows."""
+        return zip(
+            self.last_updated_ts,
+            self.last_changed_ts,
+            self.last_reported_ts,
+            self.state,
+            self.attributes,
+            strict=True,
+        )
+
+    def slice(self, start: int, end: int) -> ArchivedEntityStates:
+        """Return the states between the start and end index."""
+        return ArchivedEntityStates(
+            self.last_updated_ts[start:end],
+            self.last_changed_ts[start:end],
+            self.last_reported_ts[start:end],
+            self.state[start:end],
+            self.attributes[start:end],
+        )
+
+    def between(
+        self, start_time_ts: float, end_time_ts: float | None
+    ) -> ArchivedEntityStates:
+        """Return the states with start_time_ts < last_updated_ts < end_time_ts."""
+        last_updated_ts = self.last_updated_ts
+        return self.slice(
+            bisect_right(last_updated_ts, start_time_ts),
+            bisect_left(last_updated_ts, end_time_ts)
+            if end_time_ts
+            else len(last_updated_ts),
+        )
+
+    def merged(self, other: ArchivedEntityStates) -> ArchivedEntityStates:
+        """Return the states merged with other states without duplicates."""
+        merged = ArchivedEntityStates()
+        for row in sorted({*self.rows(), *other.rows()}, key=lambda row: row[0]):
+            merged.append(*row)
+        return merged
+
+
+def _day_start_ts(day: date) -> float:
+    """Return the timestamp of the start of a UTC day."""
+    return datetime(day.year, day.month, day.day, tzinfo=UTC).timestamp()
+
+
+def _to_us(timestamp: float) -> int:
+    """Convert a timestamp to integer microseconds."""
+    return round(timestamp * 1_000_000)
+
+
+def _encode_offsets(
+    timestamps: list[float | None], last_updated_us: list[int]
+) -> list[int | None] | None:
+    """Encode timestamps as offsets to last_updated, None if there are none."""
+    if all(timestamp is None for timestamp in timestamps):
+        return None
+    return [
+        None if timestamp is None else _to_us(timestamp) - updated_us
+        for timestamp, updated_us in zip(timestamps, last_updated_us, strict=True)
+    ]
+
+
+def _decode_offsets(
+    offsets: list[int | None] | None, last_updated_us: list[int]
+) -> list[float | None]:
+    """Decode offsets to last_updated to timestamps."""
+    if offsets is None:
+        return [None] * len(last_updated_us)
+    return [
+        None if offset is None else (updated_us + offset) / 1_000_000
+        for offset, updated_us in zip(offsets, last_updated_us, strict=True)
+    ]
+
+
+def encode_day(entities: dict[str, ArchivedEntityStates]) -> bytes:
+    """Encode the archived states of a day."""
+    shared_attrs: dict[str, int] = {}
+    encoded: dict[str, dict[str, Any]] = {}
+    for entity_id, states in entities.items():
+        last_updated_us = [_to_us(timestamp) for timestamp in states.last_updated_ts]
+        encoded[entity_id] = {
+            "last_updated": [
+                updated_us - previous_us
+                for updated_us, previous_us in zip(
+                    last_updated_us, [0, *last_updated_us[:-1]], strict=True
+                )
+            ],
+            "last_changed": _encode_offsets(states.last_changed_ts, last_updated_us),
+            "last_reported": _encode_offsets(states.last_reported_ts, last_updated_us),
+            "state": states.state,
+            "attributes": [
+                None
+                if attrs is None
+                else shared_attrs.setdefault(attrs, len(shared_attrs))
+                for attrs in states.attributes
+            ],
+        }
+    return gzip.compress(
+        json_bytes(
+            {
+                "version": ARCHIVE_VERSION,
+                "attributes": list(shared_attrs),
+                "entities": encoded,
+            }
+        ),
+        compresslevel=6,
+    )
+
+
+def decode_day(data: bytes) -> dict[str, ArchivedEntityStates]:
+    """Decode the archived states of a day."""
+    decoded = json_loads_object(gzip.decompress(data))
+    shared_attrs = cast(list[str], decoded["attributes"])
+    entities: dict[str, ArchivedEntityStates] = {}
+    for entity_id, columns in cast(
+        dict[str, dict[str, Any]], decoded["entities"]
+    ).items():
+        last_updated_us = list(accumulate(columns["last_updated"]))
+        entities[entity_id] = ArchivedEntityStates(
+            [updated_us / 1_000_000 for updated_us in last_updated_us],
+            _decode_offsets(columns["last_changed"], last_updated_us),
+            _decode_offsets(columns["last_reported"], last_updated_us),
+            columns["state"],
+            [
+                None if idx is None else shared_attrs[idx]
+                for idx in columns["attributes"]
+            ],
+        )
+    return entities
+
+
+class StatesArchive:
+    """Manage the files of archived states.
+
+    Files are written by the recorder thread and read by
+    the history queries in the database executor.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Initialize the archive."""
+        self.path = path
+        self._lock = threading.Lock()
+        self._days: list[date] | None = None
+        self._cache: OrderedDict[date, dict[str, ArchivedEntityStates]] = OrderedDict()
+
+    def load(self) -> None:
+        """Load the archived days from disk.
+
+        Must be called from the recorder thread before the
+        archive can be used.
+        """
+        days: list[date] = []
+        try:
+            names = os.listdir(self.path)
+        except FileNotFoundError:
+            names = []
+        for name in names:
+            if not name.endswith(_FILE_SUFFIX):
+                continue
+            try:
+                days.append(date.fromisoformat(name.removesuffix(_FILE_SUFFIX)))
+            except ValueError:
+                _LOGGER.warning("Ignoring unexpected file %s in archive", name)
+        with self._lock:
+            self._days = sorted(days)
+            self._cache.clear()
+
+    @property
+    def archived_before_ts(self) -> float | None:
+        """Return the end of the newest archived day or None if there are none."""
+        if not (days := self._days):
+            return None
+        return _day_start_ts(days[-1] + _ONE_DAY)
+
+    def _day_path(self, day: date) -> str:
+        """Return the path of the file of a day."""
+        return os.path.join(self.path, f"{day.isoformat()}{_FILE_SUFFIX}")
+
+    def _days_between(
+        self, start_time_ts: float, end_time_ts: float | None
+    ) -> list[date]:
+        """Return the archived days overlapping start_time_ts - end_time_ts."""
+        assert self._days is not None
+        return [
+            day
+            for day in self._days
+            if (end_time_ts is None or _day_start_ts(day) < end_time_ts)
+            and _day_start_ts(day + _ONE_DAY) > start_time_ts
+        ]
+
+    def _read_day(self, day: date) -> dict[str, ArchivedEntityStates]:
+        """Read the archived states of a day, must be called with the lock held."""
+        if (entities := self._cache.get(day)) is not None:
+            self._cache.move_to_end(day)
+            return entities
+        with open(self._day_path(day), "rb") as file:
+            entities = decode_day(file.read())
+        self._cache[day] = entities
+        if len(self._cache) > _DAY_CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return entities
+
+    def _write_day(self, day: date, entities: dict[str, ArchivedEntityStates]) -> None:
+        """Write the archived states of a day, must be called with the lock held."""
+        assert self._days is not None
+        self._cache.pop(day, None)
+        if not entities:
+            os.unlink(self._day_path(day))
+            self._days.remove(day)
+            return
+        os.makedirs(self.path, exist_ok=True)
+        write_utf8_file_atomic(self._day_path(day), encode_day(entities), mode="wb")
+        if day not in self._days:
+            insort(self._days, day)
+
+    def states_during_period(
+        self,
+        entity_ids: Iterable[str],
+        start_time_ts: float,
+        end_time_ts: float | None,
+    ) -> dict[str, ArchivedEntityStates]:
+        """Return archived states with start_time_ts < last_updated_ts < end_time_ts."""
+        result: dict[str, ArchivedEntityStates] = {}
+        with self._lock:
+            for day in self._days_between(start_time_ts, end_time_ts):
+                entities = self._read_day(day)
+                for entity_id in entity_ids:
+                    if (states := entities.get(entity_id)) is None:
+                        continue
+                    if not (states := states.between(start_time_ts, end_time_ts)):
+                        continue
+                    if existing := result.get(entity_id):
+                        existing.extend(states)
+                    else:
+                        result[entity_id] = states
+        return result
+
+    def last_states_before(
+        self,
+        entity_ids: Iterable[str],
+        start_time_ts: float,
+        before_ts: float,
+    ) -> dict[str, ArchivedEntityStates]:
+        """Return the last archived state with start_time_ts <= last_updated_ts < before_ts."""
+        result: dict[str, ArchivedEntityStates] = {}
+        remaining = set(entity_ids)
+        with self._lock:
+            for day in reversed(self._days_between(start_time_ts, before_ts)):
+                entities = self._read_day(day)
+                for entity_id in list(remaining):
+                    if (states := entities.get(entity_id)) is None:
+                        continue
+                    last_updated_ts = states.last_updated_ts
+                    idx = bisect_left(last_updated_ts, before_ts)
+                    if idx and last_updated_ts[idx - 1] >= start_time_ts:
+                        result[entity_id] = states.slice(idx - 1, idx)
+                        remaining.discard(entity_id)
+                if not remaining:
+                    break
+        return result
+
+    def add_day(self, day: date, entities: dict[str, ArchivedEntityStates]) -> None:
+        """Add the states of a day to the archive.
+
+        States that are already archived for the day are merged.
+        """
+        with self._lock:
+            assert self._days is not None
+            if day in self._days:
+                existing = self._read_day(day)
+                entities = {
+                    entity_id: existing[entity_id].merged(states)
+                    if entity_id in existing
+                    else states
+                    for entity_id, states in entities.items()
+                } | {
+                    entity_id: states
+                    for entity_id, states in existing.items()
+                    if entity_id not in entities
+                }
+            self._write_day(day, entities)
+
+    def purge_days_before(self, purge_before: datetime) -> None:
+        """Delete the archived days that ended before purge_before."""
+        purge_before_ts = purge_before.timestamp()
+        with self._lock:
+            assert self._days is not None
+            for day in [
+                day
+                for day in self._days
+                if _day_start_ts(day + _ONE_DAY) <= purge_before_ts
+            ]:
+                _LOGGER.debug("Deleting archived states of %s", day)
+                self._write_day(day, {})
+
+    def purge_entities(
+        self, entity_filter: Callable[[str], bool], purge_before: datetime
+    ) -> None:
+        """Delete archived states of entities older than purge_before."""
+        purge_before_ts = purge_before.timestamp()
+        with self._lock:
+            assert self._days is not None
+            for day in self._days_between(0, purge_before_ts):
+                entities = self._read_day(day)
+                if not any(entity_filter(entity_id) for entity_id in entities):
+                    continue
+                kept: dict[str, ArchivedEntityStates] = {}
+                for entity_id, states in entities.items():
+                    if not entity_filter(entity_id):
+                        kept[entity_id] = states
+                        continue
+                    idx = bisect_left(states.last_updated_ts, purge_before_ts)
+                    if idx < len(states):
+                        kept[entity_id] = states.slice(idx, len(states))
+                self._write_day(day, kept)
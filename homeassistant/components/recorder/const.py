@@ -50,6 +50,15 @@ DEFAULT_MAX_BIND_VARS = 4000
 
 DB_WORKER_PREFIX = "DbWorker"
 
+# Connections a MySQL, MariaDB or PostgreSQL pool may open in addition to
+# a connection for the recorder thread and each database executor thread
+DB_POOL_MAX_OVERFLOW = 10
+
+# The default budget of the queries of frontend requests, a query which
+# takes longer or fetches more rows has most likely been abandoned
+DEFAULT_QUERY_TIME_BUDGET = 120
+DEFAULT_QUERY_ROW_BUDGET = 2_000_000
+
 ALL_DOMAIN_EXCLUDE_ATTRS = {ATTR_ATTRIBUTION, ATTR_RESTORED, ATTR_SUPPORTED_FEATURES}
 
 ATTR_KEEP_DAYS = "keep_days"
@@ -58,6 +67,11 @@ ATTR_APPLY_FILTER = "apply_filter"
 
 KEEPALIVE_TIME = 30
 
+EVENT_RECORDER_PURGE_PROGRESS = "recorder_purge_progress"
+
+PURGE_STORAGE_KEY = "recorder.purge"
+PURGE_STORAGE_VERSION = 1
+
 STATISTICS_ROWS_SCHEMA_VERSION = 23
 CONTEXT_ID_AS_BINARY_SCHEMA_VERSION = 36
 EVENT_TYPE_IDS_SCHEMA_VERSION = 37
@@ -83,3 +97,10 @@ class SupportedDialect(StrEnum):
     SQLITE = "sqlite"
     MYSQL = "mysql"
     POSTGRESQL = "postgresql"
+
+
+class PartitionInterval(StrEnum):
+    """Intervals of the partitions of the states and statistics tables."""
+
+    DAILY = "daily"
+    MONTHLY = "monthly"
@@ -7,7 +7,7 @@ from collections.abc import Callable, Iterable
 from concurrent.futures import CancelledError
 import contextlib
 from datetime import datetime, timedelta
-from functools import cached_property
+from functools import cache, cached_property
 import logging
 import queue
 import sqlite3
@@ -17,17 +17,21 @@ from typing import TYPE_CHECKING, Any, cast
 
 import psutil_home_assistant as ha_psutil
 from sqlalchemy import (
+    Table,
+    bindparam,
     create_engine,
     event as sqlalchemy_event,
     exc,
+    insert,
     inspect,
     select,
     update,
 )
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Dialect, Engine
 from sqlalchemy.engine.interfaces import DBAPIConnection
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.orm.attributes import instance_dict
 from sqlalchemy.orm.session import Session
 
 from homeassistant.components import persistent_notification
@@ -51,15 +55,19 @@ from homeassistant.helpers.event import (
     async_track_utc_time_change,
 )
 from homeassistant.helpers.start import async_at_started
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.typing import UNDEFINED, UndefinedType
 import homeassistant.util.dt as dt_util
 from homeassistant.util.enum import try_parse_enum
 from homeassistant.util.event_type import EventType
 
 from . import migration, statistics
+from .archive import ARCHIVE_DIR, StatesArchive
 from .const import (
+    DB_POOL_MAX_OVERFLOW,
     DB_WORKER_PREFIX,
     DOMAIN,
+    EVENT_RECORDER_PURGE_PROGRESS,
     KEEPALIVE_TIME,
     LAST_REPORTED_SCHEMA_VERSION,
     LEGACY_STATES_EVENT_ID_INDEX_SCHEMA_VERSION,
@@ -69,9 +77,12 @@ from .const import (
     MIN_AVAILABLE_MEMORY_FOR_QUEUE_BACKLOG,
     MYSQLDB_PYMYSQL_URL_PREFIX,
     MYSQLDB_URL_PREFIX,
+    PURGE_STORAGE_KEY,
+    PURGE_STORAGE_VERSION,
     SQLITE_MAX_BIND_VARS,
     SQLITE_URL_PREFIX,
     STATISTICS_ROWS_SCHEMA_VERSION,
+    PartitionInterval,
     SupportedDialect,
 )
 from .db_schema import (
@@ -96,8 +107,15 @@ from .migration import (
     StatesContextIDMigration,
 )
 from .models import DatabaseEngine, StatisticData, StatisticMetaData, UnsupportedDialect
-from .pool import POOL_SIZE, MutexPool, RecorderPool
+from .pool import MutexPool, RecorderPool
 from .queries import get_migration_changes
+from .query_budget import (
+    QueryBudget,
+    QueryBudgetExceededError,
+    listen_for_query_budgets,
+    run_with_budget,
+)
+from .recent_states import RecentStatesCache
 from .table_managers.event_data import EventDataManager
 from .table_managers.event_types import EventTypeManager
 from .table_managers.recorder_runs import RecorderRunsManager
@@ -108,14 +126,17 @@ from .table_managers.statistics_meta import StatisticsMetaManager
 from .tasks import (
     AdjustLRUSizeTask,
     AdjustStatisticsTask,
+    ArchiveTask,
     ChangeStatisticsUnitTask,
     ClearStatisticsTask,
     CommitTask,
+    CompileMissingRollupsTask,
     CompileMissingStatisticsTask,
     DatabaseLockTask,
     EventIdMigrationTask,
     ImportStatisticsTask,
     KeepAliveTask,
+    PartitionTask,
     PerodicCleanupTask,
     PurgeTask,
     RecorderTask,
@@ -137,6 +158,7 @@ from .util import (
     move_away_broken_database,
     session_scope,
     setup_connection_for_dialect,
+    setup_read_only_connection_for_dialect,
     validate_or_move_away_sqlite_database,
     write_lock_db_sqlite,
 )
@@ -164,8 +186,38 @@ QUEUE_CHECK_INTERVAL = timedelta(minutes=5)
 INVALIDATED_ERR = "Database connection invalidated"
 CONNECTIVITY_ERR = "Error in database connectivity during commit"
 
-# Pool size must accommodate Recorder thread + All db executors
-MAX_DB_EXECUTOR_WORKERS = POOL_SIZE - 1
+
+type _PendingEvent = tuple[Events, EventTypes | None, EventData | None]
+type _PendingState = tuple[
+    States, States | None, StatesMeta | None, StateAttributes | None
+]
+
+
+@cache
+def _insert_column_keys(table: Table) -> tuple[str, ...]:
+    """Return the keys of the columns written by a bulk insert."""
+    return tuple(column.key for column in table.columns if not column.primary_key)
+
+
+@cache
+def _compile_positional_insert(
+    table: Table, dialect: Dialect
+) -> tuple[str, tuple[tuple[str, Callable[[Any], Any] | None], ...]]:
+    """Compile an insert for a dialect with a positional paramstyle.
+
+    Returns the statement and the column keys in the order of its parameters
+    with the bind processors of their types, since the statement is executed
+    on the driver without the type processing of SQLAlchemy.
+    """
+    compiled = insert(table).compile(
+        dialect=dialect, column_keys=list(_insert_column_keys(table))
+    )
+    assert compiled.positiontup is not None
+    columns = table.columns
+    return compiled.string, tuple(
+        (key, columns[key].type.dialect_impl(dialect).bind_processor(dialect))
+        for key in compiled.positiontup
+    )
 
 
 class Recorder(threading.Thread):
@@ -179,10 +231,14 @@ class Recorder(threading.Thread):
         auto_purge: bool,
         auto_repack: bool,
         keep_days: int,
+        archive_days: int | None,
         commit_interval: int,
         uri: str,
         db_max_retries: int,
         db_retry_wait: int,
+        db_reader_url: str | None,
+        db_reader_threads: int,
+        db_partition_interval: PartitionInterval | None,
         entity_filter: Callable[[str], bool] | None,
         exclude_event_types: set[EventType[Any] | str],
     ) -> None:
@@ -195,6 +251,7 @@ class Recorder(threading.Thread):
         self.auto_purge = auto_purge
         self.auto_repack = auto_repack
         self.keep_days = keep_days
+        self.archive_days = archive_days
         self.is_running: bool = False
         self._hass_started: asyncio.Future[object] = hass.loop.create_future()
         self.commit_interval = commit_interval
@@ -202,6 +259,9 @@ class Recorder(threading.Thread):
         self.db_url = uri
         self.db_max_retries = db_max_retries
         self.db_retry_wait = db_retry_wait
+        self.db_reader_url = db_reader_url
+        self.db_reader_threads = db_reader_threads
+        self.db_partition_interval = db_partition_interval
         self.database_engine: DatabaseEngine | None = None
         # Database connection is ready, but non-live migration may be in progress
         db_connected: asyncio.Future[bool] = hass.data[DOMAIN].db_connected
@@ -212,6 +272,7 @@ class Recorder(threading.Thread):
         self.async_recorder_ready = asyncio.Event()
         self._queue_watch = threading.Event()
         self.engine: Engine | None = None
+        self.reader_engine: Engine | None = None
         self.max_backlog: int = MAX_QUEUE_BACKLOG_MIN_VALUE
         self._psutil: ha_psutil.PsutilWrapper | None = None
 
@@ -224,6 +285,10 @@ class Recorder(threading.Thread):
         self.schema_version = 0
         self._commits_without_expire = 0
         self._event_session_has_pending_writes = False
+        # States and events of the commit window, they are written
+        # with a bulk insert when the event session is committed
+        self._pending_states: list[_PendingState] = []
+        self._pending_events: list[_PendingEvent] = []
 
         self.recorder_runs_manager = RecorderRunsManager()
         self.states_manager = StatesManager()
@@ -232,9 +297,15 @@ class Recorder(threading.Thread):
         self.states_meta_manager = StatesMetaManager(self)
         self.state_attributes_manager = StateAttributesManager(self)
         self.statistics_meta_manager = StatisticsMetaManager(self)
+        self.states_archive = StatesArchive(hass.config.path(ARCHIVE_DIR))
+        self.recent_states = RecentStatesCache()
+        self._purge_store: Store[dict[str, Any]] = Store(
+            hass, PURGE_STORAGE_VERSION, PURGE_STORAGE_KEY, private=True
+        )
 
         self.event_session: Session | None = None
         self._get_session: Callable[[], Session] | None = None
+        self._get_read_session: Callable[[], Session] | None = None
         self._completed_first_database_setup: bool | None = None
         self.async_migration_event = asyncio.Event()
         self.migration_in_progress = False
@@ -287,6 +358,15 @@ class Recorder(threading.Thread):
             raise RuntimeError("The database connection has not been established")
         return self._get_session()
 
+    def get_read_session(self) -> Session:
+        """Get a new sqlalchemy session for read only queries.
+
+        The session uses the read only connections if there are any.
+        """
+        if self._get_read_session is None:
+            return self.get_session()
+        return self._get_read_session()
+
     def queue_task(self, task: RecorderTask | Event) -> None:
         """Add a task to the recorder queue."""
         self._queue.put(task)
@@ -301,14 +381,15 @@ class Recorder(threading.Thread):
         self._db_executor = DBInterruptibleThreadPoolExecutor(
             self.recorder_and_worker_thread_ids,
             thread_name_prefix=DB_WORKER_PREFIX,
-            max_workers=MAX_DB_EXECUTOR_WORKERS,
+            max_workers=self.db_reader_threads,
             shutdown_hook=self._shutdown_pool,
         )
 
     def _shutdown_pool(self) -> None:
         """Close the dbpool connections in the current thread."""
-        if self.engine and hasattr(self.engine.pool, "shutdown"):
-            self.engine.pool.shutdown()
+        for engine in (self.engine, self.reader_engine):
+            if engine and hasattr(engine.pool, "shutdown"):
+                engine.pool.shutdown()
 
     @callback
     def async_initialize(self) -> None:
@@ -378,6 +459,41 @@ class Recorder(threading.Thread):
         """Add an executor job from within the event loop."""
         return self.hass.loop.run_in_executor(self._db_executor, target, *args)
 
+    async def async_run_query[_T](
+        self,
+        target: Callable[..., _T],
+        *args: Any,
+        timeout: float | None = None,
+        max_rows: int | None = None,
+    ) -> _T:
+        """Run a query in the database executor with a budget.
+
+        The query is interrupted when the caller is cancelled or the time
+        budget is exceeded, so an abandoned query does not keep holding a
+        database connection. QueryBudgetExceededError is raised when the
+        query exceeds its time budget or fetches more than max_rows rows
+        with execute_stmt_lambda_element.
+        """
+        budget = QueryBudget(timeout, max_rows)
+        future: asyncio.Future[_T] = self.async_add_executor_job(
+            run_with_budget, budget, target, *args
+        )
+        timeout_cm = asyncio.timeout(timeout)
+        try:
+            async with timeout_cm:
+                return await future
+        except TimeoutError as err:
+            if not timeout_cm.expired():
+                raise
+            raise QueryBudgetExceededError(
+                f"The query exceeded its time budget of {timeout} seconds"
+            ) from err
+        finally:
+            if future.cancelled():
+                # Killing a MySQL query needs another connection, the
+                # query is never interrupted from the event loop
+                self.hass.async_add_executor_job(budget.cancel)
+
     def _stop_executor(self) -> None:
         """Stop the executor."""
         if self._db_executor is None:
@@ -534,10 +650,73 @@ class Recorder(threading.Thread):
         """
         self._async_setup_periodic_tasks()
         self.async_recorder_ready.set()
+        self.hass.async_create_task(self._async_resume_purge(), "recorder resume purge")
+
+    async def _async_resume_purge(self) -> None:
+        """Resume a purge which did not finish before the last shutdown."""
+        if (
+            not (data := await self._purge_store.async_load())
+            or (purge_before := dt_util.parse_datetime(data["purge_before"])) is None
+        ):
+            return
+        _LOGGER.info("Resuming purge of data before %s", purge_before)
+        self.queue_task(PurgeTask(purge_before, data["repack"], data["apply_filter"]))
+
+    def report_purge_progress(
+        self,
+        purge_before: datetime,
+        repack: bool,
+        apply_filter: bool,
+        progress: int | None,
+    ) -> None:
+        """Report the progress of a purge which needs multiple runs.
+
+        The purge is saved so it is resumed after a restart until
+        progress is None which means it is done.
+        """
+        self.hass.bus.fire(
+            EVENT_RECORDER_PURGE_PROGRESS,
+            {
+                "purge_before": purge_before.isoformat(),
+                "progress": 100 if progress is None else progress,
+                "done": progress is None,
+            },
+        )
+        pending_purge = (
+            {}
+            if progress is None
+            else {
+                "purge_before": purge_before.isoformat(),
+                "repack": repack,
+                "apply_filter": apply_filter,
+            }
+        )
+        self.hass.add_job(self._async_save_pending_purge, pending_purge)
+
+    def clear_pending_purge(self) -> None:
+        """Forget the saved purge once a purge is done in a single run.
+
+        A resumed purge may finish in its first run which does not
+        report progress.
+        """
+        self.hass.add_job(self._async_save_pending_purge, {})
+
+    @callback
+    def _async_save_pending_purge(self, pending_purge: dict[str, Any]) -> None:
+        """Save the purge which is in progress."""
+        self._purge_store.async_delay_save(lambda: pending_purge)
 
     @callback
     def async_nightly_tasks(self, now: datetime) -> None:
-        """Trigger the purge."""
+        """Trigger the archive and the purge."""
+        if (
+            self.db_partition_interval
+            and self.dialect_name == SupportedDialect.POSTGRESQL
+        ):
+            self.queue_task(PartitionTask())
+        if self.archive_days:
+            archive_before = dt_util.utcnow() - timedelta(days=self.archive_days)
+            self.queue_task(ArchiveTask(archive_before))
         if self.auto_purge:
             # Purge will schedule the periodic cleanups
             # after it completes to ensure it does not happen
@@ -716,6 +895,35 @@ class Recorder(threading.Thread):
         self._event_session_has_pending_writes = True
         session.add(obj)
 
+    def _add_pending_event(
+        self,
+        dbevent: Events,
+        event_types: EventTypes | None,
+        event_data: EventData | None,
+    ) -> None:
+        """Add an event to the batch written on the next commit.
+
+        The event types and event data are passed when they are pending
+        in the session and do not have an id until the session is flushed.
+        """
+        self._event_session_has_pending_writes = True
+        self._pending_events.append((dbevent, event_types, event_data))
+
+    def _add_pending_state(
+        self,
+        dbstate: States,
+        old_state: States | None,
+        states_meta: StatesMeta | None,
+        state_attributes: StateAttributes | None,
+    ) -> None:
+        """Add a state to the batch written on the next commit.
+
+        The old state, states meta and state attributes are passed when
+        they are pending and do not have an id until they are written.
+        """
+        self._event_session_has_pending_writes = True
+        self._pending_states.append((dbstate, old_state, states_meta, state_attributes))
+
     def _run(self) -> None:
         """Start processing events to save."""
         thread_id = threading.get_ident()
@@ -728,6 +936,8 @@ class Recorder(threading.Thread):
             # Give up if we could not connect
             return
 
+        self.states_archive.load()
+
         schema_status = migration.validate_db_schema(self.hass, self, self.get_session)
         if schema_status is None:
             # Give up if we could not validate the schema
@@ -825,6 +1035,14 @@ class Recorder(threading.Thread):
                         self.queue_task(EventIdMigrationTask())
                         self.use_legacy_events_index = True
 
+        if self.db_partition_interval:
+            if self.dialect_name == SupportedDialect.POSTGRESQL:
+                self.queue_task(PartitionTask())
+            else:
+                _LOGGER.warning(
+                    "Partitioning the tables is only supported with PostgreSQL"
+                )
+
         # We must only set the db ready after we have set the table managers
         # to active if there is no data to migrate.
         #
@@ -1034,18 +1252,17 @@ class Recorder(threading.Thread):
 
         # Map the event_type to the EventTypes table
         event_type_manager = self.event_type_manager
-        if pending_event_types := event_type_manager.get_pending(event.event_type):
-            dbevent.event_type_rel = pending_event_types
-        elif event_type_id := event_type_manager.get(event.event_type, session, True):
-            dbevent.event_type_id = event_type_id
-        else:
-            event_types = EventTypes(event_type=event.event_type)
-            event_type_manager.add_pending(event_types)
-            self._add_to_session(session, event_types)
-            dbevent.event_type_rel = event_types
+        pending_event_types = event_type_manager.get_pending(event.event_type)
+        if pending_event_types is None:
+            if event_type_id := event_type_manager.get(event.event_type, session, True):
+                dbevent.event_type_id = event_type_id
+            else:
+                pending_event_types = EventTypes(event_type=event.event_type)
+                event_type_manager.add_pending(pending_event_types)
+                self._add_to_session(session, pending_event_types)
 
         if not event.data:
-            self._add_to_session(session, dbevent)
+            self._add_pending_event(dbevent, pending_event_types, None)
             return
 
         event_data_manager = self.event_data_manager
@@ -1055,22 +1272,21 @@ class Recorder(threading.Thread):
         # Map the event data to the EventData table
         shared_data = shared_data_bytes.decode("utf-8")
         # Matching attributes found in the pending commit
-        if pending_event_data := event_data_manager.get_pending(shared_data):
-            dbevent.event_data_rel = pending_event_data
-        # Matching attributes id found in the cache
-        elif (data_id := event_data_manager.get_from_cache(shared_data)) or (
-            (hash_ := EventData.hash_shared_data_bytes(shared_data_bytes))
-            and (data_id := event_data_manager.get(shared_data, hash_, session))
-        ):
-            dbevent.data_id = data_id
-        else:
-            # No matching attributes found, save them in the DB
-            dbevent_data = EventData(shared_data=shared_data, hash=hash_)
-            event_data_manager.add_pending(dbevent_data)
-            self._add_to_session(session, dbevent_data)
-            dbevent.event_data_rel = dbevent_data
+        pending_event_data = event_data_manager.get_pending(shared_data)
+        if pending_event_data is None:
+            # Matching attributes id found in the cache
+            if (data_id := event_data_manager.get_from_cache(shared_data)) or (
+                (hash_ := EventData.hash_shared_data_bytes(shared_data_bytes))
+                and (data_id := event_data_manager.get(shared_data, hash_, session))
+            ):
+                dbevent.data_id = data_id
+            else:
+                # No matching attributes found, save them in the DB
+                pending_event_data = EventData(shared_data=shared_data, hash=hash_)
+                event_data_manager.add_pending(pending_event_data)
+                self._add_to_session(session, pending_event_data)
 
-        self._add_to_session(session, dbevent)
+        self._add_pending_event(dbevent, pending_event_types, pending_event_data)
 
     def _process_state_changed_event_into_session(
         self, event: Event[EventStateChangedData]
@@ -1089,7 +1305,6 @@ class Recorder(threading.Thread):
 
         states_manager = self.states_manager
         if pending_state := states_manager.pop_pending(entity_id):
-            dbstate.old_state = pending_state
             if old_state:
                 pending_state.last_reported_ts = old_state.last_reported_timestamp
         elif old_state_id := states_manager.pop_committed(entity_id):
@@ -1112,48 +1327,50 @@ class Recorder(threading.Thread):
             return
 
         # Map the entity_id to the StatesMeta table
-        if pending_states_meta := states_meta_manager.get_pending(entity_id):
-            dbstate.states_meta_rel = pending_states_meta
-        elif metadata_id := states_meta_manager.get(entity_id, session, True):
-            dbstate.metadata_id = metadata_id
-        elif states_meta_manager.active and entity_removed:
-            # If the entity was removed, we don't need to add it to the
-            # StatesMeta table or record it in the pending commit
-            # if it does not have a metadata_id allocated to it as
-            # it either never existed or was just renamed.
-            return
-        else:
-            states_meta = StatesMeta(entity_id=entity_id)
-            states_meta_manager.add_pending(states_meta)
-            self._add_to_session(session, states_meta)
-            dbstate.states_meta_rel = states_meta
+        pending_states_meta = states_meta_manager.get_pending(entity_id)
+        if pending_states_meta is None:
+            if metadata_id := states_meta_manager.get(entity_id, session, True):
+                dbstate.metadata_id = metadata_id
+            elif states_meta_manager.active and entity_removed:
+                # If the entity was removed, we don't need to add it to the
+                # StatesMeta table or record it in the pending commit
+                # if it does not have a metadata_id allocated to it as
+                # it either never existed or was just renamed.
+                return
+            else:
+                pending_states_meta = StatesMeta(entity_id=entity_id)
+                states_meta_manager.add_pending(pending_states_meta)
+                self._add_to_session(session, pending_states_meta)
 
         # Map the event data to the StateAttributes table
         shared_attrs = shared_attrs_bytes.decode("utf-8")
-        dbstate.attributes = None
         # Matching attributes found in the pending commit
-        if pending_event_data := state_attributes_manager.get_pending(shared_attrs):
-            dbstate.state_attributes = pending_event_data
-        # Matching attributes id found in the cache
-        elif (
-            attributes_id := state_attributes_manager.get_from_cache(shared_attrs)
-        ) or (
-            (hash_ := StateAttributes.hash_shared_attrs_bytes(shared_attrs_bytes))
-            and (
-                attributes_id := state_attributes_manager.get(
-                    shared_attrs, hash_, session
+        pending_attributes = state_attributes_manager.get_pending(shared_attrs)
+        if pending_attributes is None:
+            # Matching attributes id found in the cache
+            if (
+                attributes_id := state_attributes_manager.get_from_cache(shared_attrs)
+            ) or (
+                (hash_ := StateAttributes.hash_shared_attrs_bytes(shared_attrs_bytes))
+                and (
+                    attributes_id := state_attributes_manager.get(
+                        shared_attrs, hash_, session
+                    )
                 )
-            )
-        ):
-            dbstate.attributes_id = attributes_id
-        else:
-            # No matching attributes found, save them in the DB
-            dbstate_attributes = StateAttributes(shared_attrs=shared_attrs, hash=hash_)
-            state_attributes_manager.add_pending(dbstate_attributes)
-            self._add_to_session(session, dbstate_attributes)
-            dbstate.state_attributes = dbstate_attributes
+            ):
+                dbstate.attributes_id = attributes_id
+            else:
+                # No matching attributes found, save them in the DB
+                pending_attributes = StateAttributes(
+                    shared_attrs=shared_attrs, hash=hash_
+                )
+                state_attributes_manager.add_pending(pending_attributes)
+                self._add_to_session(session, pending_attributes)
 
-        self._add_to_session(session, dbstate)
+        self._add_pending_state(
+            dbstate, pending_state, pending_states_meta, pending_attributes
+        )
+        self.recent_states.add_pending(entity_id, dbstate, shared_attrs, old_state)
 
     def _handle_database_error(self, err: Exception) -> bool:
         """Handle a database error that may result in moving away the corrupt db."""
@@ -1201,6 +1418,17 @@ class Recorder(threading.Thread):
         session = self.event_session
         self._commits_without_expire += 1
 
+        if self._pending_events or self._pending_states:
+            # Flush the new event types, event data, states meta and
+            # state attributes first so the batches can refer to their ids
+            session.flush()
+            self._insert_pending_events(session)
+            self._insert_pending_states(session)
+            # The rows are part of the transaction now, they must not
+            # be inserted again if the commit fails and is retried
+            self._pending_events.clear()
+            self._pending_states.clear()
+
         if (
             pending_last_reported
             := self.states_manager.get_pending_last_reported_timestamp()
@@ -1228,6 +1456,7 @@ class Recorder(threading.Thread):
         self.event_data_manager.post_commit_pending()
         self.event_type_manager.post_commit_pending()
         self.states_meta_manager.post_commit_pending()
+        self.recent_states.post_commit_pending()
 
         # Expire is an expensive operation (frequently more expensive
         # than the flush and commit itself) so we only
@@ -1236,6 +1465,103 @@ class Recorder(threading.Thread):
             self._commits_without_expire = 0
             session.expire_all()
 
+    def _insert_pending_events(self, session: Session) -> None:
+        """Insert the events of the commit window with a single executemany."""
+        if not (pending_events := self._pending_events):
+            return
+        table = cast(Table, Events.__table__)
+        column_keys = _insert_column_keys(table)
+        params: list[dict[str, Any]] = []
+        for dbevent, event_types, event_data in pending_events:
+            values = instance_dict(dbevent)
+            row = {key: values.get(key) for key in column_keys}
+            if event_types is not None:
+                row["event_type_id"] = event_types.event_type_id
+            if event_data is not None:
+                row["data_id"] = event_data.data_id
+            params.append(row)
+        session.connection().execute(insert(table), params)
+
+    def _insert_pending_states(self, session: Session) -> None:
+        """Insert the states of the commit window.
+
+        The state_ids are needed to link the old_state_id of the next
+        state of the entity. When the database can return the state_ids
+        of an executemany in the order of the batch, the states are
+        inserted at once and the old states that are part of the batch
+        are linked afterwards. Otherwise the states are inserted one by
+        one so each old_state_id is known when the next state is written.
+        """
+        if not (pending_states := self._pending_states):
+            return
+        assert self.engine is not None
+        dialect = self.engine.dialect
+        connection = session.connection()
+        table = cast(Table, States.__table__)
+        column_keys = _insert_column_keys(table)
+        params: list[dict[str, Any]] = []
+        for dbstate, _, states_meta, state_attributes in pending_states:
+            values = instance_dict(dbstate)
+            row = {key: values.get(key) for key in column_keys}
+            if states_meta is not None:
+                row["metadata_id"] = states_meta.metadata_id
+            if state_attributes is not None:
+                row["attributes_id"] = state_attributes.attributes_id
+            params.append(row)
+
+        if self.dialect_name == SupportedDialect.SQLITE:
+            # SQLite can not return the rowids of a multi row insert in
+            # order and SQLAlchemy would insert one row at a time anyway.
+            # Running the compiled statement on the driver avoids the
+            # overhead of the statement execution of SQLAlchemy and the
+            # rowid of each row is read from the cursor.
+            statement, positions = _compile_positional_insert(table, dialect)
+            for (dbstate, old_state, _, _), row in zip(
+                pending_states, params, strict=True
+            ):
+                if old_state is not None:
+                    row["old_state_id"] = old_state.state_id
+                dbstate.state_id = connection.exec_driver_sql(
+                    statement,
+                    tuple(
+                        [
+                            row[key] if processor is None else processor(row[key])
+                            for key, processor in positions
+                        ]
+                    ),
+                ).lastrowid
+            return
+
+        if not dialect.insert_executemany_returning_sort_by_parameter_order:
+            for (dbstate, old_state, _, _), row in zip(
+                pending_states, params, strict=True
+            ):
+                if old_state is not None:
+                    row["old_state_id"] = old_state.state_id
+                dbstate.state_id = connection.execute(
+                    insert(table), row
+                ).inserted_primary_key[0]
+            return
+
+        state_ids = connection.execute(
+            insert(table).returning(table.c.state_id, sort_by_parameter_order=True),
+            params,
+        ).scalars()
+        for (dbstate, _, _, _), state_id in zip(pending_states, state_ids, strict=True):
+            dbstate.state_id = state_id
+        if old_state_links := [
+            {"linked_state_id": dbstate.state_id, "old_state_id": old_state.state_id}
+            for dbstate, old_state, _, _ in pending_states
+            # An old state that was not recorded does not have a state_id
+            if old_state is not None and old_state.state_id is not None
+        ]:
+            connection.execute(
+                update(table)
+                .where(table.c.state_id == bindparam("linked_state_id"))
+                .values(old_state_id=bindparam("old_state_id")),
+                old_state_links,
+            )
+
     def _handle_sqlite_corruption(self) -> None:
         """Handle the sqlite3 database being corrupt."""
         try:
@@ -1243,6 +1569,7 @@ class Recorder(threading.Thread):
         finally:
             self._close_connection()
         move_away_broken_database(dburl_to_path(self.db_url))
+        self.recent_states.clear()
         self.recorder_runs_manager.reset()
         self._setup_recorder()
         self._setup_run()
@@ -1255,6 +1582,9 @@ class Recorder(threading.Thread):
         self.event_type_manager.reset()
         self.states_meta_manager.reset()
         self.statistics_meta_manager.reset()
+        self._pending_events.clear()
+        self._pending_states.clear()
+        self.recent_states.discard_pending()
 
         if not self.event_session:
             return
@@ -1302,6 +1632,11 @@ class Recorder(threading.Thread):
         """Cleanup legacy event_ids if needed."""
         return migration.cleanup_legacy_states_event_ids(self)
 
+    def _partition_tables(self) -> None:
+        """Partition the states and statistics tables."""
+        assert self.db_partition_interval is not None
+        migration.partition_tables(self.get_session, self.db_partition_interval)
+
     def _send_keep_alive(self) -> None:
         """Send a keep alive to keep the db connection open."""
         assert self.event_session is not None
@@ -1396,22 +1731,32 @@ class Recorder(threading.Thread):
             self.max_bind_vars = database_engine.max_bind_vars
         self._completed_first_database_setup = True
 
-    def _setup_connection(self) -> None:
-        """Ensure database is ready to fly."""
+    def _setup_reader_connection(
+        self, dbapi_connection: DBAPIConnection, connection_record: Any
+    ) -> None:
+        """Dbapi specific connection settings for read only connections."""
+        assert self.reader_engine is not None
+        dialect_name = self.reader_engine.dialect.name
+        setup_connection_for_dialect(self, dialect_name, dbapi_connection, False)
+        setup_read_only_connection_for_dialect(dialect_name, dbapi_connection)
+
+    def _engine_kwargs(self, db_url: str) -> dict[str, Any]:
+        """Return the create_engine arguments for a database url."""
         kwargs: dict[str, Any] = {}
-        self._completed_first_database_setup = False
-
-        if self.db_url == SQLITE_URL_PREFIX or ":memory:" in self.db_url:
+        if db_url == SQLITE_URL_PREFIX or ":memory:" in db_url:
             kwargs["connect_args"] = {"check_same_thread": False}
             kwargs["poolclass"] = MutexPool
             MutexPool.pool_lock = threading.RLock()
             kwargs["pool_reset_on_return"] = None
-        elif self.db_url.startswith(SQLITE_URL_PREFIX):
+        elif db_url.startswith(SQLITE_URL_PREFIX):
             kwargs["poolclass"] = RecorderPool
             kwargs["recorder_and_worker_thread_ids"] = (
                 self.recorder_and_worker_thread_ids
             )
-        elif self.db_url.startswith(
+            # A connection for each database executor thread
+            # and the recorder thread
+            kwargs["pool_size"] = self.db_reader_threads + 1
+        elif db_url.startswith(
             (
                 MARIADB_URL_PREFIX,
                 MARIADB_PYMYSQL_URL_PREFIX,
@@ -1420,7 +1765,7 @@ class Recorder(threading.Thread):
             )
         ):
             kwargs["connect_args"] = {"charset": "utf8mb4"}
-            if self.db_url.startswith((MARIADB_URL_PREFIX, MYSQLDB_URL_PREFIX)):
+            if db_url.startswith((MARIADB_URL_PREFIX, MYSQLDB_URL_PREFIX)):
                 # If they have configured MySQLDB but don't have
                 # the MySQLDB module installed this will throw
                 # an ImportError which we suppress here since
@@ -1430,8 +1775,19 @@ class Recorder(threading.Thread):
                     kwargs["connect_args"]["conv"] = build_mysqldb_conv()
 
         # Disable extended logging for non SQLite databases
-        if not self.db_url.startswith(SQLITE_URL_PREFIX):
+        if not db_url.startswith(SQLITE_URL_PREFIX):
             kwargs["echo"] = False
+            # A connection for each database executor thread and the
+            # recorder thread, the default pool of 5 connections would
+            # make the executor threads wait for a connection
+            kwargs["pool_size"] = self.db_reader_threads + 1
+            kwargs["max_overflow"] = DB_POOL_MAX_OVERFLOW
+        return kwargs
+
+    def _setup_connection(self) -> None:
+        """Ensure database is ready to fly."""
+        self._completed_first_database_setup = False
+        kwargs = self._engine_kwargs(self.db_url)
 
         if self._using_file_sqlite:
             validate_or_move_away_sqlite_database(self.db_url)
@@ -1441,14 +1797,37 @@ class Recorder(threading.Thread):
         self._dialect_name = try_parse_enum(SupportedDialect, self.engine.dialect.name)
         self.__dict__.pop("dialect_name", None)
         sqlalchemy_event.listen(self.engine, "connect", self._setup_recorder_connection)
+        listen_for_query_budgets(self.engine)
 
         migration.pre_migrate_schema(self.engine)
         Base.metadata.create_all(self.engine)
         self._get_session = scoped_session(sessionmaker(bind=self.engine, future=True))
         _LOGGER.debug("Connected to recorder database")
 
+        # Read only sessions use their own engine when reading from a replica
+        # or from a SQLite file, which in WAL mode can be read while the
+        # recorder is writing. Other databases already have a connection
+        # for each thread in the pool of the engine.
+        if reader_url := self.db_reader_url or (
+            self.db_url if self._using_file_sqlite else None
+        ):
+            self.reader_engine = create_engine(
+                reader_url, **self._engine_kwargs(reader_url), future=True
+            )
+            sqlalchemy_event.listen(
+                self.reader_engine, "connect", self._setup_reader_connection
+            )
+            listen_for_query_budgets(self.reader_engine)
+            self._get_read_session = scoped_session(
+                sessionmaker(bind=self.reader_engine, future=True)
+            )
+
     def _close_connection(self) -> None:
         """Close the connection."""
+        if self.reader_engine:
+            self.reader_engine.dispose()
+            self.reader_engine = None
+        self._get_read_session = None
         if self.engine:
             self.engine.dispose()
             self.engine = None
@@ -1465,6 +1844,7 @@ class Recorder(threading.Thread):
     def _schedule_compile_missing_statistics(self) -> None:
         """Add tasks for missing statistics runs."""
         self.queue_task(CompileMissingStatisticsTask())
+        self.queue_task(CompileMissingRollupsTask())
 
     def _end_session(self) -> None:
         """End the recorder session."""
@@ -13,10 +13,12 @@ from ... import recorder
 from ..filters import Filters
 from .const import NEED_ATTRIBUTE_DOMAINS, SIGNIFICANT_DOMAINS
 from .modern import (
+    StateColumns,
     get_full_significant_states_with_session as _modern_get_full_significant_states_with_session,
     get_last_state_changes as _modern_get_last_state_changes,
     get_significant_states as _modern_get_significant_states,
     get_significant_states_with_session as _modern_get_significant_states_with_session,
+    get_state_columns_with_session as _modern_get_state_columns_with_session,
     state_changes_during_period as _modern_state_changes_during_period,
 )
 
@@ -24,10 +26,12 @@ from .modern import (
 __all__ = [
     "NEED_ATTRIBUTE_DOMAINS",
     "SIGNIFICANT_DOMAINS",
+    "StateColumns",
     "get_full_significant_states_with_session",
     "get_last_state_changes",
     "get_significant_states",
     "get_significant_states_with_session",
+    "get_state_columns_with_session",
     "state_changes_during_period",
 ]
 
@@ -65,6 +69,35 @@ def get_full_significant_states_with_session(
     )
 
 
+def get_state_columns_with_session(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None,
+    entity_ids: list[str],
+) -> dict[str, StateColumns]:
+    """Return all states of entities during a time period in columns."""
+    if recorder.get_instance(hass).states_meta_manager.active:
+        return _modern_get_state_columns_with_session(
+            hass, session, start_time, end_time, entity_ids
+        )
+    from .legacy import (  # pylint: disable=import-outside-toplevel
+        get_full_significant_states_with_session as _legacy_get_full_significant_states_with_session,
+    )
+
+    return {
+        entity_id: StateColumns.from_states(states)
+        for entity_id, states in _legacy_get_full_significant_states_with_session(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            significant_changes_only=False,
+        ).items()
+    }
+
+
 def get_last_state_changes(
     hass: HomeAssistant, number_of_states: int, entity_id: str
 ) -> dict[str, list[State]]:
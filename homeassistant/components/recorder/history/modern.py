@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable, Iterable, Iterator
+from array import array
+from collections.abc import Callable, Container, Iterable, Iterator
+from dataclasses import dataclass, field
 from datetime import datetime
-from itertools import groupby
+from itertools import groupby, islice
 from operator import itemgetter
-from typing import Any, cast
+from typing import TYPE_CHECKING, Any, NamedTuple, cast
 
 from sqlalchemy import (
     CompoundSelect,
@@ -37,6 +39,9 @@ from ..models import (
     process_timestamp,
     row_to_compressed_state,
 )
+from ..models.state import EMPTY_CONTEXT
+from ..models.state_attributes import decode_attributes_from_source
+from ..recent_states import RecentStateRow
 from ..util import execute_stmt_lambda_element, session_scope
 from .const import (
     LAST_CHANGED_KEY,
@@ -45,6 +50,9 @@ from .const import (
     STATE_KEY,
 )
 
+if TYPE_CHECKING:
+    from ..core import Recorder
+
 _FIELD_MAP = {
     "metadata_id": 0,
     "state": 1,
@@ -52,6 +60,17 @@ _FIELD_MAP = {
 }
 
 
+class _StateRow(NamedTuple):
+    """A state which is not read from the database in the shape of a history row."""
+
+    metadata_id: int
+    state: str | None
+    last_updated_ts: float
+    last_changed_ts: float | None
+    last_reported_ts: float | None
+    attributes: str | None
+
+
 def _stmt_and_join_attributes(
     no_attributes: bool,
     include_last_changed: bool,
@@ -229,16 +248,85 @@ def get_significant_states_with_session(
         raise NotImplementedError("Filters are no longer supported")
     if not entity_ids:
         raise ValueError("entity_ids must be provided")
-    entity_id_to_metadata_id: dict[str, int | None] | None = None
-    metadata_ids_in_significant_domains: list[int] = []
-    instance = recorder.get_instance(hass)
     if not (
-        entity_id_to_metadata_id := instance.states_meta_manager.get_many(
-            entity_ids, session, False
+        result := _significant_states_rows(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            include_start_time_state,
+            significant_changes_only,
+            no_attributes,
         )
-    ) or not (possible_metadata_ids := extract_metadata_ids(entity_id_to_metadata_id)):
+    ):
         return {}
-    metadata_ids = possible_metadata_ids
+    states, entity_id_to_metadata_id, start_time_ts = result
+    return _sorted_states_to_dict(
+        states,
+        start_time_ts,
+        entity_ids,
+        entity_id_to_metadata_id,
+        minimal_response,
+        compressed_state_format,
+        no_attributes=no_attributes,
+    )
+
+
+def _significant_states_rows(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None,
+    entity_ids: list[str],
+    include_start_time_state: bool,
+    significant_changes_only: bool,
+    no_attributes: bool,
+) -> tuple[Iterable[Row], dict[str, int | None], float | None] | None:
+    """Return the history rows of entities during a period.
+
+    The rows are returned with the metadata_ids of the entities and the
+    start time to use for the rows of the states at the start time, or
+    None if there are no states to return.
+    """
+    metadata_ids_in_significant_domains: list[int] = []
+    instance = recorder.get_instance(hass)
+    start_time_ts = dt_util.utc_to_timestamp(start_time)
+    end_time_ts = datetime_to_timestamp_or_none(end_time)
+    if (
+        recent_states := instance.recent_states.get(
+            entity_ids, start_time_ts, end_time_ts
+        )
+    ) is not None:
+        entity_id_to_metadata_id: dict[str, int | None] = {
+            entity_id: idx for idx, entity_id in enumerate(entity_ids)
+        }
+        return (
+            _recent_states_to_rows(
+                recent_states,
+                entity_id_to_metadata_id,
+                include_start_time_state,
+                significant_changes_only,
+                SIGNIFICANT_DOMAINS,
+                not significant_changes_only,
+                False,
+                no_attributes,
+            ),
+            entity_id_to_metadata_id,
+            start_time_ts if include_start_time_state else None,
+        )
+    entity_id_to_metadata_id = instance.states_meta_manager.get_many(
+        entity_ids, session, False
+    )
+    metadata_ids = extract_metadata_ids(entity_id_to_metadata_id)
+    run_start_ts: float | None = None
+    if include_start_time_state and not (
+        run_start_ts := _get_run_start_ts_for_utc_point_in_time(hass, start_time)
+    ):
+        include_start_time_state = False
+    use_archive = _archive_has_states(instance, run_start_ts or start_time_ts)
+    if not metadata_ids and not use_archive:
+        return None
     if significant_changes_only:
         metadata_ids_in_significant_domains = [
             metadata_id
@@ -246,13 +334,6 @@ def get_significant_states_with_session(
             if metadata_id is not None
             and split_entity_id(entity_id)[0] in SIGNIFICANT_DOMAINS
         ]
-    run_start_ts: float | None = None
-    if include_start_time_state and not (
-        run_start_ts := _get_run_start_ts_for_utc_point_in_time(hass, start_time)
-    ):
-        include_start_time_state = False
-    start_time_ts = dt_util.utc_to_timestamp(start_time)
-    end_time_ts = datetime_to_timestamp_or_none(end_time)
     single_metadata_id = metadata_ids[0] if len(metadata_ids) == 1 else None
     stmt = lambda_stmt(
         lambda: _significant_states_stmt(
@@ -275,14 +356,29 @@ def get_significant_states_with_session(
             include_start_time_state,
         ],
     )
-    return _sorted_states_to_dict(
-        execute_stmt_lambda_element(session, stmt, None, end_time, orm_rows=False),
-        start_time_ts if include_start_time_state else None,
-        entity_ids,
+    states: Iterable[Row] = (
+        execute_stmt_lambda_element(session, stmt, None, end_time, orm_rows=False)
+        if metadata_ids
+        else []
+    )
+    if use_archive:
+        states = _merge_archived_states(
+            instance,
+            states,
+            entity_id_to_metadata_id,
+            start_time_ts,
+            end_time_ts,
+            run_start_ts if include_start_time_state else None,
+            significant_changes_only,
+            SIGNIFICANT_DOMAINS,
+            not significant_changes_only,
+            False,
+            no_attributes,
+        )
+    return (
+        states,
         entity_id_to_metadata_id,
-        minimal_response,
-        compressed_state_format,
-        no_attributes=no_attributes,
+        start_time_ts if include_start_time_state else None,
     )
 
 
@@ -319,6 +415,92 @@ def get_full_significant_states_with_session(
     )
 
 
+@dataclass(slots=True)
+class StateColumns:
+    """The states of an entity during a period in columns.
+
+    The attributes are decoded once per distinct attributes so rows with
+    the same attributes share the same dict.
+    """
+
+    states: list[str] = field(default_factory=list)
+    last_updated_ts: array[float] = field(default_factory=lambda: array("d"))
+    last_changed_ts: array[float] = field(default_factory=lambda: array("d"))
+    attributes: list[dict[str, Any]] = field(default_factory=list)
+
+    @classmethod
+    def from_states(cls, states: Iterable[State]) -> StateColumns:
+        """Return the columns of states."""
+        columns = cls()
+        for state in states:
+            columns.states.append(state.state)
+            columns.last_updated_ts.append(state.last_updated_timestamp)
+            columns.last_changed_ts.append(state.last_changed_timestamp)
+            columns.attributes.append(state.attributes)
+        return columns
+
+    def state(self, entity_id: str, idx: int) -> State:
+        """Return the state of a row."""
+        return State(
+            entity_id,
+            self.states[idx],
+            self.attributes[idx],
+            context=EMPTY_CONTEXT,
+            validate_entity_id=False,
+            last_updated_timestamp=self.last_updated_ts[idx],
+            last_changed_timestamp=self.last_changed_ts[idx],
+        )
+
+
+def get_state_columns_with_session(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None,
+    entity_ids: list[str],
+) -> dict[str, StateColumns]:
+    """Return all states of entities during a period in columns.
+
+    The first row of an entity is its state at the start time. Rows where
+    only the attributes changed have a last_changed_ts before their
+    last_updated_ts. Entities without states are not returned.
+    """
+    if not (
+        result := _significant_states_rows(
+            hass, session, start_time, end_time, entity_ids, True, False, False
+        )
+    ):
+        return {}
+    rows, entity_id_to_metadata_id, start_time_ts = result
+    # Rows of the states at the start time have no timestamps
+    start_row_ts = start_time_ts or 0.0
+    state_idx = _FIELD_MAP["state"]
+    last_updated_ts_idx = _FIELD_MAP["last_updated_ts"]
+    columns: dict[int, StateColumns] = {
+        metadata_id: StateColumns()
+        for metadata_id in entity_id_to_metadata_id.values()
+        if metadata_id is not None
+    }
+    for metadata_id, group in groupby(rows, itemgetter(_FIELD_MAP["metadata_id"])):
+        entity_columns = columns[metadata_id]
+        attr_cache: dict[str, dict[str, Any]] = {}
+        states = entity_columns.states
+        last_updated_ts = entity_columns.last_updated_ts
+        last_changed_ts = entity_columns.last_changed_ts
+        attributes = entity_columns.attributes
+        for row in group:
+            row_last_updated_ts: float = row[last_updated_ts_idx] or start_row_ts
+            states.append(row[state_idx] or "")
+            last_updated_ts.append(row_last_updated_ts)
+            last_changed_ts.append(row.last_changed_ts or row_last_updated_ts)
+            attributes.append(decode_attributes_from_source(row.attributes, attr_cache))
+    return {
+        entity_id: entity_columns
+        for entity_id, metadata_id in entity_id_to_metadata_id.items()
+        if metadata_id is not None and (entity_columns := columns[metadata_id]).states
+    }
+
+
 def _state_changed_during_period_stmt(
     start_time_ts: float,
     end_time_ts: float | None,
@@ -398,26 +580,52 @@ def state_changes_during_period(
     if not entity_id:
         raise ValueError("entity_id must be provided")
     entity_ids = [entity_id.lower()]
+    instance = recorder.get_instance(hass)
+    start_time_ts = dt_util.utc_to_timestamp(start_time)
+    end_time_ts = datetime_to_timestamp_or_none(end_time)
+    entity_id_to_metadata_id: dict[str, int | None]
+    if (
+        recent_states := instance.recent_states.get(
+            [entity_id], start_time_ts, end_time_ts
+        )
+    ) is not None:
+        entity_id_to_metadata_id = {entity_id: 0}
+        return cast(
+            dict[str, list[State]],
+            _sorted_states_to_dict(
+                _recent_states_to_rows(
+                    recent_states,
+                    entity_id_to_metadata_id,
+                    include_start_time_state,
+                    True,
+                    (),
+                    False,
+                    has_last_reported,
+                    no_attributes,
+                    limit,
+                ),
+                start_time_ts if include_start_time_state else None,
+                entity_ids,
+                entity_id_to_metadata_id,
+                descending=descending,
+                no_attributes=no_attributes,
+            ),
+        )
 
     with session_scope(hass=hass, read_only=True) as session:
-        instance = recorder.get_instance(hass)
-        if not (
-            possible_metadata_id := instance.states_meta_manager.get(
-                entity_id, session, False
-            )
-        ):
-            return {}
-        single_metadata_id = possible_metadata_id
-        entity_id_to_metadata_id: dict[str, int | None] = {
-            entity_id: single_metadata_id
-        }
+        possible_metadata_id = instance.states_meta_manager.get(
+            entity_id, session, False
+        )
         run_start_ts: float | None = None
         if include_start_time_state and not (
             run_start_ts := _get_run_start_ts_for_utc_point_in_time(hass, start_time)
         ):
             include_start_time_state = False
-        start_time_ts = dt_util.utc_to_timestamp(start_time)
-        end_time_ts = datetime_to_timestamp_or_none(end_time)
+        use_archive = _archive_has_states(instance, run_start_ts or start_time_ts)
+        if not possible_metadata_id and not use_archive:
+            return {}
+        single_metadata_id = possible_metadata_id or 0
+        entity_id_to_metadata_id = {entity_id: possible_metadata_id}
         stmt = lambda_stmt(
             lambda: _state_changed_during_period_stmt(
                 start_time_ts,
@@ -437,12 +645,30 @@ def state_changes_during_period(
                 has_last_reported,
             ],
         )
+        states: Iterable[Row] = (
+            execute_stmt_lambda_element(session, stmt, None, end_time, orm_rows=False)
+            if possible_metadata_id
+            else []
+        )
+        if use_archive:
+            states = _merge_archived_states(
+                instance,
+                states,
+                entity_id_to_metadata_id,
+                start_time_ts,
+                end_time_ts,
+                run_start_ts if include_start_time_state else None,
+                True,
+                (),
+                False,
+                has_last_reported,
+                no_attributes,
+                limit,
+            )
         return cast(
             dict[str, list[State]],
             _sorted_states_to_dict(
-                execute_stmt_lambda_element(
-                    session, stmt, None, end_time, orm_rows=False
-                ),
+                states,
                 start_time_ts if include_start_time_state else None,
                 entity_ids,
                 entity_id_to_metadata_id,
@@ -671,6 +897,195 @@ def _get_single_entity_start_time_stmt(
     )
 
 
+def _archive_has_states(instance: Recorder, start_time_ts: float) -> bool:
+    """Return if the archive may have states after start_time_ts."""
+    archived_before_ts = instance.states_archive.archived_before_ts
+    return archived_before_ts is not None and start_time_ts < archived_before_ts
+
+
+def _merge_archived_states(
+    instance: Recorder,
+    states: Iterable[Row],
+    entity_id_to_metadata_id: dict[str, int | None],
+    start_time_ts: float,
+    end_time_ts: float | None,
+    run_start_ts: float | None,
+    significant_changes_only: bool,
+    significant_domains: Container[str],
+    include_last_changed: bool,
+    include_last_reported: bool,
+    no_attributes: bool,
+    limit: int | None = None,
+) -> list[Row]:
+    """Merge archived states with the states from the database.
+
+    The archive only has states older than the states in the database, so
+    the archived states are placed before the states of the database and an
+    archived start time state is only used if the database did not have one.
+
+    Entities which only have archived states are given a negative metadata_id
+    in entity_id_to_metadata_id so the states can be grouped by metadata_id.
+    """
+    archive = instance.states_archive
+    archived_before_ts = archive.archived_before_ts
+    assert archived_before_ts is not None
+    last_updated_ts_idx = _FIELD_MAP["last_updated_ts"]
+    db_states: dict[int, list[Row]] = {
+        metadata_id: list(group)
+        for metadata_id, group in groupby(states, itemgetter(_FIELD_MAP["metadata_id"]))
+    }
+    for idx, (entity_id, metadata_id) in enumerate(entity_id_to_metadata_id.items(), 1):
+        if metadata_id is None:
+            entity_id_to_metadata_id[entity_id] = -idx
+
+    start_states: dict[str, Any] = {}
+    if run_start_ts is not None and run_start_ts < archived_before_ts:
+        start_states = archive.last_states_before(
+            [
+                entity_id
+                for entity_id, metadata_id in entity_id_to_metadata_id.items()
+                if not (rows := db_states.get(metadata_id))  # type: ignore[arg-type]
+                or rows[0][last_updated_ts_idx] != 0
+            ],
+            run_start_ts,
+            min(start_time_ts, archived_before_ts),
+        )
+    archived_states = (
+        archive.states_during_period(
+            entity_id_to_metadata_id, start_time_ts, end_time_ts
+        )
+        if start_time_ts < archived_before_ts
+        else {}
+    )
+
+    merged: list[Any] = []
+    for entity_id, metadata_id in entity_id_to_metadata_id.items():
+        if TYPE_CHECKING:
+            assert metadata_id is not None
+        rows = db_states.get(metadata_id, [])
+        if rows and rows[0][last_updated_ts_idx] == 0:
+            merged.append(rows[0])
+            rows = rows[1:]
+        elif start_state := start_states.get(entity_id):
+            merged.append(
+                _start_state_row(
+                    metadata_id,
+                    start_state.state[0],
+                    start_state.attributes[0],
+                    include_last_changed,
+                    include_last_reported,
+                    no_attributes,
+                )
+            )
+        entity_rows: list[Any] = []
+        if archived := archived_states.get(entity_id):
+            entity_rows.extend(
+                _state_rows(
+                    metadata_id,
+                    archived.rows(),
+                    significant_changes_only
+                    and split_entity_id(entity_id)[0] not in significant_domains,
+                    include_last_changed,
+                    include_last_reported,
+                    no_attributes,
+                )
+            )
+        entity_rows.extend(rows)
+        merged.extend(entity_rows[:limit] if limit else entity_rows)
+    return merged
+
+
+def _start_state_row(
+    metadata_id: int,
+    state: str | None,
+    attributes: str | None,
+    include_last_changed: bool,
+    include_last_reported: bool,
+    no_attributes: bool,
+) -> _StateRow:
+    """Return a start time state in the shape of the database start time state."""
+    return _StateRow(
+        metadata_id,
+        state,
+        0,
+        0 if include_last_changed else None,
+        0 if include_last_reported else None,
+        None if no_attributes else attributes,
+    )
+
+
+def _state_rows(
+    metadata_id: int,
+    rows: Iterable[tuple[Any, ...]],
+    significant_only: bool,
+    include_last_changed: bool,
+    include_last_reported: bool,
+    no_attributes: bool,
+) -> Iterator[_StateRow]:
+    """Return history rows from rows which are not read from the database."""
+    return (
+        _StateRow(
+            metadata_id,
+            state,
+            last_updated_ts,
+            last_changed_ts if include_last_changed else None,
+            last_reported_ts if include_last_reported else None,
+            None if no_attributes else attributes,
+        )
+        for (
+            last_updated_ts,
+            last_changed_ts,
+            last_reported_ts,
+            state,
+            attributes,
+        ) in rows
+        if not significant_only
+        or last_changed_ts is None
+        or last_changed_ts == last_updated_ts
+    )
+
+
+def _recent_states_to_rows(
+    recent_states: dict[str, tuple[RecentStateRow, list[RecentStateRow]]],
+    entity_id_to_metadata_id: dict[str, int | None],
+    include_start_time_state: bool,
+    significant_changes_only: bool,
+    significant_domains: Container[str],
+    include_last_changed: bool,
+    include_last_reported: bool,
+    no_attributes: bool,
+    limit: int | None = None,
+) -> list[Row]:
+    """Return history rows from the recent states cache."""
+    rows: list[Any] = []
+    for entity_id, metadata_id in entity_id_to_metadata_id.items():
+        if TYPE_CHECKING:
+            assert metadata_id is not None
+        start_state, entity_rows = recent_states[entity_id]
+        if include_start_time_state:
+            rows.append(
+                _start_state_row(
+                    metadata_id,
+                    start_state[3],
+                    start_state[4],
+                    include_last_changed,
+                    include_last_reported,
+                    no_attributes,
+                )
+            )
+        state_rows = _state_rows(
+            metadata_id,
+            entity_rows,
+            significant_changes_only
+            and split_entity_id(entity_id)[0] not in significant_domains,
+            include_last_changed,
+            include_last_reported,
+            no_attributes,
+        )
+        rows.extend(islice(state_rows, limit) if limit else state_rows)
+    return rows
+
+
 def _sorted_states_to_dict(
     states: Iterable[Row],
     start_time_ts: float | None,
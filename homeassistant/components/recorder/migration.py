@@ -6,7 +6,7 @@ from abc import ABC, abstractmethod
 from collections.abc import Callable, Iterable
 import contextlib
 from dataclasses import dataclass, replace as dataclass_replace
-from datetime import timedelta
+from datetime import date, timedelta
 import logging
 from time import time
 from typing import TYPE_CHECKING, Any, cast, final
@@ -30,6 +30,7 @@ from sqlalchemy.sql.expression import true
 from sqlalchemy.sql.lambdas import StatementLambdaElement
 
 from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
 from homeassistant.util.enum import try_parse_enum
 from homeassistant.util.ulid import ulid_at_time, ulid_to_bytes
 
@@ -53,6 +54,7 @@ from .const import (
     CONTEXT_ID_AS_BINARY_SCHEMA_VERSION,
     EVENT_TYPE_IDS_SCHEMA_VERSION,
     STATES_META_SCHEMA_VERSION,
+    PartitionInterval,
     SupportedDialect,
 )
 from .db_schema import (
@@ -81,6 +83,15 @@ from .db_schema import (
 )
 from .models import process_timestamp
 from .models.time import datetime_to_timestamp_or_none
+from .partitions import (
+    FUTURE_PARTITIONS,
+    PARTITIONED_TABLES,
+    create_partitions,
+    is_partitioned,
+    next_partition_start,
+    partition_start,
+    table_partition_interval,
+)
 from .queries import (
     batch_cleanup_entity_ids,
     delete_duplicate_short_term_statistics_row,
@@ -2411,3 +2422,113 @@ def rebuild_sqlite_table(
         with session_scope(session=session_maker()) as session:
             # Step 12 - Re-enable foreign keys
             session.connection().execute(text("PRAGMA foreign_keys=ON"))
+
+
+def partition_tables(
+    session_maker: Callable[[], Session], interval: PartitionInterval
+) -> None:
+    """Partition the states and statistics tables by time on PostgreSQL.
+
+    Tables which are not partitioned yet are rebuilt as partitioned tables
+    in a single transaction each. The partitions for the current and the
+    next FUTURE_PARTITIONS days or months are created for all tables.
+
+    The primary keys of the partitioned tables include the partition
+    column as required by PostgreSQL and the old_state_id foreign key of
+    the states table is dropped as it can not reference a partitioned
+    table without a unique state_id.
+    """
+    today = dt_util.utcnow().date()
+    for table, column in PARTITIONED_TABLES.items():
+        table_interval = table_partition_interval(table, interval)
+        last_day = partition_start(table_interval, today)
+        for _ in range(FUTURE_PARTITIONS):
+            last_day = next_partition_start(table_interval, last_day)
+        try:
+            with session_scope(session=session_maker()) as session:
+                if not is_partitioned(session, table):
+                    _partition_table(session, table, column, interval, last_day)
+                create_partitions(session, table, interval, today, last_day)
+        except SQLAlchemyError:
+            _LOGGER.exception("Error partitioning table %s", table)
+
+
+def _partition_table(
+    session: Session,
+    table: str,
+    column: str,
+    interval: PartitionInterval,
+    last_day: date,
+) -> None:
+    """Rebuild a table as a table partitioned by range of a column."""
+    table_table = Base.metadata.tables[table]
+    old_name = f"{table}_unpartitioned"
+    pk_columns = [pk_column.name for pk_column in table_table.primary_key.columns]
+
+    _LOGGER.warning(
+        "Partitioning table %s; This will take a while; Please be patient!", table
+    )
+    connection = session.connection()
+    connection.execute(text(f"ALTER TABLE {table} RENAME TO {old_name}"))
+    connection.execute(
+        text(
+            f"CREATE TABLE {table} (LIKE {old_name} INCLUDING DEFAULTS"
+            f" INCLUDING IDENTITY) PARTITION BY RANGE ({column})"
+        )
+    )
+    connection.execute(text(f"ALTER TABLE {table} ALTER COLUMN {column} SET NOT NULL"))
+    first_ts = connection.execute(
+        text(f"SELECT min({column}) FROM {old_name}")  # noqa: S608
+    ).scalar()
+    first_day = (
+        dt_util.utc_from_timestamp(first_ts).date()
+        if first_ts is not None
+        else dt_util.utcnow().date()
+    )
+    create_partitions(session, table, interval, first_day, last_day)
+    connection.execute(
+        text(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+    )
+    # Rows without a timestamp are from before schema version 31
+    # and are not shown by history
+    connection.execute(
+        text(
+            f"INSERT INTO {table} SELECT * FROM {old_name}"  # noqa: S608
+            f" WHERE {column} IS NOT NULL"
+        )
+    )
+    # Serial columns of databases created before the columns were identity
+    # columns keep using the sequence of the old table
+    for pk_column in pk_columns:
+        if sequence := connection.execute(
+            text(f"SELECT pg_get_serial_sequence('{table}', '{pk_column}')")
+        ).scalar():
+            connection.execute(
+                text(
+                    f"SELECT setval('{sequence}', (SELECT"  # noqa: S608
+                    f" coalesce(max({pk_column}), 0) + 1 FROM {table}), false)"
+                )
+            )
+        elif sequence := connection.execute(
+            text(f"SELECT pg_get_serial_sequence('{old_name}', '{pk_column}')")
+        ).scalar():
+            connection.execute(
+                text(f"ALTER SEQUENCE {sequence} OWNED BY {table}.{pk_column}")
+            )
+    connection.execute(text(f"DROP TABLE {old_name} CASCADE"))
+    connection.execute(
+        text(f"ALTER TABLE {table} ADD PRIMARY KEY ({', '.join(pk_columns)}, {column})")
+    )
+    for index in table_table.indexes:
+        index.create(connection)
+    for constraint in table_table.foreign_key_constraints:
+        if constraint.referred_table is table_table:
+            continue
+        # AddConstraint mutates the constraint passed to it, we need to
+        # undo that to avoid changing the behavior of the table schema.
+        # https://github.com/sqlalchemy/sqlalchemy/blob/96f1172812f858fead45cdc7874abac76f45b339/lib/sqlalchemy/sql/ddl.py#L746-L748
+        create_rule = constraint._create_rule  # noqa: SLF001
+        add_constraint = AddConstraint(constraint)  # type: ignore[no-untyped-call]
+        constraint._create_rule = create_rule  # noqa: SLF001
+        connection.execute(add_constraint)
+    _LOGGER.warning("Partitioning table %s finished", table)
@@ -0,0 +1,211 @@
+"""Native range partitioning of the states and statistics tables.
+
+The tables are partitioned by their timestamp column in UTC days or
+months. Partitioning is only supported with PostgreSQL, MySQL and MariaDB
+can not partition a table by a DOUBLE column and do not support foreign
+keys on partitioned tables.
+
+The partitions are named after the table and the first day or month they
+hold, for example states_p20240612 or statistics_p202406. Rows which do
+not fit in any partition are stored in the default partition.
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, date, datetime, time, timedelta
+import logging
+import re
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm.session import Session
+
+from .const import PartitionInterval
+from .db_schema import TABLE_STATES, TABLE_STATISTICS, TABLE_STATISTICS_SHORT_TERM
+
+_LOGGER = logging.getLogger(__name__)
+
+# The tables which are partitioned and the column they are partitioned by
+PARTITIONED_TABLES = {
+    TABLE_STATES: "last_updated_ts",
+    TABLE_STATISTICS: "start_ts",
+    TABLE_STATISTICS_SHORT_TERM: "start_ts",
+}
+
+# The long term statistics are never purged, they are always partitioned
+# by month to keep the number of partitions low
+MONTHLY_TABLES = {TABLE_STATISTICS}
+
+# The number of partitions created ahead of the current one
+FUTURE_PARTITIONS = 3
+
+_PARTITION_SUFFIX = re.compile(r"_p(\d{6}|\d{8})$")
+
+
+def table_partition_interval(
+    table: str, interval: PartitionInterval
+) -> PartitionInterval:
+    """Return the interval of the partitions of a table."""
+    if table in MONTHLY_TABLES:
+        return PartitionInterval.MONTHLY
+    return interval
+
+
+def partition_start(interval: PartitionInterval, day: date) -> date:
+    """Return the first day of the partition which holds a day."""
+    if interval is PartitionInterval.MONTHLY:
+        return day.replace(day=1)
+    return day
+
+
+def next_partition_start(interval: PartitionInterval, start: date) -> date:
+    """Return the first day of the partition after the one starting at start."""
+    if interval is PartitionInterval.MONTHLY:
+        return (start.replace(day=1) + timedelta(days=32)).replace(day=1)
+    return start + timedelta(days=1)
+
+
+def partition_name(table: str, interval: PartitionInterval, start: date) -> str:
+    """Return the name of the partition of a table starting at start."""
+    if interval is PartitionInterval.MONTHLY:
+        return f"{table}_p{start:%Y%m}"
+    return f"{table}_p{start:%Y%m%d}"
+
+
+def parse_partition_name(table: str, name: str) -> tuple[date, date] | None:
+    """Return the first day and the day after the last day of a partition."""
+    if not name.startswith(table) or not (
+        match := _PARTITION_SUFFIX.fullmatch(name, len(table))
+    ):
+        return None
+    suffix = match.group(1)
+    if len(suffix) == 6:
+        start = datetime.strptime(suffix, "%Y%m").date()
+        return start, next_partition_start(PartitionInterval.MONTHLY, start)
+    start = datetime.strptime(suffix, "%Y%m%d").date()
+    return start, next_partition_start(PartitionInterval.DAILY, start)
+
+
+def day_timestamp(day: date) -> float:
+    """Return the timestamp of the start of a UTC day."""
+    return datetime.combine(day, time(), tzinfo=UTC).timestamp()
+
+
+def is_partitioned(session: Session, table: str) -> bool:
+    """Return if a table is partitioned."""
+    return bool(
+        session.execute(
+            text(
+                "SELECT 1 FROM pg_class WHERE relname = :table AND relkind = 'p'"
+                " AND pg_table_is_visible(oid)"
+            ),
+            {"table": table},
+        ).scalar()
+    )
+
+
+def get_partitions(session: Session, table: str) -> dict[str, tuple[date, date]]:
+    """Return the range partitions of a table and the days they hold."""
+    partitions: dict[str, tuple[date, date]] = {}
+    for (name,) in session.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits"
+            " JOIN pg_class parent ON pg_inherits.inhparent = parent.oid"
+            " JOIN pg_class child ON pg_inherits.inhrelid = child.oid"
+            " WHERE parent.relname = :table AND pg_table_is_visible(parent.oid)"
+        ),
+        {"table": table},
+    ):
+        if days := parse_partition_name(table, name):
+            partitions[name] = days
+    return partitions
+
+
+def create_partitions(
+    session: Session,
+    table: str,
+    interval: PartitionInterval,
+    first_day: date,
+    last_day: date,
+) -> None:
+    """Create the missing partitions of a table for the days between two days.
+
+    Days which are already held by a partition of another interval are
+    skipped. A partition can not be created if the default partition has
+    rows which belong in it.
+    """
+    interval = table_partition_interval(table, interval)
+    existing = get_partitions(session, table)
+    connection = session.connection()
+    start = partition_start(interval, first_day)
+    while start <= last_day:
+        end = next_partition_start(interval, start)
+        name = partition_name(table, interval, start)
+        if name not in existing and not any(
+            start < existing_end and existing_start < end
+            for existing_start, existing_end in existing.values()
+        ):
+            _LOGGER.debug("Creating partition %s", name)
+            try:
+                with session.begin_nested():
+                    connection.execute(
+                        text(
+                            f"CREATE TABLE {name} PARTITION OF {table}"
+                            f" FOR VALUES FROM ({day_timestamp(start)})"
+                            f" TO ({day_timestamp(end)})"
+                        )
+                    )
+            except SQLAlchemyError:
+                _LOGGER.exception("Could not create partition %s", name)
+        start = end
+
+
+def find_partitions_before(session: Session, table: str, before: datetime) -> list[str]:
+    """Return the partitions of a table which only hold rows before a time."""
+    before_ts = before.timestamp()
+    return sorted(
+        name
+        for name, (_, end) in get_partitions(session, table).items()
+        if day_timestamp(end) <= before_ts
+    )
+
+
+def get_state_id_range(session: Session, name: str) -> tuple[int, int] | None:
+    """Return the first and last state_id of a partition of the states table."""
+    first, last = session.execute(
+        text(f"SELECT min(state_id), max(state_id) FROM {name}")  # noqa: S608
+    ).one()
+    return None if first is None else (first, last)
+
+
+def get_attributes_ids(session: Session, name: str) -> set[int]:
+    """Return the attributes_ids used by a partition of the states table."""
+    return {
+        attributes_id
+        for (attributes_id,) in session.execute(
+            text(
+                f"SELECT DISTINCT attributes_id FROM {name}"  # noqa: S608
+                " WHERE attributes_id IS NOT NULL"
+            )
+        )
+    }
+
+
+def disconnect_states(
+    session: Session, name: str, first_state_id: int, last_state_id: int
+) -> None:
+    """Remove the links from states to the states of a partition."""
+    session.execute(
+        text(
+            f"UPDATE {TABLE_STATES} SET old_state_id = NULL"  # noqa: S608
+            " WHERE old_state_id BETWEEN :first AND :last"
+            f" AND old_state_id IN (SELECT state_id FROM {name})"
+        ),
+        {"first": first_state_id, "last": last_state_id},
+    )
+
+
+def drop_partition(session: Session, name: str) -> None:
+    """Drop a partition."""
+    _LOGGER.debug("Dropping partition %s", name)
+    session.connection().execute(text(f"DROP TABLE {name}"))
@@ -3,17 +3,27 @@
 from __future__ import annotations
 
 from collections.abc import Callable
-from datetime import datetime
+from datetime import datetime, time as dt_time, timedelta
 from itertools import zip_longest
 import logging
 import time
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, cast
 
 from sqlalchemy.orm.session import Session
 
+from homeassistant.util import dt as dt_util
 from homeassistant.util.collection import chunked_or_all
 
-from .db_schema import Events, States, StatesMeta
+from . import partitions
+from .archive import ArchivedEntityStates
+from .const import SupportedDialect
+from .db_schema import (
+    TABLE_STATES,
+    TABLE_STATISTICS_SHORT_TERM,
+    Events,
+    States,
+    StatesMeta,
+)
 from .models import DatabaseEngine
 from .queries import (
     attributes_ids_exist_in_states,
@@ -37,7 +47,9 @@ from .queries import (
     find_legacy_detached_states_and_attributes_to_purge,
     find_legacy_event_state_and_attributes_and_data_ids_to_purge,
     find_legacy_row,
+    find_oldest_state,
     find_short_term_statistics_to_purge,
+    find_states_to_archive,
     find_states_to_purge,
     find_statistics_runs_to_purge,
 )
@@ -53,6 +65,10 @@ _LOGGER = logging.getLogger(__name__)
 DEFAULT_STATES_BATCHES_PER_PURGE = 20  # We expect ~95% de-dupe rate
 DEFAULT_EVENTS_BATCHES_PER_PURGE = 15  # We expect ~92% de-dupe rate
 
+# When the recorder backlog is larger than this, a purge run only deletes
+# a single batch so the queued events are written before the next run
+PURGE_THROTTLE_BACKLOG = 100
+
 
 @retryable_database_job("purge")
 def purge_old_data(
@@ -71,6 +87,12 @@ def purge_old_data(
         "Purging states and events before target %s",
         purge_before.isoformat(sep=" ", timespec="seconds"),
     )
+    instance.recent_states.purge_before(purge_before.timestamp())
+    if (
+        instance.db_partition_interval
+        and instance.dialect_name == SupportedDialect.POSTGRESQL
+    ):
+        _drop_old_partitions(instance, purge_before)
     with session_scope(session=instance.get_session()) as session:
         # Purge a max of max_bind_vars, based on the oldest states or events record
         has_more_to_purge = False
@@ -123,11 +145,45 @@ def purge_old_data(
             _purge_old_entity_ids(instance, session)
 
         _purge_old_recorder_runs(instance, session, purge_before)
+    instance.states_archive.purge_days_before(purge_before)
     if repack:
         repack_database(instance)
     return True
 
 
+def find_oldest_state_ts(instance: Recorder) -> float | None:
+    """Return the last_updated_ts of the oldest state."""
+    with session_scope(session=instance.get_session(), read_only=True) as session:
+        return cast(float | None, session.execute(find_oldest_state()).scalar())
+
+
+def _drop_old_partitions(instance: Recorder, purge_before: datetime) -> None:
+    """Drop the partitions which only have states or statistics to purge.
+
+    Dropping a partition is much cheaper than deleting its rows, the rows
+    of partially purged partitions are deleted in batches afterwards.
+    """
+    with session_scope(session=instance.get_session()) as session:
+        for name in partitions.find_partitions_before(
+            session, TABLE_STATES, purge_before
+        ):
+            attributes_ids = partitions.get_attributes_ids(session, name)
+            if state_id_range := partitions.get_state_id_range(session, name):
+                partitions.disconnect_states(session, name, *state_id_range)
+                instance.states_manager.evict_purged_state_id_range(*state_id_range)
+            partitions.drop_partition(session, name)
+            for attributes_ids_chunk in chunked_or_all(
+                attributes_ids, instance.max_bind_vars
+            ):
+                _purge_unused_attributes_ids(
+                    instance, session, set(attributes_ids_chunk)
+                )
+        for name in partitions.find_partitions_before(
+            session, TABLE_STATISTICS_SHORT_TERM, purge_before
+        ):
+            partitions.drop_partition(session, name)
+
+
 def _purging_legacy_format(session: Session) -> bool:
     """Check if there are any legacy event_id linked states rows remaining."""
     return bool(session.execute(find_legacy_row()).scalar())
@@ -639,6 +695,8 @@ def _purge_filtered_data(instance: Recorder, session: Session) -> bool:
 
     # Check if excluded entity_ids are in database
     entity_filter = instance.entity_filter
+    if entity_filter:
+        instance.recent_states.evict(lambda entity_id: not entity_filter(entity_id))
     has_more_states_to_purge = False
     excluded_metadata_ids: list[str] = [
         metadata_id
@@ -773,6 +831,8 @@ def purge_entity_data(
     database_engine = instance.database_engine
     assert database_engine is not None
     purge_before_timestamp = purge_before.timestamp()
+    if entity_filter:
+        instance.recent_states.evict(entity_filter)
     with session_scope(session=instance.get_session()) as session:
         selected_metadata_ids: list[str] = [
             metadata_id
@@ -800,3 +860,54 @@ def purge_entity_data(
         _purge_old_entity_ids(instance, session)
 
     return True
+
+
+@retryable_database_job("archive")
+def archive_old_states(instance: Recorder, archive_before: datetime) -> bool:
+    """Move the states of the oldest day before archive_before to the archive.
+
+    Returns True when there are no more days to archive.
+    """
+    with session_scope(session=instance.get_session()) as session:
+        if (oldest_ts := session.execute(find_oldest_state()).scalar()) is None:
+            return True
+        day = dt_util.utc_from_timestamp(oldest_ts).date()
+        day_start = datetime.combine(day, dt_time(), tzinfo=dt_util.UTC)
+        day_end = day_start + timedelta(days=1)
+        if day_end > archive_before:
+            return True
+        _LOGGER.debug("Archiving states of %s", day)
+        entities: dict[str, ArchivedEntityStates] = {}
+        state_ids: set[int] = set()
+        attributes_ids: set[int] = set()
+        for (
+            state_id,
+            attributes_id,
+            entity_id,
+            state,
+            last_updated_ts,
+            last_changed_ts,
+            last_reported_ts,
+            attributes,
+        ) in session.execute(
+            find_states_to_archive(day_start.timestamp(), day_end.timestamp())
+        ):
+            if (states := entities.get(entity_id)) is None:
+                states = entities[entity_id] = ArchivedEntityStates()
+            states.append(
+                last_updated_ts, last_changed_ts, last_reported_ts, state, attributes
+            )
+            state_ids.add(state_id)
+            if attributes_id:
+                attributes_ids.add(attributes_id)
+        if not state_ids:
+            # The oldest states cannot be archived since they
+            # have not been migrated to use states_meta yet
+            return True
+        # The archive is written before the states are deleted, if the
+        # delete fails the states are merged into the archive again
+        instance.states_archive.add_day(day, entities)
+        for state_ids_chunk in chunked_or_all(state_ids, instance.max_bind_vars):
+            _purge_state_ids(instance, session, set(state_ids_chunk))
+        _purge_unused_attributes_ids(instance, session, attributes_ids)
+    return False
@@ -10,6 +10,7 @@ from sqlalchemy.sql.lambdas import StatementLambdaElement
 from sqlalchemy.sql.selectable import Select
 
 from .db_schema import (
+    SHARED_ATTR_OR_LEGACY_ATTRIBUTES,
     EventData,
     Events,
     EventTypes,
@@ -636,6 +637,34 @@ def find_states_to_purge(
     )
 
 
+def find_oldest_state() -> StatementLambdaElement:
+    """Find the last_updated_ts of the oldest state."""
+    return lambda_stmt(lambda: select(func.min(States.last_updated_ts)))
+
+
+def find_states_to_archive(start_ts: float, end_ts: float) -> StatementLambdaElement:
+    """Find the states to move to the archive."""
+    return lambda_stmt(
+        lambda: select(
+            States.state_id,
+            States.attributes_id,
+            StatesMeta.entity_id,
+            States.state,
+            States.last_updated_ts,
+            States.last_changed_ts,
+            States.last_reported_ts,
+            SHARED_ATTR_OR_LEGACY_ATTRIBUTES,
+        )
+        .join(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+        .outerjoin(
+            StateAttributes, States.attributes_id == StateAttributes.attributes_id
+        )
+        .filter(States.last_updated_ts >= start_ts)
+        .filter(States.last_updated_ts < end_ts)
+        .order_by(States.last_updated_ts)
+    )
+
+
 def find_short_term_statistics_to_purge(
     purge_before: datetime, max_bind_vars: int
 ) -> StatementLambdaElement:
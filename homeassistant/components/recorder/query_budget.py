@@ -0,0 +1,212 @@
+"""Budgets and cancellation of queries run in the database executor.
+
+A query run with Recorder.async_run_query has a budget of time and rows.
+The budget is bound to the database executor thread while the query runs
+and is checked before every statement the thread executes.
+
+When the caller is cancelled or the time budget is exceeded, the statement
+running on the connection of the query is stopped as well. SQLite checks
+the budget with a progress handler while it runs a statement, PostgreSQL
+queries are cancelled on the server and MySQL and MariaDB queries are
+killed from another connection.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from functools import partial
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any
+
+from sqlalchemy import event as sqlalchemy_event, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.engine.interfaces import DBAPIConnection
+from sqlalchemy.pool import ConnectionPoolEntry
+
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import SupportedDialect
+
+_LOGGER = logging.getLogger(__name__)
+
+_LOCAL = threading.local()
+
+# The number of virtual machine instructions between
+# the checks of the budget of a SQLite statement
+SQLITE_PROGRESS_INSTRUCTIONS = 10000
+
+
+class QueryCancelledError(HomeAssistantError):
+    """The query was cancelled by its caller."""
+
+
+class QueryBudgetExceededError(HomeAssistantError):
+    """The query exceeded its budget of time or rows."""
+
+
+class QueryBudget:
+    """Budget of time and rows of a query."""
+
+    def __init__(self, timeout: float | None, max_rows: int | None) -> None:
+        """Initialize the budget."""
+        self.timeout = timeout
+        self.max_rows = max_rows
+        self.rows = 0
+        self.cancelled = False
+        self.stopped = False
+        self._deadline = None if timeout is None else time.monotonic() + timeout
+        self._lock = threading.Lock()
+        self._interrupt: Callable[[], Any] | None = None
+
+    @property
+    def remaining_rows(self) -> int | None:
+        """Return the number of rows the query may still fetch."""
+        if self.max_rows is None:
+            return None
+        return max(0, self.max_rows - self.rows)
+
+    def exhausted(self) -> bool:
+        """Return if the query was cancelled or exceeded its time budget."""
+        if self.cancelled or (
+            self._deadline is not None and time.monotonic() > self._deadline
+        ):
+            self.stopped = True
+        return self.stopped
+
+    def check(self) -> None:
+        """Raise if the query was cancelled or exceeded its budget."""
+        if not self.exhausted():
+            return
+        if self.cancelled:
+            raise QueryCancelledError("The query was cancelled")
+        if self.max_rows is not None and self.rows > self.max_rows:
+            raise QueryBudgetExceededError(
+                f"The query exceeded its budget of {self.max_rows} rows"
+            )
+        raise QueryBudgetExceededError(
+            f"The query exceeded its time budget of {self.timeout} seconds"
+        )
+
+    def count_rows(self, rows: int) -> None:
+        """Count fetched rows and raise if the row budget is exceeded."""
+        self.rows += rows
+        if self.max_rows is not None and self.rows > self.max_rows:
+            self.stopped = True
+            raise QueryBudgetExceededError(
+                f"The query exceeded its budget of {self.max_rows} rows"
+            )
+
+    def set_interrupt(self, interrupt: Callable[[], Any] | None) -> None:
+        """Set the function which interrupts the running statement."""
+        with self._lock:
+            self._interrupt = interrupt
+
+    def cancel(self) -> None:
+        """Cancel the query and interrupt its running statement.
+
+        This method can be called from any thread.
+        """
+        with self._lock:
+            self.cancelled = True
+            self.stopped = True
+            if not (interrupt := self._interrupt):
+                return
+            self._interrupt = None
+            # The lock is held while interrupting so the connection can
+            # not be returned to the pool and used by another query
+            try:
+                interrupt()
+            except Exception:  # noqa: BLE001
+                _LOGGER.debug("Could not interrupt the query", exc_info=True)
+
+
+def current_query_budget() -> QueryBudget | None:
+    """Return the budget of the query run by the current thread."""
+    return getattr(_LOCAL, "budget", None)
+
+
+def query_stopped() -> bool:
+    """Return if the query run by the current thread was stopped.
+
+    Errors of a stopped query are expected, the query was cancelled,
+    interrupted or exceeded its budget.
+    """
+    return (budget := current_query_budget()) is not None and budget.stopped
+
+
+def run_with_budget[_T](
+    budget: QueryBudget, target: Callable[..., _T], *args: Any
+) -> _T:
+    """Run a query with a budget in a database executor thread."""
+    # The query may have been cancelled while it was waiting for a thread
+    budget.check()
+    _LOCAL.budget = budget
+    try:
+        return target(*args)
+    finally:
+        _LOCAL.budget = None
+        budget.set_interrupt(None)
+
+
+def _kill_mysql_query(engine: Engine, thread_id: int) -> None:
+    """Kill the query running on a MySQL or MariaDB connection."""
+    with engine.connect() as connection:
+        connection.execute(text(f"KILL QUERY {int(thread_id)}"))
+
+
+def _get_interrupt(
+    connection: Connection, dbapi_connection: DBAPIConnection
+) -> Callable[[], Any] | None:
+    """Return a function which interrupts the statement running on a connection."""
+    dialect_name = connection.dialect.name
+    if dialect_name == SupportedDialect.POSTGRESQL:
+        return dbapi_connection.cancel  # type: ignore[attr-defined,no-any-return]
+    if dialect_name == SupportedDialect.MYSQL:
+        return partial(
+            _kill_mysql_query,
+            connection.engine,
+            dbapi_connection.thread_id(),  # type: ignore[attr-defined]
+        )
+    return None
+
+
+def _sqlite_progress_handler() -> bool:
+    """Abort the running SQLite statement when its query is stopped.
+
+    The handler runs in the thread executing the statement. The connection
+    of an in memory database is shared with the recorder thread, which
+    never has a budget.
+    """
+    return (budget := current_query_budget()) is not None and budget.exhausted()
+
+
+def _before_cursor_execute(connection: Connection, *args: Any) -> None:
+    """Check the budget of the query before a statement is executed."""
+    if (budget := current_query_budget()) is None:
+        return
+    budget.check()
+    dbapi_connection: Any = connection.connection.dbapi_connection
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        dbapi_connection.set_progress_handler(
+            _sqlite_progress_handler, SQLITE_PROGRESS_INSTRUCTIONS
+        )
+    elif dbapi_connection is not None:
+        budget.set_interrupt(_get_interrupt(connection, dbapi_connection))
+
+
+def _checkin(dbapi_connection: Any, record: ConnectionPoolEntry) -> None:
+    """Stop interrupting a connection once it is returned to the pool."""
+    if (budget := current_query_budget()) is None:
+        return
+    budget.set_interrupt(None)
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        dbapi_connection.set_progress_handler(None, 0)
+
+
+def listen_for_query_budgets(engine: Engine) -> None:
+    """Enforce the budgets of the queries executed with an engine."""
+    sqlalchemy_event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    sqlalchemy_event.listen(engine, "checkin", _checkin)
@@ -0,0 +1,228 @@
+"""Cache of recently recorded states to answer history queries without SQL.
+
+The cache keeps the rows written by the recorder per entity_id in the
+order they were recorded. The rows are added when the event session is
+committed so the cache always has the same rows as the database.
+
+An entity can only be answered from the cache when it has a row before
+the start of the requested period, which guarantees that all rows of the
+period and the state at the start time are in the cache. Other requests
+fall back to the database.
+
+The size of the cache is limited by an estimate of the memory used by
+the rows. When the limit is exceeded the entities which were least
+recently used by a history request are evicted.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+import threading
+from typing import TYPE_CHECKING
+
+from homeassistant.core import State
+
+if TYPE_CHECKING:
+    from .db_schema import States
+
+# A row is last_updated_ts, last_changed_ts, last_reported_ts, state, attributes
+type RecentStateRow = tuple[float, float | None, float | None, str | None, str]
+
+# Rough memory use of the tuple and its floats excluding the strings
+_ROW_OVERHEAD = 200
+
+DEFAULT_MAX_SIZE = 32 * 1024**2
+
+
+def _last_updated_ts(row: RecentStateRow) -> float:
+    """Return the last_updated_ts of a row."""
+    return row[0]
+
+
+def _rows_size(rows: Iterable[RecentStateRow]) -> int:
+    """Return the estimated memory use of the rows."""
+    size = 0
+    prev_attributes: str | None = None
+    for _, _, _, state, attributes in rows:
+        size += _ROW_OVERHEAD + len(state or "")
+        if attributes is not prev_attributes:
+            size += len(attributes)
+            prev_attributes = attributes
+    return size
+
+
+class RecentStatesCache:
+    """Cache of the recently recorded states of entities."""
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        """Initialize the cache."""
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._states: OrderedDict[str, list[RecentStateRow]] = OrderedDict()
+        self._sizes: dict[str, int] = {}
+        self._size = 0
+        self._pending: list[tuple[str, States, str, State | None]] = []
+
+    @property
+    def size(self) -> int:
+        """Return the estimated memory use of the cache."""
+        return self._size
+
+    def add_pending(
+        self,
+        entity_id: str,
+        dbstate: States,
+        shared_attrs: str,
+        old_state: State | None,
+    ) -> None:
+        """Add a state that is written on the next commit.
+
+        The last_reported_ts of a pending state can still change before
+        the commit, so the row is created in post_commit_pending.
+
+        This method must only be called from the recorder thread.
+        """
+        self._pending.append((entity_id, dbstate, shared_attrs, old_state))
+
+    def discard_pending(self) -> None:
+        """Discard the pending states after the commit failed.
+
+        This method must only be called from the recorder thread.
+        """
+        self._pending.clear()
+
+    def post_commit_pending(self) -> None:
+        """Add the pending states to the cache after they were committed.
+
+        This method must only be called from the recorder thread.
+        """
+        if not self._pending:
+            return
+        states = self._states
+        sizes = self._sizes
+        with self._lock:
+            for entity_id, dbstate, shared_attrs, old_state in self._pending:
+                last_updated_ts = dbstate.last_updated_ts
+                if TYPE_CHECKING:
+                    assert last_updated_ts is not None
+                size = _ROW_OVERHEAD + len(dbstate.state or "")
+                if not (rows := states.get(entity_id)):
+                    # New entities are the first to be evicted until they
+                    # are used by a history request
+                    rows = states[entity_id] = []
+                    states.move_to_end(entity_id, last=False)
+                    sizes[entity_id] = 0
+                elif (prev := rows[-1])[0] > last_updated_ts:
+                    # The clock went backwards, the rows would no longer
+                    # be ordered so start over for this entity
+                    self._evict(entity_id)
+                    rows = states[entity_id] = []
+                    states.move_to_end(entity_id, last=False)
+                    sizes[entity_id] = 0
+                else:
+                    if (
+                        old_state is not None
+                        and prev[0] == old_state.last_updated_timestamp
+                    ):
+                        # The database row of the old state is updated
+                        # with the time it was last reported
+                        rows[-1] = (
+                            prev[0],
+                            prev[1],
+                            old_state.last_reported_timestamp,
+                            prev[3],
+                            prev[4],
+                        )
+                    if prev[4] == shared_attrs:
+                        shared_attrs = prev[4]
+                if not rows or rows[-1][4] is not shared_attrs:
+                    size += len(shared_attrs)
+                rows.append(
+                    (
+                        last_updated_ts,
+                        dbstate.last_changed_ts,
+                        dbstate.last_reported_ts,
+                        dbstate.state,
+                        shared_attrs,
+                    )
+                )
+                sizes[entity_id] += size
+                self._size += size
+            self._pending.clear()
+            while self._size > self.max_size and states:
+                self._evict(next(iter(states)))
+
+    def _evict(self, entity_id: str) -> None:
+        """Evict an entity from the cache."""
+        del self._states[entity_id]
+        self._size -= self._sizes.pop(entity_id)
+
+    def get(
+        self, entity_ids: Iterable[str], start_time_ts: float, end_time_ts: float | None
+    ) -> dict[str, tuple[RecentStateRow, list[RecentStateRow]]] | None:
+        """Return the states of the entities during a period.
+
+        For each entity the state at the start time and the rows with a
+        last_updated_ts after the start time and before the end time are
+        returned.
+
+        None is returned when the cache does not have all the states of
+        the period for any of the entities.
+        """
+        result: dict[str, tuple[RecentStateRow, list[RecentStateRow]]] = {}
+        states = self._states
+        with self._lock:
+            for entity_id in entity_ids:
+                if not (rows := states.get(entity_id)):
+                    return None
+                if not (
+                    start_idx := bisect_left(rows, start_time_ts, key=_last_updated_ts)
+                ):
+                    return None
+                # Rows updated exactly at the start time are neither
+                # the start state nor part of the period
+                first_idx = start_idx
+                while first_idx < len(rows) and rows[first_idx][0] == start_time_ts:
+                    first_idx += 1
+                end_idx = (
+                    bisect_left(rows, end_time_ts, key=_last_updated_ts)
+                    if end_time_ts
+                    else len(rows)
+                )
+                result[entity_id] = (rows[start_idx - 1], rows[first_idx:end_idx])
+            for entity_id in result:
+                states.move_to_end(entity_id)
+        return result
+
+    def purge_before(self, purge_before_ts: float) -> None:
+        """Remove the rows which were purged from the database."""
+        with self._lock:
+            for entity_id, rows in list(self._states.items()):
+                if not (
+                    idx := bisect_left(rows, purge_before_ts, key=_last_updated_ts)
+                ):
+                    continue
+                if idx == len(rows):
+                    self._evict(entity_id)
+                    continue
+                del rows[:idx]
+                size = _rows_size(rows)
+                self._size += size - self._sizes[entity_id]
+                self._sizes[entity_id] = size
+
+    def evict(self, entity_filter: Callable[[str], bool]) -> None:
+        """Evict the entities matching the filter."""
+        with self._lock:
+            for entity_id in [
+                entity_id for entity_id in self._states if entity_filter(entity_id)
+            ]:
+                self._evict(entity_id)
+
+    def clear(self) -> None:
+        """Clear the cache."""
+        with self._lock:
+            self._states.clear()
+            self._sizes.clear()
+            self._size = 0
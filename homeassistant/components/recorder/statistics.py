@@ -59,6 +59,8 @@ from .db_schema import (
     STATISTICS_TABLES,
     Statistics,
     StatisticsBase,
+    StatisticsDaily,
+    StatisticsMonthly,
     StatisticsRuns,
     StatisticsShortTerm,
 )
@@ -125,6 +127,9 @@ QUERY_STATISTICS_SUMMARY_SUM = (
     .label("rownum"),
 )
 
+# The number of days or months rolled up in one run, limits the time the
+# recorder is blocked when the rollups of existing statistics are compiled
+MAX_ROLLUP_PERIODS_PER_RUN = 100
 
 STATISTIC_UNIT_TO_UNIT_CONVERTER: dict[str | None, type[BaseUnitConverter]] = {
     **{unit: ConductivityConverter for unit in ConductivityConverter.VALID_UNITS},
@@ -618,6 +623,179 @@ def _compile_statistics(
     return modified_statistic_ids
 
 
+def _rollup_tables() -> (
+    list[
+        tuple[
+            type[StatisticsDaily | StatisticsMonthly],
+            Callable[[float], tuple[float, float]],
+        ]
+    ]
+):
+    """Return the rollup tables and functions to get the period of a time."""
+    return [
+        (StatisticsDaily, reduce_day_ts_factory()[1]),
+        (StatisticsMonthly, reduce_month_ts_factory()[1]),
+    ]
+
+
+def _rollup_end_ts(
+    session: Session,
+    table: type[StatisticsDaily | StatisticsMonthly],
+    period_start_end: Callable[[float], tuple[float, float]],
+) -> float | None:
+    """Return the end of the last period which was rolled up.
+
+    The periods are compiled in order, so all periods which ended before
+    have been rolled up. None is returned if no period was rolled up or if
+    the rollups were compiled for another time zone.
+    """
+    if (last_start_ts := session.query(func.max(table.start_ts)).scalar()) is None:
+        return None
+    start_ts, end_ts = period_start_end(last_start_ts)
+    return end_ts if start_ts == last_start_ts else None
+
+
+def _compile_rollup(
+    session: Session,
+    table: type[StatisticsDaily | StatisticsMonthly],
+    start_ts: float,
+    end_ts: float,
+    metadata_id: int | None = None,
+) -> None:
+    """Roll up the hourly statistics of a day or month.
+
+    Like the reduced statistics, the mean is the mean of the hourly means
+    and the sum and state are taken from the last hour of the period.
+    """
+    period_filter = (Statistics.start_ts >= start_ts) & (Statistics.start_ts < end_ts)
+    rollup_filter = (table.start_ts >= start_ts) & (table.start_ts < end_ts)
+    if metadata_id is not None:
+        period_filter &= Statistics.metadata_id == metadata_id
+        rollup_filter &= table.metadata_id == metadata_id
+    session.query(table).filter(rollup_filter).delete(synchronize_session=False)
+
+    summary: dict[int, StatisticDataTimestamp] = {}
+    for _metadata_id, _mean, _min, _max in session.execute(
+        select(
+            Statistics.metadata_id,
+            func.avg(Statistics.mean),
+            func.min(Statistics.min),
+            func.max(Statistics.max),
+        )
+        .filter(period_filter)
+        .group_by(Statistics.metadata_id)
+    ):
+        summary[_metadata_id] = {
+            "start_ts": start_ts,
+            "mean": _mean,
+            "min": _min,
+            "max": _max,
+        }
+
+    subquery = (
+        select(
+            Statistics.metadata_id,
+            Statistics.last_reset_ts,
+            Statistics.state,
+            Statistics.sum,
+            func.row_number()
+            .over(
+                partition_by=Statistics.metadata_id,
+                order_by=Statistics.start_ts.desc(),
+            )
+            .label("rownum"),
+        )
+        .filter(period_filter)
+        .subquery()
+    )
+    for _metadata_id, last_reset_ts, state, _sum, _ in session.execute(
+        select(subquery).filter(subquery.c.rownum == 1)
+    ):
+        summary[_metadata_id].update(
+            {"last_reset_ts": last_reset_ts, "state": state, "sum": _sum}
+        )
+
+    session.add_all(
+        table.from_stats_ts(_metadata_id, summary_item)
+        for _metadata_id, summary_item in summary.items()
+    )
+
+
+def _compile_missing_rollups(session: Session, end_ts: float, max_periods: int) -> bool:
+    """Roll up the hourly statistics of the days and months which ended.
+
+    Returns False if there are more periods to roll up.
+    """
+    for table, period_start_end in _rollup_tables():
+        if (
+            start_ts := _rollup_end_ts(session, table, period_start_end)
+        ) is None and session.query(table.id).first():
+            _LOGGER.info(
+                "The time zone changed, compiling %s again", table.__tablename__
+            )
+            session.query(table).delete(synchronize_session=False)
+        start_ts = start_ts or 0.0
+        # Periods without hourly statistics are skipped
+        while (
+            next_start_ts := session.query(func.min(Statistics.start_ts))
+            .filter(Statistics.start_ts >= start_ts)
+            .scalar()
+        ) is not None:
+            period_start_ts, period_end_ts = period_start_end(next_start_ts)
+            if period_end_ts > end_ts:
+                break
+            if not max_periods:
+                return False
+            _LOGGER.debug(
+                "Compiling %s for %s-%s",
+                table.__tablename__,
+                dt_util.utc_from_timestamp(period_start_ts),
+                dt_util.utc_from_timestamp(period_end_ts),
+            )
+            _compile_rollup(session, table, period_start_ts, period_end_ts)
+            start_ts = period_end_ts
+            max_periods -= 1
+    return True
+
+
+@retryable_database_job("compile missing rollups")
+def compile_missing_rollups(instance: Recorder) -> bool:
+    """Roll up the hourly statistics to daily and monthly statistics.
+
+    The days and months are rolled up once all their hours have been
+    compiled.
+
+    Returns False if there are more periods to roll up.
+    """
+    with session_scope(session=instance.get_session()) as session:
+        if not (last_run := session.query(func.max(StatisticsRuns.start)).scalar()):
+            return True
+        # The hourly statistics are compiled with the last 5-minute run of the hour
+        end_time = (process_timestamp(last_run) + StatisticsShortTerm.duration).replace(
+            minute=0, second=0, microsecond=0
+        )
+        return _compile_missing_rollups(
+            session, end_time.timestamp(), MAX_ROLLUP_PERIODS_PER_RUN
+        )
+
+
+def _recompile_rollups(
+    session: Session, metadata_id: int, start_timestamps: Iterable[float]
+) -> None:
+    """Roll up the hourly statistics of a statistic again after they changed.
+
+    Only the periods which hold one of the start times and were already
+    rolled up are compiled again.
+    """
+    for table, period_start_end in _rollup_tables():
+        if (rollup_end_ts := _rollup_end_ts(session, table, period_start_end)) is None:
+            continue
+        for start_ts, end_ts in sorted(
+            {period_start_end(ts) for ts in start_timestamps if ts < rollup_end_ts}
+        ):
+            _compile_rollup(session, table, start_ts, end_ts, metadata_id)
+
+
 def _adjust_sum_statistics(
     session: Session,
     table: type[StatisticsBase],
@@ -1687,6 +1865,65 @@ def _augment_result_with_change(
             prev_sum = _sum
 
 
+def _rollup_statistics_during_period(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None,
+    metadata_ids: list[int] | None,
+    statistic_ids: set[str] | None,
+    metadata: dict[str, tuple[int, StatisticMetaData]],
+    period: Literal["5minute", "day", "hour", "week", "month"],
+    units: dict[str, str] | None,
+    types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]],
+) -> tuple[dict[str, list[StatisticsRow]], datetime]:
+    """Return the statistics of the periods which were rolled up.
+
+    The start and end time must be aligned with the period. Weeks are
+    reduced from the daily statistics unless the mean is requested, since
+    the mean of the daily means is not the mean of the hourly means.
+
+    Returns the statistics and the end of the last period they include.
+    """
+    period_start_end: Callable[[float], tuple[float, float]]
+    table: type[StatisticsDaily | StatisticsMonthly]
+    if period == "day" or (period == "week" and "mean" not in types):
+        table, period_start_end = StatisticsDaily, reduce_day_ts_factory()[1]
+    elif period == "month":
+        table, period_start_end = StatisticsMonthly, reduce_month_ts_factory()[1]
+    else:
+        return {}, start_time
+    if (rollup_end_ts := _rollup_end_ts(session, table, period_start_end)) is None:
+        return {}, start_time
+    if period == "week":
+        rollup_end_ts = reduce_week_ts_factory()[1](rollup_end_ts)[0]
+    rollup_end = dt_util.utc_from_timestamp(rollup_end_ts)
+    if rollup_end <= start_time:
+        return {}, start_time
+    if end_time is not None and end_time < rollup_end:
+        rollup_end = end_time
+
+    stmt = _generate_statistics_during_period_stmt(
+        start_time, rollup_end, metadata_ids, table, types
+    )
+    if not (
+        stats := cast(
+            Sequence[Row], execute_stmt_lambda_element(session, stmt, orm_rows=False)
+        )
+    ):
+        return {}, rollup_end
+    result = _sorted_statistics_to_dict(
+        hass, stats, statistic_ids, metadata, True, table, units, types
+    )
+    if period == "week":
+        return _reduce_statistics_per_week(result, types), rollup_end
+    # The length of the days and months vary
+    for rows in result.values():
+        for row in rows:
+            row["end"] = period_start_end(row["start"])[1]
+    return result, rollup_end
+
+
 def _statistics_during_period_with_session(
     hass: HomeAssistant,
     session: Session,
@@ -1757,35 +1994,59 @@ def _statistics_during_period_with_session(
     table: type[Statistics | StatisticsShortTerm] = (
         Statistics if period != "5minute" else StatisticsShortTerm
     )
-    stmt = _generate_statistics_during_period_stmt(
-        start_time, end_time, metadata_ids, table, types
-    )
-    stats = cast(
-        Sequence[Row], execute_stmt_lambda_element(session, stmt, orm_rows=False)
-    )
-
-    if not stats:
-        return {}
-
-    result = _sorted_statistics_to_dict(
+    # The periods which were rolled up are read from the rollup tables, the
+    # hourly statistics are only reduced for the periods after them
+    result, reduce_start_time = _rollup_statistics_during_period(
         hass,
-        stats,
+        session,
+        start_time,
+        end_time,
+        metadata_ids,
         statistic_ids,
         metadata,
-        True,
-        table,
+        period,
         units,
         types,
     )
+    if end_time is None or reduce_start_time < end_time:
+        stmt = _generate_statistics_during_period_stmt(
+            reduce_start_time, end_time, metadata_ids, table, types
+        )
+        stats = cast(
+            Sequence[Row], execute_stmt_lambda_element(session, stmt, orm_rows=False)
+        )
+    else:
+        stats = None
 
-    if period == "day":
-        result = _reduce_statistics_per_day(result, types)
+    if stats:
+        reduced_result = _sorted_statistics_to_dict(
+            hass,
+            stats,
+            statistic_ids,
+            metadata,
+            True,
+            table,
+            units,
+            types,
+        )
 
-    if period == "week":
-        result = _reduce_statistics_per_week(result, types)
+        if period == "day":
+            reduced_result = _reduce_statistics_per_day(reduced_result, types)
 
-    if period == "month":
-        result = _reduce_statistics_per_month(result, types)
+        if period == "week":
+            reduced_result = _reduce_statistics_per_week(reduced_result, types)
+
+        if period == "month":
+            reduced_result = _reduce_statistics_per_month(reduced_result, types)
+
+        if result:
+            for statistic_id, rows in reduced_result.items():
+                result.setdefault(statistic_id, []).extend(rows)
+        else:
+            result = reduced_result
+
+    if not result:
+        return {}
 
     if "change" in _types:
         _augment_result_with_change(
@@ -2447,9 +2708,22 @@ def import_statistics(
             instance, "statistic"
         ),
     ) as session:
-        return _import_statistics_with_session(
-            instance, session, metadata, statistics, table
-        )
+        _import_statistics_with_session(instance, session, metadata, statistics, table)
+
+    if table == Statistics:
+        # Roll up the periods with imported statistics again once they
+        # were committed
+        with session_scope(session=instance.get_session()) as session:
+            if statistic_metadata := instance.statistics_meta_manager.get(
+                session, metadata["statistic_id"]
+            ):
+                _recompile_rollups(
+                    session,
+                    statistic_metadata[0],
+                    [stat["start"].timestamp() for stat in statistics],
+                )
+
+    return True
 
 
 @retryable_database_job("adjust_statistics")
@@ -2491,6 +2765,19 @@ def adjust_statistics(
             sum_adjustment,
         )
 
+        # The rollups of the periods after the start time are adjusted,
+        # the period which holds the start time is rolled up again
+        start_time_ts = start_time.replace(minute=0).timestamp()
+        for table, period_start_end in _rollup_tables():
+            _adjust_sum_statistics(
+                session,
+                table,
+                metadata[statistic_id][0],
+                dt_util.utc_from_timestamp(period_start_end(start_time_ts)[1]),
+                sum_adjustment,
+            )
+        _recompile_rollups(session, metadata[statistic_id][0], (start_time_ts,))
+
     return True
 
 
@@ -2551,6 +2838,8 @@ def change_statistics_unit(
         tables: tuple[type[StatisticsBase], ...] = (
             Statistics,
             StatisticsShortTerm,
+            StatisticsDaily,
+            StatisticsMonthly,
         )
         for table in tables:
             _change_statistics_unit_for_table(session, table, metadata_id, convert)
@@ -93,6 +93,23 @@ class StatesManager:
         ):
             last_committed_ids.pop(last_committed_ids_reversed[purged_state_id], None)
 
+    def evict_purged_state_id_range(
+        self, first_state_id: int, last_state_id: int
+    ) -> None:
+        """Evict the committed states with a state_id in a range.
+
+        When we drop a partition of the states table we need to make sure
+        the next call to record a state does not link the old_state_id to
+        a dropped state.
+        """
+        last_committed_ids = self._last_committed_id
+        for entity_id in [
+            entity_id
+            for entity_id, state_id in last_committed_ids.items()
+            if first_state_id <= state_id <= last_state_id
+        ]:
+            del last_committed_ids[entity_id]
+
     def evict_purged_entity_ids(self, purged_entity_ids: set[str]) -> None:
         """Evict purged entity_ids from the committed states.
 
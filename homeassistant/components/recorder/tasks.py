@@ -94,6 +94,9 @@ class UpdateStatesMetadataTask(RecorderTask):
 
     def run(self, instance: Recorder) -> None:
         """Handle the task."""
+        instance.recent_states.evict(
+            lambda entity_id: entity_id in (self.entity_id, self.new_entity_id)
+        )
         entity_registry.update_states_metadata(
             instance,
             self.entity_id,
@@ -108,12 +111,35 @@ class PurgeTask(RecorderTask):
     purge_before: datetime
     repack: bool
     apply_filter: bool
+    # The purge is done in runs, the oldest state is used to report progress
+    runs: int = 0
+    oldest_state_ts: float | None = None
 
     def run(self, instance: Recorder) -> None:
         """Purge the database."""
+        if not self.runs:
+            self.oldest_state_ts = purge.find_oldest_state_ts(instance)
+        batches_per_purge = (
+            1 if instance.backlog > purge.PURGE_THROTTLE_BACKLOG else None
+        )
         if purge.purge_old_data(
-            instance, self.purge_before, self.repack, self.apply_filter
+            instance,
+            self.purge_before,
+            self.repack,
+            self.apply_filter,
+            events_batch_size=(
+                batches_per_purge or purge.DEFAULT_EVENTS_BATCHES_PER_PURGE
+            ),
+            states_batch_size=(
+                batches_per_purge or purge.DEFAULT_STATES_BATCHES_PER_PURGE
+            ),
         ):
+            if self.runs:
+                instance.report_purge_progress(
+                    self.purge_before, self.repack, self.apply_filter, None
+                )
+            else:
+                instance.clear_pending_purge()
             with instance.get_session() as session:
                 instance.recorder_runs_manager.load_from_db(session)
             # We always need to do the db cleanups after a purge
@@ -121,11 +147,51 @@ class PurgeTask(RecorderTask):
             # tasks happen after a vacuum.
             periodic_db_cleanups(instance)
             return
+        instance.report_purge_progress(
+            self.purge_before, self.repack, self.apply_filter, self._progress(instance)
+        )
         # Schedule a new purge task if this one didn't finish
         instance.queue_task(
-            PurgeTask(self.purge_before, self.repack, self.apply_filter)
+            PurgeTask(
+                self.purge_before,
+                self.repack,
+                self.apply_filter,
+                self.runs + 1,
+                self.oldest_state_ts,
+            )
         )
 
+    def _progress(self, instance: Recorder) -> int:
+        """Return the percentage of the states purged."""
+        purge_before_ts = self.purge_before.timestamp()
+        if (
+            (start_ts := self.oldest_state_ts) is None
+            or (oldest_state_ts := purge.find_oldest_state_ts(instance)) is None
+            or purge_before_ts <= start_ts
+        ):
+            return 99
+        return max(
+            0,
+            min(
+                99,
+                int(100 * (oldest_state_ts - start_ts) / (purge_before_ts - start_ts)),
+            ),
+        )
+
+
+@dataclass(slots=True)
+class ArchiveTask(RecorderTask):
+    """Object to store information about archive task."""
+
+    archive_before: datetime
+
+    def run(self, instance: Recorder) -> None:
+        """Move old states to the archive."""
+        if purge.archive_old_states(instance, self.archive_before):
+            return
+        # Schedule a new archive task if this one didn't finish
+        instance.queue_task(ArchiveTask(self.archive_before))
+
 
 @dataclass(slots=True)
 class PurgeEntitiesTask(RecorderTask):
@@ -137,6 +203,9 @@ class PurgeEntitiesTask(RecorderTask):
     def run(self, instance: Recorder) -> None:
         """Purge entities from the database."""
         if purge.purge_entity_data(instance, self.entity_filter, self.purge_before):
+            instance.states_archive.purge_entities(
+                self.entity_filter, self.purge_before
+            )
             return
         # Schedule a new purge task if this one didn't finish
         instance.queue_task(PurgeEntitiesTask(self.entity_filter, self.purge_before))
@@ -164,6 +233,9 @@ class StatisticsTask(RecorderTask):
     def run(self, instance: Recorder) -> None:
         """Run statistics task."""
         if statistics.compile_statistics(instance, self.start, self.fire_events):
+            if self.start.minute == 55:
+                # A full hour was compiled, roll up the days and months it ended
+                instance.queue_task(CompileMissingRollupsTask())
             return
         # Schedule a new statistics task if this one didn't finish
         instance.queue_task(StatisticsTask(self.start, self.fire_events))
@@ -181,6 +253,18 @@ class CompileMissingStatisticsTask(RecorderTask):
         instance.queue_task(CompileMissingStatisticsTask())
 
 
+@dataclass(slots=True)
+class CompileMissingRollupsTask(RecorderTask):
+    """An object to insert into the recorder queue to roll up statistics."""
+
+    def run(self, instance: Recorder) -> None:
+        """Run statistics task to roll up daily and monthly statistics."""
+        if statistics.compile_missing_rollups(instance):
+            return
+        # Schedule a new task to roll up the remaining periods
+        instance.queue_task(CompileMissingRollupsTask())
+
+
 @dataclass(slots=True)
 class ImportStatisticsTask(RecorderTask):
     """An object to insert into the recorder queue to run an import statistics task."""
@@ -385,6 +469,19 @@ class EventIdMigrationTask(RecorderTask):
         instance._cleanup_legacy_states_event_ids()  # noqa: SLF001
 
 
+@dataclass(slots=True)
+class PartitionTask(RecorderTask):
+    """An object to insert into the recorder queue to partition the tables.
+
+    Partitions the states and statistics tables if they are not partitioned
+    yet and creates the partitions for the next days or months.
+    """
+
+    def run(self, instance: Recorder) -> None:
+        """Partition the states and statistics tables."""
+        instance._partition_tables()  # noqa: SLF001
+
+
 @dataclass(slots=True)
 class RefreshEventTypesTask(RecorderTask):
     """An object to insert into the recorder queue to refresh event types."""
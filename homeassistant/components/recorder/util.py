@@ -53,6 +53,7 @@ from .models import (
     UnsupportedDialect,
     process_timestamp,
 )
+from .query_budget import QueryBudget, current_query_budget, query_stopped
 
 if TYPE_CHECKING:
     from sqlite3.dbapi2 import Cursor as SQLiteCursor
@@ -122,11 +123,12 @@ def session_scope(
     """Provide a transactional scope around a series of operations.
 
     read_only is used to indicate that the session is only used for reading
-    data and that no commit is required. It does not prevent the session
-    from writing and is not a security measure.
+    data and that no commit is required. When a session is created from hass,
+    it uses the read only connections of the recorder if it has them.
     """
     if session is None and hass is not None:
-        session = get_instance(hass).get_session()
+        instance = get_instance(hass)
+        session = instance.get_read_session() if read_only else instance.get_session()
 
     if session is None:
         raise RuntimeError("Session required")
@@ -138,7 +140,8 @@ def session_scope(
             need_rollback = True
             session.commit()
     except Exception as err:
-        _LOGGER.exception("Error executing query")
+        if not query_stopped():
+            _LOGGER.exception("Error executing query")
         if need_rollback:
             session.rollback()
         if not exception_filter or not exception_filter(err):
@@ -207,7 +210,7 @@ def execute_stmt_lambda_element(
     end_time: datetime | None = None,
     yield_per: int = DEFAULT_YIELD_STATES_ROWS,
     orm_rows: bool = True,
-) -> Sequence[Row] | Result:
+) -> Sequence[Row] | Result | Generator[Row]:
     """Execute a StatementLambdaElement.
 
     If the time window passed is greater than one day
@@ -220,16 +223,28 @@ def execute_stmt_lambda_element(
     with .all().
     """
     use_all = not start_time or ((end_time or dt_util.utcnow()) - start_time).days <= 1
+    budget = current_query_budget()
     for tryno in range(RETRIES):
         try:
             if orm_rows:
                 executed = session.execute(stmt)
             else:
                 executed = session.connection().execute(stmt)
+            if budget is None or (remaining_rows := budget.remaining_rows) is None:
+                if use_all:
+                    return executed.all()
+                return executed.yield_per(yield_per)
             if use_all:
-                return executed.all()
-            return executed.yield_per(yield_per)
+                # Stop fetching once the row budget is exceeded
+                rows = executed.fetchmany(remaining_rows + 1)
+                budget.count_rows(len(rows))
+                return rows
+            return _count_budget_rows(budget, executed.yield_per(yield_per))
         except SQLAlchemyError as err:
+            if budget and budget.exhausted():
+                # The statement was stopped by the budget of the query,
+                # raise the error of the budget instead of retrying
+                budget.check()
             _LOGGER.error("Error executing query: %s", err)
             if tryno == RETRIES - 1:
                 raise
@@ -239,6 +254,13 @@ def execute_stmt_lambda_element(
     raise RuntimeError  # pragma: no cover
 
 
+def _count_budget_rows(budget: QueryBudget, result: Result) -> Generator[Row]:
+    """Yield the rows of a result and count them against the row budget."""
+    for partition in result.partitions():
+        budget.count_rows(len(partition))
+        yield from partition
+
+
 def validate_or_move_away_sqlite_database(dburl: str) -> bool:
     """Ensure that the database is valid or move it away."""
     dbpath = dburl_to_path(dburl)
@@ -601,6 +623,21 @@ def setup_connection_for_dialect(
     )
 
 
+def setup_read_only_connection_for_dialect(
+    dialect_name: str, dbapi_connection: DBAPIConnection
+) -> None:
+    """Make a connection used for read only sessions refuse writes."""
+    if dialect_name == SupportedDialect.SQLITE:
+        execute_on_connection(dbapi_connection, "PRAGMA query_only=ON")
+    elif dialect_name == SupportedDialect.MYSQL:
+        execute_on_connection(dbapi_connection, "SET SESSION TRANSACTION READ ONLY")
+    elif dialect_name == SupportedDialect.POSTGRESQL:
+        execute_on_connection(
+            dbapi_connection,
+            "SET SESSION CHARACTERISTICS AS TRANSACTION READ ONLY",
+        )
+
+
 def end_incomplete_runs(session: Session, start_time: datetime) -> None:
     """End any incomplete recorder runs."""
     for run in session.query(RecorderRuns).filter_by(end=None):
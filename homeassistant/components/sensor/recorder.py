@@ -2,12 +2,15 @@
 
 from __future__ import annotations
 
+from array import array
 from collections import defaultdict
-from collections.abc import Callable, Iterable
+from collections.abc import Callable
+from dataclasses import dataclass
 import datetime
-import itertools
+from itertools import repeat
 import logging
 import math
+import operator
 from typing import Any
 
 from sqlalchemy.orm.session import Session
@@ -18,6 +21,7 @@ from homeassistant.components.recorder import (
     history,
     statistics,
 )
+from homeassistant.components.recorder.history import StateColumns
 from homeassistant.components.recorder.models import (
     StatisticData,
     StatisticMetaData,
@@ -93,8 +97,20 @@ def _get_sensor_states(hass: HomeAssistant) -> list[State]:
     ]
 
 
+@dataclass(slots=True)
+class _FloatStates:
+    """The states of an entity with a valid float value in columns."""
+
+    values: array[float]
+    # The index of the state in the StateColumns of the entity
+    rows: list[int]
+
+
 def _time_weighted_average(
-    fstates: list[tuple[float, State]], start: datetime.datetime, end: datetime.datetime
+    values: array[float],
+    timestamps: array[float],
+    start_ts: float,
+    end_ts: float,
 ) -> float:
     """Calculate a time weighted average.
 
@@ -102,33 +118,14 @@ def _time_weighted_average(
     state changes.
     Note: there's no interpolation of values between state changes.
     """
-    old_fstate: float | None = None
-    old_start_time: datetime.datetime | None = None
-    accumulated = 0.0
-
-    for fstate, state in fstates:
-        # The recorder will give us the last known state, which may be well
-        # before the requested start time for the statistics
-        start_time = max(state.last_updated, start)
-        if old_start_time is None:
-            # Adjust start time, if there was no last known state
-            start = start_time
-        else:
-            duration = start_time - old_start_time
-            # Accumulate the value, weighted by duration until next state change
-            assert old_fstate is not None
-            accumulated += old_fstate * duration.total_seconds()
-
-        old_fstate = fstate
-        old_start_time = start_time
-
-    if old_fstate is not None:
-        # Accumulate the value, weighted by duration until end of the period
-        assert old_start_time is not None
-        duration = end - old_start_time
-        accumulated += old_fstate * duration.total_seconds()
-
-    period_seconds = (end - start).total_seconds()
+    # The recorder will give us the last known state, which may be well
+    # before the requested start time for the statistics
+    start_times = array("d", map(max, timestamps, repeat(start_ts)))
+    # Each value is weighted by the duration until the next state change
+    # and the last value by the duration until the end of the period
+    durations = array("d", map(operator.sub, start_times[1:], start_times))
+    durations.append(end_ts - start_times[-1])
+    period_seconds = end_ts - start_times[0]
     if period_seconds == 0:
         # If the only state changed that happened was at the exact moment
         # at the end of the period, we can't calculate a meaningful average
@@ -137,12 +134,7 @@ def _time_weighted_average(
         # column schema in the database is incorrect but it is actually possible
         # to happen if the state change event fired at the exact microsecond
         return 0.0
-    return accumulated / period_seconds
-
-
-def _get_units(fstates: list[tuple[float, State]]) -> set[str | None]:
-    """Return a set of all units."""
-    return {item[1].attributes.get(ATTR_UNIT_OF_MEASUREMENT) for item in fstates}
+    return math.sumprod(values, durations) / period_seconds
 
 
 def _equivalent_units(units: set[str | None]) -> bool:
@@ -156,34 +148,43 @@ def _equivalent_units(units: set[str | None]) -> bool:
     return len(units) == 1
 
 
-def _entity_history_to_float_and_state(
-    entity_history: Iterable[State],
-) -> list[tuple[float, State]]:
-    """Return a list of (float, state) tuples for the given entity."""
-    float_states: list[tuple[float, State]] = []
-    append = float_states.append
+def _entity_history_to_float_states(
+    entity_history: StateColumns, significant_changes_only: bool
+) -> _FloatStates:
+    """Return the states of an entity which have a valid float value."""
+    values: array[float] = array("d")
+    rows: list[int] = []
+    append_value = values.append
+    append_row = rows.append
     isfinite = math.isfinite
-    for state in entity_history:
+    last_updated_ts = entity_history.last_updated_ts
+    last_changed_ts = entity_history.last_changed_ts
+    for idx, state in enumerate(entity_history.states):
+        if significant_changes_only and last_changed_ts[idx] != last_updated_ts[idx]:
+            # Only the attributes changed
+            continue
         try:
-            if (float_state := float(state.state)) is not None and isfinite(
-                float_state
-            ):
-                append((float_state, state))
-        except (ValueError, TypeError):
-            pass
-    return float_states
+            float_state = float(state)
+        except ValueError:
+            continue
+        if isfinite(float_state):
+            append_value(float_state)
+            append_row(idx)
+    return _FloatStates(values, rows)
 
 
 def _normalize_states(
     hass: HomeAssistant,
     old_metadatas: dict[str, tuple[int, StatisticMetaData]],
-    fstates: list[tuple[float, State]],
+    entity_history: StateColumns,
+    fstates: _FloatStates,
     entity_id: str,
-) -> tuple[str | None, list[tuple[float, State]]]:
+) -> tuple[str | None, _FloatStates | None]:
     """Normalize units."""
-    state_unit: str | None = None
     statistics_unit: str | None
-    state_unit = fstates[0][1].attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+    attributes = entity_history.attributes
+    units = [attributes[idx].get(ATTR_UNIT_OF_MEASUREMENT) for idx in fstates.rows]
+    state_unit = units[0]
     old_metadata = old_metadatas[entity_id][1] if entity_id in old_metadatas else None
     if not old_metadata:
         # We've not seen this sensor before, the first valid state determines the unit
@@ -196,7 +197,7 @@ def _normalize_states(
     if statistics_unit not in statistics.STATISTIC_UNIT_TO_UNIT_CONVERTER:
         # The unit used by this sensor doesn't support unit conversion
 
-        all_units = _get_units(fstates)
+        all_units = set(units)
         if not _equivalent_units(all_units):
             if WARN_UNSTABLE_UNIT not in hass.data:
                 hass.data[WARN_UNSTABLE_UNIT] = set()
@@ -219,18 +220,22 @@ def _normalize_states(
                     extra,
                     LINK_DEV_STATISTICS,
                 )
-            return None, []
-        state_unit = fstates[0][1].attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+            return None, None
         return state_unit, fstates
 
+    if all(unit == statistics_unit for unit in units):
+        # Nothing to convert
+        return statistics_unit, fstates
+
     converter = statistics.STATISTIC_UNIT_TO_UNIT_CONVERTER[statistics_unit]
-    valid_fstates: list[tuple[float, State]] = []
+    valid_fstates = _FloatStates(array("d"), [])
     convert: Callable[[float], float] | None = None
     last_unit: str | None | object = object()
     valid_units = converter.VALID_UNITS
 
-    for fstate, state in fstates:
-        state_unit = state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+    for fstate, idx, state_unit in zip(
+        fstates.values, fstates.rows, units, strict=True
+    ):
         # Exclude states with unsupported unit from statistics
         if state_unit not in valid_units:
             if WARN_UNSUPPORTED_UNIT not in hass.data:
@@ -261,12 +266,10 @@ def _normalize_states(
                 convert = converter.converter_factory(state_unit, statistics_unit)
             last_unit = state_unit
 
-        if convert is not None:
-            fstate = convert(fstate)
-
-        valid_fstates.append((fstate, state))
+        valid_fstates.values.append(fstate if convert is None else convert(fstate))
+        valid_fstates.rows.append(idx)
 
-    return statistics_unit, valid_fstates
+    return statistics_unit, valid_fstates if valid_fstates.rows else None
 
 
 def _suggest_report_issue(hass: HomeAssistant, entity_id: str) -> str:
@@ -399,45 +402,32 @@ def compile_statistics(  # noqa: C901
 
     sensor_states = _get_sensor_states(hass)
     wanted_statistics = _wanted_statistics(sensor_states)
-    # Get history between start and end
-    entities_full_history = [
-        i.entity_id for i in sensor_states if "sum" in wanted_statistics[i.entity_id]
-    ]
-    history_list: dict[str, list[State]] = {}
-    if entities_full_history:
-        history_list = history.get_full_significant_states_with_session(
-            hass,
-            session,
-            start - datetime.timedelta.resolution,
-            end,
-            entity_ids=entities_full_history,
-            significant_changes_only=False,
-        )
-    entities_significant_history = [
-        i.entity_id
-        for i in sensor_states
-        if "sum" not in wanted_statistics[i.entity_id]
-    ]
-    if entities_significant_history:
-        _history_list = history.get_full_significant_states_with_session(
+    # Get the history of all sensors between start and end with a single query
+    history_columns: dict[str, StateColumns] = {}
+    if sensor_states:
+        history_columns = history.get_state_columns_with_session(
             hass,
             session,
             start - datetime.timedelta.resolution,
             end,
-            entity_ids=entities_significant_history,
+            [state.entity_id for state in sensor_states],
         )
-        history_list = {**history_list, **_history_list}
 
-    entities_with_float_states: dict[str, list[tuple[float, State]]] = {}
+    entities_with_float_states: dict[str, tuple[StateColumns, _FloatStates]] = {}
     for _state in sensor_states:
         entity_id = _state.entity_id
-        # If there are no recent state changes, the sensor's state may already be pruned
-        # from the recorder. Get the state from the state machine instead.
-        if not (entity_history := history_list.get(entity_id, [_state])):
-            continue
-        if not (float_states := _entity_history_to_float_and_state(entity_history)):
+        if (entity_history := history_columns.get(entity_id)) is None:
+            # If there are no recent state changes, the sensor's state may already
+            # be pruned from the recorder. Get the state from the state machine
+            # instead.
+            entity_history = StateColumns.from_states([_state])
+        # Only the changes of the state are used for the mean, min and max
+        float_states = _entity_history_to_float_states(
+            entity_history, "sum" not in wanted_statistics[entity_id]
+        )
+        if not float_states.rows:
             continue
-        entities_with_float_states[entity_id] = float_states
+        entities_with_float_states[entity_id] = (entity_history, float_states)
 
     # Only lookup metadata for entities that have valid float states
     # since it will result in cache misses for statistic_ids
@@ -446,32 +436,45 @@ def compile_statistics(  # noqa: C901
     old_metadatas = statistics.get_metadata_with_session(
         get_instance(hass), session, statistic_ids=set(entities_with_float_states)
     )
-    to_process: list[tuple[str, str | None, str, list[tuple[float, State]]]] = []
+    to_process: list[tuple[str, str | None, str, StateColumns, _FloatStates]] = []
     to_query: set[str] = set()
     for _state in sensor_states:
         entity_id = _state.entity_id
         if not (maybe_float_states := entities_with_float_states.get(entity_id)):
             continue
+        entity_history, float_states = maybe_float_states
         statistics_unit, valid_float_states = _normalize_states(
             hass,
             old_metadatas,
-            maybe_float_states,
+            entity_history,
+            float_states,
             entity_id,
         )
         if not valid_float_states:
             continue
         state_class: str = _state.attributes[ATTR_STATE_CLASS]
-        to_process.append((entity_id, statistics_unit, state_class, valid_float_states))
+        to_process.append(
+            (
+                entity_id,
+                statistics_unit,
+                state_class,
+                entity_history,
+                valid_float_states,
+            )
+        )
         if "sum" in wanted_statistics[entity_id]:
             to_query.add(entity_id)
 
     last_stats = statistics.get_latest_short_term_statistics_with_session(
         hass, session, to_query, {"last_reset", "state", "sum"}, metadata=old_metadatas
     )
+    start_ts = start.timestamp()
+    end_ts = end.timestamp()
     for (  # pylint: disable=too-many-nested-blocks
         entity_id,
         statistics_unit,
         state_class,
+        entity_history,
         valid_float_states,
     ) in to_process:
         # Check metadata
@@ -511,17 +514,25 @@ def compile_statistics(  # noqa: C901
 
         # Make calculations
         stat: StatisticData = {"start": start}
+        values = valid_float_states.values
         if "max" in wanted_statistics[entity_id]:
-            stat["max"] = max(
-                *itertools.islice(zip(*valid_float_states, strict=False), 1)
-            )
+            stat["max"] = max(values)
         if "min" in wanted_statistics[entity_id]:
-            stat["min"] = min(
-                *itertools.islice(zip(*valid_float_states, strict=False), 1)
-            )
+            stat["min"] = min(values)
 
         if "mean" in wanted_statistics[entity_id]:
-            stat["mean"] = _time_weighted_average(valid_float_states, start, end)
+            stat["mean"] = _time_weighted_average(
+                values,
+                array(
+                    "d",
+                    map(
+                        entity_history.last_updated_ts.__getitem__,
+                        valid_float_states.rows,
+                    ),
+                ),
+                start_ts,
+                end_ts,
+            )
 
         if "sum" in wanted_statistics[entity_id]:
             last_reset = old_last_reset = None
@@ -539,13 +550,14 @@ def compile_statistics(  # noqa: C901
                 new_state = old_state = last_stat.get("state")
                 _sum = last_stat.get("sum") or 0.0
 
-            for fstate, state in valid_float_states:
+            for fstate, idx in zip(values, valid_float_states.rows, strict=True):
                 reset = False
                 if (
                     state_class != SensorStateClass.TOTAL_INCREASING
                     and (
                         last_reset := _last_reset_as_utc_isoformat(
-                            state.attributes.get("last_reset"), entity_id
+                            entity_history.attributes[idx].get("last_reset"),
+                            entity_id,
                         )
                     )
                     != old_last_reset
@@ -579,6 +591,7 @@ def compile_statistics(  # noqa: C901
                         fstate,
                     )
                 elif state_class == SensorStateClass.TOTAL_INCREASING:
+                    state = entity_history.state(entity_id, idx)
                     try:
                         if old_state is None or reset_detected(
                             hass, entity_id, fstate, new_state, state
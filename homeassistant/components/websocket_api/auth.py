@@ -16,7 +16,9 @@ from homeassistant.helpers.json import json_bytes
 from homeassistant.util.json import JsonValueType
 
 from .connection import ActiveConnection
+from .const import ENCODING_JSON, ENCODING_MSGPACK
 from .error import Disconnect
+from .messages import ENCODINGS, JSON_ENCODING
 
 if TYPE_CHECKING:
     from .http import WebSocketAdapter
@@ -32,10 +34,14 @@ AUTH_MESSAGE_SCHEMA: Final = vol.Schema(
         vol.Required("type"): TYPE_AUTH,
         vol.Exclusive("api_password", "auth"): str,
         vol.Exclusive("access_token", "auth"): str,
+        vol.Optional("encoding", default=ENCODING_JSON): vol.In(ENCODINGS),
     }
 )
 
 AUTH_OK_MESSAGE = json_bytes({"type": TYPE_AUTH_OK, "ha_version": __version__})
+AUTH_OK_MSGPACK_MESSAGE = json_bytes(
+    {"type": TYPE_AUTH_OK, "ha_version": __version__, "encoding": ENCODING_MSGPACK}
+)
 AUTH_REQUIRED_MESSAGE = json_bytes(
     {"type": TYPE_AUTH_REQUIRED, "ha_version": __version__}
 )
@@ -83,19 +89,27 @@ class AuthPhase:
         if (access_token := valid_msg.get("access_token")) and (
             refresh_token := self._hass.auth.async_validate_access_token(access_token)
         ):
+            encoding = ENCODINGS[valid_msg["encoding"]]
             conn = ActiveConnection(
                 self._logger,
                 self._hass,
                 self._send_message,
                 refresh_token.user,
                 refresh_token,
+                encoding,
             )
             conn.subscriptions["auth"] = (
                 self._hass.auth.async_register_revoke_token_callback(
                     refresh_token.id, self._cancel_ws
                 )
             )
-            await self._send_bytes_text(AUTH_OK_MESSAGE)
+            # The auth_ok message is always sent as json, the
+            # messages after it are sent with the selected encoding
+            await self._send_bytes_text(
+                AUTH_OK_MESSAGE
+                if encoding is JSON_ENCODING
+                else AUTH_OK_MSGPACK_MESSAGE
+            )
             self._logger.debug("Auth OK")
             process_success_login(self._request)
             return conn
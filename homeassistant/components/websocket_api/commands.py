@@ -60,6 +60,11 @@ from homeassistant.util.json import format_unserializable_data
 
 from . import const, decorators, messages
 from .connection import ActiveConnection
+from .entity_subscriptions import (
+    EntitySubscription,
+    async_get_entity_subscriptions,
+    async_user_can_read,
+)
 from .messages import construct_result_message
 
 ALL_SERVICE_DESCRIPTIONS_JSON_CACHE = "websocket_api_all_service_descriptions_json"
@@ -105,6 +110,7 @@ def pong_message(iden: int) -> dict[str, Any]:
 def _forward_events_check_permissions(
     send_message: Callable[[bytes | str | dict[str, Any]], None],
     user: User,
+    cached_event_message: Callable[[bytes, Event], bytes],
     message_id_as_bytes: bytes,
     event: Event,
 ) -> None:
@@ -118,17 +124,18 @@ def _forward_events_check_permissions(
         and not permissions.check_entity(event.data["entity_id"], POLICY_READ)
     ):
         return
-    send_message(messages.cached_event_message(message_id_as_bytes, event))
+    send_message(cached_event_message(message_id_as_bytes, event))
 
 
 @callback
 def _forward_events_unconditional(
     send_message: Callable[[bytes | str | dict[str, Any]], None],
+    cached_event_message: Callable[[bytes, Event], bytes],
     message_id_as_bytes: bytes,
     event: Event,
 ) -> None:
     """Forward events to websocket."""
-    send_message(messages.cached_event_message(message_id_as_bytes, event))
+    send_message(cached_event_message(message_id_as_bytes, event))
 
 
 @callback
@@ -152,18 +159,23 @@ def handle_subscribe_events(
         )
         raise Unauthorized(user_id=connection.user.id)
 
-    message_id_as_bytes = str(msg["id"]).encode()
+    encoding = connection.encoding
+    message_id_as_bytes = encoding.message_id(msg["id"])
 
     if event_type == EVENT_STATE_CHANGED:
         forward_events = partial(
             _forward_events_check_permissions,
-            connection.send_message,
+            connection.send_encoded_message,
             connection.user,
+            encoding.cached_event_message,
             message_id_as_bytes,
         )
     else:
         forward_events = partial(
-            _forward_events_unconditional, connection.send_message, message_id_as_bytes
+            _forward_events_unconditional,
+            connection.send_encoded_message,
+            encoding.cached_event_message,
+            message_id_as_bytes,
         )
 
     connection.subscriptions[msg["id"]] = hass.bus.async_listen(
@@ -327,6 +339,10 @@ def handle_get_states(
 ) -> None:
     """Handle get states command."""
     states = _async_get_allowed_states(hass, connection)
+    if connection.encoding is not messages.JSON_ENCODING and _send_encoded_response(
+        connection, messages.result_message(msg["id"], states)
+    ):
+        return
 
     try:
         serialized_states = [state.as_dict_json for state in states]
@@ -352,6 +368,23 @@ def handle_get_states(
     _send_handle_get_states_response(connection, msg["id"], serialized_states)
 
 
+def _send_encoded_response(
+    connection: ActiveConnection, message: dict[str, Any]
+) -> bool:
+    """Send a large response serialized with the encoding of the connection.
+
+    Responses are serialized without serializing them to JSON first.
+    Returns False if the response can not be serialized, the response
+    is then serialized to JSON to find and skip the states with bad data.
+    """
+    try:
+        encoded_message = connection.encoding.dumps(message)
+    except (ValueError, TypeError):
+        return False
+    connection.send_encoded_message(encoded_message)
+    return True
+
+
 def _send_handle_get_states_response(
     connection: ActiveConnection, msg_id: int, serialized_states: list[bytes]
 ) -> None:
@@ -363,58 +396,73 @@ def _send_handle_get_states_response(
     )
 
 
-@callback
-def _forward_entity_changes(
-    send_message: Callable[[str | bytes | dict[str, Any]], None],
-    entity_ids: set[str],
-    user: User,
-    message_id_as_bytes: bytes,
-    event: Event[EventStateChangedData],
-) -> None:
-    """Forward entity state changed events to websocket."""
-    entity_id = event.data["entity_id"]
-    if entity_ids and entity_id not in entity_ids:
-        return
-    # We have to lookup the permissions again because the user might have
-    # changed since the subscription was created.
-    permissions = user.permissions
-    if (
-        not user.is_admin
-        and not permissions.access_all_entities(POLICY_READ)
-        and not permissions.check_entity(event.data["entity_id"], POLICY_READ)
-    ):
-        return
-    send_message(messages.cached_state_diff_message(message_id_as_bytes, event))
-
-
 @callback
 @decorators.websocket_command(
     {
         vol.Required("type"): "subscribe_entities",
         vol.Optional("entity_ids"): cv.entity_ids,
+        vol.Optional("resumable", default=False): bool,
+        vol.Optional("resume_token"): str,
     }
 )
 def handle_subscribe_entities(
     hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
 ) -> None:
-    """Handle subscribe entities command."""
+    """Handle subscribe entities command.
+
+    A resumable subscription receives a resume token with each message. When
+    it is resubscribed with the last received token, only the entities changed
+    since the token are sent if the token did not expire.
+    """
     entity_ids = set(msg.get("entity_ids", []))
+    entity_subscriptions = async_get_entity_subscriptions(hass)
+    journal = None
+    changed: list[str] | None = None
+    if msg["resumable"] or "resume_token" in msg:
+        journal = entity_subscriptions.journal
+        if "resume_token" in msg:
+            changed = journal.async_changed_since(msg["resume_token"])
     # We must never await between sending the states and listening for
     # state changed events or we will introduce a race condition
     # where some states are missed
     states = _async_get_allowed_states(hass, connection)
-    message_id_as_bytes = str(msg["id"]).encode()
-    connection.subscriptions[msg["id"]] = hass.bus.async_listen(
-        EVENT_STATE_CHANGED,
-        partial(
-            _forward_entity_changes,
-            connection.send_message,
-            entity_ids,
-            connection.user,
-            message_id_as_bytes,
-        ),
+    connection.subscriptions[msg["id"]] = entity_subscriptions.async_subscribe(
+        EntitySubscription(connection, msg["id"], journal), frozenset(entity_ids)
     )
-    connection.send_result(msg["id"])
+    if journal is None:
+        connection.send_result(msg["id"])
+    else:
+        connection.send_result(msg["id"], {"resumed": changed is not None})
+
+    removed: list[str] = []
+    if changed is not None:
+        # Only the changed entities are sent to a resumed subscription,
+        # the entities that no longer exist are sent as removed
+        changed_ids = set(changed)
+        states = [state for state in states if state.entity_id in changed_ids]
+        removed = [
+            entity_id
+            for entity_id in changed
+            if (not entity_ids or entity_id in entity_ids)
+            and hass.states.get(entity_id) is None
+            and async_user_can_read(connection.user, entity_id)
+        ]
+    token = None if journal is None else journal.token
+
+    if connection.encoding is not messages.JSON_ENCODING:
+        event: dict[str, Any] = {
+            messages.ENTITY_EVENT_ADD: {
+                state.entity_id: state.as_compressed_state
+                for state in states
+                if not entity_ids or state.entity_id in entity_ids
+            }
+        }
+        if removed:
+            event[messages.ENTITY_EVENT_REMOVE] = removed
+        if token is not None:
+            event[messages.ENTITY_EVENT_TOKEN] = token
+        if _send_encoded_response(connection, messages.event_message(msg["id"], event)):
+            return
 
     # JSON serialize here so we can recover if it blows up due to the
     # state machine containing unserializable data. This command is required
@@ -428,7 +476,9 @@ def handle_subscribe_entities(
     except (ValueError, TypeError):
         pass
     else:
-        _send_handle_entities_init_response(connection, msg["id"], serialized_states)
+        _send_handle_entities_init_response(
+            connection, msg["id"], serialized_states, removed, token
+        )
         return
 
     serialized_states = []
@@ -443,24 +493,32 @@ def handle_subscribe_entities(
                 ),
             )
 
-    _send_handle_entities_init_response(connection, msg["id"], serialized_states)
+    _send_handle_entities_init_response(
+        connection, msg["id"], serialized_states, removed, token
+    )
 
 
 def _send_handle_entities_init_response(
-    connection: ActiveConnection, msg_id: int, serialized_states: list[bytes]
+    connection: ActiveConnection,
+    msg_id: int,
+    serialized_states: list[bytes],
+    removed: list[str] | None = None,
+    token: str | None = None,
 ) -> None:
     """Send handle entities init response."""
-    connection.send_message(
-        b"".join(
-            (
-                b'{"id":',
-                str(msg_id).encode(),
-                b',"type":"event","event":{"a":{',
-                b",".join(serialized_states),
-                b"}}}",
-            )
-        )
-    )
+    parts = [
+        b'{"id":',
+        str(msg_id).encode(),
+        b',"type":"event","event":{"a":{',
+        b",".join(serialized_states),
+        b"}",
+    ]
+    if removed:
+        parts.extend((b',"r":', json_bytes(removed)))
+    if token is not None:
+        parts.extend((b',"t":', json_bytes(token)))
+    parts.append(b"}}")
+    connection.send_message(b"".join(parts))
 
 
 async def _async_get_all_descriptions_json(hass: HomeAssistant) -> bytes:
@@ -4,16 +4,17 @@ from __future__ import annotations
 
 from collections.abc import Callable, Hashable
 from contextvars import ContextVar
-from typing import TYPE_CHECKING, Any, Literal
+from functools import partial
+from typing import TYPE_CHECKING, Any, Literal, cast
 
 from aiohttp import web
 import voluptuous as vol
 
 from homeassistant.auth.models import RefreshToken, User
-from homeassistant.core import Context, HomeAssistant, callback
+from homeassistant.core import CALLBACK_TYPE, Context, HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError, Unauthorized
 from homeassistant.helpers.http import current_request
-from homeassistant.util.json import JsonValueType
+from homeassistant.util.json import JsonValueType, json_loads
 
 from . import const, messages
 from .util import describe_request
@@ -30,6 +31,28 @@ type MessageHandler = Callable[[HomeAssistant, ActiveConnection, dict[str, Any]]
 type BinaryHandler = Callable[[HomeAssistant, ActiveConnection, bytes], None]
 
 
+def _send_message_with_encoding(
+    send_message: Callable[[bytes | str | dict[str, Any]], None],
+    encoding: messages.MessageEncoding,
+    message: bytes | str | dict[str, Any],
+) -> None:
+    """Send a message or a message serialized to json with another encoding."""
+    if not isinstance(message, dict):
+        message = cast(dict[str, Any], json_loads(message))
+    send_message(encoding.message_to_bytes(message))
+
+
+def _not_congested() -> bool:
+    """Return False for connections without flow control."""
+    return False
+
+
+@callback
+def _call_now(drained_callback: CALLBACK_TYPE) -> None:
+    """Call a callback for connections without flow control."""
+    drained_callback()
+
+
 class ActiveConnection:
     """Handle an active websocket client connection."""
 
@@ -37,6 +60,8 @@ class ActiveConnection:
         "logger",
         "hass",
         "send_message",
+        "send_encoded_message",
+        "encoding",
         "user",
         "refresh_token_id",
         "subscriptions",
@@ -45,6 +70,8 @@ class ActiveConnection:
         "supported_features",
         "handlers",
         "binary_handlers",
+        "is_congested",
+        "async_call_when_drained",
     )
 
     def __init__(
@@ -54,11 +81,22 @@ class ActiveConnection:
         send_message: Callable[[bytes | str | dict[str, Any]], None],
         user: User,
         refresh_token: RefreshToken,
+        encoding: messages.MessageEncoding = messages.JSON_ENCODING,
     ) -> None:
         """Initialize an active connection."""
         self.logger = logger
         self.hass = hass
-        self.send_message = send_message
+        # send_encoded_message sends messages which are already serialized
+        # with the encoding of the connection, send_message sends messages
+        # which are dicts or serialized to json.
+        self.send_encoded_message = send_message
+        self.encoding = encoding
+        if encoding is messages.JSON_ENCODING:
+            self.send_message = send_message
+        else:
+            self.send_message = partial(
+                _send_message_with_encoding, send_message, encoding
+            )
         self.user = user
         self.refresh_token_id = refresh_token.id
         self.subscriptions: dict[Hashable, Callable[[], Any]] = {}
@@ -69,6 +107,11 @@ class ActiveConnection:
             self.hass.data[const.DOMAIN]
         )
         self.binary_handlers: list[BinaryHandler | None] = []
+        # Flow control of the websocket handler, is_congested returns if the
+        # client falls behind and async_call_when_drained calls a callback
+        # once the client caught up
+        self.is_congested: Callable[[], bool] = _not_congested
+        self.async_call_when_drained: Callable[[CALLBACK_TYPE], None] = _call_now
         current_connection.set(self)
 
     def __repr__(self) -> str:
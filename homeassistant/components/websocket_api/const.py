@@ -34,6 +34,29 @@ MAX_PENDING_MSG: Final = 4096
 # resolve the ready future.
 PENDING_MSG_MAX_FORCE_READY: Final = 256
 
+# Number of pending messages at which a client is considered to fall behind.
+# Entity subscriptions stop queuing a message for every state change and
+# merge the pending changes of each entity until the queue is drained below
+# this size. This keeps slow clients connected with bounded memory.
+PENDING_MSG_COALESCE: Final = 256
+
+# Messages smaller than this are sent uncompressed when the client negotiated
+# compression. Compressing a message costs more event loop time than sending
+# it, and small messages are only sent on their own when there is little
+# traffic. When there is a lot of traffic the messages are coalesced and the
+# coalesced message is compressed.
+COMPRESS_MIN_SIZE: Final = 256
+
+# Number of seconds the entity change journal is kept after the last
+# subscribe_entities subscription was removed. A resumable subscription
+# resumed within this window only receives the entities changed since its
+# resume token instead of all states.
+ENTITY_RESUME_WINDOW: Final = 300
+
+# Maximum number of entities in the entity change journal, resume tokens
+# older than the oldest change in the journal have expired.
+ENTITY_JOURNAL_MAX_SIZE: Final = 16384
+
 ERR_ID_REUSE: Final = "id_reuse"
 ERR_INVALID_FORMAT: Final = "invalid_format"
 ERR_NOT_ALLOWED: Final = "not_allowed"
@@ -58,3 +81,8 @@ SIGNAL_WEBSOCKET_DISCONNECTED: Final = "websocket_disconnected"
 DATA_CONNECTIONS: Final = f"{DOMAIN}.connections"
 
 FEATURE_COALESCE_MESSAGES = "coalesce_messages"
+
+# Encodings of the messages sent to a client, the client
+# selects the encoding in its auth message
+ENCODING_JSON: Final = "json"
+ENCODING_MSGPACK: Final = "msgpack"
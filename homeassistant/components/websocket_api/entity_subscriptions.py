@@ -0,0 +1,334 @@
+"""Shared fan-out of state changes to subscribe_entities subscriptions.
+
+All subscribe_entities subscriptions share a single state_changed listener.
+The subscriptions are grouped by their entity filter so a state change is
+only matched against the groups which include its entity. The diff message
+of a state change is built once and the framed message is shared by all
+subscriptions with the same message id and encoding.
+
+When the connection of a subscription falls behind, the changes of each
+entity are merged until the pending messages of the connection are sent.
+The client then receives a single diff from the states it knows to the
+latest states, so the memory used for a slow client is bounded by the
+number of entities instead of the number of state changes.
+
+Every state change is recorded in a bounded journal of the position of the
+last change of each entity. Resumable subscriptions receive a resume token
+with each message. When the client reconnects with the token, it only
+receives the entities changed since the token instead of all states. The
+journal is kept for ENTITY_RESUME_WINDOW seconds after the last
+subscription was removed.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from itertools import chain
+import secrets
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.auth.models import User
+from homeassistant.auth.permissions.const import POLICY_READ
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    State,
+    callback,
+)
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util.hass_dict import HassKey
+
+from . import messages
+from .connection import ActiveConnection
+from .const import ENTITY_JOURNAL_MAX_SIZE, ENTITY_RESUME_WINDOW
+
+DATA_ENTITY_SUBSCRIPTIONS: HassKey[EntitySubscriptions] = HassKey(
+    "websocket_api_entity_subscriptions"
+)
+
+
+class EntityChangeJournal:
+    """Bounded journal of the last change of each entity."""
+
+    __slots__ = ("_changes", "_start", "id", "position")
+
+    def __init__(self) -> None:
+        """Initialize the journal."""
+        # Resume tokens of another journal, or of the journal before a
+        # restart, are not valid for this journal
+        self.id = secrets.token_hex(8)
+        self.position = 0
+        # The oldest position the entities changed since are known of
+        self._start = 0
+        # The position of the last change of each entity, oldest first
+        self._changes: dict[str, int] = {}
+
+    @property
+    def token(self) -> str:
+        """Return the resume token of the current position."""
+        return f"{self.id}.{self.position}"
+
+    @callback
+    def async_record(self, entity_id: str) -> None:
+        """Record a change of an entity."""
+        self.position += 1
+        changes = self._changes
+        changes.pop(entity_id, None)
+        changes[entity_id] = self.position
+        if len(changes) > ENTITY_JOURNAL_MAX_SIZE:
+            self._start = changes.pop(next(iter(changes)))
+
+    @callback
+    def async_changed_since(self, token: str) -> list[str] | None:
+        """Return the entities changed since a resume token.
+
+        Returns None if the token is invalid or expired.
+        """
+        journal_id, _, token_position = token.partition(".")
+        if journal_id != self.id or not token_position.isdecimal():
+            return None
+        if not self._start <= (position := int(token_position)) <= self.position:
+            return None
+        changed: list[str] = []
+        for entity_id, changed_at in reversed(self._changes.items()):
+            if changed_at <= position:
+                break
+            changed.append(entity_id)
+        return changed
+
+    @callback
+    def async_reset(self) -> None:
+        """Forget all changes and expire all resume tokens."""
+        self.id = secrets.token_hex(8)
+        self._start = self.position
+        self._changes.clear()
+
+
+class EntitySubscription:
+    """A subscribe_entities subscription of a connection."""
+
+    __slots__ = (
+        "cached_message",
+        "connection",
+        "journal",
+        "message_key",
+        "msg_id",
+        "pending",
+        "send_message",
+        "user",
+    )
+
+    def __init__(
+        self,
+        connection: ActiveConnection,
+        msg_id: int,
+        journal: EntityChangeJournal | None = None,
+    ) -> None:
+        """Initialize the subscription.
+
+        The subscription is resumable if it has the journal of the
+        subscriptions, its messages include the resume token.
+        """
+        encoding = connection.encoding
+        self.connection = connection
+        self.msg_id = msg_id
+        self.journal = journal
+        # The first old state and the latest new state of the changed
+        # entities while the connection is congested
+        self.pending: dict[str, tuple[State | None, State | None]] | None = None
+        self.send_message = connection.send_encoded_message
+        self.user = connection.user
+        self.cached_message: Callable[[bytes, Event[EventStateChangedData]], bytes] = (
+            encoding.cached_state_diff_message
+            if journal is None
+            else self._resumable_message
+        )
+        # The serialized message id is only unique per encoding
+        self.message_key = (
+            encoding.name,
+            encoding.message_id(msg_id),
+            journal is not None,
+        )
+
+    def _resumable_message(
+        self, message_id_as_bytes: bytes, event: Event[EventStateChangedData]
+    ) -> bytes:
+        """Return the message of a state change with the resume token."""
+        if TYPE_CHECKING:
+            assert self.journal is not None
+        return self.connection.encoding.message_to_bytes(
+            messages.event_message(
+                self.msg_id,
+                messages.resumable_state_diff_event(event, self.journal.token),
+            )
+        )
+
+    @callback
+    def async_add_pending(self, event: Event[EventStateChangedData]) -> None:
+        """Merge a state change into the pending changes."""
+        data = event.data
+        entity_id = data["entity_id"]
+        if (pending := self.pending) is None:
+            pending = self.pending = {}
+            self.connection.async_call_when_drained(self._async_send_pending)
+        if (change := pending.get(entity_id)) is None:
+            pending[entity_id] = (data["old_state"], data["new_state"])
+        else:
+            pending[entity_id] = (change[0], data["new_state"])
+
+    @callback
+    def _async_send_pending(self) -> None:
+        """Send the merged pending changes."""
+        if not (pending := self.pending):
+            return
+        self.pending = None
+        if event := messages.coalesced_state_diff_event(pending):
+            if self.journal is not None:
+                event[messages.ENTITY_EVENT_TOKEN] = self.journal.token
+            self.send_message(
+                self.connection.encoding.message_to_bytes(
+                    messages.event_message(self.msg_id, event)
+                )
+            )
+
+    @callback
+    def async_cancel(self) -> None:
+        """Drop the pending changes of a removed subscription."""
+        self.pending = None
+
+
+class EntitySubscriptions:
+    """Forward state changes to the subscribe_entities subscriptions."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the subscriptions."""
+        self._hass = hass
+        # Subscriptions grouped by their entity filter, an empty
+        # filter matches all entities
+        self._groups: dict[frozenset[str], set[EntitySubscription]] = {}
+        # The groups which match an entity, except the group of
+        # the subscriptions without a filter
+        self._entity_groups: dict[str, list[set[EntitySubscription]]] = {}
+        self._unsub: CALLBACK_TYPE | None = None
+        self.journal = EntityChangeJournal()
+        # The journal is kept after the last subscription was
+        # removed if resumable subscriptions were made
+        self._keep_journal = False
+        self._expire_journal_unsub: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_subscribe(
+        self, subscription: EntitySubscription, entity_ids: frozenset[str]
+    ) -> CALLBACK_TYPE:
+        """Add a subscription for the entities, or all entities if empty."""
+        if not (group := self._groups.get(entity_ids)):
+            group = self._groups[entity_ids] = set()
+            for entity_id in entity_ids:
+                self._entity_groups.setdefault(entity_id, []).append(group)
+        group.add(subscription)
+        if subscription.journal is not None:
+            self._keep_journal = True
+        if self._expire_journal_unsub is not None:
+            self._expire_journal_unsub()
+            self._expire_journal_unsub = None
+        if self._unsub is None:
+            self._unsub = self._hass.bus.async_listen(
+                EVENT_STATE_CHANGED, self._async_forward_entity_changes
+            )
+
+        @callback
+        def _async_unsubscribe() -> None:
+            """Remove the subscription."""
+            group.discard(subscription)
+            subscription.async_cancel()
+            if group or self._groups.get(entity_ids) is not group:
+                return
+            del self._groups[entity_ids]
+            for entity_id in entity_ids:
+                groups = self._entity_groups[entity_id]
+                groups.remove(group)
+                if not groups:
+                    del self._entity_groups[entity_id]
+            if self._groups or not self._unsub:
+                return
+            if self._keep_journal:
+                self._expire_journal_unsub = async_call_later(
+                    self._hass, ENTITY_RESUME_WINDOW, self._async_expire_journal
+                )
+            else:
+                self._async_stop_listening()
+
+        return _async_unsubscribe
+
+    @callback
+    def _async_expire_journal(self, _now: Any) -> None:
+        """Stop keeping the journal once the resume window passed."""
+        self._expire_journal_unsub = None
+        self._async_stop_listening()
+
+    @callback
+    def _async_stop_listening(self) -> None:
+        """Stop listening for state changes."""
+        if self._unsub:
+            self._unsub()
+            self._unsub = None
+        # Changes are no longer recorded
+        self.journal.async_reset()
+        self._keep_journal = False
+
+    @callback
+    def _async_forward_entity_changes(
+        self, event: Event[EventStateChangedData]
+    ) -> None:
+        """Forward a state changed event to the matching subscriptions."""
+        entity_id = event.data["entity_id"]
+        self.journal.async_record(entity_id)
+        groups = self._entity_groups.get(entity_id, ())
+        if all_entities := self._groups.get(frozenset()):
+            groups = (all_entities, *groups)
+        # The messages for each message id and the read permission
+        # of each user are only determined once per state change
+        messages_by_key: dict[tuple[str, bytes, bool], bytes] = {}
+        can_read: dict[str, bool] = {}
+        for subscription in chain.from_iterable(groups):
+            user = subscription.user
+            if (allowed := can_read.get(user.id)) is None:
+                allowed = can_read[user.id] = async_user_can_read(user, entity_id)
+            if not allowed:
+                continue
+            if (
+                subscription.pending is not None
+                or subscription.connection.is_congested()
+            ):
+                subscription.async_add_pending(event)
+                continue
+            message_key = subscription.message_key
+            if (message := messages_by_key.get(message_key)) is None:
+                message = messages_by_key[message_key] = subscription.cached_message(
+                    message_key[1], event
+                )
+            subscription.send_message(message)
+
+
+@callback
+def async_user_can_read(user: User, entity_id: str) -> bool:
+    """Return if a user can read the state of an entity."""
+    # We have to lookup the permissions again because the user might have
+    # changed since the subscription was created.
+    permissions = user.permissions
+    return (
+        user.is_admin
+        or permissions.access_all_entities(POLICY_READ)
+        or permissions.check_entity(entity_id, POLICY_READ)
+    )
+
+
+@callback
+def async_get_entity_subscriptions(hass: HomeAssistant) -> EntitySubscriptions:
+    """Return the subscribe_entities subscriptions."""
+    if (subscriptions := hass.data.get(DATA_ENTITY_SUBSCRIPTIONS)) is None:
+        subscriptions = hass.data[DATA_ENTITY_SUBSCRIPTIONS] = EntitySubscriptions(hass)
+    return subscriptions
@@ -4,17 +4,18 @@ from __future__ import annotations
 
 import asyncio
 from collections import deque
-from collections.abc import Callable, Coroutine
+from collections.abc import Callable, Collection, Coroutine
 import datetime as dt
 from functools import partial
 import logging
 from typing import TYPE_CHECKING, Any, Final
 
 from aiohttp import WSMsgType, web
+from aiohttp.http_websocket import WebSocketWriter
 
 from homeassistant.components.http import KEY_HASS, HomeAssistantView
 from homeassistant.const import EVENT_HOMEASSISTANT_STOP
-from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.event import async_call_later
 from homeassistant.util.async_ import create_eager_task
@@ -22,8 +23,10 @@ from homeassistant.util.json import json_loads
 
 from .auth import AUTH_REQUIRED_MESSAGE, AuthPhase
 from .const import (
+    COMPRESS_MIN_SIZE,
     DATA_CONNECTIONS,
     MAX_PENDING_MSG,
+    PENDING_MSG_COALESCE,
     PENDING_MSG_MAX_FORCE_READY,
     PENDING_MSG_PEAK,
     PENDING_MSG_PEAK_TIME,
@@ -42,6 +45,30 @@ if TYPE_CHECKING:
 _WS_LOGGER: Final = logging.getLogger(f"{__name__}.connection")
 
 
+async def _async_send_compressed_if_large(
+    writer: WebSocketWriter, compress: int, binary: bool, message: bytes
+) -> None:
+    """Send a message and only compress it if it is large.
+
+    permessage-deflate allows sending any message uncompressed. The
+    messages which are not compressed do not change the compression
+    context shared by the compressed messages.
+    """
+    # Only the writer sends data frames after the auth phase
+    # so the compression can be changed for each message
+    writer.compress = compress if len(message) >= COMPRESS_MIN_SIZE else 0
+    await writer.send(message, binary=binary)
+
+
+def _get_send_bytes(
+    writer: WebSocketWriter, compress: int, binary: bool
+) -> Callable[[bytes], Coroutine[Any, Any, None]]:
+    """Return the function which sends text or binary messages with a writer."""
+    if compress:
+        return partial(_async_send_compressed_if_large, writer, compress, binary)
+    return partial(writer.send, binary=binary)
+
+
 class WebsocketAPIView(HomeAssistantView):
     """View to serve a websockets endpoint."""
 
@@ -81,6 +108,7 @@ class WebSocketHandler:
         "_message_queue",
         "_ready_future",
         "_release_ready_queue_size",
+        "_drained_callbacks",
     )
 
     def __init__(self, hass: HomeAssistant, request: web.Request) -> None:
@@ -104,6 +132,8 @@ class WebSocketHandler:
         self._message_queue: deque[bytes] = deque()
         self._ready_future: asyncio.Future[int] | None = None
         self._release_ready_queue_size: int = 0
+        # Callbacks to call once the queue is below PENDING_MSG_COALESCE
+        self._drained_callbacks: list[CALLBACK_TYPE] = []
 
     def __repr__(self) -> str:
         """Return the representation."""
@@ -124,7 +154,9 @@ class WebSocketHandler:
         return "finished connection"
 
     async def _writer(
-        self, send_bytes_text: Callable[[bytes], Coroutine[Any, Any, None]]
+        self,
+        send_bytes: Callable[[bytes], Coroutine[Any, Any, None]],
+        coalesce: Callable[[Collection[bytes]], bytes],
     ) -> None:
         """Write outgoing messages."""
         # Variables are set locally to avoid lookups in the loop
@@ -139,6 +171,12 @@ class WebSocketHandler:
         # Exceptions if Socket disconnected or cancelled by connection handler
         try:
             while not wsock.closed:
+                if (
+                    self._drained_callbacks
+                    and len(message_queue) < PENDING_MSG_COALESCE
+                ):
+                    self._call_drained_callbacks()
+
                 if not message_queue:
                     self._ready_future = loop.create_future()
                     ready_message_count = await self._ready_future
@@ -154,14 +192,14 @@ class WebSocketHandler:
                     message = message_queue.popleft()
                     if is_debug_log_enabled():
                         debug("%s: Sending %s", self.description, message)
-                    await send_bytes_text(message)
+                    await send_bytes(message)
                     continue
 
-                coalesced_messages = b"".join((b"[", b",".join(message_queue), b"]"))
+                coalesced_messages = coalesce(message_queue)
                 message_queue.clear()
                 if is_debug_log_enabled():
                     debug("%s: Sending %s", self.description, coalesced_messages)
-                await send_bytes_text(coalesced_messages)
+                await send_bytes(coalesced_messages)
         except asyncio.CancelledError:
             debug("%s: Writer cancelled", self.description)
             raise
@@ -172,6 +210,24 @@ class WebSocketHandler:
             # Clean up the peak checker when we shut down the writer
             self._cancel_peak_checker()
 
+    @callback
+    def _is_congested(self) -> bool:
+        """Return if the client falls behind reading the messages."""
+        return len(self._message_queue) >= PENDING_MSG_COALESCE
+
+    @callback
+    def _async_call_when_drained(self, drained_callback: CALLBACK_TYPE) -> None:
+        """Call a callback once the client caught up reading the messages."""
+        self._drained_callbacks.append(drained_callback)
+
+    @callback
+    def _call_drained_callbacks(self) -> None:
+        """Call the callbacks waiting for the queue to drain."""
+        drained_callbacks = self._drained_callbacks
+        self._drained_callbacks = []
+        for drained_callback in drained_callbacks:
+            drained_callback()
+
     @callback
     def _cancel_peak_checker(self) -> None:
         """Cancel the peak checker."""
@@ -321,7 +377,10 @@ class WebSocketHandler:
         if TYPE_CHECKING:
             assert writer is not None
 
-        send_bytes_text = partial(writer.send, binary=False)
+        # The compression negotiated for the connection, the compression
+        # of the writer changes with the size of the messages sent
+        compress = writer.compress
+        send_bytes_text = _get_send_bytes(writer, compress, False)
         auth = AuthPhase(
             logger, hass, self._send_message, self._cancel, request, send_bytes_text
         )
@@ -360,7 +419,15 @@ class WebSocketHandler:
             # We only start the writer queue after the auth phase is completed
             # since there is no need to queue messages before the auth phase
             self._connection = connection
-            self._writer_task = create_eager_task(self._writer(send_bytes_text))
+            connection.is_congested = self._is_congested
+            connection.async_call_when_drained = self._async_call_when_drained
+            encoding = connection.encoding
+            self._writer_task = create_eager_task(
+                self._writer(
+                    _get_send_bytes(writer, compress, encoding.binary),
+                    encoding.coalesce,
+                )
+            )
             hass.data[DATA_CONNECTIONS] = hass.data.get(DATA_CONNECTIONS, 0) + 1
             async_dispatcher_send(hass, SIGNAL_WEBSOCKET_CONNECTED)
 
@@ -462,6 +529,7 @@ class WebSocketHandler:
                 connection.async_handle_close()
 
             self._closing = True
+            self._drained_callbacks.clear()
             if self._ready_future and not self._ready_future.done():
                 self._ready_future.set_result(len(self._message_queue))
 
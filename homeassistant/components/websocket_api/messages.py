@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
-from functools import lru_cache
+from collections.abc import Callable, Collection
+from dataclasses import dataclass
+from functools import lru_cache, partial
 import logging
-from typing import Any, Final
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Final
 
+import ormsgpack
 import voluptuous as vol
 
 from homeassistant.const import (
@@ -15,14 +19,14 @@ from homeassistant.const import (
     COMPRESSED_STATE_LAST_UPDATED,
     COMPRESSED_STATE_STATE,
 )
-from homeassistant.core import CompressedState, Event, EventStateChangedData
+from homeassistant.core import CompressedState, Event, EventStateChangedData, State
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.json import (
     JSON_DUMP,
     find_paths_unserializable_data,
     json_bytes,
 )
-from homeassistant.util.json import format_unserializable_data
+from homeassistant.util.json import format_unserializable_data, json_loads
 
 from . import const
 
@@ -43,6 +47,7 @@ STATE_DIFF_REMOVALS = "-"
 ENTITY_EVENT_ADD = "a"
 ENTITY_EVENT_REMOVE = "r"
 ENTITY_EVENT_CHANGE = "c"
+ENTITY_EVENT_TOKEN = "t"
 
 BASE_ERROR_MESSAGE = {
     "type": const.TYPE_RESULT,
@@ -60,6 +65,48 @@ INVALID_JSON_PARTIAL_MESSAGE = json_bytes(
 )
 
 
+# The key of the message id which completes a cached MessagePack message
+_MSGPACK_ID_KEY: Final = b"\xa2id"
+
+
+def _msgpack_encoder_default(obj: Any) -> Any:
+    """Convert Home Assistant objects.
+
+    Hand other objects to the original method.
+    """
+    if hasattr(obj, "as_dict"):
+        return obj.as_dict()
+    if isinstance(obj, set):
+        return list(obj)
+    if isinstance(obj, float):
+        return float(obj)
+    if isinstance(obj, Path):
+        return obj.as_posix()
+    raise TypeError
+
+
+if TYPE_CHECKING:
+
+    def msgpack_bytes(obj: Any) -> bytes:
+        """Dump MessagePack bytes."""
+
+else:
+    msgpack_bytes = partial(
+        ormsgpack.packb,
+        option=ormsgpack.OPT_NON_STR_KEYS,
+        default=_msgpack_encoder_default,
+    )
+    """Dump MessagePack bytes."""
+
+
+def json_to_msgpack_bytes(message: bytes | str) -> bytes:
+    """Convert a message serialized to JSON to MessagePack."""
+    return msgpack_bytes(json_loads(message))
+
+
+INVALID_MSGPACK_PARTIAL_MESSAGE = json_to_msgpack_bytes(INVALID_JSON_PARTIAL_MESSAGE)
+
+
 def result_message(iden: int, result: Any = None) -> dict[str, Any]:
     """Return a success result message."""
     return {"id": iden, "type": const.TYPE_RESULT, "success": True, "result": result}
@@ -177,6 +224,61 @@ def _partial_cached_state_diff_message(event: Event[EventStateChangedData]) -> b
     )
 
 
+def cached_event_msgpack_message(message_id_as_msgpack: bytes, event: Event) -> bytes:
+    """Return an event message serialized to MessagePack.
+
+    Serialize to MessagePack once per message like cached_event_message.
+    """
+    return _partial_cached_event_msgpack_message(event) + message_id_as_msgpack
+
+
+@lru_cache(maxsize=128)
+def _partial_cached_event_msgpack_message(event: Event) -> bytes:
+    """Cache and serialize the event to MessagePack.
+
+    The message is constructed without the value of the id which
+    is appended in cached_event_msgpack_message.
+    """
+    return _partial_msgpack_message({"type": "event", "event": event.as_dict()})
+
+
+def cached_state_diff_msgpack_message(
+    message_id_as_msgpack: bytes, event: Event[EventStateChangedData]
+) -> bytes:
+    """Return a state diff event message serialized to MessagePack.
+
+    Serialize to MessagePack once per message like cached_state_diff_message.
+    """
+    return _partial_cached_state_diff_msgpack_message(event) + message_id_as_msgpack
+
+
+@lru_cache(maxsize=128)
+def _partial_cached_state_diff_msgpack_message(
+    event: Event[EventStateChangedData],
+) -> bytes:
+    """Cache and serialize the state diff event to MessagePack.
+
+    The message is constructed without the value of the id which
+    is appended in cached_state_diff_msgpack_message.
+    """
+    return _partial_msgpack_message(
+        {"type": "event", "event": _state_diff_event(event)}
+    )
+
+
+def _partial_msgpack_message(message: dict[str, Any]) -> bytes:
+    """Serialize a message without an id to MessagePack.
+
+    The message is a map of less than 15 keys which has the number of
+    keys in its first byte. The id is added as last key of the map so
+    appending the serialized value of the id completes the message.
+    """
+    packed = (
+        _message_to_msgpack_bytes_or_none(message) or INVALID_MSGPACK_PARTIAL_MESSAGE
+    )
+    return b"".join((bytes((packed[0] + 1,)), packed[1:], _MSGPACK_ID_KEY))
+
+
 def _state_diff_event(
     event: Event[EventStateChangedData],
 ) -> dict[
@@ -199,6 +301,50 @@ def _state_diff_event(
         return {ENTITY_EVENT_REMOVE: [event.data["entity_id"]]}
     if (old_state := event.data["old_state"]) is None:
         return {ENTITY_EVENT_ADD: {new_state.entity_id: new_state.as_compressed_state}}
+    return {
+        ENTITY_EVENT_CHANGE: {new_state.entity_id: _state_diff(old_state, new_state)}
+    }
+
+
+def resumable_state_diff_event(
+    event: Event[EventStateChangedData], token: str
+) -> dict[str, Any]:
+    """Convert a state_changed event to the minimal version with a resume token."""
+    return {**_state_diff_event(event), ENTITY_EVENT_TOKEN: token}
+
+
+def coalesced_state_diff_event(
+    changes: dict[str, tuple[State | None, State | None]],
+) -> dict[str, Any]:
+    """Convert the changes of multiple entities to the minimal version.
+
+    The changes map entity ids to the state the client knows and the
+    latest state. The intermediate states are never sent to the client
+    so the diff is made against the state the client knows.
+    """
+    added: dict[str, CompressedState] = {}
+    changed: dict[str, dict[str, dict[str, Any]]] = {}
+    removed: list[str] = []
+    for entity_id, (old_state, new_state) in changes.items():
+        if new_state is None:
+            if old_state is not None:
+                removed.append(entity_id)
+        elif old_state is None:
+            added[entity_id] = new_state.as_compressed_state
+        else:
+            changed[entity_id] = _state_diff(old_state, new_state)
+    event: dict[str, Any] = {}
+    if added:
+        event[ENTITY_EVENT_ADD] = added
+    if changed:
+        event[ENTITY_EVENT_CHANGE] = changed
+    if removed:
+        event[ENTITY_EVENT_REMOVE] = removed
+    return event
+
+
+def _state_diff(old_state: State, new_state: State) -> dict[str, dict[str, Any]]:
+    """Return the diff of two states of an entity."""
     additions: dict[str, Any] = {}
     diff: dict[str, dict[str, Any]] = {STATE_DIFF_ADDITIONS: additions}
     new_state_context = new_state.context
@@ -232,7 +378,7 @@ def _state_diff_event(
             # here if there are any values to avoid jumping into the json_encoder_default
             # for every state diff with a removed attribute
             diff[STATE_DIFF_REMOVALS] = {COMPRESSED_STATE_ATTRIBUTES: list(removed)}
-    return {ENTITY_EVENT_CHANGE: {new_state.entity_id: diff}}
+    return diff
 
 
 def _message_to_json_bytes_or_none(message: dict[str, Any]) -> bytes | None:
@@ -256,3 +402,90 @@ def message_to_json_bytes(message: dict[str, Any]) -> bytes:
             message["id"], const.ERR_UNKNOWN_ERROR, "Invalid JSON in response"
         )
     )
+
+
+def _message_to_msgpack_bytes_or_none(message: dict[str, Any]) -> bytes | None:
+    """Serialize a websocket message to MessagePack or return None."""
+    try:
+        return msgpack_bytes(message)
+    except (ValueError, TypeError):
+        # Messages with JSON fragments or objects only the JSON
+        # encoder can serialize are serialized to JSON first
+        if json_message := _message_to_json_bytes_or_none(message):
+            return json_to_msgpack_bytes(json_message)
+    return None
+
+
+def message_to_msgpack_bytes(message: dict[str, Any]) -> bytes:
+    """Serialize a websocket message to MessagePack or return an error."""
+    return _message_to_msgpack_bytes_or_none(message) or msgpack_bytes(
+        error_message(
+            message["id"], const.ERR_UNKNOWN_ERROR, "Invalid JSON in response"
+        )
+    )
+
+
+def _json_message_id(iden: int) -> bytes:
+    """Serialize a message id to json."""
+    return str(iden).encode()
+
+
+def _coalesce_json_messages(messages: Collection[bytes]) -> bytes:
+    """Coalesce messages serialized to json to a json array."""
+    return b"".join((b"[", b",".join(messages), b"]"))
+
+
+def _coalesce_msgpack_messages(messages: Collection[bytes]) -> bytes:
+    """Coalesce messages serialized to MessagePack to an array."""
+    if (count := len(messages)) < 16:
+        header = bytes((0x90 | count,))
+    elif count < 2**16:
+        header = b"\xdc" + count.to_bytes(2)
+    else:
+        header = b"\xdd" + count.to_bytes(4)
+    return header + b"".join(messages)
+
+
+@dataclass(slots=True, frozen=True)
+class MessageEncoding:
+    """Encoding of the messages sent to a client."""
+
+    name: str
+    # Send the messages as binary instead of text websocket messages
+    binary: bool
+    # Serialize a message, raises if the message can not be serialized
+    dumps: Callable[[Any], bytes]
+    # Serialize a message or return an error message
+    message_to_bytes: Callable[[dict[str, Any]], bytes]
+    # Serialize a message id to complete the cached event messages
+    message_id: Callable[[int], bytes]
+    cached_event_message: Callable[[bytes, Event], bytes]
+    cached_state_diff_message: Callable[[bytes, Event[EventStateChangedData]], bytes]
+    coalesce: Callable[[Collection[bytes]], bytes]
+
+
+JSON_ENCODING: Final = MessageEncoding(
+    name=const.ENCODING_JSON,
+    binary=False,
+    dumps=json_bytes,
+    message_to_bytes=message_to_json_bytes,
+    message_id=_json_message_id,
+    cached_event_message=cached_event_message,
+    cached_state_diff_message=cached_state_diff_message,
+    coalesce=_coalesce_json_messages,
+)
+
+MSGPACK_ENCODING: Final = MessageEncoding(
+    name=const.ENCODING_MSGPACK,
+    binary=True,
+    dumps=msgpack_bytes,
+    message_to_bytes=message_to_msgpack_bytes,
+    message_id=msgpack_bytes,
+    cached_event_message=cached_event_msgpack_message,
+    cached_state_diff_message=cached_state_diff_msgpack_message,
+    coalesce=_coalesce_msgpack_messages,
+)
+
+ENCODINGS: Final = {
+    encoding.name: encoding for encoding in (JSON_ENCODING, MSGPACK_ENCODING)
+}
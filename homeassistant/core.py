@@ -15,6 +15,7 @@ from collections.abc import (
     Iterable,
     KeysView,
     Mapping,
+    Sequence,
     ValuesView,
 )
 import concurrent.futures
@@ -110,6 +111,7 @@ from .util.hass_dict import HassDict
 from .util.json import JsonObjectType
 from .util.read_only_dict import ReadOnlyDict
 from .util.timeout import TimeoutManager
+from .util.timer import CoalescedTimerHandle, TimerScheduler
 from .util.ulid import ulid_at_time, ulid_now
 from .util.unit_system import (
     _CONF_UNIT_SYSTEM_IMPERIAL,
@@ -125,6 +127,7 @@ if TYPE_CHECKING:
     from .components.http import ApiConfig, HomeAssistantHTTP
     from .config_entries import ConfigEntries
     from .helpers.entity import StateInfo
+    from .helpers.instrumentation import BusInstrumentation
 
 STOPPING_STAGE_SHUTDOWN_TIMEOUT = 20
 STOP_STAGE_SHUTDOWN_TIMEOUT = 100
@@ -430,6 +433,7 @@ class HomeAssistant:
         # This is a dictionary that any component can store any data on.
         self.data = HassDict()
         self.loop = asyncio.get_running_loop()
+        self.timers = TimerScheduler(self.loop)
         self._tasks: set[asyncio.Future[Any]] = set()
         self._background_tasks: set[asyncio.Future[Any]] = set()
         self.bus = EventBus(self)
@@ -453,6 +457,7 @@ class HomeAssistant:
         self.loop_thread_id = getattr(
             self.loop, "_thread_ident", getattr(self.loop, "_thread_id")
         )
+        self._job_instrumentation: BusInstrumentation | None = None
 
     def verify_event_loop_thread(self, what: str) -> None:
         """Report and raise if we are not running in the event loop thread."""
@@ -940,6 +945,25 @@ class HomeAssistant:
 
         return self._async_add_hass_job(hassjob, *args, background=background)
 
+    @callback
+    def async_set_job_instrumentation(
+        self, instrumentation: BusInstrumentation | None
+    ) -> None:
+        """Set the instrumentation which records the run time of jobs.
+
+        Use homeassistant.helpers.instrumentation instead of calling
+        this method directly.
+
+        This method must be run in the event loop.
+        """
+        self._job_instrumentation = instrumentation
+        # The method is replaced on the instance so running jobs
+        # does not pay for instrumentation while it is disabled
+        if instrumentation is None:
+            self.__dict__.pop("async_run_hass_job", None)
+        else:
+            self.async_run_hass_job = instrumentation.async_run_hass_job  # type: ignore[assignment,method-assign]
+
     @overload
     @callback
     def async_run_job[_R, *_Ts](
@@ -1227,7 +1251,11 @@ class HomeAssistant:
 
     def _cancel_cancellable_timers(self) -> None:
         """Cancel timer handles marked as cancellable."""
-        handles: Iterable[asyncio.TimerHandle] = self.loop._scheduled  # type: ignore[attr-defined] # noqa: SLF001
+        loop_handles: Iterable[asyncio.TimerHandle] = self.loop._scheduled  # type: ignore[attr-defined] # noqa: SLF001
+        handles: Iterable[asyncio.TimerHandle | CoalescedTimerHandle] = (
+            *loop_handles,
+            *self.timers.scheduled(),
+        )
         for handle in handles:
             if (
                 not handle.cancelled()
@@ -1292,6 +1320,15 @@ class Context:
         """Return a ReadOnlyDict representation of the context."""
         return ReadOnlyDict(self._as_dict)
 
+    @cached_property
+    def _expired(self) -> Context:
+        """Return a copy of the context without the origin event.
+
+        The copy is cached so all the states expired with the same
+        context share a single copy.
+        """
+        return Context(self.user_id, self.parent_id, self.id)
+
     @cached_property
     def json_fragment(self) -> json_fragment:
         """Return a JSON fragment of the context."""
@@ -1435,6 +1472,74 @@ class _OneTimeListener(Generic[_DataT]):
 # Empty list, used by EventBus.async_fire_internal
 EMPTY_LIST: list[Any] = []
 
+_KeyedIndexType = tuple[
+    EventType[Any] | str,  # event_type
+    str | Callable[[Any], str | None],  # event_key
+    bool,  # match_all
+]
+
+
+@dataclass(slots=True)
+class _KeyedListeners(Generic[_DataT]):
+    """Listeners for an event type indexed by a key of the event data.
+
+    All listeners of the index share a single listener on the bus
+    which does a dict lookup to route the event instead of running
+    a filter for every listener.
+    """
+
+    bus: EventBus
+    event_key: str | Callable[[_DataT], str | None]
+    jobs: defaultdict[
+        str, list[HassJob[[Event[_DataT]], Coroutine[Any, Any, None] | None]]
+    ]
+    # Listeners with the MATCH_ALL key run for every event with a key
+    match_all: bool = False
+    remove: CALLBACK_TYPE | None = None
+
+    @callback
+    def _async_key(self, event_data: _DataT) -> str | None:
+        """Return the key of the event data."""
+        if isinstance(event_key := self.event_key, str):
+            return event_data.get(event_key)
+        return event_key(event_data)
+
+    @callback
+    def async_filter(self, event_data: _DataT) -> bool:
+        """Filter events by key."""
+        if (key := self._async_key(event_data)) is None:
+            return False
+        return key in self.jobs or (self.match_all and MATCH_ALL in self.jobs)
+
+    @callback
+    def async_dispatch(self, event: Event[_DataT]) -> None:
+        """Dispatch the event to the listeners of its key."""
+        if (key := self._async_key(event.data)) is None:
+            return
+        jobs = self.jobs
+        jobs_list: (
+            list[HassJob[[Event[_DataT]], Coroutine[Any, Any, None] | None]] | None
+        )
+        if self.match_all and MATCH_ALL in jobs:
+            jobs_list = jobs.get(key, EMPTY_LIST) + jobs[MATCH_ALL]
+        elif jobs_list := jobs.get(key):
+            # Copy the list since a listener may remove itself
+            jobs_list = jobs_list.copy()
+        else:
+            return
+        bus = self.bus
+        instrumentation = bus._instrumentation  # noqa: SLF001
+        for job in jobs_list:
+            try:
+                if instrumentation is None:
+                    bus._hass.async_run_hass_job(job, event)  # noqa: SLF001
+                else:
+                    instrumentation.async_run_job(job, event)
+            except Exception:
+                _LOGGER.exception(
+                    "Error while dispatching event for %s to %s", key, job
+                )
+
 
 @functools.lru_cache
 def _verify_event_type_length_or_raise(event_type: EventType[_DataT] | str) -> None:
@@ -1446,16 +1551,29 @@ def _verify_event_type_length_or_raise(event_type: EventType[_DataT] | str) -> N
 class EventBus:
     """Allow the firing of and listening for events."""
 
-    __slots__ = ("_debug", "_hass", "_listeners", "_match_all_listeners")
+    __slots__ = (
+        "_debug",
+        "_hass",
+        "_instrumentation",
+        "_keyed_dispatch_jobs",
+        "_keyed_listeners",
+        "_listeners",
+        "_match_all_listeners",
+    )
 
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize a new event bus."""
         self._listeners: defaultdict[
             EventType[Any] | str, list[_FilterableJobType[Any]]
         ] = defaultdict(list)
+        self._keyed_listeners: dict[_KeyedIndexType, _KeyedListeners[Any]] = {}
+        # The jobs dispatching to keyed listeners are not instrumented
+        # since the keyed listeners they run are instrumented instead.
+        self._keyed_dispatch_jobs: set[HassJob[..., Any]] = set()
         self._match_all_listeners: list[_FilterableJobType[Any]] = []
         self._listeners[MATCH_ALL] = self._match_all_listeners
         self._hass = hass
+        self._instrumentation: BusInstrumentation | None = None
         self._async_logging_changed()
         self.async_listen(EVENT_LOGGING_CHANGED, self._async_logging_changed)
 
@@ -1477,6 +1595,19 @@ class EventBus:
         """Return dictionary with events and the number of listeners."""
         return run_callback_threadsafe(self._hass.loop, self.async_listeners).result()
 
+    @callback
+    def async_set_instrumentation(
+        self, instrumentation: BusInstrumentation | None
+    ) -> None:
+        """Set the instrumentation which records the run time of listeners.
+
+        Use homeassistant.helpers.instrumentation instead of calling
+        this method directly.
+
+        This method must be run in the event loop.
+        """
+        self._instrumentation = instrumentation
+
     def fire(
         self,
         event_type: EventType[_DataT] | str,
@@ -1535,6 +1666,9 @@ class EventBus:
                 "Bus:Handling %s", _event_repr(event_type, origin, event_data)
             )
 
+        if (instrumentation := self._instrumentation) is not None:
+            instrumentation.async_record_event(event_type)
+
         listeners = self._listeners.get(event_type, EMPTY_LIST)
         if event_type not in EVENTS_EXCLUDED_FROM_MATCH_ALL:
             match_all_listeners = self._match_all_listeners
@@ -1561,10 +1695,85 @@ class EventBus:
                 )
 
             try:
-                self._hass.async_run_hass_job(job, event)
+                if instrumentation is None:
+                    self._hass.async_run_hass_job(job, event)
+                else:
+                    instrumentation.async_run_job(
+                        job, event, job not in self._keyed_dispatch_jobs
+                    )
             except Exception:
                 _LOGGER.exception("Error running job: %s", job)
 
+    @callback
+    def async_fire_many_internal(
+        self,
+        event_type: EventType[_DataT] | str,
+        batch: Sequence[tuple[_DataT, Context | None]],
+        origin: EventOrigin = EventOrigin.local,
+        time_fired: float | None = None,
+    ) -> None:
+        """Fire a batch of events of the same type, for internal use only.
+
+        The listeners for the event type are resolved once for the whole
+        batch and each listener is run for all of its matching events
+        before moving on to the next listener.
+
+        This method is intended to only be used by core internally
+        and should not be considered a stable API. We will make
+        breaking changes to this function in the future and it
+        should not be used in integrations.
+
+        This method must be run in the event loop.
+        """
+        if not batch:
+            return
+
+        if self._debug:
+            for event_data, _ in batch:
+                _LOGGER.debug(
+                    "Bus:Handling %s", _event_repr(event_type, origin, event_data)
+                )
+
+        if (instrumentation := self._instrumentation) is not None:
+            for _ in batch:
+                instrumentation.async_record_event(event_type)
+
+        listeners = self._listeners.get(event_type, EMPTY_LIST)
+        if event_type not in EVENTS_EXCLUDED_FROM_MATCH_ALL:
+            match_all_listeners = self._match_all_listeners
+        else:
+            match_all_listeners = EMPTY_LIST
+
+        events: list[Event[_DataT] | None] = [None] * len(batch)
+        for job, event_filter in listeners + match_all_listeners:
+            for idx, (event_data, context) in enumerate(batch):
+                if event_filter is not None:
+                    try:
+                        if not event_filter(event_data):
+                            continue
+                    except Exception:
+                        _LOGGER.exception("Error in event filter")
+                        continue
+
+                if (event := events[idx]) is None:
+                    event = events[idx] = Event(
+                        event_type,
+                        event_data,
+                        origin,
+                        time_fired,
+                        context,
+                    )
+
+                try:
+                    if instrumentation is None:
+                        self._hass.async_run_hass_job(job, event)
+                    else:
+                        instrumentation.async_run_job(
+                            job, event, job not in self._keyed_dispatch_jobs
+                        )
+                except Exception:
+                    _LOGGER.exception("Error running job: %s", job)
+
     def listen(
         self,
         event_type: EventType[_DataT] | str,
@@ -1628,6 +1837,100 @@ class EventBus:
                 )
         return self._async_listen_filterable_job(event_type, filterable_job)
 
+    @callback
+    def async_listen_keyed(
+        self,
+        event_type: EventType[_DataT] | str,
+        event_key: str | Callable[[_DataT], str | None],
+        keys: str | Iterable[str],
+        listener: Callable[[Event[_DataT]], Coroutine[Any, Any, None] | None],
+        job_type: HassJobType | None = None,
+        *,
+        match_all: bool = False,
+    ) -> CALLBACK_TYPE:
+        """Listen for events of a specific type indexed by a key of the event data.
+
+        event_key is either the name of a field of the event data, for
+        example entity_id or device_id, or a callable decorated with
+        @callback which returns the key of the event data or None if the
+        event should not be dispatched.
+
+        The listener runs for events where the key is one of keys. If
+        match_all is set and keys contains MATCH_ALL the listener runs
+        for every event with a key.
+
+        Listeners with the same event_type and event_key share a hash
+        index so dispatching an event is a dict lookup regardless of the
+        number of listeners.
+
+        This method must be run in the event loop.
+        """
+        if not isinstance(event_key, str) and not is_callback_check_partial(event_key):
+            raise HomeAssistantError(f"Event key {event_key} is not a callback")
+
+        index_key = (event_type, event_key, match_all)
+        if (keyed_listeners := self._keyed_listeners.get(index_key)) is None:
+            keyed_listeners = _KeyedListeners(
+                self, event_key, defaultdict(list), match_all
+            )
+            dispatch_job = HassJob(
+                keyed_listeners.async_dispatch,
+                f"keyed listen {event_type} {event_key}",
+                job_type=HassJobType.Callback,
+            )
+            remove_dispatch_job = self._async_listen_filterable_job(
+                event_type, (dispatch_job, keyed_listeners.async_filter)
+            )
+            self._keyed_dispatch_jobs.add(dispatch_job)
+
+            @callback
+            def _async_remove_dispatch_job() -> None:
+                self._keyed_dispatch_jobs.discard(dispatch_job)
+                remove_dispatch_job()
+
+            keyed_listeners.remove = _async_remove_dispatch_job
+            self._keyed_listeners[index_key] = keyed_listeners
+
+        job = HassJob(listener, f"listen {event_type} {keys}", job_type=job_type)
+        jobs = keyed_listeners.jobs
+        if isinstance(keys, str):
+            # Almost all listeners use a single key so we optimize for that
+            # case to avoid creating a tuple for every listener.
+            jobs[keys].append(job)
+            keys = (keys,)
+        else:
+            keys = tuple(keys)
+            for key in keys:
+                jobs[key].append(job)
+
+        return functools.partial(
+            self._async_remove_keyed_listener, index_key, keys, job
+        )
+
+    @callback
+    def _async_remove_keyed_listener(
+        self,
+        index_key: _KeyedIndexType,
+        keys: tuple[str, ...],
+        job: HassJob[[Event[Any]], Coroutine[Any, Any, None] | None],
+    ) -> None:
+        """Remove a keyed listener.
+
+        This method must be run in the event loop.
+        """
+        keyed_listeners = self._keyed_listeners[index_key]
+        jobs = keyed_listeners.jobs
+        for key in keys:
+            jobs[key].remove(job)
+            if not jobs[key]:
+                del jobs[key]
+
+        if not jobs:
+            del self._keyed_listeners[index_key]
+            if TYPE_CHECKING:
+                assert keyed_listeners.remove is not None
+            keyed_listeners.remove()
+
     @callback
     def _async_listen_filterable_job(
         self,
@@ -1765,6 +2068,7 @@ class State:
         validate_entity_id: bool | None = True,
         state_info: StateInfo | None = None,
         last_updated_timestamp: float | None = None,
+        last_changed_timestamp: float | None = None,
     ) -> None:
         """Initialize a new state."""
         state = str(state)
@@ -1786,26 +2090,38 @@ class State:
             self.attributes = ReadOnlyDict(attributes or {})
         else:
             self.attributes = attributes
-        self.last_reported = last_reported or dt_util.utcnow()
-        self.last_updated = last_updated or self.last_reported
-        self.last_changed = last_changed or self.last_updated
         self.context = context or Context()
         self.state_info = state_info
         self.domain, self.object_id = split_entity_id(self.entity_id)
-        # The recorder or the websocket_api will always call the timestamps,
-        # so we will set the timestamp values here to avoid the overhead of
-        # the function call in the property we know will always be called.
-        last_updated = self.last_updated
-        if not last_updated_timestamp:
+        # The timestamps are always stored since the recorder and the
+        # websocket_api will always use them. The datetime objects are
+        # only created when something asks for them as most states are
+        # never examined as datetimes, which keeps old states held by
+        # the history and template caches small.
+        if last_updated_timestamp is None:
+            last_reported = last_reported or dt_util.utcnow()
+            last_updated = last_updated or last_reported
             last_updated_timestamp = last_updated.timestamp()
+        if last_updated is not None:
+            self.__dict__["last_updated"] = last_updated
         self.last_updated_timestamp = last_updated_timestamp
-        if self.last_changed == last_updated:
-            self.__dict__["last_changed_timestamp"] = last_updated_timestamp
         # If last_reported is the same as last_updated async_set will pass
         # the same datetime object for both values so we can use an identity
         # check here.
-        if self.last_reported is last_updated:
-            self.__dict__["last_reported_timestamp"] = last_updated_timestamp
+        if last_reported is None or last_reported is last_updated:
+            self.last_reported_timestamp = last_updated_timestamp
+        else:
+            self.__dict__["last_reported"] = last_reported
+            self.last_reported_timestamp = last_reported.timestamp()
+        if last_changed is None:
+            self.last_changed_timestamp = (
+                last_changed_timestamp or last_updated_timestamp
+            )
+        elif last_changed == last_updated:
+            self.last_changed_timestamp = last_updated_timestamp
+        else:
+            self.__dict__["last_changed"] = last_changed
+            self.last_changed_timestamp = last_changed.timestamp()
 
     @cached_property
     def name(self) -> str:
@@ -1815,14 +2131,23 @@ class State:
         )
 
     @cached_property
-    def last_changed_timestamp(self) -> float:
-        """Timestamp of last change."""
-        return self.last_changed.timestamp()
+    def last_updated(self) -> datetime.datetime:
+        """Last time the state or attributes were changed."""
+        return dt_util.utc_from_timestamp(self.last_updated_timestamp)
+
+    @cached_property
+    def last_changed(self) -> datetime.datetime:
+        """Last time the state was changed."""
+        if self.last_changed_timestamp == self.last_updated_timestamp:
+            return self.last_updated
+        return dt_util.utc_from_timestamp(self.last_changed_timestamp)
 
     @cached_property
-    def last_reported_timestamp(self) -> float:
-        """Timestamp of last report."""
-        return self.last_reported.timestamp()
+    def last_reported(self) -> datetime.datetime:
+        """Last time the state was reported."""
+        if self.last_reported_timestamp == self.last_updated_timestamp:
+            return self.last_updated
+        return dt_util.utc_from_timestamp(self.last_reported_timestamp)
 
     @cached_property
     def _as_dict(self) -> dict[str, Any]:
@@ -1832,11 +2157,11 @@ class State:
         as it will mutate the cached version.
         """
         last_changed_isoformat = self.last_changed.isoformat()
-        if self.last_changed == self.last_updated:
+        if self.last_changed_timestamp == self.last_updated_timestamp:
             last_updated_isoformat = last_changed_isoformat
         else:
             last_updated_isoformat = self.last_updated.isoformat()
-        if self.last_changed == self.last_reported:
+        if self.last_changed_timestamp == self.last_reported_timestamp:
             last_reported_isoformat = last_changed_isoformat
         else:
             last_reported_isoformat = self.last_reported.isoformat()
@@ -1880,10 +2205,22 @@ class State:
             as_dict["context"] = ReadOnlyDict(context)
         return ReadOnlyDict(as_dict)
 
+    @cached_property
+    def attributes_json(self) -> bytes:
+        """Return a JSON string of the attributes.
+
+        The state machine passes the value on to the next state
+        when the attributes do not change so it is only built once
+        for each set of attributes.
+        """
+        return json_bytes(self.attributes)
+
     @cached_property
     def as_dict_json(self) -> bytes:
         """Return a JSON string of the State."""
-        return json_bytes(self._as_dict)
+        return json_bytes(
+            self._as_dict | {"attributes": json_fragment(self.attributes_json)}
+        )
 
     @cached_property
     def json_fragment(self) -> json_fragment:
@@ -1912,7 +2249,7 @@ class State:
             COMPRESSED_STATE_CONTEXT: context,
             COMPRESSED_STATE_LAST_CHANGED: self.last_changed_timestamp,
         }
-        if self.last_changed != self.last_updated:
+        if self.last_changed_timestamp != self.last_updated_timestamp:
             compressed_state[COMPRESSED_STATE_LAST_UPDATED] = (
                 self.last_updated_timestamp
             )
@@ -1926,7 +2263,12 @@ class State:
 
         It is used for sending multiple states in a single message.
         """
-        return json_bytes({self.entity_id: self.as_compressed_state})[1:-1]
+        return json_bytes(
+            {
+                self.entity_id: self.as_compressed_state
+                | {COMPRESSED_STATE_ATTRIBUTES: json_fragment(self.attributes_json)}
+            }
+        )[1:-1]
 
     @classmethod
     def from_dict(cls, json_dict: dict[str, Any]) -> Self | None:
@@ -1978,9 +2320,17 @@ class State:
         since it can never be garbage collected as each event would
         reference the previous one.
         """
-        self.context = Context(
-            self.context.user_id, self.context.parent_id, self.context.id
-        )
+        self.context = self.context._expired  # noqa: SLF001
+
+    def async_report(self, timestamp: float) -> datetime.datetime:
+        """Mark the state as reported and return the previous last_reported.
+
+        This method must be run in the event loop.
+        """
+        old_last_reported = self.last_reported
+        self.last_reported_timestamp = timestamp
+        self.__dict__.pop("last_reported", None)
+        return old_last_reported
 
     def __repr__(self) -> str:
         """Return the representation of the states."""
@@ -2284,33 +2634,21 @@ class StateMachine:
             old_state = None
             same_state = False
             same_attr = False
-            last_changed = None
+            last_changed_timestamp = None
         else:
             same_state = old_state.state == new_state and not force_update
-            same_attr = old_state.attributes == attributes
-            last_changed = old_state.last_changed if same_state else None
-
-        # It is much faster to convert a timestamp to a utc datetime object
-        # than converting a utc datetime object to a timestamp since cpython
-        # does not have a fast path for handling the UTC timezone and has to do
-        # multiple local timezone conversions.
-        #
-        # from_timestamp implementation:
-        # https://github.com/python/cpython/blob/c90a862cdcf55dc1753c6466e5fa4a467a13ae24/Modules/_datetimemodule.c#L2936
-        #
-        # timestamp implementation:
-        # https://github.com/python/cpython/blob/c90a862cdcf55dc1753c6466e5fa4a467a13ae24/Modules/_datetimemodule.c#L6387
-        # https://github.com/python/cpython/blob/c90a862cdcf55dc1753c6466e5fa4a467a13ae24/Modules/_datetimemodule.c#L6323
-        now = dt_util.utc_from_timestamp(timestamp)
+            old_attributes = old_state.attributes
+            same_attr = old_attributes is attributes or old_attributes == attributes
+            last_changed_timestamp = (
+                old_state.last_changed_timestamp if same_state else None
+            )
 
         if context is None:
             context = Context(id=ulid_at_time(timestamp))
 
         if same_state and same_attr:
             # mypy does not understand this is only possible if old_state is not None
-            old_last_reported = old_state.last_reported  # type: ignore[union-attr]
-            old_state.last_reported = now  # type: ignore[union-attr]
-            old_state.last_reported_timestamp = timestamp  # type: ignore[union-attr]
+            old_last_reported = old_state.async_report(timestamp)  # type: ignore[union-attr]
             # Avoid creating an EventStateReportedData
             self._bus.async_fire_internal(  # type: ignore[misc]
                 EVENT_STATE_REPORTED,
@@ -2324,10 +2662,12 @@ class StateMachine:
             )
             return
 
+        attributes_json: bytes | None = None
         if same_attr:
             if TYPE_CHECKING:
                 assert old_state is not None
             attributes = old_state.attributes
+            attributes_json = old_state.__dict__.get("attributes_json")
 
         # This is intentionally called with positional only arguments for performance
         # reasons
@@ -2335,14 +2675,19 @@ class StateMachine:
             entity_id,
             new_state,
             attributes,
-            last_changed,
-            now,
-            now,
+            None,
+            None,
+            None,
             context,
             old_state is None,
             state_info,
             timestamp,
+            last_changed_timestamp,
         )
+        if attributes_json is not None:
+            # The attributes are shared with the old state
+            # so the JSON of the attributes can be shared as well.
+            state.__dict__["attributes_json"] = attributes_json
         if old_state is not None:
             old_state.expire()
         self._states[entity_id] = state
@@ -2358,6 +2703,168 @@ class StateMachine:
             time_fired=timestamp,
         )
 
+    @callback
+    def async_set_many(
+        self,
+        states: Iterable[tuple[str, str, Mapping[str, Any] | None]],
+        force_update: bool = False,
+        context: Context | None = None,
+        timestamp: float | None = None,
+    ) -> None:
+        """Set the state of multiple entities, add entities if they do not exist.
+
+        states is an iterable of (entity_id, state, attributes) tuples.
+
+        All states are written to the state machine before any
+        EVENT_STATE_CHANGED or EVENT_STATE_REPORTED event is fired,
+        and if any of the states is invalid none of them are written.
+
+        This method must be run in the event loop.
+        """
+        self.async_set_many_internal(
+            [
+                (
+                    entity_id.lower(),
+                    str(new_state),
+                    attributes or {},
+                    force_update,
+                    context,
+                    None,
+                )
+                for entity_id, new_state, attributes in states
+            ],
+            timestamp or time.time(),
+        )
+
+    @callback
+    def async_set_many_internal(
+        self,
+        states: Sequence[
+            tuple[
+                str,
+                str,
+                Mapping[str, Any] | None,
+                bool,
+                Context | None,
+                StateInfo | None,
+            ]
+        ],
+        timestamp: float,
+    ) -> None:
+        """Set the state of multiple entities, add entities if they do not exist.
+
+        states is a sequence of
+        (entity_id, state, attributes, force_update, context, state_info)
+        tuples which follow the same rules as the arguments of
+        async_set_internal.
+
+        This method is intended to only be used by core internally
+        and should not be considered a stable API. We will make
+        breaking changes to this function in the future and it
+        should not be used in integrations.
+
+        This method must be run in the event loop.
+        """
+        states_data = self._states_data
+        # The new states are created before anything is written to the
+        # state machine so an invalid state does not leave the batch
+        # partially applied. An entity_id may appear more than once in a
+        # batch in which case each write is applied on top of the previous.
+        staged: dict[str, State] = {}
+        pending: list[tuple[str, State | None, State | None, Context]] = []
+        for (
+            entity_id,
+            new_state,
+            attributes,
+            force_update,
+            context,
+            state_info,
+        ) in states:
+            if context is None:
+                # Each write has its own context, the entities of a
+                # batch are not caused by each other
+                context = Context(id=ulid_at_time(timestamp))
+            old_state = staged.get(entity_id) or states_data.get(entity_id)
+            if old_state is None:
+                same_state = False
+                same_attr = False
+                last_changed_timestamp = None
+            else:
+                same_state = old_state.state == new_state and not force_update
+                old_attributes = old_state.attributes
+                same_attr = old_attributes is attributes or old_attributes == attributes
+                last_changed_timestamp = (
+                    old_state.last_changed_timestamp if same_state else None
+                )
+
+            if same_state and same_attr:
+                pending.append((entity_id, old_state, None, context))
+                continue
+
+            attributes_json: bytes | None = None
+            if same_attr:
+                if TYPE_CHECKING:
+                    assert old_state is not None
+                attributes = old_state.attributes
+                attributes_json = old_state.__dict__.get("attributes_json")
+
+            state = State(
+                entity_id,
+                new_state,
+                attributes,
+                None,
+                None,
+                None,
+                context,
+                old_state is None,
+                state_info,
+                timestamp,
+                last_changed_timestamp,
+            )
+            if attributes_json is not None:
+                state.__dict__["attributes_json"] = attributes_json
+            staged[entity_id] = state
+            pending.append((entity_id, old_state, state, context))
+
+        changed: list[tuple[EventStateChangedData, Context | None]] = []
+        reported: list[tuple[EventStateReportedData, Context | None]] = []
+        for entity_id, old_state, staged_state, context in pending:
+            if staged_state is None:
+                if TYPE_CHECKING:
+                    assert old_state is not None
+                old_last_reported = old_state.async_report(timestamp)
+                reported.append(
+                    (
+                        {
+                            "entity_id": entity_id,
+                            "old_last_reported": old_last_reported,
+                            "new_state": old_state,
+                        },
+                        context,
+                    )
+                )
+                continue
+            if old_state is not None:
+                old_state.expire()
+            self._states[entity_id] = staged_state
+            changed.append(
+                (
+                    {
+                        "entity_id": entity_id,
+                        "old_state": old_state,
+                        "new_state": staged_state,
+                    },
+                    context,
+                )
+            )
+
+        self._bus.async_fire_many_internal(
+            EVENT_STATE_CHANGED, changed, time_fired=timestamp
+        )
+        self._bus.async_fire_many_internal(
+            EVENT_STATE_REPORTED, reported, time_fired=timestamp
+        )
+
 
 class SupportsResponse(enum.StrEnum):
     """Service call response configuration."""
@@ -2797,6 +3304,19 @@ class ServiceRegistry:
     ) -> ServiceResponse:
         """Execute a service."""
         job = handler.job
+        if (instrumentation := self._hass._job_instrumentation) is None:  # noqa: SLF001
+            return await self._execute_service_job(job, service_call)
+        # Service handlers are timed until they return their response
+        start = time.perf_counter()
+        try:
+            return await self._execute_service_job(job, service_call)
+        finally:
+            instrumentation.async_record_job(job, time.perf_counter() - start)
+
+    async def _execute_service_job(
+        self, job: HassJob[[ServiceCall], Any], service_call: ServiceCall
+    ) -> ServiceResponse:
+        """Run the job of a service handler."""
         target = job.target
         if job.job_type is HassJobType.Coroutinefunction:
             if TYPE_CHECKING:
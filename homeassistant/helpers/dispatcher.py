@@ -244,7 +244,10 @@ def async_dispatcher_send_internal[*_Ts](
         # than the actual callback takes to run in many cases.
         if job.job_type is HassJobType.Callback:
             try:
-                job.target(*args)
+                if (instrumentation := hass._job_instrumentation) is None:  # noqa: SLF001
+                    job.target(*args)
+                else:
+                    instrumentation.async_run_hass_job(job, *args)
             except Exception:  # noqa: BLE001
                 log_exception(partial(_format_err, signal, target), *args)  # type: ignore[arg-type]
         else:
@@ -48,6 +48,7 @@ from homeassistant.core import (
     callback,
     get_hassjob_callable_job_type,
     get_release_channel,
+    validate_state,
 )
 from homeassistant.exceptions import (
     HomeAssistantError,
@@ -196,6 +197,45 @@ def get_unit_of_measurement(hass: HomeAssistant, entity_id: str) -> str | None:
     return entry.unit_of_measurement
 
 
+@callback
+def async_write_ha_states(hass: HomeAssistant, entities: Iterable[Entity]) -> None:
+    """Write the state of multiple entities to the state machine.
+
+    The states are written as a single batch, all states are in the
+    state machine before the state changed events are fired and each
+    listener handles the events of the batch in one go.
+
+    This method must be run in the event loop.
+    """
+    if hass.loop_thread_id != threading.get_ident():
+        report_non_thread_safe_operation("async_write_ha_states")
+
+    states: list[
+        tuple[str, str, dict[str, Any], bool, Context | None, StateInfo | None]
+    ] = []
+    timestamp: float | None = None
+    for entity in entities:
+        if not entity.hass or not entity._verified_state_writable:  # noqa: SLF001
+            entity._async_verify_state_writable()  # noqa: SLF001
+        if (state_write := entity._async_prepare_state_write()) is None:  # noqa: SLF001
+            continue
+        entity_id, state, attr, force_update, context, state_info, timestamp = (
+            state_write
+        )
+        try:
+            validate_state(state)
+        except InvalidStateError:
+            _LOGGER.exception(
+                "Failed to set state for %s, fall back to %s", entity_id, STATE_UNKNOWN
+            )
+            state = STATE_UNKNOWN
+            attr = {}
+        states.append((entity_id, state, attr, force_update, context, state_info))
+
+    if timestamp is not None:
+        hass.states.async_set_many_internal(states, timestamp)
+
+
 ENTITY_CATEGORIES_SCHEMA: Final = vol.Coerce(EntityCategory)
 
 
@@ -1105,9 +1145,43 @@ class Entity(
     @callback
     def _async_write_ha_state(self) -> None:
         """Write the state to the state machine."""
+        if (state_write := self._async_prepare_state_write()) is None:
+            return
+
+        try:
+            self.hass.states.async_set_internal(*state_write)
+        except InvalidStateError:
+            entity_id = self.entity_id
+            _LOGGER.exception(
+                "Failed to set state for %s, fall back to %s", entity_id, STATE_UNKNOWN
+            )
+            self.hass.states.async_set(
+                entity_id, STATE_UNKNOWN, {}, self.force_update, self._context
+            )
+
+    @callback
+    def _async_prepare_state_write(
+        self,
+    ) -> (
+        tuple[
+            str,
+            str,
+            dict[str, Any],
+            bool,
+            Context | None,
+            StateInfo | None,
+            float,
+        ]
+        | None
+    ):
+        """Calculate the state write for the state machine.
+
+        Returns the arguments for StateMachine.async_set_internal or
+        None if the state should not be written.
+        """
         if self._platform_state is EntityPlatformState.REMOVED:
             # Polling returned after the entity has already been removed
-            return
+            return None
 
         hass = self.hass
         entity_id = self.entity_id
@@ -1123,7 +1197,7 @@ class Entity(
                     entity_id,
                     self.platform.platform_name,
                 )
-            return
+            return None
 
         state_calculate_start = timer()
         state, attr, capabilities, original_device_class, supported_features = (
@@ -1205,23 +1279,15 @@ class Entity(
             self._context = None
             self._context_set = None
 
-        try:
-            hass.states.async_set_internal(
-                entity_id,
-                state,
-                attr,
-                self.force_update,
-                self._context,
-                self._state_info,
-                time_now,
-            )
-        except InvalidStateError:
-            _LOGGER.exception(
-                "Failed to set state for %s, fall back to %s", entity_id, STATE_UNKNOWN
-            )
-            hass.states.async_set(
-                entity_id, STATE_UNKNOWN, {}, self.force_update, self._context
-            )
+        return (
+            entity_id,
+            state,
+            attr,
+            self.force_update,
+            self._context,
+            self._state_info,
+            time_now,
+        )
 
     def schedule_update_ha_state(self, force_refresh: bool = False) -> None:
         """Schedule an update ha state change task.
@@ -47,6 +47,7 @@ from . import (
     service,
     translation,
 )
+from .entity import async_write_ha_states
 from .entity_registry import EntityRegistry, RegistryEntryDisabler, RegistryEntryHider
 from .event import async_call_later
 from .issue_registry import IssueSeverity, async_create_issue
@@ -958,6 +959,14 @@ class EntityPlatform:
         await self.async_reset()
         self.hass.data[DATA_ENTITY_PLATFORM][self.platform_name].remove(self)
 
+    @callback
+    def async_write_ha_states(self, entities: Iterable[Entity]) -> None:
+        """Write the state of multiple entities of this platform in one batch.
+
+        This method must be run in the event loop.
+        """
+        async_write_ha_states(self.hass, entities)
+
     async def async_remove_entity(self, entity_id: str) -> None:
         """Remove entity id from platform."""
         await self.entities[entity_id].async_remove()
@@ -0,0 +1,313 @@
+"""Opt-in instrumentation of event bus listeners and jobs.
+
+While enabled, the run time of every event bus listener is recorded per
+listener and event type. The run time of the other jobs run with
+HomeAssistant.async_run_hass_job, like timer callbacks, and of dispatcher
+signal targets and service handlers is recorded per job. The run time of a
+job includes the jobs it runs itself. Service handlers are timed until they
+return their response.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from bisect import bisect_left
+from collections.abc import Callable, Coroutine, Iterable
+from dataclasses import dataclass, field
+from functools import partial
+import inspect
+import time
+from typing import Any, Final
+from weakref import WeakKeyDictionary
+
+from homeassistant.core import Event, HassJob, HassJobType, HomeAssistant, callback
+from homeassistant.util.event_type import EventType
+from homeassistant.util.hass_dict import HassKey
+
+DATA_INSTRUMENTATION: HassKey[BusInstrumentation] = HassKey("bus_instrumentation")
+
+# Upper bounds in seconds of the run time histogram buckets,
+# run times above the last bound go in an overflow bucket.
+RUN_TIME_BUCKETS: Final = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+)
+
+DEFAULT_LISTENER_LIMIT: Final = 50
+
+
+@dataclass(slots=True)
+class ListenerStats:
+    """Run time statistics of an event listener."""
+
+    name: str
+    integration: str
+    event_type: EventType[Any] | str | None
+    calls: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+    histogram: list[int] = field(
+        default_factory=lambda: [0] * (len(RUN_TIME_BUCKETS) + 1)
+    )
+
+    def record(self, run_time: float) -> None:
+        """Record a run of the listener."""
+        self.calls += 1
+        self.total_time += run_time
+        if run_time > self.max_time:
+            self.max_time = run_time
+        self.histogram[bisect_left(RUN_TIME_BUCKETS, run_time)] += 1
+
+    def percentile(self, percentile: float) -> float:
+        """Return an estimate of the run time percentile.
+
+        The estimate is the upper bound of the histogram bucket
+        the percentile falls in, capped at the maximum run time.
+        """
+        if not self.calls:
+            return 0.0
+        threshold = self.calls * percentile / 100
+        seen = 0
+        for idx, count in enumerate(self.histogram[:-1]):
+            seen += count
+            if count and seen >= threshold:
+                return min(RUN_TIME_BUCKETS[idx], self.max_time)
+        return self.max_time
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a dict representation of the statistics."""
+        return {
+            "listener": self.name,
+            "integration": self.integration,
+            **({} if self.event_type is None else {"event_type": self.event_type}),
+            "calls": self.calls,
+            "total_time": self.total_time,
+            "mean_time": self.total_time / self.calls if self.calls else 0.0,
+            "p99_time": self.percentile(99),
+            "max_time": self.max_time,
+            "histogram": self.histogram,
+        }
+
+
+@dataclass(slots=True)
+class EventTypeStats:
+    """Fan-out statistics of an event type."""
+
+    events: int = 0
+    listener_calls: int = 0
+    total_time: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a dict representation of the statistics."""
+        return {
+            "events": self.events,
+            "listener_calls": self.listener_calls,
+            "fan_out": self.listener_calls / self.events if self.events else 0.0,
+            "total_time": self.total_time,
+        }
+
+
+def _unwrap_target(target: Callable[..., Any]) -> Callable[..., Any]:
+    """Return the function wrapped by partials and one time listeners."""
+    while True:
+        if isinstance(target, partial):
+            target = target.func
+        elif (listener_job := getattr(target, "listener_job", None)) is not None:
+            target = listener_job.target
+        else:
+            return target
+
+
+def _describe_target(target: Callable[..., Any]) -> tuple[str, str]:
+    """Return the name and integration of a listener target."""
+    target = _unwrap_target(target)
+    module = getattr(target, "__module__", None) or (
+        module_obj.__name__
+        if (module_obj := inspect.getmodule(target)) is not None
+        else ""
+    )
+    qualname = getattr(target, "__qualname__", None) or type(target).__qualname__
+    parts = module.split(".")
+    if len(parts) > 2 and parts[:2] == ["homeassistant", "components"]:
+        integration = parts[2]
+    elif len(parts) > 1 and parts[0] == "custom_components":
+        integration = parts[1]
+    else:
+        integration = "homeassistant"
+    return f"{module}.{qualname}" if module else qualname, integration
+
+
+class BusInstrumentation:
+    """Collect run time statistics of the event bus listeners and jobs."""
+
+    __slots__ = (
+        "_hass",
+        "_job_stats",
+        "_listener_stats",
+        "event_types",
+        "jobs",
+        "listeners",
+        "started",
+    )
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the instrumentation."""
+        self._hass = hass
+        self.started = time.time()
+        # The statistics are keyed by the name of the listener or job so
+        # they do not keep removed listeners and finished jobs alive
+        self.listeners: dict[tuple[str, EventType[Any] | str], ListenerStats] = {}
+        self.jobs: dict[str, ListenerStats] = {}
+        self.event_types: dict[EventType[Any] | str, EventTypeStats] = {}
+        # Avoid describing the target of a job on every run
+        self._listener_stats: WeakKeyDictionary[HassJob[..., Any], ListenerStats] = (
+            WeakKeyDictionary()
+        )
+        self._job_stats: WeakKeyDictionary[HassJob[..., Any], ListenerStats] = (
+            WeakKeyDictionary()
+        )
+
+    @callback
+    def async_record_event(self, event_type: EventType[Any] | str) -> None:
+        """Record an event being fired."""
+        if (event_type_stats := self.event_types.get(event_type)) is None:
+            event_type_stats = self.event_types[event_type] = EventTypeStats()
+        event_type_stats.events += 1
+
+    def _async_run(
+        self, job: HassJob[..., Any], args: tuple[Any, ...], background: bool
+    ) -> asyncio.Future[Any] | None:
+        """Run a job without recording it as a job."""
+        if job.job_type is HassJobType.Callback:
+            job.target(*args)
+            return None
+        return self._hass._async_add_hass_job(  # noqa: SLF001
+            job, *args, background=background
+        )
+
+    @callback
+    def async_run_job(
+        self,
+        job: HassJob[[Event[Any]], Coroutine[Any, Any, None] | None],
+        event: Event[Any],
+        record: bool = True,
+    ) -> None:
+        """Run a listener job and record its run time.
+
+        For coroutine functions the run time covers the part of the
+        coroutine that runs eagerly until it is suspended. Listeners
+        which only dispatch to other listeners are not recorded.
+        """
+        if not record:
+            self._async_run(job, (event,), False)
+            return
+        start = time.perf_counter()
+        try:
+            self._async_run(job, (event,), False)
+        finally:
+            run_time = time.perf_counter() - start
+            if (listener_stats := self._listener_stats.get(job)) is None:
+                name, integration = _describe_target(job.target)
+                key = (name, event.event_type)
+                if (listener_stats := self.listeners.get(key)) is None:
+                    listener_stats = self.listeners[key] = ListenerStats(
+                        name, integration, event.event_type
+                    )
+                self._listener_stats[job] = listener_stats
+            listener_stats.record(run_time)
+            if (event_type_stats := self.event_types.get(event.event_type)) is None:
+                event_type_stats = self.event_types[event.event_type] = EventTypeStats()
+            event_type_stats.listener_calls += 1
+            event_type_stats.total_time += run_time
+
+    @callback
+    def async_run_hass_job(
+        self, job: HassJob[..., Any], *args: Any, background: bool = False
+    ) -> asyncio.Future[Any] | None:
+        """Run a job and record its run time.
+
+        For coroutine functions the run time covers the part of the
+        coroutine that runs eagerly until it is suspended, for executor
+        jobs it only covers scheduling the job.
+        """
+        start = time.perf_counter()
+        try:
+            return self._async_run(job, args, background)
+        finally:
+            self.async_record_job(job, time.perf_counter() - start)
+
+    @callback
+    def async_record_job(self, job: HassJob[..., Any], run_time: float) -> None:
+        """Record the run time of a job."""
+        if (job_stats := self._job_stats.get(job)) is None:
+            name, integration = _describe_target(job.target)
+            if (job_stats := self.jobs.get(name)) is None:
+                job_stats = self.jobs[name] = ListenerStats(name, integration, None)
+            self._job_stats[job] = job_stats
+        job_stats.record(run_time)
+
+    @callback
+    def async_as_dict(self, limit: int = DEFAULT_LISTENER_LIMIT) -> dict[str, Any]:
+        """Return the statistics with the listeners and jobs sorted by total run time."""
+        return {
+            "started": self.started,
+            "duration": time.time() - self.started,
+            "run_time_buckets": RUN_TIME_BUCKETS,
+            "listeners": _slowest(self.listeners.values(), limit),
+            "jobs": _slowest(self.jobs.values(), limit),
+            "event_types": {
+                event_type: event_type_stats.as_dict()
+                for event_type, event_type_stats in self.event_types.items()
+            },
+        }
+
+
+def _slowest(stats: Iterable[ListenerStats], limit: int) -> list[dict[str, Any]]:
+    """Return the statistics with the longest total run time."""
+    return [
+        listener_stats.as_dict()
+        for listener_stats in sorted(
+            stats, key=lambda listener_stats: listener_stats.total_time, reverse=True
+        )[:limit]
+    ]
+
+
+@callback
+def async_get(hass: HomeAssistant) -> BusInstrumentation | None:
+    """Return the active event bus instrumentation."""
+    return hass.data.get(DATA_INSTRUMENTATION)
+
+
+@callback
+def async_enable(hass: HomeAssistant) -> BusInstrumentation:
+    """Enable instrumentation of the event bus listeners and jobs.
+
+    If the instrumentation is already enabled the existing
+    statistics are kept.
+    """
+    if (instrumentation := hass.data.get(DATA_INSTRUMENTATION)) is None:
+        instrumentation = hass.data[DATA_INSTRUMENTATION] = BusInstrumentation(hass)
+        hass.bus.async_set_instrumentation(instrumentation)
+        hass.async_set_job_instrumentation(instrumentation)
+    return instrumentation
+
+
+@callback
+def async_disable(hass: HomeAssistant) -> None:
+    """Disable instrumentation of the event bus listeners and jobs."""
+    if hass.data.pop(DATA_INSTRUMENTATION, None) is not None:
+        hass.bus.async_set_instrumentation(None)
+        hass.async_set_job_instrumentation(None)
@@ -0,0 +1,199 @@
+"""Detect stalls of the event loop and report what was running."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from types import FrameType
+from typing import Final
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import (
+    DOMAIN as HOMEASSISTANT_DOMAIN,
+    Event,
+    HomeAssistant,
+    callback,
+)
+from homeassistant.util.hass_dict import HassKey
+
+from . import issue_registry as ir
+from .frame import IntegrationFrame, MissingIntegrationFrame, get_integration_frame
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_LOOP_WATCHDOG: HassKey[LoopWatchdog] = HassKey("loop_watchdog")
+
+DEFAULT_THRESHOLD: Final = 0.5
+
+# A stall at the same location is only logged as a warning
+# once per interval, later stalls are logged at debug level.
+REPORT_INTERVAL: Final = 3600
+
+
+class LoopWatchdog:
+    """Watch the event loop from a separate thread.
+
+    The event loop updates a heartbeat at a fixed interval. When the
+    watchdog thread sees the heartbeat is late by more than the threshold,
+    the loop is stalled by a callback that has not returned, and the stack
+    of the event loop thread is captured to find out what it is running.
+    """
+
+    def __init__(self, hass: HomeAssistant, threshold: float) -> None:
+        """Initialize the watchdog."""
+        self.hass = hass
+        self.threshold = threshold
+        self.stalls = 0
+        self._interval = threshold / 4
+        self._loop_thread_id: int | None = None
+        self._last_beat = 0.0
+        self._beat_handle: asyncio.TimerHandle | None = None
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._reported: dict[tuple[str | None, str, int], float] = {}
+
+    @callback
+    def async_start(self) -> None:
+        """Start watching the event loop."""
+        self._loop_thread_id = threading.get_ident()
+        self._async_beat()
+        self._thread = threading.Thread(
+            target=self._run, name="LoopWatchdog", daemon=True
+        )
+        self._thread.start()
+
+    async def async_stop(self) -> None:
+        """Stop watching the event loop and wait for the thread to finish."""
+        self._stop_event.set()
+        if self._beat_handle is not None:
+            self._beat_handle.cancel()
+            self._beat_handle = None
+        if (thread := self._thread) is not None:
+            self._thread = None
+            await self.hass.async_add_executor_job(thread.join)
+
+    @callback
+    def _async_beat(self) -> None:
+        """Update the heartbeat of the event loop."""
+        self._last_beat = time.monotonic()
+        self._beat_handle = self.hass.loop.call_later(self._interval, self._async_beat)
+
+    def _run(self) -> None:
+        """Check the heartbeat until stopped."""
+        loop_thread_id = self._loop_thread_id
+        assert loop_thread_id is not None
+        reported_beat = 0.0
+        while not self._stop_event.wait(self._interval):
+            last_beat = self._last_beat
+            if last_beat == reported_beat:
+                # Already reported this stall
+                continue
+            # The next heartbeat is due one interval after the last one
+            stalled_for = time.monotonic() - last_beat - self._interval
+            if stalled_for < self.threshold:
+                continue
+            reported_beat = last_beat
+            if (frame := sys._current_frames().get(loop_thread_id)) is None:  # noqa: SLF001
+                continue
+            self._report_stall(stalled_for, frame)
+
+    def _report_stall(self, stalled_for: float, frame: FrameType) -> None:
+        """Report a stall of the event loop from the watchdog thread."""
+        self.stalls += 1
+        integration_frame: IntegrationFrame | None
+        try:
+            integration_frame = get_integration_frame(frame=frame)
+        except MissingIntegrationFrame:
+            integration_frame = None
+
+        filename = frame.f_code.co_filename
+        lineno = frame.f_lineno
+        if integration_frame is not None:
+            integration: str | None = integration_frame.integration
+            location = (
+                f"{integration_frame.relative_filename}, "
+                f"line {integration_frame.line_number}: {integration_frame.line}"
+            )
+            report_key = (
+                integration,
+                integration_frame.filename,
+                integration_frame.line_number,
+            )
+        else:
+            integration = None
+            location = f"{filename}, line {lineno}"
+            report_key = (None, filename, lineno)
+
+        now = time.monotonic()
+        if (reported := self._reported.get(report_key)) is not None and (
+            now - reported < REPORT_INTERVAL
+        ):
+            level = logging.DEBUG
+        else:
+            self._reported[report_key] = now
+            level = logging.WARNING
+
+        _LOGGER.log(
+            level,
+            "Detected that %s is blocking the event loop for at least %.3f "
+            "seconds at %s\n%s",
+            f"integration '{integration}'" if integration else "Home Assistant",
+            stalled_for,
+            location,
+            "".join(traceback.format_stack(frame)).strip(),
+        )
+        if integration is not None and level == logging.WARNING:
+            self.hass.loop.call_soon_threadsafe(
+                self._async_create_issue, integration, stalled_for, location
+            )
+
+    @callback
+    def _async_create_issue(
+        self, integration: str, stalled_for: float, location: str
+    ) -> None:
+        """Create a repair issue for an integration stalling the event loop."""
+        ir.async_create_issue(
+            self.hass,
+            HOMEASSISTANT_DOMAIN,
+            f"event_loop_stall_{integration}",
+            is_fixable=False,
+            issue_domain=integration,
+            severity=ir.IssueSeverity.WARNING,
+            translation_key="event_loop_stall",
+            translation_placeholders={
+                "integration": integration,
+                "duration": f"{stalled_for:.3f}",
+                "location": location,
+            },
+        )
+
+
+@callback
+def async_start(
+    hass: HomeAssistant, threshold: float = DEFAULT_THRESHOLD
+) -> LoopWatchdog:
+    """Start the event loop watchdog.
+
+    The watchdog is stopped when Home Assistant closes.
+    """
+    if (watchdog := hass.data.get(DATA_LOOP_WATCHDOG)) is not None:
+        return watchdog
+    watchdog = hass.data[DATA_LOOP_WATCHDOG] = LoopWatchdog(hass, threshold)
+    watchdog.async_start()
+
+    async def _async_stop(_: Event) -> None:
+        """Stop the watchdog."""
+        await async_stop(hass)
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_stop)
+    return watchdog
+
+
+async def async_stop(hass: HomeAssistant) -> None:
+    """Stop the event loop watchdog."""
+    if (watchdog := hass.data.pop(DATA_LOOP_WATCHDOG, None)) is not None:
+        await watchdog.async_stop()
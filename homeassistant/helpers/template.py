@@ -373,6 +373,7 @@ class RenderInfo:
         "entities",
         "rate_limit",
         "has_time",
+        "state_values_only",
     )
 
     def __init__(self, template: Template) -> None:
@@ -391,6 +392,9 @@ class RenderInfo:
         self.entities: collections.abc.Set[str] = set()
         self.rate_limit: float | None = None
         self.has_time = False
+        # Set to False once the template reads anything from a state
+        # other than the state value, like attributes or timestamps
+        self.state_values_only = True
 
     def __repr__(self) -> str:
         """Representation of RenderInfo."""
@@ -403,6 +407,7 @@ class RenderInfo:
             f" entities={self.entities}"
             f" rate_limit={self.rate_limit}"
             f" has_time={self.has_time}"
+            f" state_values_only={self.state_values_only}"
             f" exception={self.exception}"
             f" is_static={self.is_static}"
             ">"
@@ -457,6 +462,8 @@ class RenderInfo:
                 self.rate_limit = DOMAIN_STATES_RATE_LIMIT
 
         if self.exception:
+            # The render may have stopped before reading everything it needs
+            self.state_values_only = False
             return
 
         if not self.all_states_lifecycle:
@@ -1004,6 +1011,12 @@ class TemplateStateBase(State):
         self._entity_id = entity_id
 
     def _collect_state(self) -> None:
+        if render_info := _render_info.get():
+            render_info.state_values_only = False
+            if self._collect:
+                render_info.entities.add(self._entity_id)  # type: ignore[attr-defined]
+
+    def _collect_state_value(self) -> None:
         if self._collect and (render_info := _render_info.get()):
             render_info.entities.add(self._entity_id)  # type: ignore[attr-defined]
 
@@ -1013,8 +1026,11 @@ class TemplateStateBase(State):
         """Return a property as an attribute for jinja."""
         if item in _COLLECTABLE_STATE_ATTRIBUTES:
             # _collect_state inlined here for performance
-            if self._collect and (render_info := _render_info.get()):
-                render_info.entities.add(self._entity_id)  # type: ignore[attr-defined]
+            if render_info := _render_info.get():
+                if item != "state":
+                    render_info.state_values_only = False
+                if self._collect:
+                    render_info.entities.add(self._entity_id)  # type: ignore[attr-defined]
             return getattr(self._state, item)
         if item == "entity_id":
             return self._entity_id
@@ -1033,7 +1049,7 @@ class TemplateStateBase(State):
     @property
     def state(self) -> str:  # type: ignore[override]
         """Wrap State.state."""
-        self._collect_state()
+        self._collect_state_value()
         return self._state.state
 
     @property
@@ -1043,19 +1059,25 @@ class TemplateStateBase(State):
         return self._state.attributes
 
     @property
-    def last_changed(self) -> datetime:  # type: ignore[override]
+    def attributes_json(self) -> bytes:
+        """Wrap State.attributes_json."""
+        self._collect_state()
+        return self._state.attributes_json
+
+    @property
+    def last_changed(self) -> datetime:
         """Wrap State.last_changed."""
         self._collect_state()
         return self._state.last_changed
 
     @property
-    def last_reported(self) -> datetime:  # type: ignore[override]
+    def last_reported(self) -> datetime:
         """Wrap State.last_reported."""
         self._collect_state()
         return self._state.last_reported
 
     @property
-    def last_updated(self) -> datetime:  # type: ignore[override]
+    def last_updated(self) -> datetime:
         """Wrap State.last_updated."""
         self._collect_state()
         return self._state.last_updated
@@ -1126,6 +1148,9 @@ class TemplateState(TemplateStateBase):
 
     def __repr__(self) -> str:
         """Representation of Template State."""
+        # The representation includes the attributes and timestamps
+        if render_info := _render_info.get():
+            render_info.state_values_only = False
         return f"<template TemplateState({self._state!r})>"
 
 
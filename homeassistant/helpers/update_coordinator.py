@@ -222,16 +222,16 @@ class DataUpdateCoordinator(BaseDataUpdateCoordinatorProtocol, Generic[_DataT]):
         # than the debouncer cooldown, this would cause the debounce to never be called
         self._async_unsub_refresh()
 
-        # We use loop.call_at because DataUpdateCoordinator does
+        # We use hass.timers.call_at because DataUpdateCoordinator does
         # not need an exact update interval which also avoids
-        # calling dt_util.utcnow() on every update.
-        hass = self.hass
-        loop = hass.loop
+        # calling dt_util.utcnow() on every update, and the refreshes
+        # of many coordinators share a few event loop timers.
+        timers = self.hass.timers
 
         next_refresh = (
-            int(loop.time()) + self._microsecond + self._update_interval_seconds
+            int(timers.loop.time()) + self._microsecond + self._update_interval_seconds
         )
-        self._unsub_refresh = loop.call_at(
+        self._unsub_refresh = timers.call_at(
             next_refresh, self.__wrap_handle_refresh_interval
         ).cancel
 
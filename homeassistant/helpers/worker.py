@@ -0,0 +1,212 @@
+"""Run CPU heavy work on dedicated worker event loops.
+
+A worker owns a thread running its own asyncio event loop so work
+scheduled on it does not compete with the core event loop. Code running
+on a worker must not touch the state machine or the event bus directly,
+it reports back through the batched WorkerChannel instead.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Coroutine, Mapping
+import logging
+import threading
+from typing import Any
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.exceptions import (
+    HomeAssistantError,
+    InvalidEntityFormatError,
+    InvalidStateError,
+)
+from homeassistant.util.event_type import EventType
+from homeassistant.util.hass_dict import HassKey
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_WORKERS: HassKey[dict[str, Worker]] = HassKey("workers")
+
+
+class WorkerChannel:
+    """Batched channel from worker threads to the core event loop.
+
+    Writes queued from any thread are applied on the core event loop in a
+    single batch. Within a batch the states are written with
+    StateMachine.async_set_many first, then the events are fired in the
+    order they were queued. If a state of the batch is invalid, the other
+    states are written one by one and the invalid states are logged.
+    """
+
+    __slots__ = ("_events", "_hass", "_lock", "_scheduled", "_states")
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the channel."""
+        self._hass = hass
+        self._lock = threading.Lock()
+        self._states: list[tuple[str, str, Mapping[str, Any] | None]] = []
+        self._events: list[tuple[EventType[Any] | str, Mapping[str, Any] | None]] = []
+        self._scheduled = False
+
+    def set_state(
+        self,
+        entity_id: str,
+        new_state: str,
+        attributes: Mapping[str, Any] | None = None,
+    ) -> None:
+        """Queue a state write.
+
+        This method is thread safe.
+        """
+        with self._lock:
+            self._states.append((entity_id, new_state, attributes))
+            self._schedule_flush()
+
+    def fire_event(
+        self,
+        event_type: EventType[Any] | str,
+        event_data: Mapping[str, Any] | None = None,
+    ) -> None:
+        """Queue an event.
+
+        This method is thread safe.
+        """
+        with self._lock:
+            self._events.append((event_type, event_data))
+            self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        """Schedule a flush on the core event loop, the lock must be held."""
+        if not self._scheduled:
+            self._scheduled = True
+            self._hass.loop.call_soon_threadsafe(self.async_flush)
+
+    @callback
+    def async_flush(self) -> None:
+        """Apply the queued states and events.
+
+        This method must be run in the event loop.
+        """
+        with self._lock:
+            states, self._states = self._states, []
+            events, self._events = self._events, []
+            self._scheduled = False
+        if states:
+            self._async_set_states(states)
+        for event_type, event_data in events:
+            self._hass.bus.async_fire(event_type, event_data)
+
+    @callback
+    def _async_set_states(
+        self, states: list[tuple[str, str, Mapping[str, Any] | None]]
+    ) -> None:
+        """Write the queued states, skipping invalid states."""
+        state_machine = self._hass.states
+        try:
+            state_machine.async_set_many(states)
+        except (InvalidEntityFormatError, InvalidStateError):
+            # The batch is validated before it is written, nothing
+            # was written so fall back to writing the states one by one
+            for entity_id, new_state, attributes in states:
+                try:
+                    state_machine.async_set(entity_id, new_state, attributes)
+                except (InvalidEntityFormatError, InvalidStateError) as err:
+                    _LOGGER.error(
+                        "Invalid state of %s written from a worker: %s", entity_id, err
+                    )
+
+
+class Worker:
+    """A thread running a dedicated event loop."""
+
+    def __init__(self, hass: HomeAssistant, name: str) -> None:
+        """Initialize the worker."""
+        self.hass = hass
+        self.name = name
+        self.channel = WorkerChannel(hass)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        """Return if the worker is running."""
+        return self._loop is not None
+
+    @callback
+    def async_start(self) -> None:
+        """Start the worker thread."""
+        if self._loop is not None:
+            raise HomeAssistantError(f"Worker {self.name} is already running")
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._run, name=f"Worker{self.name}", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        """Run the event loop of the worker until it is stopped."""
+        loop = self._loop
+        assert loop is not None
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_forever()
+        finally:
+            try:
+                tasks = asyncio.all_tasks(loop)
+                for task in tasks:
+                    task.cancel()
+                loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+                loop.run_until_complete(loop.shutdown_asyncgens())
+            finally:
+                loop.close()
+
+    async def async_run[_R](
+        self,
+        target: Callable[..., Coroutine[Any, Any, _R]],
+        *args: Any,
+    ) -> _R:
+        """Run a coroutine function on the worker and return its result."""
+        if (loop := self._loop) is None:
+            raise HomeAssistantError(f"Worker {self.name} is not running")
+        return await asyncio.wrap_future(
+            asyncio.run_coroutine_threadsafe(target(*args), loop)
+        )
+
+    async def async_stop(self) -> None:
+        """Stop the worker and wait for its thread to finish.
+
+        Tasks still running on the worker are cancelled and any
+        states or events they queued are applied.
+        """
+        if (loop := self._loop) is None or (thread := self._thread) is None:
+            return
+        self._loop = None
+        self._thread = None
+        loop.call_soon_threadsafe(loop.stop)
+        await self.hass.async_add_executor_job(thread.join)
+        self.channel.async_flush()
+
+
+@callback
+def async_get_worker(hass: HomeAssistant, name: str) -> Worker:
+    """Return the worker with the given name, starting it on first use.
+
+    Integrations typically use their domain as the name. All workers
+    are stopped when Home Assistant stops.
+    """
+    if (workers := hass.data.get(DATA_WORKERS)) is None:
+        workers = hass.data[DATA_WORKERS] = {}
+
+        async def _async_stop_workers(_: Event) -> None:
+            """Stop all the workers."""
+            hass.data.pop(DATA_WORKERS, None)
+            for worker in workers.values():
+                await worker.async_stop()
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_stop_workers)
+
+    if (worker := workers.get(name)) is None or not worker.running:
+        worker = workers[name] = Worker(hass, name)
+        worker.async_start()
+    return worker
@@ -53,6 +53,7 @@ class RuntimeConfig:
     log_no_color: bool = False
 
     debug: bool = False
+    loop_stall_threshold: float | None = None
     open_ui: bool = False
 
     safe_mode: bool = False
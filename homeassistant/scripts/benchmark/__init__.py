@@ -9,16 +9,23 @@ from collections.abc import Callable
 from contextlib import suppress
 import json
 import logging
+import tempfile
 from timeit import default_timer as timer
+import tracemalloc
 
 from homeassistant import core
 from homeassistant.const import EVENT_STATE_CHANGED
 from homeassistant.helpers.entityfilter import convert_include_exclude_filter
 from homeassistant.helpers.event import (
+    TrackTemplate,
+    async_call_later,
     async_track_state_change,
     async_track_state_change_event,
+    async_track_template_result,
 )
 from homeassistant.helpers.json import JSON_DUMP, JSONEncoder
+from homeassistant.helpers.template import Template
+from homeassistant.util.json import json_loads
 
 # mypy: allow-untyped-calls, allow-untyped-defs, no-check-untyped-defs
 # mypy: no-warn-return-any
@@ -312,6 +319,423 @@ async def json_serialize_states(hass):
     return timer() - start
 
 
+@benchmark
+async def state_memory(hass):
+    """Measure the memory held by 10k entities with 10 old states each."""
+    entities = 10**4
+    updates = 10
+    old_states = []
+
+    @core.callback
+    def listener(event):
+        """Hold on to the old states like the history and template caches."""
+        if (old_state := event.data["old_state"]) is not None:
+            old_states.append(old_state)
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, listener)
+    entity_ids = [f"sensor.benchmark_{idx}" for idx in range(entities)]
+    attributes = {"unit_of_measurement": "W", "friendly_name": "Benchmark"}
+
+    tracemalloc.start()
+    start = timer()
+    for update in range(updates + 1):
+        for entity_id in entity_ids:
+            hass.states.async_set(entity_id, str(update), attributes)
+    await hass.async_block_till_done()
+    runtime = timer() - start
+    compact = tracemalloc.get_traced_memory()[0]
+
+    # Materialize everything a State used to create eagerly
+    # to compare against the non compact representation.
+    for state in (*old_states, *hass.states.async_all()):
+        state.last_changed  # noqa: B018
+        state.last_updated  # noqa: B018
+        state.last_reported  # noqa: B018
+    materialized = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print(f"Bytes per entity (compact): {compact / entities:.0f}")
+    print(f"Bytes per entity (materialized): {materialized / entities:.0f}")
+    return runtime
+
+
+@benchmark
+async def schedule_timers(hass):
+    """Schedule, reschedule and fire 50k timers."""
+    count = 50000
+    fired = 0
+    done = hass.loop.create_future()
+
+    @core.callback
+    def action(now):
+        """Count the timers that fired."""
+        nonlocal fired
+        fired += 1
+        if fired == count:
+            done.set_result(None)
+
+    start = timer()
+    # Spread the deadlines over a second like coordinators and debouncers do
+    unsubs = [async_call_later(hass, idx / count, action) for idx in range(count)]
+    # Reschedule every other timer like a debouncer does
+    for idx in range(0, count, 2):
+        unsubs[idx]()
+        unsubs[idx] = async_call_later(hass, 0.5 + idx / count / 2, action)
+    print(f"Scheduled in {timer() - start}s")
+    print(f"Event loop timers: {len(getattr(hass.loop, '_scheduled'))}")
+    await done
+    return timer() - start
+
+
+@benchmark
+async def template_aggregation(hass):
+    """Track a template aggregating 1k sensors while they update 10k times."""
+    entities = 1000
+    updates = 10**4
+    renders = 0
+    template = Template(
+        "{{ states.sensor | selectattr('state', 'eq', 'on') | list | count }}", hass
+    )
+
+    @core.callback
+    def action(event, updates):
+        """Count the renders that changed the result."""
+        nonlocal renders
+        renders += 1
+
+    entity_ids = [f"sensor.benchmark_{idx}" for idx in range(entities)]
+    for entity_id in entity_ids:
+        hass.states.async_set(entity_id, "off", {"power": 0})
+    info = async_track_template_result(
+        hass, [TrackTemplate(template, None, rate_limit=0)], action
+    )
+    info.async_refresh()
+
+    start = timer()
+    for update in range(updates):
+        entity_id = entity_ids[update % entities]
+        # Most updates only change attributes, every tenth sensor flips its state
+        state = "on" if update % 10 == 0 and (update // entities) % 2 else "off"
+        hass.states.async_set(entity_id, state, {"power": update})
+    await hass.async_block_till_done()
+    runtime = timer() - start
+    info.async_remove()
+
+    print(f"Template results: {renders}")
+    return runtime
+
+
+@benchmark
+async def recorder_write(hass):
+    """Replay 20k state changes and 2k events into a SQLite recorder."""
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant import config_entries, loader
+
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components.recorder import get_instance
+
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.helpers import recorder as recorder_helper
+
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.setup import async_setup_component
+
+    entities = 200
+    updates = 20000
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        hass.config.config_dir = tmp_dir
+        loader.async_setup(hass)
+        hass.config_entries = config_entries.ConfigEntries(hass, {})
+        await hass.config_entries.async_initialize()
+        recorder_helper.async_initialize_recorder(hass)
+        assert await async_setup_component(
+            hass,
+            "recorder",
+            {"recorder": {"db_url": f"sqlite:///{tmp_dir}/benchmark.db"}},
+        )
+        await hass.async_start()
+        instance = get_instance(hass)
+        await instance.async_block_till_done()
+
+        attributes = [
+            {"unit_of_measurement": "W", "friendly_name": f"Benchmark {idx}"}
+            for idx in range(entities)
+        ]
+        start = timer()
+        for update in range(updates):
+            idx = update % entities
+            hass.states.async_set(
+                f"sensor.benchmark_{idx}", str(update), attributes[idx]
+            )
+            if update % 10 == 0:
+                hass.bus.async_fire("benchmark_event", {"idx": idx})
+            if update % 1000 == 0:
+                # Let the recorder queue the events like it does at runtime
+                await asyncio.sleep(0)
+        await hass.async_block_till_done()
+        await instance.async_block_till_done()
+        runtime = timer() - start
+        await hass.async_stop()
+
+    return runtime
+
+
+@benchmark
+async def compile_statistics(hass):
+    """Compile the 5-minute statistics of 2k sensors with 10 states each."""
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant import config_entries, loader
+
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components.recorder import get_instance
+    from homeassistant.components.recorder.util import (  # pylint: disable=import-outside-toplevel
+        session_scope,
+    )
+    from homeassistant.components.sensor.recorder import (  # pylint: disable=import-outside-toplevel
+        compile_statistics,
+    )
+
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.helpers import recorder as recorder_helper
+
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.setup import async_setup_component
+
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.util import dt as dt_util
+
+    measurements = 1800
+    totals = 200
+    updates = 10
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        hass.config.config_dir = tmp_dir
+        loader.async_setup(hass)
+        hass.config_entries = config_entries.ConfigEntries(hass, {})
+        await hass.config_entries.async_initialize()
+        recorder_helper.async_initialize_recorder(hass)
+        assert await async_setup_component(
+            hass,
+            "recorder",
+            {"recorder": {"db_url": f"sqlite:///{tmp_dir}/benchmark.db"}},
+        )
+        await hass.async_start()
+        instance = get_instance(hass)
+        await instance.async_block_till_done()
+
+        start = dt_util.utcnow()
+        for update in range(updates):
+            for idx in range(measurements):
+                hass.states.async_set(
+                    f"sensor.power_{idx}",
+                    str(idx + update / 10),
+                    {
+                        "unit_of_measurement": "W",
+                        "state_class": "measurement",
+                        "friendly_name": f"Power {idx}",
+                    },
+                )
+            for idx in range(totals):
+                hass.states.async_set(
+                    f"sensor.energy_{idx}",
+                    str(idx * 100 + update),
+                    {
+                        "unit_of_measurement": "kWh",
+                        "state_class": "total_increasing",
+                        "friendly_name": f"Energy {idx}",
+                    },
+                )
+            await asyncio.sleep(0)
+        await hass.async_block_till_done()
+        await instance.async_block_till_done()
+        end = dt_util.utcnow()
+
+        def _compile():
+            with session_scope(session=instance.get_session()) as session:
+                compiled = compile_statistics(hass, session, start, end)
+            assert len(compiled.platform_stats) == measurements + totals
+
+        runtime = 0.0
+        for _ in range(5):
+            compile_start = timer()
+            await instance.async_add_executor_job(_compile)
+            runtime += timer() - compile_start
+        await hass.async_stop()
+
+    return runtime / 5
+
+
+@benchmark
+async def subscribe_entities_fan_out(hass):
+    """Send 10k state changes of 100 entities to 30 subscribe_entities clients.
+
+    Half of the clients subscribe to all entities like dashboards do, the
+    other half to 10 entities like tablets showing a single view.
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.auth.models import User
+
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components.websocket_api.entity_subscriptions import (
+        EntitySubscription,
+        async_get_entity_subscriptions,
+    )
+
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components.websocket_api.messages import JSON_ENCODING
+
+    connections = 30
+    entities = 100
+    updates = 10**4
+    entity_ids = [f"sensor.benchmark_{idx}" for idx in range(entities)]
+    user = User(name="benchmark", is_owner=True, is_active=True, perm_lookup=None)
+    sent = 0
+
+    class Connection:
+        """Connection which counts the sent messages."""
+
+        def __init__(self) -> None:
+            """Initialize the connection."""
+            self.user = user
+            self.encoding = JSON_ENCODING
+
+        def is_congested(self) -> bool:
+            """Return if the client falls behind."""
+            return False
+
+        def send_encoded_message(self, message):
+            """Count a sent message."""
+            nonlocal sent
+            sent += 1
+
+    entity_subscriptions = async_get_entity_subscriptions(hass)
+    for idx in range(connections):
+        filtered = entity_ids[:10] if idx % 2 else []
+        entity_subscriptions.async_subscribe(
+            EntitySubscription(Connection(), idx % 3 + 1), frozenset(filtered)
+        )
+
+    start = timer()
+    for update in range(updates):
+        hass.states.async_set(entity_ids[update % entities], str(update))
+    await hass.async_block_till_done()
+    runtime = timer() - start
+
+    assert sent == updates * connections // 2 + updates // 10 * connections // 2
+    return runtime
+
+
+@benchmark
+async def websocket_json_throughput(hass):
+    """Stream state changes and history to websocket clients as JSON."""
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components.websocket_api.messages import JSON_ENCODING
+
+    return await _websocket_throughput(hass, JSON_ENCODING, json_loads)
+
+
+@benchmark
+async def websocket_msgpack_throughput(hass):
+    """Stream state changes and history to websocket clients as MessagePack."""
+    # pylint: disable-next=import-outside-toplevel
+    import ormsgpack
+
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components.websocket_api.messages import MSGPACK_ENCODING
+
+    return await _websocket_throughput(hass, MSGPACK_ENCODING, ormsgpack.unpackb)
+
+
+async def _websocket_throughput(hass, encoding, loads):
+    """Send 10k state changes of 100 entities to 10 subscribe_entities clients.
+
+    The messages of each client are coalesced like the writer of a connection
+    does. A history stream message of 100 entities with 100 states each is
+    serialized for each client as well. The runtime only includes the
+    serialization, the time a Python client needs to parse the messages
+    and the number of bytes sent are printed.
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.auth.models import User
+
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components.websocket_api.entity_subscriptions import (
+        EntitySubscription,
+        async_get_entity_subscriptions,
+    )
+
+    connections = 10
+    entities = 100
+    updates = 10**4
+    coalesce_messages = 50
+    entity_ids = [f"sensor.benchmark_{idx}" for idx in range(entities)]
+    user = User(name="benchmark", is_owner=True, is_active=True, perm_lookup=None)
+    frames = []
+
+    class Connection:
+        """Connection which coalesces the sent messages to frames."""
+
+        def __init__(self) -> None:
+            """Initialize the connection."""
+            self.user = user
+            self.encoding = encoding
+            self.queue: list[bytes] = []
+
+        def is_congested(self) -> bool:
+            """Return if the client falls behind."""
+            return False
+
+        def send_encoded_message(self, message):
+            """Queue a message and coalesce the queue when it is full."""
+            self.queue.append(message)
+            if len(self.queue) == coalesce_messages:
+                frames.append(encoding.coalesce(self.queue))
+                self.queue.clear()
+
+    entity_subscriptions = async_get_entity_subscriptions(hass)
+    for idx in range(connections):
+        entity_subscriptions.async_subscribe(
+            EntitySubscription(Connection(), idx + 1), frozenset()
+        )
+    history = {
+        "states": {
+            entity_id: [
+                {"s": str(idx), "a": {"unit_of_measurement": "W"}, "lu": 1.7e9 + idx}
+                for idx in range(100)
+            ]
+            for entity_id in entity_ids
+        },
+        "start_time": 1.7e9,
+        "end_time": 1.7e9 + 100,
+    }
+
+    start = timer()
+    for update in range(updates):
+        hass.states.async_set(
+            entity_ids[update % entities],
+            str(update / 10),
+            {
+                "unit_of_measurement": "W",
+                "device_class": "power",
+                "state_class": "measurement",
+                "friendly_name": f"Benchmark {update % entities}",
+                "voltage": update % 230,
+            },
+        )
+    await hass.async_block_till_done()
+    frames.extend(
+        encoding.dumps({"id": idx + 1, "type": "event", "event": history})
+        for idx in range(connections)
+    )
+    runtime = timer() - start
+
+    parse_start = timer()
+    for frame in frames:
+        loads(frame)
+    print(f"Parse time of a Python client: {timer() - parse_start}s")
+    print(f"Bytes sent: {sum(len(frame) for frame in frames)}")
+    return runtime
+
+
 def _create_state_changed_event_from_old_new(
     entity_id, event_time_fired, old_state, new_state
 ):
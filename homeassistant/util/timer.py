@@ -0,0 +1,156 @@
+"""Coalesce timers with nearby deadlines into shared event loop timers."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import contextvars
+import math
+from typing import Any, Final
+
+# Timers are grouped in buckets of this many seconds. A timer fires at
+# the end of its bucket, at most this many seconds after its deadline.
+TIMER_RESOLUTION: Final = 0.05
+
+
+class CoalescedTimerHandle:
+    """A timer scheduled with a TimerScheduler.
+
+    The handle mirrors the parts of asyncio.TimerHandle that are used
+    to inspect, cancel and run scheduled timers.
+    """
+
+    __slots__ = ("_when", "_callback", "_args", "_context", "_loop", "_bucket")
+
+    def __init__(
+        self,
+        when: float,
+        callback: Callable[..., Any],
+        args: tuple[Any, ...],
+        loop: asyncio.AbstractEventLoop,
+    ) -> None:
+        """Initialize the handle."""
+        self._when = when
+        self._callback = callback
+        self._args = args
+        self._context = contextvars.copy_context()
+        self._loop = loop
+        self._bucket: TimerBucket | None = None
+
+    def __repr__(self) -> str:
+        """Return the representation of the handle."""
+        state = " cancelled" if self._bucket is None else ""
+        return (
+            f"<{self.__class__.__name__}{state} when={self._when} "
+            f"{self._callback!r}{self._args!r}>"
+        )
+
+    def when(self) -> float:
+        """Return the scheduled loop time of the timer."""
+        return self._when
+
+    def cancelled(self) -> bool:
+        """Return if the timer is no longer scheduled."""
+        return self._bucket is None
+
+    def cancel(self) -> None:
+        """Cancel the timer."""
+        if (bucket := self._bucket) is not None:
+            self._bucket = None
+            bucket.remove(self)
+
+    def _run(self) -> None:
+        """Run the callback of the timer."""
+        try:
+            self._context.run(self._callback, *self._args)
+        except (SystemExit, KeyboardInterrupt):
+            raise
+        except BaseException as exc:  # noqa: BLE001
+            self._loop.call_exception_handler(
+                {
+                    "message": f"Exception in callback {self._callback!r}",
+                    "exception": exc,
+                    "handle": self,
+                }
+            )
+
+
+class TimerBucket:
+    """Timers sharing a single event loop timer."""
+
+    __slots__ = ("_scheduler", "_key", "handles", "timer")
+
+    def __init__(self, scheduler: TimerScheduler, key: int, when: float) -> None:
+        """Initialize the bucket and schedule its event loop timer."""
+        self._scheduler = scheduler
+        self._key = key
+        self.handles: dict[CoalescedTimerHandle, None] = {}
+        self.timer = scheduler.loop.call_at(when, self)
+
+    def __repr__(self) -> str:
+        """Return the representation of the bucket."""
+        return f"<{self.__class__.__name__} {list(self.handles)!r}>"
+
+    def remove(self, handle: CoalescedTimerHandle) -> None:
+        """Remove a cancelled handle, dropping the bucket when it is empty."""
+        handles = self.handles
+        del handles[handle]
+        if not handles:
+            self.timer.cancel()
+            del self._scheduler.buckets[self._key]
+
+    def __call__(self) -> None:
+        """Run the timers in the bucket in the order of their deadlines."""
+        del self._scheduler.buckets[self._key]
+        handles = self.handles
+        self.handles = {}
+        for handle in sorted(handles, key=CoalescedTimerHandle.when):
+            # A callback earlier in the bucket may have cancelled it
+            if handle._bucket is self:  # noqa: SLF001
+                handle._bucket = None  # noqa: SLF001
+                handle._run()  # noqa: SLF001
+
+
+class TimerScheduler:
+    """Schedule timers on the event loop, coalescing nearby deadlines.
+
+    Timers are grouped into buckets of TIMER_RESOLUTION seconds and each
+    bucket holds a single event loop timer. Thousands of timers therefore
+    only need a handful of entries in the heap of the event loop, and
+    cancelling or rescheduling a timer into an existing bucket does not
+    touch the heap at all.
+    """
+
+    __slots__ = ("loop", "resolution", "buckets")
+
+    def __init__(
+        self, loop: asyncio.AbstractEventLoop, resolution: float = TIMER_RESOLUTION
+    ) -> None:
+        """Initialize the scheduler."""
+        self.loop = loop
+        self.resolution = resolution
+        self.buckets: dict[int, TimerBucket] = {}
+
+    def call_at(
+        self, when: float, callback: Callable[..., Any], *args: Any
+    ) -> CoalescedTimerHandle:
+        """Run the callback at or shortly after the loop time when."""
+        handle = CoalescedTimerHandle(when, callback, args, self.loop)
+        key = math.ceil(when / self.resolution)
+        if (bucket := self.buckets.get(key)) is None:
+            bucket = self.buckets[key] = TimerBucket(
+                self, key, max(when, key * self.resolution)
+            )
+        bucket.handles[handle] = None
+        handle._bucket = bucket  # noqa: SLF001
+        return handle
+
+    def call_later(
+        self, delay: float, callback: Callable[..., Any], *args: Any
+    ) -> CoalescedTimerHandle:
+        """Run the callback at or shortly after delay seconds."""
+        return self.call_at(self.loop.time() + delay, callback, *args)
+
+    def scheduled(self) -> list[CoalescedTimerHandle]:
+        """Return the timers that are scheduled."""
+        return [handle for bucket in self.buckets.values() for handle in bucket.handles]
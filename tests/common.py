@@ -103,6 +103,7 @@ from homeassistant.util.json import (
     json_loads_object,
 )
 from homeassistant.util.signal_type import SignalType
+from homeassistant.util.timer import CoalescedTimerHandle, TimerBucket
 import homeassistant.util.ulid as ulid_util
 from homeassistant.util.unit_system import METRIC_SYSTEM
 import homeassistant.util.yaml.loader as yaml_loader
@@ -525,9 +526,17 @@ def _async_fire_time_changed(
     hass: HomeAssistant, utc_datetime: datetime | None, fire_all: bool
 ) -> None:
     timestamp = dt_util.utc_to_timestamp(utc_datetime)
+    tasks: list[asyncio.TimerHandle | CoalescedTimerHandle] = []
     for task in list(hass.loop._scheduled):
         if not isinstance(task, asyncio.TimerHandle):
             continue
+        if isinstance(bucket := task._callback, TimerBucket):
+            # Fire the coalesced timers individually at their own deadlines
+            tasks.extend(bucket.handles)
+        else:
+            tasks.append(task)
+
+    for task in tasks:
         if task.cancelled():
             continue
 
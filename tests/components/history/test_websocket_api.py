@@ -2,6 +2,8 @@
 
 import asyncio
 from datetime import timedelta
+from functools import partial
+from typing import Any
 from unittest.mock import patch
 
 from freezegun import freeze_time
@@ -9,7 +11,7 @@ import pytest
 
 from homeassistant.components import history
 from homeassistant.components.history import websocket_api
-from homeassistant.components.recorder import Recorder
+from homeassistant.components.recorder import Recorder, history as recorder_history
 from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
 from homeassistant.core import HomeAssistant
 from homeassistant.setup import async_setup_component
@@ -2072,3 +2074,125 @@ async def test_history_stream_historical_only_with_start_time_state_past(
         "id": 1,
         "type": "event",
     }
+
+
+async def _async_record_power_states(hass: HomeAssistant) -> list[str]:
+    """Record a numeric series with a spike and a gap."""
+    await async_setup_component(hass, "history", {})
+    await async_setup_component(hass, "sensor", {})
+    hass.states.async_set("sensor.power", "0", attributes={"unit": "W"})
+    hass.states.async_set("sensor.mode", "eco")
+    await async_recorder_block_till_done(hass)
+    values = [str(value % 10) for value in range(1, 100)]
+    values[50] = "1000"
+    values[70] = "unavailable"
+    for value in values:
+        hass.states.async_set("sensor.power", value, attributes={"unit": "W"})
+    await async_wait_recording_done(hass)
+    return values
+
+
+def _assert_downsampled(
+    states: list[dict[str, Any]], all_states: list[dict[str, Any]], max_points: int
+) -> None:
+    """Assert a series is a downsampled version of all its states."""
+    assert len(all_states) == 100
+    # The gap is kept in addition to the max points and splits its bucket
+    assert len(states) <= max_points + 5
+    assert [state for state in all_states if state in states] == states
+    assert states[0] == all_states[0]
+    assert states[-1] == all_states[-1]
+    assert {"1000", "unavailable", "0", "9"} <= {state["s"] for state in states}
+
+
+async def test_history_during_period_max_points(
+    hass: HomeAssistant, recorder_mock: Recorder, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test history_during_period downsamples numeric series."""
+    now = dt_util.utcnow()
+    await _async_record_power_states(hass)
+
+    client = await hass_ws_client()
+    results = []
+    for msg_id, max_points in ((1, None), (2, 21)):
+        await client.send_json(
+            {
+                "id": msg_id,
+                "type": "history/history_during_period",
+                "start_time": now.isoformat(),
+                "entity_ids": ["sensor.power", "sensor.mode"],
+                "significant_changes_only": False,
+                "minimal_response": True,
+            }
+            | ({"max_points": max_points} if max_points else {})
+        )
+        response = await client.receive_json()
+        assert response["success"]
+        results.append(response["result"])
+
+    all_states, states = results
+    _assert_downsampled(states["sensor.power"], all_states["sensor.power"], 21)
+    assert states["sensor.power"][0]["a"] == {"unit": "W"}
+    assert states["sensor.mode"] == all_states["sensor.mode"]
+
+
+async def test_history_during_period_max_points_too_low(
+    hass: HomeAssistant, recorder_mock: Recorder, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test history_during_period rejects too few points."""
+    await async_setup_component(hass, "history", {})
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "history/history_during_period",
+            "start_time": dt_util.utcnow().isoformat(),
+            "entity_ids": ["sensor.power"],
+            "max_points": 4,
+        }
+    )
+    response = await client.receive_json()
+    assert not response["success"]
+    assert response["error"]["code"] == "invalid_format"
+
+
+async def test_history_stream_historical_only_max_points(
+    hass: HomeAssistant, recorder_mock: Recorder, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test history stream downsamples numeric series."""
+    now = dt_util.utcnow()
+    await _async_record_power_states(hass)
+    end_time = dt_util.utcnow()
+    all_states = await recorder_mock.async_add_executor_job(
+        partial(
+            recorder_history.get_significant_states,
+            hass,
+            now,
+            end_time,
+            ["sensor.power"],
+            significant_changes_only=False,
+            minimal_response=True,
+            compressed_state_format=True,
+        )
+    )
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "history/stream",
+            "entity_ids": ["sensor.power"],
+            "start_time": now.isoformat(),
+            "end_time": end_time.isoformat(),
+            "significant_changes_only": False,
+            "minimal_response": True,
+            "max_points": 41,
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+
+    response = await client.receive_json()
+    states = response["event"]["states"]["sensor.power"]
+    _assert_downsampled(states, all_states["sensor.power"], 41)
+    assert response["event"]["end_time"] == pytest.approx(states[-1]["lu"])
@@ -0,0 +1,37 @@
+"""Test the Profiler diagnostics."""
+
+from homeassistant.components.profiler import SERVICE_START_LISTENER_STATS
+from homeassistant.components.profiler.const import DOMAIN
+from homeassistant.core import HomeAssistant
+
+from tests.common import MockConfigEntry
+from tests.components.diagnostics import get_diagnostics_for_config_entry
+from tests.typing import ClientSessionGenerator
+
+
+async def test_diagnostics(
+    hass: HomeAssistant, hass_client: ClientSessionGenerator
+) -> None:
+    """Test the listener stats are included in the diagnostics."""
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    diagnostics = await get_diagnostics_for_config_entry(hass, hass_client, entry)
+    assert diagnostics == {"listener_stats": {"enabled": False}}
+
+    await hass.services.async_call(
+        DOMAIN, SERVICE_START_LISTENER_STATS, {}, blocking=True
+    )
+    hass.bus.async_fire("test_event")
+    await hass.async_block_till_done()
+
+    diagnostics = await get_diagnostics_for_config_entry(hass, hass_client, entry)
+    listener_stats = diagnostics["listener_stats"]
+    assert listener_stats["enabled"] is True
+    assert listener_stats["event_types"]["test_event"]["events"] == 1
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
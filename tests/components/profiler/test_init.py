@@ -25,18 +25,21 @@ from homeassistant.components.profiler import (
     SERVICE_MEMORY,
     SERVICE_SET_ASYNCIO_DEBUG,
     SERVICE_START,
+    SERVICE_START_LISTENER_STATS,
     SERVICE_START_LOG_OBJECT_SOURCES,
     SERVICE_START_LOG_OBJECTS,
+    SERVICE_STOP_LISTENER_STATS,
     SERVICE_STOP_LOG_OBJECT_SOURCES,
     SERVICE_STOP_LOG_OBJECTS,
 )
 from homeassistant.components.profiler.const import DOMAIN
 from homeassistant.const import CONF_SCAN_INTERVAL, CONF_TYPE
-from homeassistant.core import HomeAssistant
+from homeassistant.core import Event, HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
 import homeassistant.util.dt as dt_util
 
 from tests.common import MockConfigEntry, async_fire_time_changed
+from tests.typing import WebSocketGenerator
 
 
 async def test_basic_usage(hass: HomeAssistant, tmp_path: Path) -> None:
@@ -446,3 +449,75 @@ async def test_set_asyncio_debug(
 
     assert await hass.config_entries.async_unload(entry.entry_id)
     await hass.async_block_till_done()
+
+
+async def test_listener_stats(
+    hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test recording event listener stats."""
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    client = await hass_ws_client(hass)
+    await client.send_json_auto_id({"type": "profiler/listener_stats"})
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["result"] == {"enabled": False}
+
+    with pytest.raises(HomeAssistantError, match="Listener stats not running"):
+        await hass.services.async_call(
+            DOMAIN, SERVICE_STOP_LISTENER_STATS, {}, blocking=True
+        )
+
+    await hass.services.async_call(
+        DOMAIN, SERVICE_START_LISTENER_STATS, {}, blocking=True
+    )
+    with pytest.raises(HomeAssistantError, match="Listener stats already started"):
+        await hass.services.async_call(
+            DOMAIN, SERVICE_START_LISTENER_STATS, {}, blocking=True
+        )
+
+    @callback
+    def _listener(event: Event) -> None:
+        """Listen for test events."""
+
+    hass.bus.async_listen("test_event", _listener)
+    hass.bus.async_fire("test_event")
+    hass.bus.async_fire("test_event")
+    await hass.async_block_till_done()
+
+    await client.send_json_auto_id({"type": "profiler/listener_stats", "limit": 1})
+    response = await client.receive_json()
+    assert response["success"]
+    result = response["result"]
+    assert result["enabled"] is True
+    assert result["event_types"]["test_event"]["events"] == 2
+    assert result["event_types"]["test_event"]["listener_calls"] == 2
+    assert result["event_types"]["test_event"]["fan_out"] == 1.0
+    assert len(result["listeners"]) == 1
+
+    await client.send_json_auto_id({"type": "profiler/listener_stats"})
+    response = await client.receive_json()
+    assert {
+        "listener": f"{__name__}.test_listener_stats.<locals>._listener",
+        "integration": "homeassistant",
+        "event_type": "test_event",
+        "calls": 2,
+    }.items() <= next(
+        listener
+        for listener in response["result"]["listeners"]
+        if listener["event_type"] == "test_event"
+    ).items()
+
+    await hass.services.async_call(
+        DOMAIN, SERVICE_STOP_LISTENER_STATS, {}, blocking=True
+    )
+    await client.send_json_auto_id({"type": "profiler/listener_stats"})
+    response = await client.receive_json()
+    assert response["result"] == {"enabled": False}
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
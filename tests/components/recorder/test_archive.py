@@ -0,0 +1,272 @@
+"""Test the archive of old states."""
+
+from collections.abc import AsyncGenerator
+from datetime import datetime, timedelta
+from functools import partial
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+
+from homeassistant.components.recorder import Recorder, history
+from homeassistant.components.recorder.archive import (
+    ArchivedEntityStates,
+    decode_day,
+    encode_day,
+)
+from homeassistant.components.recorder.db_schema import StateAttributes, States
+from homeassistant.components.recorder.purge import archive_old_states
+from homeassistant.components.recorder.tasks import ArchiveTask, PurgeTask
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.core import HomeAssistant, State
+from homeassistant.util import dt as dt_util
+
+from .common import async_wait_purge_done, async_wait_recording_done
+
+from tests.typing import RecorderInstanceGenerator
+
+
+@pytest.fixture
+async def mock_recorder_before_hass(
+    async_test_recorder: RecorderInstanceGenerator, tmp_path: Path
+) -> AsyncGenerator[None]:
+    """Set up recorder with the archive in a temporary directory."""
+    with patch(
+        "homeassistant.components.recorder.core.ARCHIVE_DIR", str(tmp_path / "archive")
+    ):
+        yield
+
+
+def _next_midnight() -> datetime:
+    """Return the start of the next UTC day."""
+    return dt_util.utcnow().replace(hour=0, minute=0, second=0, microsecond=0) + (
+        timedelta(days=1)
+    )
+
+
+async def _add_states(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, first_day: datetime
+) -> None:
+    """Record states on three days."""
+    for day in range(3):
+        for hour in range(1, 24, 4):
+            freezer.move_to(first_day + timedelta(days=day, hours=hour))
+            hass.states.async_set(
+                "sensor.temperature",
+                str(day * 24 + hour),
+                {"unit_of_measurement": "°C"},
+            )
+            hass.states.async_set(
+                "media_player.living_room",
+                "playing" if hour % 8 == 1 else "idle",
+                {"volume": hour},
+            )
+            hass.states.async_set(
+                "climate.house", "heat", {"current_temperature": day + hour}
+            )
+    freezer.move_to(first_day + timedelta(hours=2))
+    hass.states.async_set("light.kitchen", "on")
+    await async_wait_recording_done(hass)
+
+
+def _snapshot(result: dict[str, list[State | dict[str, Any]]]) -> dict[str, list]:
+    """Return a comparable snapshot of a history result."""
+    return {
+        entity_id: [
+            state
+            if isinstance(state, dict)
+            else (
+                state.state,
+                state.attributes,
+                state.last_updated,
+                state.last_changed,
+                state.last_reported,
+            )
+            for state in states
+        ]
+        for entity_id, states in result.items()
+    }
+
+
+async def _async_history_queries(
+    hass: HomeAssistant, recorder: Recorder, first_day: datetime
+) -> list[dict[str, list]]:
+    """Run history queries against the recorded states."""
+    entity_ids = [
+        "sensor.temperature",
+        "media_player.living_room",
+        "climate.house",
+        "light.kitchen",
+    ]
+    results = []
+    for start_time, end_time in (
+        (first_day, first_day + timedelta(days=3)),
+        (first_day + timedelta(hours=30), first_day + timedelta(hours=60)),
+        (first_day + timedelta(hours=50), None),
+    ):
+        results.extend(
+            [
+                _snapshot(
+                    await recorder.async_add_executor_job(
+                        partial(
+                            history.get_significant_states,
+                            hass,
+                            start_time,
+                            end_time,
+                            entity_ids,
+                            **kwargs,
+                        )
+                    )
+                )
+                for kwargs in (
+                    {},
+                    {"significant_changes_only": False},
+                    {"minimal_response": True, "compressed_state_format": True},
+                    {"minimal_response": True, "no_attributes": True},
+                    {"include_start_time_state": False},
+                )
+            ]
+        )
+        results.extend(
+            [
+                _snapshot(
+                    await recorder.async_add_executor_job(
+                        partial(
+                            history.state_changes_during_period,
+                            hass,
+                            start_time,
+                            end_time,
+                            entity_id,
+                            **kwargs,
+                        )
+                    )
+                )
+                for entity_id in entity_ids
+                for kwargs in ({}, {"limit": 3}, {"descending": True, "limit": 2})
+            ]
+        )
+    return results
+
+
+def test_encode_decode_day() -> None:
+    """Test the archive format round trips."""
+    states = ArchivedEntityStates()
+    states.append(1718000000.123456, None, None, "on", '{"a":1}')
+    states.append(1718000010.5, 1718000000.123456, None, "on", '{"a":2}')
+    states.append(1718000020.000001, None, 1718000030.25, None, None)
+    states.append(1718000030.75, None, None, "off", '{"a":1}')
+
+    decoded = decode_day(encode_day({"light.kitchen": states}))
+
+    assert decoded == {"light.kitchen": states}
+
+
+async def test_archive_old_states(
+    hass: HomeAssistant, recorder_mock: Recorder, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test states are moved to the archive and still returned by history."""
+    first_day = _next_midnight()
+    await _add_states(hass, freezer, first_day)
+    expected = await _async_history_queries(hass, recorder_mock, first_day)
+
+    recorder_mock.queue_task(ArchiveTask(first_day + timedelta(days=2, hours=12)))
+    await async_wait_purge_done(hass)
+
+    assert recorder_mock.states_archive.archived_before_ts == (
+        (first_day + timedelta(days=2)).timestamp()
+    )
+    with session_scope(hass=hass) as session:
+        assert {
+            state.last_updated_ts >= (first_day + timedelta(days=2)).timestamp()
+            for state in session.query(States)
+        } == {True}
+        assert session.query(StateAttributes).count() == 13
+
+    assert await _async_history_queries(hass, recorder_mock, first_day) == expected
+
+    # Entities without states in the database lose their states_meta row
+    recorder_mock.queue_task(PurgeTask(first_day, False, False))
+    await async_wait_purge_done(hass)
+    with session_scope(hass=hass) as session:
+        assert not recorder_mock.states_meta_manager.get(
+            "light.kitchen", session, False
+        )
+
+    assert await _async_history_queries(hass, recorder_mock, first_day) == expected
+
+
+async def test_archive_old_states_is_idempotent(
+    hass: HomeAssistant, recorder_mock: Recorder, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test archiving states that are already archived does not duplicate them."""
+    first_day = _next_midnight()
+    await _add_states(hass, freezer, first_day)
+    archive_before = first_day + timedelta(days=1)
+    with session_scope(hass=hass) as session:
+        states = session.query(States).count()
+
+    with (
+        patch(
+            "homeassistant.components.recorder.purge._purge_state_ids",
+            side_effect=ValueError,
+        ),
+        pytest.raises(ValueError),
+    ):
+        await recorder_mock.async_add_executor_job(
+            archive_old_states, recorder_mock, archive_before
+        )
+    assert not await recorder_mock.async_add_executor_job(
+        archive_old_states, recorder_mock, archive_before
+    )
+    assert await recorder_mock.async_add_executor_job(
+        archive_old_states, recorder_mock, archive_before
+    )
+
+    archived = await recorder_mock.async_add_executor_job(
+        recorder_mock.states_archive.states_during_period,
+        ["sensor.temperature", "light.kitchen"],
+        0,
+        None,
+    )
+    assert len(archived["sensor.temperature"]) == 6
+    assert len(archived["light.kitchen"]) == 1
+    with session_scope(hass=hass) as session:
+        assert session.query(States).count() == states - 19
+
+
+async def test_purge_archived_states(
+    hass: HomeAssistant, recorder_mock: Recorder, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test purging deletes archived days and archived states of entities."""
+    first_day = _next_midnight()
+    await _add_states(hass, freezer, first_day)
+    recorder_mock.queue_task(ArchiveTask(first_day + timedelta(days=2)))
+    await async_wait_purge_done(hass)
+    archive = recorder_mock.states_archive
+
+    freezer.move_to(first_day + timedelta(days=3, hours=1))
+    await hass.services.async_call(
+        "recorder",
+        "purge_entities",
+        {"entity_id": "climate.house", "keep_days": 0},
+        blocking=True,
+    )
+    await async_wait_purge_done(hass)
+    archived = await recorder_mock.async_add_executor_job(
+        archive.states_during_period,
+        ["climate.house", "sensor.temperature"],
+        0,
+        None,
+    )
+    assert "climate.house" not in archived
+    assert len(archived["sensor.temperature"]) == 12
+
+    await hass.services.async_call("recorder", "purge", {"keep_days": 2}, blocking=True)
+    await async_wait_purge_done(hass)
+    assert archive.archived_before_ts == (first_day + timedelta(days=2)).timestamp()
+    archived = await recorder_mock.async_add_executor_job(
+        archive.states_during_period, ["sensor.temperature"], 0, None
+    )
+    assert len(archived["sensor.temperature"]) == 6
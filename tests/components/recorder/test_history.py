@@ -1164,6 +1164,59 @@ async def test_get_full_significant_states_handles_empty_last_changed(
     )
 
 
+async def test_get_state_columns_with_session(hass: HomeAssistant) -> None:
+    """Test getting the states of a period in columns."""
+    hass.states.async_set("sensor.one", "1", {"attr": "original"})
+    await async_wait_recording_done(hass)
+    start = dt_util.utcnow()
+    hass.states.async_set("sensor.one", "1", {"attr": "new"})
+    hass.states.async_set("sensor.one", "2", {"attr": "new"})
+    hass.states.async_set("sensor.two", "on")
+    await async_wait_recording_done(hass)
+
+    def _get_entries():
+        with session_scope(hass=hass, read_only=True) as session:
+            return (
+                history.get_state_columns_with_session(
+                    hass,
+                    session,
+                    start,
+                    dt_util.utcnow(),
+                    ["sensor.one", "sensor.two", "sensor.unknown"],
+                ),
+                history.get_full_significant_states_with_session(
+                    hass,
+                    session,
+                    start,
+                    dt_util.utcnow(),
+                    ["sensor.one", "sensor.two", "sensor.unknown"],
+                    significant_changes_only=False,
+                ),
+            )
+
+    columns, states = await recorder.get_instance(hass).async_add_executor_job(
+        _get_entries
+    )
+    assert columns.keys() == states.keys() == {"sensor.one", "sensor.two"}
+    one = columns["sensor.one"]
+    assert one.states == ["1", "1", "2"]
+    assert [attributes["attr"] for attributes in one.attributes] == [
+        "original",
+        "new",
+        "new",
+    ]
+    assert one.attributes[1] is one.attributes[2]
+    assert one.last_changed_ts[1] < one.last_updated_ts[1]
+    for entity_id, entity_states in states.items():
+        assert_multiple_states_equal_without_context(
+            [
+                columns[entity_id].state(entity_id, idx)
+                for idx in range(len(entity_states))
+            ],
+            entity_states,
+        )
+
+
 async def test_state_changes_during_period_multiple_entities_single_test(
     hass: HomeAssistant,
 ) -> None:
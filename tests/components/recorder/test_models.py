@@ -81,6 +81,37 @@ def test_from_event_to_db_state_attributes() -> None:
     assert db_attrs.to_native() == attrs
 
 
+def test_from_event_to_db_state_attributes_reuses_attributes_json() -> None:
+    """Test the attributes JSON of the state is reused when nothing is excluded."""
+    state = ha.State("sensor.temperature", "18", {"this_attr": True})
+    event = ha.Event(
+        EVENT_STATE_CHANGED,
+        {"entity_id": "sensor.temperature", "old_state": None, "new_state": state},
+        context=state.context,
+    )
+    shared_attrs_bytes = StateAttributes.shared_attrs_bytes_from_event(
+        event, SupportedDialect.MYSQL
+    )
+    assert shared_attrs_bytes is state.attributes_json
+
+    state = ha.State("sensor.temperature", "18", {"this_attr": "a\0b"})
+    event = ha.Event(
+        EVENT_STATE_CHANGED,
+        {"entity_id": "sensor.temperature", "old_state": None, "new_state": state},
+        context=state.context,
+    )
+    assert (
+        StateAttributes.shared_attrs_bytes_from_event(event, SupportedDialect.MYSQL)
+        == b'{"this_attr":"a\\u0000b"}'
+    )
+    assert (
+        StateAttributes.shared_attrs_bytes_from_event(
+            event, SupportedDialect.POSTGRESQL
+        )
+        == b'{"this_attr":"a"}'
+    )
+
+
 def test_repr() -> None:
     """Test converting event to db state repr."""
     attrs = {"this_attr": True}
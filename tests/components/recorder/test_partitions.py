@@ -0,0 +1,138 @@
+"""Test partitioning the states and statistics tables."""
+
+from datetime import date, datetime
+from unittest.mock import patch
+
+import pytest
+
+from homeassistant.components.recorder import Recorder
+from homeassistant.components.recorder.const import PartitionInterval
+from homeassistant.components.recorder.db_schema import (
+    TABLE_STATES,
+    TABLE_STATISTICS,
+    TABLE_STATISTICS_SHORT_TERM,
+)
+from homeassistant.components.recorder.partitions import (
+    day_timestamp,
+    next_partition_start,
+    parse_partition_name,
+    partition_name,
+    partition_start,
+    table_partition_interval,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .common import async_wait_recording_done
+
+from tests.typing import RecorderInstanceGenerator
+
+
+@pytest.fixture
+async def mock_recorder_before_hass(
+    async_test_recorder: RecorderInstanceGenerator,
+) -> None:
+    """Set up recorder."""
+
+
+@pytest.fixture
+def recorder_config() -> dict[str, str]:
+    """Partition the tables daily."""
+    return {"db_partition_interval": "daily"}
+
+
+@pytest.mark.parametrize(
+    ("interval", "day", "start", "next_start", "name"),
+    [
+        (
+            PartitionInterval.DAILY,
+            date(2024, 2, 29),
+            date(2024, 2, 29),
+            date(2024, 3, 1),
+            "states_p20240229",
+        ),
+        (
+            PartitionInterval.DAILY,
+            date(2024, 12, 31),
+            date(2024, 12, 31),
+            date(2025, 1, 1),
+            "states_p20241231",
+        ),
+        (
+            PartitionInterval.MONTHLY,
+            date(2024, 1, 31),
+            date(2024, 1, 1),
+            date(2024, 2, 1),
+            "states_p202401",
+        ),
+        (
+            PartitionInterval.MONTHLY,
+            date(2024, 12, 15),
+            date(2024, 12, 1),
+            date(2025, 1, 1),
+            "states_p202412",
+        ),
+    ],
+)
+def test_partition_ranges(
+    interval: PartitionInterval,
+    day: date,
+    start: date,
+    next_start: date,
+    name: str,
+) -> None:
+    """Test the ranges and names of the partitions."""
+    assert partition_start(interval, day) == start
+    assert next_partition_start(interval, start) == next_start
+    assert partition_name(TABLE_STATES, interval, start) == name
+    assert parse_partition_name(TABLE_STATES, name) == (start, next_start)
+
+
+def test_parse_partition_name() -> None:
+    """Test only partitions of the table are parsed."""
+    assert parse_partition_name(TABLE_STATES, "states_default") is None
+    assert parse_partition_name(TABLE_STATES, "states_meta") is None
+    assert parse_partition_name(TABLE_STATES, "states_p2024") is None
+    assert parse_partition_name(TABLE_STATISTICS, "statistics_short_term_p202401") is (
+        None
+    )
+    assert parse_partition_name(
+        TABLE_STATISTICS_SHORT_TERM, "statistics_short_term_p202401"
+    ) == (date(2024, 1, 1), date(2024, 2, 1))
+
+
+def test_table_partition_interval() -> None:
+    """Test the long term statistics are always partitioned by month."""
+    for interval in PartitionInterval:
+        assert table_partition_interval(TABLE_STATES, interval) is interval
+        assert (
+            table_partition_interval(TABLE_STATISTICS, interval)
+            is PartitionInterval.MONTHLY
+        )
+
+
+def test_day_timestamp() -> None:
+    """Test the partition bounds are UTC midnights."""
+    assert day_timestamp(date(2024, 6, 12)) == (
+        datetime(2024, 6, 12, tzinfo=dt_util.UTC).timestamp()
+    )
+
+
+async def test_partitioning_requires_postgresql(
+    hass: HomeAssistant,
+    recorder_mock: Recorder,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test the tables are not partitioned with SQLite."""
+    assert recorder_mock.db_partition_interval is PartitionInterval.DAILY
+    assert any(
+        "only supported with PostgreSQL" in record.message
+        for record in caplog.get_records("setup")
+    )
+
+    with patch(
+        "homeassistant.components.recorder.migration.partition_tables"
+    ) as partition_mock:
+        recorder_mock.async_nightly_tasks(dt_util.utcnow())
+        await async_wait_recording_done(hass)
+    assert not partition_mock.called
@@ -4,7 +4,8 @@ from collections.abc import Generator
 from datetime import datetime, timedelta
 import json
 import sqlite3
-from unittest.mock import patch
+from typing import Any
+from unittest.mock import PropertyMock, patch
 
 from freezegun import freeze_time
 import pytest
@@ -13,7 +14,10 @@ from sqlalchemy.orm.session import Session
 from voluptuous.error import MultipleInvalid
 
 from homeassistant.components.recorder import DOMAIN as RECORDER_DOMAIN, Recorder
-from homeassistant.components.recorder.const import SupportedDialect
+from homeassistant.components.recorder.const import (
+    EVENT_RECORDER_PURGE_PROGRESS,
+    SupportedDialect,
+)
 from homeassistant.components.recorder.db_schema import (
     Events,
     EventTypes,
@@ -45,6 +49,7 @@ from .common import (
     convert_pending_states_to_meta,
 )
 
+from tests.common import async_capture_events
 from tests.typing import RecorderInstanceGenerator
 
 TEST_EVENT_TYPES = (
@@ -1974,3 +1979,115 @@ async def test_purge_entities_keep_days(
     )
     assert len(states["sensor.keep"]) == 2
     assert "sensor.purge" not in states
+
+
+async def test_purge_reports_progress(
+    hass: HomeAssistant, recorder_mock: Recorder, hass_storage: dict[str, Any]
+) -> None:
+    """Test a purge which needs multiple runs reports its progress."""
+    await _add_test_states(hass)
+    progress_events = async_capture_events(hass, EVENT_RECORDER_PURGE_PROGRESS)
+    purge_before = dt_util.utcnow() - timedelta(days=4)
+
+    with (
+        patch.object(recorder_mock, "max_bind_vars", 1),
+        patch(
+            "homeassistant.components.recorder.purge.DEFAULT_STATES_BATCHES_PER_PURGE",
+            1,
+        ),
+    ):
+        recorder_mock.queue_task(PurgeTask(purge_before, False, False))
+        await async_wait_purge_done(hass, 6)
+    await hass.async_block_till_done()
+
+    assert len(progress_events) == 5
+    progress = [event.data["progress"] for event in progress_events]
+    assert progress == sorted(progress)
+    assert progress[-1] == 100
+    assert [event.data["done"] for event in progress_events] == [
+        False,
+        False,
+        False,
+        False,
+        True,
+    ]
+    assert progress_events[0].data["purge_before"] == purge_before.isoformat()
+    assert hass_storage["recorder.purge"]["data"] == {}
+
+    with session_scope(hass=hass) as session:
+        assert session.query(States).count() == 2
+
+
+async def test_purge_resumes_after_restart(
+    hass: HomeAssistant, recorder_mock: Recorder, hass_storage: dict[str, Any]
+) -> None:
+    """Test a purge which did not finish is resumed."""
+    await _add_test_states(hass)
+    hass_storage["recorder.purge"] = {
+        "version": 1,
+        "minor_version": 1,
+        "key": "recorder.purge",
+        "data": {
+            "purge_before": (dt_util.utcnow() - timedelta(days=4)).isoformat(),
+            "repack": False,
+            "apply_filter": False,
+        },
+    }
+
+    await recorder_mock._async_resume_purge()  # noqa: SLF001
+    await async_wait_purge_done(hass)
+
+    with session_scope(hass=hass) as session:
+        assert session.query(States).count() == 2
+
+
+async def test_resumed_purge_done_in_one_run_clears_store(
+    hass: HomeAssistant, recorder_mock: Recorder, hass_storage: dict[str, Any]
+) -> None:
+    """Test a resumed purge which finishes in its first run is not resumed again."""
+    await _add_test_states(hass)
+    progress_events = async_capture_events(hass, EVENT_RECORDER_PURGE_PROGRESS)
+    hass_storage["recorder.purge"] = {
+        "version": 1,
+        "minor_version": 1,
+        "key": "recorder.purge",
+        "data": {
+            "purge_before": (dt_util.utcnow() - timedelta(days=4)).isoformat(),
+            "repack": True,
+            "apply_filter": False,
+        },
+    }
+
+    with patch(
+        "homeassistant.components.recorder.purge.purge_old_data",
+        wraps=purge_old_data,
+    ) as purge_mock:
+        await recorder_mock._async_resume_purge()  # noqa: SLF001
+        await async_wait_purge_done(hass)
+        await hass.async_block_till_done()
+
+    assert purge_mock.call_count == 1
+    assert progress_events == []
+    assert hass_storage["recorder.purge"]["data"] == {}
+
+
+async def test_purge_is_throttled_by_backlog(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test a purge only deletes a single batch per run when there is a backlog."""
+    await _add_test_states(hass)
+
+    with (
+        patch.object(Recorder, "backlog", new_callable=PropertyMock, return_value=1000),
+        patch(
+            "homeassistant.components.recorder.purge.purge_old_data",
+            wraps=purge_old_data,
+        ) as purge_mock,
+    ):
+        recorder_mock.queue_task(
+            PurgeTask(dt_util.utcnow() - timedelta(days=4), False, False)
+        )
+        await async_wait_purge_done(hass)
+
+    assert purge_mock.call_args.kwargs["states_batch_size"] == 1
+    assert purge_mock.call_args.kwargs["events_batch_size"] == 1
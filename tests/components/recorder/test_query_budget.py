@@ -0,0 +1,154 @@
+"""Test the budgets and cancellation of recorder queries."""
+
+import asyncio
+from collections.abc import Sequence
+from datetime import timedelta
+import threading
+import time
+
+import pytest
+from sqlalchemy import lambda_stmt, select, text
+
+from homeassistant.components.recorder import Recorder
+from homeassistant.components.recorder.db_schema import States
+from homeassistant.components.recorder.query_budget import (
+    QueryBudget,
+    QueryBudgetExceededError,
+    QueryCancelledError,
+    run_with_budget,
+)
+from homeassistant.components.recorder.util import (
+    execute_stmt_lambda_element,
+    session_scope,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .common import async_wait_recording_done
+
+from tests.typing import RecorderInstanceGenerator
+
+# A query which never finishes unless it is interrupted
+ENDLESS_QUERY = (
+    "WITH RECURSIVE numbers(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM numbers)"
+    " SELECT max(x) FROM numbers"
+)
+
+
+@pytest.fixture
+async def mock_recorder_before_hass(
+    async_test_recorder: RecorderInstanceGenerator,
+) -> None:
+    """Set up recorder."""
+
+
+def _get_state_ids(hass: HomeAssistant) -> list[int]:
+    """Return the state_ids of all states."""
+    with session_scope(hass=hass, read_only=True) as session:
+        return [
+            state_id
+            for (state_id,) in execute_stmt_lambda_element(
+                session, lambda_stmt(lambda: select(States.state_id))
+            )
+        ]
+
+
+async def test_row_budget(hass: HomeAssistant, recorder_mock: Recorder) -> None:
+    """Test a query can not fetch more rows than its budget."""
+    for state in range(5):
+        hass.states.async_set("sensor.test", str(state))
+    await async_wait_recording_done(hass)
+
+    state_ids = await recorder_mock.async_run_query(_get_state_ids, hass, max_rows=5)
+    assert len(state_ids) == 5
+
+    with pytest.raises(QueryBudgetExceededError, match="budget of 4 rows"):
+        await recorder_mock.async_run_query(_get_state_ids, hass, max_rows=4)
+
+
+def _get_state_ids_over_days(hass: HomeAssistant) -> list[int]:
+    """Return the state_ids of all states, fetched for a range of days."""
+    with session_scope(hass=hass, read_only=True) as session:
+        rows = execute_stmt_lambda_element(
+            session,
+            lambda_stmt(lambda: select(States.state_id)),
+            dt_util.utcnow() - timedelta(days=3),
+            yield_per=2,
+        )
+        # The rows are still fetched in partitions
+        assert not isinstance(rows, Sequence)
+        return [state_id for (state_id,) in rows]
+
+
+async def test_row_budget_over_days(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test the rows of a range of days are counted while they are consumed."""
+    for state in range(5):
+        hass.states.async_set("sensor.test", str(state))
+    await async_wait_recording_done(hass)
+
+    state_ids = await recorder_mock.async_run_query(
+        _get_state_ids_over_days, hass, max_rows=5
+    )
+    assert len(state_ids) == 5
+
+    with pytest.raises(QueryBudgetExceededError, match="budget of 4 rows"):
+        await recorder_mock.async_run_query(_get_state_ids_over_days, hass, max_rows=4)
+
+
+async def test_time_budget(hass: HomeAssistant, recorder_mock: Recorder) -> None:
+    """Test a query is stopped when it exceeds its time budget."""
+    statements = []
+
+    def _slow_query() -> None:
+        with session_scope(hass=hass, read_only=True) as session:
+            while True:
+                statements.append(session.execute(text("SELECT 1")).scalar())
+                time.sleep(0.01)
+
+    with pytest.raises(QueryBudgetExceededError, match="time budget of 0.1 seconds"):
+        await recorder_mock.async_run_query(_slow_query, timeout=0.1)
+    # The query is stopped before its next statement
+    await hass.async_block_till_done()
+    count = len(statements)
+    await asyncio.sleep(0.1)
+    assert len(statements) == count
+
+
+@pytest.mark.parametrize("persistent_database", [False, True])
+async def test_cancelled_query_is_interrupted(
+    hass: HomeAssistant, recorder_mock: Recorder, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test the running statement of a cancelled query is interrupted."""
+    started = threading.Event()
+    finished = threading.Event()
+
+    def _endless_query() -> None:
+        try:
+            with session_scope(hass=hass, read_only=True) as session:
+                started.set()
+                session.execute(text(ENDLESS_QUERY))
+        finally:
+            finished.set()
+
+    task = hass.async_create_task(recorder_mock.async_run_query(_endless_query))
+    await hass.async_add_executor_job(started.wait, 5)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert await hass.async_add_executor_job(finished.wait, 5)
+    assert "Error executing query" not in caplog.text
+
+    # The connection can be used by the next query
+    hass.states.async_set("sensor.test", "1")
+    await async_wait_recording_done(hass)
+    assert len(await recorder_mock.async_run_query(_get_state_ids, hass)) == 1
+
+
+def test_cancelled_before_start() -> None:
+    """Test a query cancelled while waiting for a thread is never run."""
+    budget = QueryBudget(None, None)
+    budget.cancel()
+    with pytest.raises(QueryCancelledError):
+        run_with_budget(budget, pytest.fail)
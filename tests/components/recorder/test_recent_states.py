@@ -0,0 +1,252 @@
+"""Test the cache of recently recorded states."""
+
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Any
+from unittest.mock import patch
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+
+from homeassistant.components.recorder import Recorder, history
+from homeassistant.components.recorder.tasks import PurgeEntitiesTask, PurgeTask
+from homeassistant.core import HomeAssistant, State
+from homeassistant.util import dt as dt_util
+
+from .common import async_wait_purge_done, async_wait_recording_done
+
+from tests.typing import RecorderInstanceGenerator
+
+ENTITY_IDS = ["sensor.temperature", "media_player.living_room", "climate.house"]
+
+
+@pytest.fixture
+async def mock_recorder_before_hass(
+    async_test_recorder: RecorderInstanceGenerator,
+) -> None:
+    """Set up recorder."""
+
+
+@pytest.fixture
+async def first_hour(
+    recorder_mock: Recorder, hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> datetime:
+    """Record states every 10 minutes for five hours."""
+    start = dt_util.utcnow() + timedelta(minutes=1)
+    for minute in range(0, 300, 10):
+        freezer.move_to(start + timedelta(minutes=minute))
+        hass.states.async_set(
+            "sensor.temperature", str(minute // 30), {"unit_of_measurement": "°C"}
+        )
+        hass.states.async_set(
+            "media_player.living_room",
+            "playing" if minute % 60 < 30 else "idle",
+            {"volume": minute % 20},
+        )
+        hass.states.async_set(
+            "climate.house", "heat", {"current_temperature": minute // 20}
+        )
+    await async_wait_recording_done(hass)
+    return start
+
+
+def _snapshot(result: dict[str, list[State | dict[str, Any]]]) -> dict[str, list]:
+    """Return a comparable snapshot of a history result."""
+    return {
+        entity_id: [
+            state
+            if isinstance(state, dict)
+            else (
+                state.state,
+                state.attributes,
+                state.last_updated,
+                state.last_changed,
+                state.last_reported,
+            )
+            for state in states
+        ]
+        for entity_id, states in result.items()
+    }
+
+
+async def _async_history_queries(
+    hass: HomeAssistant,
+    recorder: Recorder,
+    start_time: datetime,
+    end_time: datetime | None,
+) -> list[dict[str, list]]:
+    """Run history queries for a period."""
+    results = [
+        _snapshot(
+            await recorder.async_add_executor_job(
+                partial(
+                    history.get_significant_states,
+                    hass,
+                    start_time,
+                    end_time,
+                    ENTITY_IDS,
+                    **kwargs,
+                )
+            )
+        )
+        for kwargs in (
+            {},
+            {"significant_changes_only": False},
+            {"minimal_response": True, "compressed_state_format": True},
+            {"minimal_response": True, "no_attributes": True},
+            {"include_start_time_state": False},
+        )
+    ]
+    results.extend(
+        [
+            _snapshot(
+                await recorder.async_add_executor_job(
+                    partial(
+                        history.state_changes_during_period,
+                        hass,
+                        start_time,
+                        end_time,
+                        entity_id,
+                        **kwargs,
+                    )
+                )
+            )
+            for entity_id in ENTITY_IDS
+            for kwargs in ({}, {"limit": 3}, {"descending": True, "limit": 2})
+        ]
+    )
+    return results
+
+
+@pytest.mark.parametrize(
+    ("start_offset", "end_offset"),
+    [(5, 295), (60, 120), (95, 185), (200, None), (290, None)],
+)
+async def test_history_from_recent_states(
+    hass: HomeAssistant,
+    recorder_mock: Recorder,
+    first_hour: datetime,
+    start_offset: int,
+    end_offset: int | None,
+) -> None:
+    """Test history of recent periods is answered from the cache."""
+    start_time = first_hour + timedelta(minutes=start_offset)
+    end_time = (
+        None if end_offset is None else first_hour + timedelta(minutes=end_offset)
+    )
+
+    with patch(
+        "homeassistant.components.recorder.history.modern.execute_stmt_lambda_element",
+        side_effect=AssertionError,
+    ):
+        cached = await _async_history_queries(hass, recorder_mock, start_time, end_time)
+
+    recorder_mock.recent_states.clear()
+    assert (
+        await _async_history_queries(hass, recorder_mock, start_time, end_time)
+        == cached
+    )
+
+
+async def test_history_falls_back_to_database(
+    hass: HomeAssistant, recorder_mock: Recorder, first_hour: datetime
+) -> None:
+    """Test periods which are not fully cached are read from the database."""
+    cache = recorder_mock.recent_states
+    end_time = first_hour + timedelta(hours=1)
+
+    assert cache.get(ENTITY_IDS, first_hour.timestamp(), None) is None
+    assert cache.get(["light.kitchen"], end_time.timestamp(), None) is None
+    with patch(
+        "homeassistant.components.recorder.history.modern.execute_stmt_lambda_element",
+        wraps=history.modern.execute_stmt_lambda_element,
+    ) as execute_mock:
+        states = await recorder_mock.async_add_executor_job(
+            history.get_significant_states,
+            hass,
+            first_hour - timedelta(minutes=5),
+            end_time,
+            ENTITY_IDS,
+        )
+    assert execute_mock.called
+    assert len(states["sensor.temperature"]) == 2
+    assert len(states["climate.house"]) == 3
+
+
+async def test_last_reported_is_updated(
+    hass: HomeAssistant,
+    recorder_mock: Recorder,
+    freezer: FrozenDateTimeFactory,
+    first_hour: datetime,
+) -> None:
+    """Test the cached rows have the last_reported time of the database rows."""
+    start_time = first_hour + timedelta(hours=5)
+    freezer.move_to(start_time + timedelta(minutes=1))
+    hass.states.async_set("sensor.temperature", "12", {"unit_of_measurement": "°C"})
+    await async_wait_recording_done(hass)
+    for minute in (2, 3):
+        freezer.move_to(start_time + timedelta(minutes=minute))
+        hass.states.async_set("sensor.temperature", "12", {"unit_of_measurement": "°C"})
+    freezer.move_to(start_time + timedelta(minutes=4))
+    hass.states.async_set("sensor.temperature", "13", {"unit_of_measurement": "°C"})
+    await async_wait_recording_done(hass)
+
+    cached = await _async_history_queries(hass, recorder_mock, start_time, None)
+    rows = recorder_mock.recent_states.get(
+        ["sensor.temperature"], start_time.timestamp(), None
+    )
+    assert rows is not None
+    assert rows["sensor.temperature"][1][0][2] == (
+        (start_time + timedelta(minutes=3)).timestamp()
+    )
+
+    recorder_mock.recent_states.clear()
+    assert await _async_history_queries(hass, recorder_mock, start_time, None) == (
+        cached
+    )
+
+
+async def test_least_recently_used_entities_are_evicted(
+    hass: HomeAssistant,
+    recorder_mock: Recorder,
+    freezer: FrozenDateTimeFactory,
+    first_hour: datetime,
+) -> None:
+    """Test the entities least recently used are evicted to limit memory use."""
+    cache = recorder_mock.recent_states
+    start_time_ts = (first_hour + timedelta(hours=1)).timestamp()
+    assert cache.get(["climate.house"], start_time_ts, None)
+    assert cache.get(["sensor.temperature"], start_time_ts, None)
+
+    cache.max_size = cache.size - 1
+    freezer.move_to(first_hour + timedelta(hours=6))
+    hass.states.async_set("light.kitchen", "on")
+    await async_wait_recording_done(hass)
+
+    assert cache.size <= cache.max_size
+    assert cache.get(["media_player.living_room"], start_time_ts, None) is None
+    assert cache.get(["climate.house"], start_time_ts, None)
+    assert cache.get(["sensor.temperature"], start_time_ts, None)
+
+
+async def test_purge_removes_cached_states(
+    hass: HomeAssistant,
+    recorder_mock: Recorder,
+    freezer: FrozenDateTimeFactory,
+    first_hour: datetime,
+) -> None:
+    """Test purged states are removed from the cache."""
+    cache = recorder_mock.recent_states
+    purge_before = first_hour + timedelta(hours=2)
+
+    recorder_mock.queue_task(PurgeTask(purge_before, False, False))
+    await async_wait_purge_done(hass)
+    assert cache.get(ENTITY_IDS, purge_before.timestamp(), None) is None
+    assert cache.get(ENTITY_IDS, purge_before.timestamp() + 1, None)
+
+    recorder_mock.queue_task(
+        PurgeEntitiesTask(lambda entity_id: entity_id == "climate.house", purge_before)
+    )
+    await async_wait_purge_done(hass)
+    assert cache.get(["climate.house"], purge_before.timestamp() + 1, None) is None
+    assert cache.get(["sensor.temperature"], purge_before.timestamp() + 1, None)
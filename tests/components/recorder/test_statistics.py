@@ -1,14 +1,19 @@
 """The tests for sensor recorder platform."""
 
-from datetime import timedelta
+from datetime import datetime, timedelta
 from unittest.mock import patch
 
 import pytest
 from sqlalchemy import select
 
 from homeassistant.components import recorder
-from homeassistant.components.recorder import Recorder, history, statistics
-from homeassistant.components.recorder.db_schema import StatisticsShortTerm
+from homeassistant.components.recorder import Recorder, history, statistics, tasks
+from homeassistant.components.recorder.db_schema import (
+    StatisticsDaily,
+    StatisticsMeta,
+    StatisticsMonthly,
+    StatisticsShortTerm,
+)
 from homeassistant.components.recorder.models import (
     datetime_to_timestamp_or_none,
     process_timestamp,
@@ -2468,3 +2473,220 @@ async def test_change_with_none(
         types={"change"},
     )
     assert stats == {}
+
+
+ROLLUP_START = dt_util.as_utc(dt_util.parse_datetime("2022-09-20 00:00:00"))
+ROLLUP_PERIODS = ("day", "week", "month")
+ROLLUP_TYPES = ({"max", "mean", "min"}, {"change", "last_reset", "state", "sum"})
+
+
+async def _async_import_rollup_statistics(hass: HomeAssistant) -> None:
+    """Import hourly statistics of a mean and a sum from Sep 20 to Nov 10."""
+    mean_statistics = []
+    sum_statistics = []
+    for hour in range(51 * 24):
+        if 400 <= hour < 460:
+            # A gap of two and a half days
+            continue
+        start = ROLLUP_START + timedelta(hours=hour)
+        mean_statistics.append(
+            {
+                "start": start,
+                "mean": hour % 17,
+                "min": hour % 17 - hour % 5,
+                "max": hour % 17 + hour % 3,
+            }
+        )
+        sum_statistics.append({"start": start, "state": hour % 11, "sum": hour * 2})
+    for statistic_id, has_mean, stats in (
+        ("sensor.mean", True, mean_statistics),
+        ("sensor.sum", False, sum_statistics),
+    ):
+        async_import_statistics(
+            hass,
+            {
+                "has_mean": has_mean,
+                "has_sum": not has_mean,
+                "name": None,
+                "source": "recorder",
+                "statistic_id": statistic_id,
+                "unit_of_measurement": "kWh",
+            },
+            stats,
+        )
+    await async_wait_recording_done(hass)
+
+
+async def _async_compile_rollups(hass: HomeAssistant) -> None:
+    """Roll up the statistics."""
+    recorder.get_instance(hass).queue_task(tasks.CompileMissingRollupsTask())
+    await async_wait_recording_done(hass)
+
+
+def _assert_rollups_match_hourly_statistics(
+    hass: HomeAssistant, end_time: datetime | None = None
+) -> None:
+    """Assert the statistics from the rollups match the reduced statistics."""
+    for period in ROLLUP_PERIODS:
+        for types in ROLLUP_TYPES:
+            stats = statistics_during_period(
+                hass,
+                ROLLUP_START,
+                end_time,
+                {"sensor.mean", "sensor.sum"},
+                period,
+                types=types,
+            )
+            with patch.object(statistics, "_rollup_end_ts", return_value=None):
+                reduced_stats = statistics_during_period(
+                    hass,
+                    ROLLUP_START,
+                    end_time,
+                    {"sensor.mean", "sensor.sum"},
+                    period,
+                    types=types,
+                )
+            assert stats
+            assert stats.keys() == reduced_stats.keys()
+            for statistic_id, rows in stats.items():
+                # The mean of converted means may differ in the last digit
+                assert rows == [
+                    pytest.approx(row) for row in reduced_stats[statistic_id]
+                ]
+
+
+def _get_rollup_starts(
+    hass: HomeAssistant, table: type[StatisticsDaily | StatisticsMonthly]
+) -> list[datetime]:
+    """Return the start of the rolled up periods of sensor.sum."""
+    with session_scope(hass=hass, read_only=True) as session:
+        return [
+            dt_util.as_local(dt_util.utc_from_timestamp(start_ts))
+            for start_ts in session.scalars(
+                select(table.start_ts)
+                .join(StatisticsMeta, table.metadata_id == StatisticsMeta.id)
+                .filter(StatisticsMeta.statistic_id == "sensor.sum")
+                .order_by(table.start_ts)
+            )
+        ]
+
+
+@pytest.mark.parametrize(
+    "timezone", ["America/Regina", "Europe/Vienna", "Asia/Kolkata"]
+)
+@pytest.mark.freeze_time("2022-12-01 00:00:00+00:00")
+async def test_rollup_statistics(
+    hass: HomeAssistant, setup_recorder: None, timezone: str
+) -> None:
+    """Test the statistics of days and months are rolled up."""
+    await hass.config.async_set_time_zone(timezone)
+    await _async_import_rollup_statistics(hass)
+
+    instance = recorder.get_instance(hass)
+    # The rollups are compiled in chunks
+    with patch.object(statistics, "MAX_ROLLUP_PERIODS_PER_RUN", 10):
+        runs = 1
+        while not await instance.async_add_executor_job(
+            statistics.compile_missing_rollups, instance
+        ):
+            runs += 1
+    assert runs == 6
+
+    daily_starts = _get_rollup_starts(hass, StatisticsDaily)
+    # The days of the gap without statistics are skipped
+    assert len(daily_starts) == (51 if timezone == "America/Regina" else 50)
+    assert daily_starts[0] == dt_util.as_local(ROLLUP_START).replace(hour=0, minute=0)
+    assert all(start.hour == start.minute == 0 for start in daily_starts)
+    # November only ended in Vienna and Kolkata before the last compiled hour
+    assert [
+        (start.month, start.day)
+        for start in _get_rollup_starts(hass, StatisticsMonthly)
+    ] == [(9, 1), (10, 1)] + ([(11, 1)] if timezone != "America/Regina" else [])
+
+    _assert_rollups_match_hourly_statistics(hass)
+    _assert_rollups_match_hourly_statistics(
+        hass, dt_util.as_utc(dt_util.parse_datetime("2022-10-20 12:00:00"))
+    )
+
+    # Only the rollups are read for periods which were rolled up
+    with patch.object(
+        statistics,
+        "_generate_statistics_during_period_stmt",
+        wraps=statistics._generate_statistics_during_period_stmt,
+    ) as stmt_mock:
+        statistics_during_period(
+            hass,
+            ROLLUP_START,
+            dt_util.as_utc(dt_util.parse_datetime("2022-10-20 12:00:00")),
+            {"sensor.sum"},
+            "day",
+        )
+    assert [call.args[3] for call in stmt_mock.call_args_list] == [StatisticsDaily]
+
+
+@pytest.mark.freeze_time("2022-12-01 00:00:00+00:00")
+async def test_rollup_statistics_are_updated(
+    hass: HomeAssistant, setup_recorder: None
+) -> None:
+    """Test the rollups are updated when the hourly statistics change."""
+    await hass.config.async_set_time_zone("Europe/Vienna")
+    await _async_import_rollup_statistics(hass)
+    await _async_compile_rollups(hass)
+    instance = recorder.get_instance(hass)
+
+    async_import_statistics(
+        hass,
+        {
+            "has_mean": False,
+            "has_sum": True,
+            "name": None,
+            "source": "recorder",
+            "statistic_id": "sensor.sum",
+            "unit_of_measurement": "kWh",
+        },
+        [
+            {
+                "start": ROLLUP_START + timedelta(days=10, hours=5),
+                "state": 100,
+                "sum": 1000,
+            },
+            # A new hour in the gap
+            {"start": ROLLUP_START + timedelta(hours=420), "state": 0, "sum": 850},
+        ],
+    )
+    await async_wait_recording_done(hass)
+    _assert_rollups_match_hourly_statistics(hass)
+
+    instance.async_adjust_statistics(
+        "sensor.sum", ROLLUP_START + timedelta(days=20, hours=7), 50, "kWh"
+    )
+    await async_wait_recording_done(hass)
+    _assert_rollups_match_hourly_statistics(hass)
+
+    instance.async_change_statistics_unit(
+        "sensor.mean", new_unit_of_measurement="Wh", old_unit_of_measurement="kWh"
+    )
+    await async_wait_recording_done(hass)
+    _assert_rollups_match_hourly_statistics(hass)
+
+
+@pytest.mark.freeze_time("2022-12-01 00:00:00+00:00")
+async def test_rollup_statistics_time_zone_change(
+    hass: HomeAssistant, setup_recorder: None, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test the rollups are compiled again when the time zone changes."""
+    await hass.config.async_set_time_zone("Europe/Vienna")
+    await _async_import_rollup_statistics(hass)
+    await _async_compile_rollups(hass)
+
+    await hass.config.async_set_time_zone("America/Regina")
+    # The rollups of the old time zone are not used
+    _assert_rollups_match_hourly_statistics(hass)
+
+    await _async_compile_rollups(hass)
+    assert "The time zone changed, compiling statistics_daily again" in caplog.text
+    assert all(
+        start.hour == start.minute == 0
+        for start in _get_rollup_starts(hass, StatisticsDaily)
+    )
+    _assert_rollups_match_hourly_statistics(hass)
@@ -1,9 +1,10 @@
 """Test auth of websocket API."""
 
-from unittest.mock import patch
+from unittest.mock import ANY, patch
 
 import aiohttp
 from aiohttp import WSMsgType
+import ormsgpack
 import pytest
 
 from homeassistant.auth.providers.homeassistant import HassAuthProvider
@@ -21,6 +22,7 @@ from homeassistant.components.websocket_api.const import (
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.setup import async_setup_component
+from homeassistant.util.json import json_loads
 
 from tests.typing import ClientSessionGenerator
 
@@ -127,6 +129,123 @@ async def test_auth_active_with_token(
     assert auth_msg["type"] == TYPE_AUTH_OK
 
 
+async def test_auth_with_msgpack_encoding(
+    hass: HomeAssistant, no_auth_websocket_client, hass_access_token: str
+) -> None:
+    """Test the messages after auth are sent as MessagePack if selected."""
+    await no_auth_websocket_client.send_json(
+        {"type": TYPE_AUTH, "access_token": hass_access_token, "encoding": "msgpack"}
+    )
+    auth_msg = await no_auth_websocket_client.receive_json()
+    assert auth_msg["type"] == TYPE_AUTH_OK
+    assert auth_msg["encoding"] == "msgpack"
+
+    hass.states.async_set("light.kitchen", "off", {"brightness": 100})
+    # Commands are still sent as json
+    await no_auth_websocket_client.send_json(
+        {"id": 5, "type": "subscribe_events", "event_type": "state_changed"}
+    )
+    await no_auth_websocket_client.send_json({"id": 6, "type": "subscribe_entities"})
+    await no_auth_websocket_client.send_json({"id": 7, "type": "get_states"})
+    msg = ormsgpack.unpackb(await no_auth_websocket_client.receive_bytes())
+    assert msg == {"id": 5, "type": "result", "success": True, "result": None}
+    msg = ormsgpack.unpackb(await no_auth_websocket_client.receive_bytes())
+    assert msg == {"id": 6, "type": "result", "success": True, "result": None}
+    msg = ormsgpack.unpackb(await no_auth_websocket_client.receive_bytes())
+    assert msg["id"] == 6
+    assert msg["event"]["a"]["light.kitchen"]["s"] == "off"
+    msg = ormsgpack.unpackb(await no_auth_websocket_client.receive_bytes())
+    assert msg["id"] == 7
+    assert msg["result"][0]["attributes"] == {"brightness": 100}
+
+    hass.states.async_set("light.kitchen", "on", {"brightness": 100})
+    msg = ormsgpack.unpackb(await no_auth_websocket_client.receive_bytes())
+    assert msg["id"] == 5
+    assert msg["type"] == "event"
+    assert msg["event"]["data"]["new_state"]["state"] == "on"
+    msg = ormsgpack.unpackb(await no_auth_websocket_client.receive_bytes())
+    assert msg == {
+        "id": 6,
+        "type": "event",
+        "event": {"c": {"light.kitchen": {"+": {"s": "on", "c": ANY, "lc": ANY}}}},
+    }
+
+
+async def test_subscribe_entities_with_msgpack_encoding(
+    hass: HomeAssistant, no_auth_websocket_client, hass_access_token: str
+) -> None:
+    """Test the entity snapshot and states are packed for MessagePack clients."""
+    await no_auth_websocket_client.send_json(
+        {"type": TYPE_AUTH, "access_token": hass_access_token, "encoding": "msgpack"}
+    )
+    auth_msg = await no_auth_websocket_client.receive_json()
+    assert auth_msg["encoding"] == "msgpack"
+
+    hass.states.async_set("light.kitchen", "on", {"brightness": 100, "rgb": [1, 2]})
+    hass.states.async_set("light.bed", "off", {"effects": {"colorloop"}})
+    hass.states.async_set("light.broken", "on", {"bad": object()})
+    kitchen = hass.states.get("light.kitchen")
+    bed = hass.states.get("light.bed")
+
+    await no_auth_websocket_client.send_json(
+        {
+            "id": 5,
+            "type": "subscribe_entities",
+            "entity_ids": ["light.kitchen", "light.bed"],
+        }
+    )
+    msg = ormsgpack.unpackb(await no_auth_websocket_client.receive_bytes())
+    assert msg == {"id": 5, "type": "result", "success": True, "result": None}
+    msg = ormsgpack.unpackb(await no_auth_websocket_client.receive_bytes())
+    assert msg == {
+        "id": 5,
+        "type": "event",
+        "event": {
+            "a": {
+                "light.kitchen": {
+                    "s": "on",
+                    "a": {"brightness": 100, "rgb": [1, 2]},
+                    "c": kitchen.context.id,
+                    "lc": kitchen.last_changed_timestamp,
+                },
+                "light.bed": {
+                    "s": "off",
+                    "a": {"effects": ["colorloop"]},
+                    "c": bed.context.id,
+                    "lc": bed.last_changed_timestamp,
+                },
+            }
+        },
+    }
+
+    # States that can not be packed are skipped in both responses
+    await no_auth_websocket_client.send_json({"id": 6, "type": "subscribe_entities"})
+    msg = ormsgpack.unpackb(await no_auth_websocket_client.receive_bytes())
+    assert msg["success"]
+    msg = ormsgpack.unpackb(await no_auth_websocket_client.receive_bytes())
+    assert msg["id"] == 6
+    assert set(msg["event"]["a"]) == {"light.kitchen", "light.bed"}
+
+    await no_auth_websocket_client.send_json({"id": 7, "type": "get_states"})
+    msg = ormsgpack.unpackb(await no_auth_websocket_client.receive_bytes())
+    assert msg["id"] == 7
+    # The states are the same as the states sent to JSON clients
+    assert msg["result"] == [
+        json_loads(kitchen.as_dict_json),
+        json_loads(bed.as_dict_json),
+    ]
+
+
+async def test_auth_with_unknown_encoding(no_auth_websocket_client) -> None:
+    """Test an unknown encoding is refused."""
+    await no_auth_websocket_client.send_json(
+        {"type": TYPE_AUTH, "access_token": "token", "encoding": "xml"}
+    )
+    msg = await no_auth_websocket_client.receive_json()
+    assert msg["type"] == TYPE_AUTH_INVALID
+    assert msg["message"].startswith("Auth message incorrectly formatted")
+
+
 async def test_auth_active_user_inactive(
     hass: HomeAssistant,
     hass_client_no_auth: ClientSessionGenerator,
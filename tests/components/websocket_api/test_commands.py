@@ -2,10 +2,12 @@
 
 import asyncio
 from copy import deepcopy
+from datetime import timedelta
 import logging
 from typing import Any
 from unittest.mock import ANY, AsyncMock, Mock, patch
 
+from freezegun.api import FrozenDateTimeFactory
 import pytest
 import voluptuous as vol
 
@@ -17,9 +19,16 @@ from homeassistant.components.websocket_api.auth import (
     TYPE_AUTH_OK,
     TYPE_AUTH_REQUIRED,
 )
-from homeassistant.components.websocket_api.const import FEATURE_COALESCE_MESSAGES, URL
+from homeassistant.components.websocket_api.const import (
+    ENTITY_RESUME_WINDOW,
+    FEATURE_COALESCE_MESSAGES,
+    URL,
+)
+from homeassistant.components.websocket_api.entity_subscriptions import (
+    EntityChangeJournal,
+)
 from homeassistant.config_entries import ConfigEntryState
-from homeassistant.const import SIGNAL_BOOTSTRAP_INTEGRATIONS
+from homeassistant.const import EVENT_STATE_CHANGED, SIGNAL_BOOTSTRAP_INTEGRATIONS
 from homeassistant.core import Context, HomeAssistant, State, SupportsResponse, callback
 from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
 from homeassistant.helpers import device_registry as dr
@@ -33,6 +42,7 @@ from tests.common import (
     MockEntity,
     MockEntityPlatform,
     MockUser,
+    async_fire_time_changed,
     async_mock_service,
     mock_platform,
 )
@@ -1261,6 +1271,212 @@ async def test_subscribe_unsubscribe_entities_specific_entities(
     }
 
 
+async def test_subscribe_entities_share_listener(
+    hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test subscribe entities of all connections share one listener."""
+    hass.states.async_set("light.kitchen", "off")
+    hass.states.async_set("light.hallway", "off")
+    clients = [await hass_ws_client(hass) for _ in range(4)]
+    init_count = hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0)
+
+    subscriptions = [
+        (clients[0], 5, None),
+        (clients[1], 5, None),
+        (clients[2], 7, ["light.kitchen"]),
+        (clients[3], 8, ["light.hallway"]),
+    ]
+    for client, msg_id, entity_ids in subscriptions:
+        msg = {"id": msg_id, "type": "subscribe_entities"}
+        if entity_ids:
+            msg["entity_ids"] = entity_ids
+        await client.send_json(msg)
+        assert (await client.receive_json())["success"]
+        assert (await client.receive_json())["event"]["a"]
+    assert hass.bus.async_listeners()[EVENT_STATE_CHANGED] == init_count + 1
+
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("light.hallway", "on")
+    for client, msg_id, entity_ids in subscriptions:
+        for entity_id in entity_ids or ["light.kitchen", "light.hallway"]:
+            msg = await client.receive_json()
+            assert msg["id"] == msg_id
+            assert msg["event"] == {
+                "c": {entity_id: {"+": {"s": "on", "c": ANY, "lc": ANY}}}
+            }
+
+    for client, msg_id, _ in subscriptions:
+        await client.send_json(
+            {"id": msg_id + 1, "type": "unsubscribe_events", "subscription": msg_id}
+        )
+        assert (await client.receive_json())["success"]
+    assert hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0) == init_count
+
+
+async def test_subscribe_entities_coalesce_when_congested(
+    hass: HomeAssistant, websocket_client: MockHAClientWebSocket
+) -> None:
+    """Test subscribe entities merges changes while the client falls behind."""
+    hass.states.async_set("light.kitchen", "off")
+    hass.states.async_set("light.hallway", "off")
+    hass.states.async_set("light.porch", "off")
+    await websocket_client.send_json({"id": 7, "type": "subscribe_entities"})
+    assert (await websocket_client.receive_json())["success"]
+    assert (await websocket_client.receive_json())["event"]["a"]
+
+    with patch("homeassistant.components.websocket_api.http.PENDING_MSG_COALESCE", 1):
+        hass.states.async_set("light.kitchen", "on")
+        # The first message is still pending, the next changes are merged
+        hass.states.async_set("light.kitchen", "off", {"brightness": 10})
+        hass.states.async_set("light.kitchen", "dim", {"brightness": 20})
+        hass.states.async_set("light.hallway", "on")
+        hass.states.async_set("light.new", "on")
+        hass.states.async_remove("light.new")
+        hass.states.async_remove("light.porch")
+
+        msg = await websocket_client.receive_json()
+        assert msg["id"] == 7
+        assert msg["event"] == {
+            "c": {"light.kitchen": {"+": {"s": "on", "c": ANY, "lc": ANY}}}
+        }
+        msg = await websocket_client.receive_json()
+        assert msg["id"] == 7
+        assert msg["event"] == {
+            "c": {
+                "light.kitchen": {
+                    "+": {"s": "dim", "a": {"brightness": 20}, "c": ANY, "lc": ANY}
+                },
+                "light.hallway": {"+": {"s": "on", "c": ANY, "lc": ANY}},
+            },
+            "r": ["light.porch"],
+        }
+
+        # Changes are sent right away once the client caught up
+        hass.states.async_set("light.hallway", "off")
+        msg = await websocket_client.receive_json()
+        assert msg["event"] == {
+            "c": {"light.hallway": {"+": {"s": "off", "c": ANY, "lc": ANY}}}
+        }
+
+
+async def test_subscribe_entities_resume(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test resuming a subscribe entities subscription after reconnecting."""
+    hass.states.async_set("light.kitchen", "off")
+    hass.states.async_set("light.porch", "off")
+    hass.states.async_set("switch.other", "off")
+    init_count = hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0)
+
+    client = await hass_ws_client(hass)
+    await client.send_json(
+        {
+            "id": 5,
+            "type": "subscribe_entities",
+            "entity_ids": ["light.kitchen", "light.porch", "light.new"],
+            "resumable": True,
+        }
+    )
+    msg = await client.receive_json()
+    assert msg["result"] == {"resumed": False}
+    msg = await client.receive_json()
+    assert set(msg["event"]["a"]) == {"light.kitchen", "light.porch"}
+    token = msg["event"]["t"]
+
+    hass.states.async_set("light.porch", "on")
+    msg = await client.receive_json()
+    assert msg["event"] == {
+        "c": {"light.porch": {"+": {"s": "on", "c": ANY}}},
+        "t": ANY,
+    }
+    assert msg["event"]["t"] != token
+    token = msg["event"]["t"]
+    await client.close()
+    await hass.async_block_till_done()
+
+    # The journal is kept after the last subscription was removed
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("light.new", "on")
+    hass.states.async_remove("light.porch")
+    hass.states.async_set("switch.other", "on")
+
+    client = await hass_ws_client(hass)
+    await client.send_json(
+        {
+            "id": 5,
+            "type": "subscribe_entities",
+            "entity_ids": ["light.kitchen", "light.porch", "light.new"],
+            "resume_token": token,
+        }
+    )
+    msg = await client.receive_json()
+    assert msg["result"] == {"resumed": True}
+    msg = await client.receive_json()
+    assert set(msg["event"]["a"]) == {"light.kitchen", "light.new"}
+    assert msg["event"]["r"] == ["light.porch"]
+    token = msg["event"]["t"]
+
+    # Invalid tokens get all states
+    await client.send_json(
+        {"id": 6, "type": "subscribe_entities", "resume_token": "invalid"}
+    )
+    msg = await client.receive_json()
+    assert msg["result"] == {"resumed": False}
+    msg = await client.receive_json()
+    assert set(msg["event"]["a"]) == {"light.kitchen", "light.new", "switch.other"}
+    assert "r" not in msg["event"]
+    await client.close()
+    await hass.async_block_till_done()
+
+    # The journal expires after the resume window
+    freezer.tick(timedelta(seconds=ENTITY_RESUME_WINDOW + 1))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0) == init_count
+
+    client = await hass_ws_client(hass)
+    await client.send_json(
+        {"id": 5, "type": "subscribe_entities", "resume_token": token}
+    )
+    msg = await client.receive_json()
+    assert msg["result"] == {"resumed": False}
+    msg = await client.receive_json()
+    assert set(msg["event"]["a"]) == {"light.kitchen", "light.new", "switch.other"}
+
+
+async def test_entity_change_journal_is_bounded() -> None:
+    """Test resume tokens expire once their changes left the journal."""
+    journal = EntityChangeJournal()
+    start_token = journal.token
+    with patch(
+        "homeassistant.components.websocket_api.entity_subscriptions.ENTITY_JOURNAL_MAX_SIZE",
+        2,
+    ):
+        journal.async_record("light.kitchen")
+        token = journal.token
+        journal.async_record("light.porch")
+        journal.async_record("light.porch")
+        assert journal.async_changed_since(start_token) == [
+            "light.porch",
+            "light.kitchen",
+        ]
+        journal.async_record("light.hallway")
+
+    assert journal.async_changed_since(start_token) is None
+    assert journal.async_changed_since(token) == ["light.hallway", "light.porch"]
+    assert journal.async_changed_since(journal.token) == []
+    assert journal.async_changed_since(f"{journal.id}.100") is None
+    # Malformed tokens are invalid
+    for position in ("", "-1", "1.5", "²", " 1"):
+        assert journal.async_changed_since(f"{journal.id}.{position}") is None
+    assert journal.async_changed_since("garbage") is None
+
+    journal.async_reset()
+    assert journal.async_changed_since(token) is None
+
+
 async def test_render_template_renders_template(
     hass: HomeAssistant, websocket_client
 ) -> None:
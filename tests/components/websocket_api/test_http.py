@@ -6,6 +6,7 @@ from typing import Any, cast
 from unittest.mock import patch
 
 from aiohttp import ServerDisconnectedError, WSMsgType, web
+from aiohttp.http_websocket import WebSocketWriter
 import pytest
 
 from homeassistant.components.websocket_api import (
@@ -16,10 +17,15 @@ from homeassistant.components.websocket_api import (
 )
 from homeassistant.components.websocket_api.connection import ActiveConnection
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.setup import async_setup_component
 from homeassistant.util.dt import utcnow
 
 from tests.common import async_fire_time_changed
-from tests.typing import MockHAClientWebSocket, WebSocketGenerator
+from tests.typing import (
+    ClientSessionGenerator,
+    MockHAClientWebSocket,
+    WebSocketGenerator,
+)
 
 
 @pytest.fixture
@@ -433,6 +439,51 @@ async def test_enable_coalesce(
         await asyncio.gather(*send_tasks_with_close)
 
 
+async def test_only_large_messages_are_compressed(
+    hass: HomeAssistant,
+    aiohttp_client: ClientSessionGenerator,
+    hass_access_token: str,
+    socket_enabled: None,
+) -> None:
+    """Test only large messages are compressed when compression is negotiated."""
+    for idx in range(20):
+        hass.states.async_set(f"light.kitchen_{idx}", "on", {"brightness": idx})
+    sent: list[tuple[bytes, int]] = []
+    send = WebSocketWriter.send
+
+    async def _send(
+        writer: WebSocketWriter, message: bytes, *args: Any, **kwargs: Any
+    ) -> None:
+        if not writer.use_mask:
+            # Only the client masks its frames
+            sent.append((message, writer.compress))
+        await send(writer, message, *args, **kwargs)
+
+    with patch.object(WebSocketWriter, "send", _send):
+        assert await async_setup_component(hass, "websocket_api", {})
+        client = await aiohttp_client(hass.http.app)
+        websocket_client = await client.ws_connect(const.URL, compress=15)
+        assert websocket_client.compress == 15
+        assert (await websocket_client.receive_json())["type"] == "auth_required"
+        await websocket_client.send_json(
+            {"type": "auth", "access_token": hass_access_token}
+        )
+        assert (await websocket_client.receive_json())["type"] == "auth_ok"
+        sent.clear()
+        for msg_id in range(1, 6):
+            msg_type = "get_states" if msg_id % 2 else "ping"
+            await websocket_client.send_json({"id": msg_id, "type": msg_type})
+            msg = await websocket_client.receive_json()
+            assert msg["id"] == msg_id
+            if msg_type == "get_states":
+                assert len(msg["result"]) == 20
+
+    assert [
+        (len(message) >= const.COMPRESS_MIN_SIZE, compress)
+        for message, compress in sent
+    ] == [(True, 15), (False, 0), (True, 15), (False, 0), (True, 15)]
+
+
 async def test_binary_message(
     hass: HomeAssistant, websocket_client, caplog: pytest.LogCaptureFixture
 ) -> None:
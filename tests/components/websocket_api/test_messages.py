@@ -1,15 +1,22 @@
 """Test Websocket API messages module."""
 
+import ormsgpack
 import pytest
 
 from homeassistant.components.websocket_api.messages import (
+    JSON_ENCODING,
+    MSGPACK_ENCODING,
     _partial_cached_event_message as lru_event_cache,
     _state_diff_event,
     cached_event_message,
+    coalesced_state_diff_event,
     message_to_json_bytes,
+    message_to_msgpack_bytes,
 )
 from homeassistant.const import EVENT_STATE_CHANGED
 from homeassistant.core import Context, Event, HomeAssistant, State, callback
+from homeassistant.helpers.json import json_fragment
+from homeassistant.util.json import json_loads
 
 from tests.common import async_capture_events
 
@@ -281,6 +288,37 @@ async def test_state_diff_event(hass: HomeAssistant) -> None:
     }
 
 
+async def test_coalesced_state_diff_event(hass: HomeAssistant) -> None:
+    """Test merging the changes of multiple entities into one diff."""
+    context = Context(id="id")
+    window_on = State("light.window", "on", context=context)
+    window_off = State("light.window", "off", {"brightness": 10}, context=context)
+    door = State("light.door", "on", context=context)
+    porch = State("light.porch", "on", context=context)
+
+    assert coalesced_state_diff_event({}) == {}
+    assert coalesced_state_diff_event(
+        {
+            "light.window": (window_on, window_off),
+            "light.door": (None, door),
+            "light.porch": (porch, None),
+            "light.gone": (None, None),
+        }
+    ) == {
+        "a": {"light.door": door.as_compressed_state},
+        "c": {
+            "light.window": {
+                "+": {
+                    "a": {"brightness": 10},
+                    "lc": window_off.last_changed_timestamp,
+                    "s": "off",
+                }
+            }
+        },
+        "r": ["light.porch"],
+    }
+
+
 async def test_message_to_json_bytes(caplog: pytest.LogCaptureFixture) -> None:
     """Test we can serialize websocket messages."""
 
@@ -297,5 +335,57 @@ async def test_message_to_json_bytes(caplog: pytest.LogCaptureFixture) -> None:
     assert "Unable to serialize to JSON" in caplog.text
 
 
+async def test_message_to_msgpack_bytes(caplog: pytest.LogCaptureFixture) -> None:
+    """Test we can serialize websocket messages to MessagePack."""
+    assert ormsgpack.unpackb(message_to_msgpack_bytes({"id": 1, "message": {"a"}})) == {
+        "id": 1,
+        "message": ["a"],
+    }
+    assert ormsgpack.unpackb(
+        message_to_msgpack_bytes({"id": 1, "message": json_fragment(b'{"a":1}')})
+    ) == {"id": 1, "message": {"a": 1}}
+    assert ormsgpack.unpackb(
+        message_to_msgpack_bytes({"id": 1, "message": _Unserializeable()})
+    ) == {
+        "id": 1,
+        "type": "result",
+        "success": False,
+        "error": {"code": "unknown_error", "message": "Invalid JSON in response"},
+    }
+    assert "Unable to serialize to JSON" in caplog.text
+
+
+async def test_msgpack_encoding(hass: HomeAssistant) -> None:
+    """Test the MessagePack messages match the json messages."""
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+    hass.states.async_set("light.window", "on", {"color": (1, 2), "names": {"a"}})
+    hass.states.async_set("light.window", "off", {"color": (2, 3), "names": {"a"}})
+    hass.states.async_remove("light.window")
+    await hass.async_block_till_done()
+
+    for message_id in (1, 300, 2**40):
+        for event in events:
+            for attr in ("cached_event_message", "cached_state_diff_message"):
+                json_message = getattr(JSON_ENCODING, attr)(
+                    JSON_ENCODING.message_id(message_id), event
+                )
+                msgpack_message = getattr(MSGPACK_ENCODING, attr)(
+                    MSGPACK_ENCODING.message_id(message_id), event
+                )
+                assert ormsgpack.unpackb(msgpack_message) == json_loads(json_message)
+
+    for count in (1, 15, 16, 2**16):
+        messages = [{"id": idx, "type": "pong"} for idx in range(count)]
+        assert ormsgpack.unpackb(
+            MSGPACK_ENCODING.coalesce(
+                [MSGPACK_ENCODING.message_to_bytes(message) for message in messages]
+            )
+        ) == json_loads(
+            JSON_ENCODING.coalesce(
+                [JSON_ENCODING.message_to_bytes(message) for message in messages]
+            )
+        )
+
+
 class _Unserializeable:
     """A class that cannot be serialized."""
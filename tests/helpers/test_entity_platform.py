@@ -9,9 +9,16 @@ from unittest.mock import ANY, AsyncMock, Mock, patch
 
 import pytest
 
-from homeassistant.const import EVENT_HOMEASSISTANT_STARTED, PERCENTAGE, EntityCategory
+from homeassistant.const import (
+    EVENT_HOMEASSISTANT_STARTED,
+    EVENT_STATE_CHANGED,
+    PERCENTAGE,
+    EntityCategory,
+)
 from homeassistant.core import (
     CoreState,
+    Event,
+    EventStateChangedData,
     HomeAssistant,
     ServiceCall,
     ServiceResponse,
@@ -627,6 +634,49 @@ async def test_async_remove_with_platform_update_finishes(hass: HomeAssistant) -
         assert hass.states.async_entity_ids() == []
 
 
+async def test_async_write_ha_states(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test writing the state of multiple entities in one batch."""
+    platform = MockEntityPlatform(hass)
+    entity1 = MockEntity(entity_id="test_domain.one")
+    entity2 = MockEntity(entity_id="test_domain.two")
+    entity3 = MockEntity(entity_id="test_domain.three")
+    await platform.async_add_entities([entity1, entity2, entity3])
+
+    seen_states: list[list[str]] = []
+
+    @callback
+    def _listener(event: Event[EventStateChangedData]) -> None:
+        seen_states.append(
+            [
+                hass.states.get(entity_id).state
+                for entity_id in ("test_domain.one", "test_domain.two")
+            ]
+        )
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, _listener)
+    entity1._attr_state = "off"
+    entity2._attr_state = "off"
+    entity3._attr_state = "x" * 256
+    await platform.async_remove_entity("test_domain.three")
+    entity3.hass = hass
+    platform.async_write_ha_states([entity1, entity2, entity3])
+    await hass.async_block_till_done()
+
+    # Removed entities are skipped and all states are
+    # written before the state changed events are fired
+    assert seen_states[-2:] == [["off", "off"], ["off", "off"]]
+    assert hass.states.get("test_domain.three") is None
+
+    entity4 = MockEntity(entity_id="test_domain.four")
+    await platform.async_add_entities([entity4])
+    entity4._attr_state = "x" * 256
+    platform.async_write_ha_states([entity4])
+    assert hass.states.get("test_domain.four").state == "unknown"
+    assert "Failed to set state for test_domain.four" in caplog.text
+
+
 async def test_not_adding_duplicate_entities_with_unique_id(
     hass: HomeAssistant,
     entity_registry: er.EntityRegistry,
@@ -552,6 +552,34 @@ async def test_async_track_state_change_event_with_empty_list(
     unsub_single()
 
 
+async def test_async_track_state_change_event_match_all_is_not_a_wildcard(
+    hass: HomeAssistant,
+) -> None:
+    """Test tracking MATCH_ALL as an entity_id does not track every entity."""
+    entity_runs: list[Event[EventStateChangedData]] = []
+    domain_runs: list[Event[EventStateChangedData]] = []
+
+    @ha.callback
+    def entity_run_callback(event: Event[EventStateChangedData]) -> None:
+        entity_runs.append(event)
+
+    @ha.callback
+    def domain_run_callback(event: Event[EventStateChangedData]) -> None:
+        domain_runs.append(event)
+
+    unsub_entity = async_track_state_change_event(hass, MATCH_ALL, entity_run_callback)
+    # Only the domain trackers run listeners of MATCH_ALL for every event
+    unsub_domain = async_track_state_added_domain(hass, MATCH_ALL, domain_run_callback)
+
+    hass.states.async_set("light.bowl", "on")
+    await hass.async_block_till_done()
+    assert len(entity_runs) == 0
+    assert len(domain_runs) == 1
+
+    unsub_entity()
+    unsub_domain()
+
+
 async def test_async_track_state_added_domain(hass: HomeAssistant) -> None:
     """Test async_track_state_added_domain."""
     single_entity_id_tracker = []
@@ -2169,6 +2197,49 @@ async def test_track_template_result_and_conditional_upper_case(
     assert specific_runs[2] == "on"
 
 
+async def test_track_template_result_state_values_only(hass: HomeAssistant) -> None:
+    """Test templates only reading state values skip attribute changes."""
+    state_runs = []
+    attribute_runs = []
+    template_state = Template(
+        "{{ states.sensor | selectattr('state', 'eq', 'on') | list | count }}", hass
+    )
+    template_attribute = Template(
+        "{{ states.sensor | map(attribute='attributes.power') | sum }}", hass
+    )
+
+    hass.states.async_set("sensor.one", "off", {"power": 1})
+    hass.states.async_set("sensor.two", "off", {"power": 2})
+
+    async_track_template_result(
+        hass,
+        [TrackTemplate(template_state, None, rate_limit=0)],
+        ha.callback(lambda event, updates: state_runs.append(updates[0].result)),
+    ).async_refresh()
+    async_track_template_result(
+        hass,
+        [TrackTemplate(template_attribute, None, rate_limit=0)],
+        ha.callback(lambda event, updates: attribute_runs.append(updates[0].result)),
+    ).async_refresh()
+    await hass.async_block_till_done()
+    renders = template_state._renders
+
+    hass.states.async_set("sensor.one", "off", {"power": 5})
+    await hass.async_block_till_done()
+    assert template_state._renders == renders
+    assert attribute_runs == [3, 7]
+
+    hass.states.async_set("sensor.one", "on", {"power": 5})
+    await hass.async_block_till_done()
+    assert state_runs == [0, 1]
+
+    # A new entity in the domain always re-renders
+    hass.states.async_set("sensor.three", "on", {"power": 3})
+    await hass.async_block_till_done()
+    assert state_runs == [0, 1, 2]
+    assert attribute_runs == [3, 7, 10]
+
+
 async def test_track_template_result_iterator(hass: HomeAssistant) -> None:
     """Test tracking template."""
     iterator_runs = []
@@ -3935,6 +4006,139 @@ async def test_periodic_task_minute(
     assert len(specific_runs) == 2
 
 
+async def test_periodic_task_shared_pattern(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test listeners with the same pattern share the next time calculation."""
+    first_runs = []
+    second_runs = []
+    other_runs = []
+
+    now = dt_util.utcnow()
+
+    time_that_will_not_match_right_away = datetime(
+        now.year + 1, 5, 24, 11, 59, 55, tzinfo=dt_util.UTC
+    )
+    freezer.move_to(time_that_will_not_match_right_away)
+
+    with patch(
+        "homeassistant.helpers.event.dt_util.find_next_time_expression_time",
+        wraps=dt_util.find_next_time_expression_time,
+    ) as mock_find_next:
+        unsub_first = async_track_utc_time_change(
+            hass,
+            # pylint: disable-next=unnecessary-lambda
+            callback(lambda x: first_runs.append(x)),
+            minute="/5",
+            second=0,
+        )
+        unsub_second = async_track_utc_time_change(
+            hass,
+            # pylint: disable-next=unnecessary-lambda
+            callback(lambda x: second_runs.append(x)),
+            minute="/5",
+            second=0,
+        )
+        unsub_other = async_track_utc_time_change(
+            hass,
+            # pylint: disable-next=unnecessary-lambda
+            callback(lambda x: other_runs.append(x)),
+            minute="/5",
+            second=0,
+            local=True,
+        )
+        # One calculation for each distinct pattern
+        assert mock_find_next.call_count == 2
+
+        async_fire_time_changed(
+            hass, datetime(now.year + 1, 5, 24, 12, 0, 0, 999999, tzinfo=dt_util.UTC)
+        )
+        await hass.async_block_till_done()
+        assert len(first_runs) == 1
+        assert len(second_runs) == 1
+        assert len(other_runs) == 1
+        assert mock_find_next.call_count == 4
+
+    unsub_first()
+    unsub_first()
+
+    async_fire_time_changed(
+        hass, datetime(now.year + 1, 5, 24, 12, 5, 0, 999999, tzinfo=dt_util.UTC)
+    )
+    await hass.async_block_till_done()
+    assert len(first_runs) == 1
+    assert len(second_runs) == 2
+    assert len(other_runs) == 2
+
+    unsub_second()
+    unsub_other()
+
+    async_fire_time_changed(
+        hass, datetime(now.year + 1, 5, 24, 12, 10, 0, 999999, tzinfo=dt_util.UTC)
+    )
+    await hass.async_block_till_done()
+    assert len(second_runs) == 2
+    assert len(other_runs) == 2
+
+    # A new listener after all others were removed starts a new timer
+    unsub_first = async_track_utc_time_change(
+        hass,
+        # pylint: disable-next=unnecessary-lambda
+        callback(lambda x: first_runs.append(x)),
+        minute="/5",
+        second=0,
+    )
+    async_fire_time_changed(
+        hass, datetime(now.year + 1, 5, 24, 12, 15, 0, 999999, tzinfo=dt_util.UTC)
+    )
+    await hass.async_block_till_done()
+    assert len(first_runs) == 2
+    unsub_first()
+
+
+async def test_periodic_task_duplicate_job(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test each registration of the same action runs and is removed on its own."""
+    runs = []
+    now = dt_util.utcnow()
+
+    time_that_will_not_match_right_away = datetime(
+        now.year + 1, 5, 24, 11, 59, 55, tzinfo=dt_util.UTC
+    )
+    freezer.move_to(time_that_will_not_match_right_away)
+
+    # pylint: disable-next=unnecessary-lambda
+    action = callback(lambda x: runs.append(x))
+    unsub_first = async_track_utc_time_change(hass, action, minute="/5", second=0)
+    unsub_second = async_track_utc_time_change(hass, action, minute="/5", second=0)
+
+    async_fire_time_changed(
+        hass, datetime(now.year + 1, 5, 24, 12, 0, 0, 999999, tzinfo=dt_util.UTC)
+    )
+    await hass.async_block_till_done()
+    assert len(runs) == 2
+
+    unsub_first()
+    unsub_first()
+
+    async_fire_time_changed(
+        hass, datetime(now.year + 1, 5, 24, 12, 5, 0, 999999, tzinfo=dt_util.UTC)
+    )
+    await hass.async_block_till_done()
+    assert len(runs) == 3
+
+    unsub_second()
+
+    async_fire_time_changed(
+        hass, datetime(now.year + 1, 5, 24, 12, 10, 0, 999999, tzinfo=dt_util.UTC)
+    )
+    await hass.async_block_till_done()
+    assert len(runs) == 3
+
+
 async def test_periodic_task_hour(
     hass: HomeAssistant,
     freezer: FrozenDateTimeFactory,
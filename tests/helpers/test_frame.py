@@ -247,3 +247,35 @@ async def test_report_error_if_integration(
         ),
     ):
         frame.report("did a bad thing", error_if_integration=True)
+
+
+async def test_extract_frame_integration_from_frame() -> None:
+    """Test extracting the integration frame from a passed frame."""
+    stack = extract_stack_to_frame(
+        [
+            Mock(
+                filename="/home/paulus/homeassistant/core.py",
+                lineno="23",
+                line="do_something()",
+            ),
+            correct_frame := Mock(
+                filename="/home/paulus/homeassistant/components/mqtt/discovery.py",
+                lineno="42",
+                line="self.discover()",
+            ),
+            Mock(
+                filename="/home/paulus/homeassistant/util/json.py",
+                lineno="2",
+                line="something()",
+            ),
+        ]
+    )
+    integration_frame = frame.get_integration_frame(frame=stack)
+    assert integration_frame.integration == "mqtt"
+    assert integration_frame.frame is correct_frame
+    assert integration_frame.relative_filename == (
+        "homeassistant/components/mqtt/discovery.py"
+    )
+
+    with pytest.raises(frame.MissingIntegrationFrame):
+        frame.get_integration_frame(frame=stack.f_back.f_back)
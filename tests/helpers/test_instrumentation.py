@@ -0,0 +1,167 @@
+"""Test the event bus instrumentation helper."""
+
+from datetime import timedelta
+from functools import partial
+import gc
+
+import pytest
+
+from homeassistant.core import Event, HomeAssistant, ServiceCall, callback
+from homeassistant.helpers import instrumentation
+from homeassistant.helpers.dispatcher import (
+    async_dispatcher_connect,
+    async_dispatcher_send,
+)
+from homeassistant.helpers.event import async_call_later, async_track_state_change_event
+import homeassistant.util.dt as dt_util
+
+from tests.common import async_fire_time_changed
+
+
+def test_listener_stats_percentile() -> None:
+    """Test estimating run time percentiles from the histogram."""
+    listener_stats = instrumentation.ListenerStats("listener", "test", "test_event")
+    assert listener_stats.percentile(99) == 0.0
+
+    for _ in range(99):
+        listener_stats.record(0.00005)
+    listener_stats.record(0.3)
+
+    assert listener_stats.calls == 100
+    assert listener_stats.max_time == 0.3
+    assert listener_stats.percentile(50) == 0.0001
+    assert listener_stats.percentile(99) == 0.0001
+    assert listener_stats.percentile(100) == 0.3
+
+    listener_stats.record(10.0)
+    assert listener_stats.histogram[-1] == 1
+    assert listener_stats.percentile(100) == 10.0
+
+
+async def test_enable_disable(hass: HomeAssistant) -> None:
+    """Test enabling and disabling the instrumentation."""
+    assert instrumentation.async_get(hass) is None
+
+    bus_instrumentation = instrumentation.async_enable(hass)
+    assert instrumentation.async_enable(hass) is bus_instrumentation
+    assert instrumentation.async_get(hass) is bus_instrumentation
+
+    hass.bus.async_fire("test_event")
+    instrumentation.async_disable(hass)
+    instrumentation.async_disable(hass)
+    hass.bus.async_fire("test_event")
+
+    assert instrumentation.async_get(hass) is None
+    assert bus_instrumentation.event_types["test_event"].events == 1
+
+
+async def test_listener_attribution(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test listeners are attributed through partials and keyed listeners."""
+
+    @callback
+    def _state_listener(name: str, event: Event) -> None:
+        """Listen for state changes."""
+
+    @callback
+    def _failing_listener(event: Event) -> None:
+        """Fail to listen."""
+        raise ValueError("boom")
+
+    async def _coro_listener(event: Event) -> None:
+        """Listen for events with a coroutine function."""
+
+    async_track_state_change_event(
+        hass, "light.kitchen", partial(_state_listener, "kitchen")
+    )
+    hass.bus.async_listen("test_event", _failing_listener)
+    hass.bus.async_listen_once("test_event", _coro_listener)
+    bus_instrumentation = instrumentation.async_enable(hass)
+
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("light.living_room", "on")
+    hass.bus.async_fire("test_event")
+    await hass.async_block_till_done()
+
+    stats = bus_instrumentation.async_as_dict()
+    listeners = {listener["listener"]: listener for listener in stats["listeners"]}
+    prefix = f"{__name__}.test_listener_attribution.<locals>"
+    # The keyed listener is recorded instead of the keyed dispatcher
+    assert listeners[f"{prefix}._state_listener"]["calls"] == 1
+    assert not any("_KeyedListeners" in name for name in listeners)
+    assert listeners[f"{prefix}._state_listener"]["integration"] == "homeassistant"
+    # Failing listeners are recorded as well
+    assert listeners[f"{prefix}._failing_listener"]["calls"] == 1
+    assert "boom" in caplog.text
+    assert listeners[f"{prefix}._coro_listener"]["calls"] == 1
+    assert stats["event_types"]["state_changed"]["events"] == 2
+    assert stats["event_types"]["test_event"]["listener_calls"] == 2
+
+    instrumentation.async_disable(hass)
+
+
+async def test_job_stats(hass: HomeAssistant) -> None:
+    """Test jobs run outside of the event bus are recorded."""
+    calls = []
+
+    @callback
+    def _timer_callback(now) -> None:
+        """Run a timer."""
+        calls.append(now)
+
+    @callback
+    def _signal_callback() -> None:
+        """Receive a signal."""
+        calls.append(None)
+
+    async def _service_handler(call: ServiceCall) -> None:
+        """Handle a service call."""
+        calls.append(call)
+
+    hass.services.async_register("test", "service", _service_handler)
+    bus_instrumentation = instrumentation.async_enable(hass)
+    async_dispatcher_connect(hass, "test_signal", _signal_callback)
+    await hass.services.async_call("test", "service", blocking=True)
+    async_call_later(hass, 1, _timer_callback)
+    async_dispatcher_send(hass, "test_signal")
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=2))
+    await hass.async_block_till_done()
+    assert len(calls) == 3
+
+    stats = bus_instrumentation.async_as_dict()
+    jobs = {job["listener"]: job for job in stats["jobs"]}
+    prefix = f"{__name__}.test_job_stats.<locals>"
+    assert jobs[f"{prefix}._timer_callback"]["calls"] == 1
+    assert jobs[f"{prefix}._signal_callback"]["calls"] == 1
+    assert jobs[f"{prefix}._service_handler"]["calls"] == 1
+    assert "event_type" not in jobs[f"{prefix}._signal_callback"]
+
+    instrumentation.async_disable(hass)
+    async_dispatcher_send(hass, "test_signal")
+    assert jobs[f"{prefix}._signal_callback"]["calls"] == 1
+
+
+async def test_removed_listeners_are_released(hass: HomeAssistant) -> None:
+    """Test the statistics do not keep removed listeners alive."""
+    bus_instrumentation = instrumentation.async_enable(hass)
+
+    @callback
+    def _listener(event: Event) -> None:
+        """Listen for events."""
+
+    for _ in range(2):
+        unsub = hass.bus.async_listen("test_event", _listener)
+        hass.bus.async_fire("test_event")
+        unsub()
+    del unsub
+    gc.collect()
+
+    assert not bus_instrumentation._listener_stats
+    # Both listeners are recorded under the same name
+    prefix = f"{__name__}.test_removed_listeners_are_released.<locals>"
+    assert (
+        bus_instrumentation.listeners[(f"{prefix}._listener", "test_event")].calls == 2
+    )
+
+    instrumentation.async_disable(hass)
@@ -0,0 +1,105 @@
+"""Test the event loop watchdog."""
+
+import asyncio
+import logging
+import time
+from types import FrameType
+from unittest.mock import patch
+
+import pytest
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import DOMAIN as HOMEASSISTANT_DOMAIN, HomeAssistant
+from homeassistant.helpers import issue_registry as ir, loop_watchdog
+from homeassistant.helpers.frame import IntegrationFrame, MissingIntegrationFrame
+
+
+def _stall(duration: float) -> None:
+    """Block the event loop."""
+    time.sleep(duration)
+
+
+def _mock_integration_frame(
+    exclude_integrations: set | None = None, frame: FrameType | None = None
+) -> IntegrationFrame:
+    """Attribute the frame to the hue integration."""
+    assert frame is not None
+    return IntegrationFrame(
+        custom_integration=False,
+        integration="hue",
+        module=None,
+        relative_filename="homeassistant/components/hue/light.py",
+        frame=frame,
+    )
+
+
+def _stall_records(caplog: pytest.LogCaptureFixture, level: int) -> list[str]:
+    """Return the messages of the stall reports at the given level."""
+    return [
+        record.getMessage()
+        for record in caplog.records
+        if record.name == loop_watchdog.__name__
+        and record.levelno == level
+        and "time.sleep(duration)" in record.getMessage()
+    ]
+
+
+async def test_integration_stall(
+    hass: HomeAssistant,
+    caplog: pytest.LogCaptureFixture,
+    issue_registry: ir.IssueRegistry,
+) -> None:
+    """Test a stall caused by an integration is reported once per location."""
+    caplog.set_level(logging.DEBUG, logger=loop_watchdog.__name__)
+    watchdog = loop_watchdog.async_start(hass, 0.1)
+    assert loop_watchdog.async_start(hass) is watchdog
+
+    with patch(
+        "homeassistant.helpers.loop_watchdog.get_integration_frame",
+        side_effect=_mock_integration_frame,
+    ):
+        _stall(0.5)
+        # Let the heartbeat run again so the second stall is detected
+        await asyncio.sleep(0.1)
+        _stall(0.5)
+        await asyncio.sleep(0.1)
+
+    assert watchdog.stalls >= 2
+    warnings = _stall_records(caplog, logging.WARNING)
+    assert len(warnings) == 1
+    assert "Detected that integration 'hue' is blocking the event loop" in warnings[0]
+    assert "_stall" in warnings[0]
+    assert _stall_records(caplog, logging.DEBUG)
+
+    issue = issue_registry.async_get_issue(HOMEASSISTANT_DOMAIN, "event_loop_stall_hue")
+    assert issue is not None
+    assert issue.issue_domain == "hue"
+    assert issue.translation_key == "event_loop_stall"
+
+    await loop_watchdog.async_stop(hass)
+    assert loop_watchdog.DATA_LOOP_WATCHDOG not in hass.data
+
+
+async def test_core_stall(
+    hass: HomeAssistant,
+    caplog: pytest.LogCaptureFixture,
+    issue_registry: ir.IssueRegistry,
+) -> None:
+    """Test a stall outside of an integration is logged without an issue."""
+    loop_watchdog.async_start(hass, 0.1)
+
+    with patch(
+        "homeassistant.helpers.loop_watchdog.get_integration_frame",
+        side_effect=MissingIntegrationFrame,
+    ):
+        _stall(0.5)
+        await asyncio.sleep(0.1)
+
+    warnings = _stall_records(caplog, logging.WARNING)
+    assert len(warnings) == 1
+    assert "Detected that Home Assistant is blocking the event loop" in warnings[0]
+    assert not issue_registry.issues
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_CLOSE)
+    await hass.async_block_till_done()
+    assert loop_watchdog.DATA_LOOP_WATCHDOG not in hass.data
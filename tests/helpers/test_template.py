@@ -280,6 +280,32 @@ def test_iterating_domain_states(hass: HomeAssistant) -> None:
     )
 
 
+@pytest.mark.parametrize(
+    ("tmpl_str", "state_values_only"),
+    [
+        ("{{ states('sensor.temperature') }}", True),
+        ("{{ states.sensor.temperature.state }}", True),
+        ("{{ states.sensor | selectattr('state', 'eq', '10') | list | count }}", True),
+        ("{{ states.sensor.temperature.entity_id }}", True),
+        ("{{ states.sensor.temperature.attributes.unit }}", False),
+        ("{{ state_attr('sensor.temperature', 'unit') }}", False),
+        ("{{ states.sensor.temperature.last_updated }}", False),
+        ("{{ states.sensor | map(attribute='name') | list }}", False),
+        ("{{ states.sensor | list }}", False),
+        ("{{ states('sensor.temperature', with_unit=True) }}", False),
+        ("{{ states.sensor.temperature.state | unknown_filter }}", False),
+    ],
+)
+def test_state_values_only(
+    hass: HomeAssistant, tmpl_str: str, state_values_only: bool
+) -> None:
+    """Test render info tracks if only state values were read."""
+    hass.states.async_set("sensor.temperature", 10, {"unit": "°C"})
+
+    info = template.Template(tmpl_str, hass).async_render_to_info()
+    assert info.state_values_only is state_values_only
+
+
 async def test_import(hass: HomeAssistant) -> None:
     """Test that imports work from the config/custom_templates folder."""
     await template.async_load_custom_templates(hass)
@@ -0,0 +1,110 @@
+"""Test the worker helper."""
+
+import asyncio
+import threading
+
+import pytest
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import worker as worker_helper
+
+from tests.common import async_capture_events
+
+
+async def test_worker_runs_on_own_loop(hass: HomeAssistant) -> None:
+    """Test work runs on the worker loop and reports back through the channel."""
+    worker = worker_helper.async_get_worker(hass, "test")
+    assert worker_helper.async_get_worker(hass, "test") is worker
+    events = async_capture_events(hass, "test_event")
+
+    async def _work(value: int) -> tuple[int, str]:
+        """Do some work on the worker."""
+        assert asyncio.get_running_loop() is not hass.loop
+        for idx in range(value):
+            worker.channel.set_state("sensor.worker", str(idx), {"step": idx})
+        worker.channel.fire_event("test_event", {"value": value})
+        return value * 2, threading.current_thread().name
+
+    assert await worker.async_run(_work, 3) == (6, "Workertest")
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.worker")
+    assert state.state == "2"
+    assert state.attributes == {"step": 2}
+    assert len(events) == 1
+    assert events[0].data == {"value": 3}
+
+    await worker.async_stop()
+    assert not worker.running
+    with pytest.raises(HomeAssistantError, match="Worker test is not running"):
+        await worker.async_run(_work, 1)
+    # A stopped worker is replaced by a new one
+    new_worker = worker_helper.async_get_worker(hass, "test")
+    assert new_worker is not worker
+    await new_worker.async_stop()
+
+
+async def test_channel_invalid_state(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test an invalid state does not drop the other queued writes."""
+    channel = worker_helper.WorkerChannel(hass)
+    events = async_capture_events(hass, "test_event")
+
+    def _queue() -> None:
+        """Queue a single batch from a worker thread."""
+        channel.set_state("sensor.valid", "on")
+        channel.set_state("invalid_entity_id", "on")
+        channel.set_state("sensor.long", "x" * 256)
+        channel.fire_event("test_event")
+
+    await hass.async_add_executor_job(_queue)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.valid").state == "on"
+    assert hass.states.get("sensor.long") is None
+    assert len(events) == 1
+    assert "Invalid state of invalid_entity_id written from a worker" in caplog.text
+    assert "Invalid state of sensor.long written from a worker" in caplog.text
+
+
+async def test_worker_errors(hass: HomeAssistant) -> None:
+    """Test errors raised on the worker are raised to the caller."""
+    worker = worker_helper.async_get_worker(hass, "test")
+
+    async def _fail() -> None:
+        """Fail on the worker."""
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        await worker.async_run(_fail)
+
+    with pytest.raises(HomeAssistantError, match="Worker test is already running"):
+        worker.async_start()
+    await worker.async_stop()
+
+
+async def test_workers_stop_with_home_assistant(hass: HomeAssistant) -> None:
+    """Test the workers stop when Home Assistant stops."""
+    worker = worker_helper.async_get_worker(hass, "test")
+    started = asyncio.Event()
+
+    async def _forever() -> None:
+        """Run until cancelled."""
+        hass.loop.call_soon_threadsafe(started.set)
+        await asyncio.Event().wait()
+
+    task = hass.async_create_task(worker.async_run(_forever))
+    await started.wait()
+    worker.channel.set_state("sensor.worker", "on")
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_STOP)
+    await hass.async_block_till_done()
+
+    assert not worker.running
+    assert hass.states.get("sensor.worker").state == "on"
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert worker_helper.DATA_WORKERS not in hass.data
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import array
 import asyncio
+from collections.abc import Callable
 from datetime import datetime, timedelta
 import functools
 import gc
@@ -64,6 +65,7 @@ from homeassistant.helpers.json import json_dumps
 from homeassistant.setup import async_setup_component
 from homeassistant.util.async_ import create_eager_task
 import homeassistant.util.dt as dt_util
+from homeassistant.util.json import json_loads
 from homeassistant.util.read_only_dict import ReadOnlyDict
 from homeassistant.util.unit_system import METRIC_SYSTEM
 
@@ -1121,6 +1123,29 @@ def test_state_as_compressed_state_json() -> None:
     assert state.as_compressed_state_json is as_compressed_state
 
 
+async def test_state_attributes_json_shared(hass: HomeAssistant) -> None:
+    """Test the attributes JSON is shared between states with the same attributes."""
+    hass.states.async_set("light.bedroom", "on", {"brightness": 100})
+    state = hass.states.get("light.bedroom")
+    attributes_json = state.attributes_json
+    assert attributes_json == b'{"brightness":100}'
+
+    hass.states.async_set("light.bedroom", "off", {"brightness": 100})
+    new_state = hass.states.get("light.bedroom")
+    assert new_state.attributes is state.attributes
+    assert new_state.attributes_json is attributes_json
+    assert json_loads(new_state.as_dict_json)["attributes"] == {"brightness": 100}
+    assert b'"a":{"brightness":100}' in new_state.as_compressed_state_json
+
+    hass.states.async_set_many([("light.bedroom", "on", {"brightness": 100})])
+    assert hass.states.get("light.bedroom").attributes_json is attributes_json
+
+    hass.states.async_set("light.bedroom", "on", {"brightness": 50})
+    new_state = hass.states.get("light.bedroom")
+    assert "attributes_json" not in new_state.__dict__
+    assert new_state.attributes_json == b'{"brightness":50}'
+
+
 async def test_eventbus_add_remove_listener(hass: HomeAssistant) -> None:
     """Test remove_listener method."""
     old_count = len(hass.bus.async_listeners())
@@ -2896,6 +2921,59 @@ def test_state_timestamps() -> None:
     assert state.last_updated_timestamp == now.timestamp()
 
 
+async def test_state_datetimes_are_lazy(hass: HomeAssistant) -> None:
+    """Test the datetimes of a State are created from the timestamps on demand."""
+    hass.states.async_set("light.bedroom", "on", timestamp=1000.5)
+    state = hass.states.get("light.bedroom")
+    assert "last_updated" not in state.__dict__
+    assert "last_changed" not in state.__dict__
+    assert "last_reported" not in state.__dict__
+    assert state.last_updated == dt_util.utc_from_timestamp(1000.5)
+    assert state.last_changed is state.last_updated
+    assert state.last_reported is state.last_updated
+
+    hass.states.async_set("light.bedroom", "on", {"brightness": 100}, timestamp=1001.5)
+    state = hass.states.get("light.bedroom")
+    assert state.last_changed_timestamp == 1000.5
+    assert state.last_updated_timestamp == 1001.5
+    assert state.last_changed == dt_util.utc_from_timestamp(1000.5)
+    assert state.last_updated == dt_util.utc_from_timestamp(1001.5)
+    assert state.as_dict()["last_changed"] == "1970-01-01T00:16:40.500000+00:00"
+    assert state.as_dict()["last_updated"] == "1970-01-01T00:16:41.500000+00:00"
+    assert state.as_compressed_state == {
+        "a": {"brightness": 100},
+        "c": state.context.id,
+        "lc": 1000.5,
+        "lu": 1001.5,
+        "s": "on",
+    }
+
+    # Reporting the same state moves last_reported without
+    # changing last_changed or last_updated.
+    hass.states.async_set("light.bedroom", "on", {"brightness": 100}, timestamp=1002.5)
+    assert hass.states.get("light.bedroom") is state
+    assert state.last_reported == dt_util.utc_from_timestamp(1002.5)
+    assert state.last_reported_timestamp == 1002.5
+    assert state.last_updated_timestamp == 1001.5
+
+
+async def test_state_expire_shares_context(hass: HomeAssistant) -> None:
+    """Test states expired with the same context share the expired copy."""
+    context = ha.Context()
+    hass.states.async_set_many(
+        [("light.bedroom", "on", None), ("light.kitchen", "on", None)],
+        context=context,
+    )
+    bedroom = hass.states.get("light.bedroom")
+    kitchen = hass.states.get("light.kitchen")
+    hass.states.async_set_many(
+        [("light.bedroom", "off", None), ("light.kitchen", "off", None)]
+    )
+    assert bedroom.context is not context
+    assert bedroom.context == context
+    assert bedroom.context is kitchen.context
+
+
 async def test_state_firing_event_matches_context_id_ulid_time(
     hass: HomeAssistant,
 ) -> None:
@@ -3576,3 +3654,281 @@ async def test_async_set_updates_last_reported(hass: HomeAssistant) -> None:
         assert state.last_reported_timestamp != last_reported_timestamp
         last_reported = state.last_reported
         last_reported_timestamp = state.last_reported_timestamp
+
+
+async def test_statemachine_async_set_many(hass: HomeAssistant) -> None:
+    """Test setting multiple states in a single batch."""
+    hass.states.async_set("light.bowl", "on", {"brightness": 100})
+    hass.states.async_set("light.ceiling", "off")
+    old_bowl = hass.states.get("light.bowl")
+
+    seen_states: list[tuple[str | None, str | None]] = []
+
+    @callback
+    def listener(event: ha.Event[ha.EventStateChangedData]) -> None:
+        # All states of the batch are written before any event is fired
+        seen_states.append(
+            (
+                hass.states.get("light.bowl").state,
+                hass.states.get("switch.new").state,
+            )
+        )
+
+    state_changed_events = async_capture_events(hass, EVENT_STATE_CHANGED)
+    state_reported_events: list[ha.Event[ha.EventStateReportedData]] = []
+
+    @callback
+    def reported_listener(event: ha.Event[ha.EventStateReportedData]) -> None:
+        state_reported_events.append(event)
+
+    hass.bus.async_listen(
+        EVENT_STATE_REPORTED,
+        reported_listener,
+        event_filter=callback(lambda event_data: True),
+    )
+    hass.bus.async_listen(EVENT_STATE_CHANGED, listener)
+    context = ha.Context()
+
+    hass.states.async_set_many(
+        [
+            ("light.Bowl", "off", {"brightness": 100}),
+            ("light.ceiling", "off", None),
+            ("switch.new", "on", None),
+        ],
+        context=context,
+    )
+    await hass.async_block_till_done()
+
+    assert seen_states == [("off", "on"), ("off", "on")]
+    assert [event.data["entity_id"] for event in state_changed_events] == [
+        "light.bowl",
+        "switch.new",
+    ]
+    assert state_changed_events[0].data["old_state"] is old_bowl
+    assert state_changed_events[1].data["old_state"] is None
+    assert all(event.context is context for event in state_changed_events)
+    assert len(state_reported_events) == 1
+    assert state_reported_events[0].data["entity_id"] == "light.ceiling"
+
+    bowl = hass.states.get("light.bowl")
+    ceiling = hass.states.get("light.ceiling")
+    # Unchanged attributes are shared with the previous state
+    assert bowl.attributes is old_bowl.attributes
+    assert bowl.last_updated == ceiling.last_reported
+    assert bowl.last_updated == state_changed_events[0].time_fired
+    # The old state is expired to avoid leaking the context
+    assert old_bowl.context is not context
+
+
+async def test_statemachine_async_set_many_without_context(
+    hass: HomeAssistant,
+) -> None:
+    """Test writes of a batch without a context do not share a context."""
+    state_changed_events = async_capture_events(hass, EVENT_STATE_CHANGED)
+
+    hass.states.async_set_many(
+        [("light.bowl", "on", None), ("light.ceiling", "on", None)]
+    )
+    await hass.async_block_till_done()
+
+    bowl = hass.states.get("light.bowl")
+    ceiling = hass.states.get("light.ceiling")
+    assert bowl.context.id != ceiling.context.id
+    assert [event.context for event in state_changed_events] == [
+        bowl.context,
+        ceiling.context,
+    ]
+
+
+async def test_statemachine_async_set_many_same_entity(hass: HomeAssistant) -> None:
+    """Test writes to the same entity in a batch are applied in order."""
+    hass.states.async_set("light.bowl", "on")
+    state_changed_events = async_capture_events(hass, EVENT_STATE_CHANGED)
+    state_reported_events: list[ha.Event[ha.EventStateReportedData]] = []
+
+    @callback
+    def reported_listener(event: ha.Event[ha.EventStateReportedData]) -> None:
+        state_reported_events.append(event)
+
+    hass.bus.async_listen(
+        EVENT_STATE_REPORTED,
+        reported_listener,
+        event_filter=callback(lambda event_data: True),
+    )
+
+    hass.states.async_set_many(
+        [
+            ("light.bowl", "off", None),
+            ("light.bowl", "off", None),
+            ("light.bowl", "on", None),
+        ]
+    )
+    await hass.async_block_till_done()
+
+    assert [
+        (event.data["old_state"].state, event.data["new_state"].state)
+        for event in state_changed_events
+    ] == [("on", "off"), ("off", "on")]
+    assert len(state_reported_events) == 1
+    assert hass.states.get("light.bowl").state == "on"
+    # Each write without a context has its own context
+    assert state_changed_events[0].context.id != state_changed_events[1].context.id
+
+
+async def test_statemachine_async_set_many_invalid(hass: HomeAssistant) -> None:
+    """Test an invalid state in a batch does not write any state."""
+    hass.states.async_set("light.bowl", "on")
+    state_changed_events = async_capture_events(hass, EVENT_STATE_CHANGED)
+
+    with pytest.raises(InvalidStateError):
+        hass.states.async_set_many(
+            [("light.bowl", "off", None), ("light.ceiling", "x" * 256, None)]
+        )
+    with pytest.raises(InvalidEntityFormatError):
+        hass.states.async_set_many(
+            [("light.bowl", "off", None), ("invalid_entity_format", "on", None)]
+        )
+    await hass.async_block_till_done()
+
+    assert hass.states.get("light.bowl").state == "on"
+    assert hass.states.get("light.ceiling") is None
+    assert len(state_changed_events) == 0
+
+
+async def test_eventbus_async_fire_many_internal(hass: HomeAssistant) -> None:
+    """Test firing a batch of events runs each listener for its matching events."""
+    calls: list[tuple[str, int]] = []
+
+    @callback
+    def filter_even(event_data: dict[str, Any]) -> bool:
+        return event_data["idx"] % 2 == 0
+
+    @callback
+    def listener_all(event: ha.Event) -> None:
+        calls.append(("all", event.data["idx"]))
+
+    @callback
+    def listener_even(event: ha.Event) -> None:
+        calls.append(("even", event.data["idx"]))
+
+    @callback
+    def listener_once(event: ha.Event) -> None:
+        calls.append(("once", event.data["idx"]))
+
+    hass.bus.async_listen("test_event", listener_all)
+    hass.bus.async_listen("test_event", listener_even, event_filter=filter_even)
+    hass.bus.async_listen_once("test_event", listener_once)
+
+    hass.bus.async_fire_many_internal(
+        "test_event", [({"idx": idx}, None) for idx in range(4)]
+    )
+    hass.bus.async_fire_many_internal("test_event", [])
+    await hass.async_block_till_done()
+
+    assert calls == [
+        ("all", 0),
+        ("all", 1),
+        ("all", 2),
+        ("all", 3),
+        ("even", 0),
+        ("even", 2),
+        ("once", 0),
+    ]
+
+
+async def test_eventbus_listen_keyed(hass: HomeAssistant) -> None:
+    """Test listening for events indexed by a key of the event data."""
+    calls: list[tuple[str, str]] = []
+
+    def _listener(name: str) -> Callable[[ha.Event], None]:
+        @callback
+        def _handle(event: ha.Event) -> None:
+            calls.append((name, event.data["device_id"]))
+
+        return _handle
+
+    listeners_before = hass.bus.async_listeners().get("test_event", 0)
+    unsub_a = hass.bus.async_listen_keyed(
+        "test_event", "device_id", "device_a", _listener("a")
+    )
+    unsub_ab = hass.bus.async_listen_keyed(
+        "test_event", "device_id", ["device_a", "device_b"], _listener("ab")
+    )
+    unsub_all = hass.bus.async_listen_keyed(
+        "test_event", "device_id", MATCH_ALL, _listener("all"), match_all=True
+    )
+    unsub_star = hass.bus.async_listen_keyed(
+        "test_event", "device_id", MATCH_ALL, _listener("star")
+    )
+    # All listeners of an index share a single listener on the bus
+    assert hass.bus.async_listeners()["test_event"] == listeners_before + 2
+
+    for device_id in ("device_a", "device_b", "device_c"):
+        hass.bus.async_fire("test_event", {"device_id": device_id})
+    hass.bus.async_fire("test_event", {"other": "data"})
+    await hass.async_block_till_done()
+    # Without match_all MATCH_ALL is only a key of the index
+    assert calls == [
+        ("a", "device_a"),
+        ("ab", "device_a"),
+        ("all", "device_a"),
+        ("ab", "device_b"),
+        ("all", "device_b"),
+        ("all", "device_c"),
+    ]
+
+    calls.clear()
+    unsub_all()
+    hass.bus.async_fire("test_event", {"device_id": MATCH_ALL})
+    await hass.async_block_till_done()
+    assert calls == [("star", MATCH_ALL)]
+
+    calls.clear()
+    unsub_star()
+    unsub_a()
+    hass.bus.async_fire("test_event", {"device_id": "device_a"})
+    hass.bus.async_fire("test_event", {"device_id": "device_c"})
+    await hass.async_block_till_done()
+    assert calls == [("ab", "device_a")]
+
+    unsub_ab()
+    assert hass.bus.async_listeners().get("test_event", 0) == listeners_before
+
+
+async def test_eventbus_listen_keyed_callable_key(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test listening for events indexed by a key function."""
+    calls: list[str] = []
+
+    @callback
+    def _domain_key(event_data: ha.EventStateChangedData) -> str | None:
+        if (new_state := event_data["new_state"]) is None:
+            return None
+        return new_state.domain
+
+    @callback
+    def _listener(event: ha.Event[ha.EventStateChangedData]) -> None:
+        calls.append(event.data["entity_id"])
+
+    @callback
+    def _bad_listener(event: ha.Event[ha.EventStateChangedData]) -> None:
+        raise ValueError("boom")
+
+    hass.bus.async_listen_keyed(EVENT_STATE_CHANGED, _domain_key, "light", _listener)
+    hass.bus.async_listen_keyed(
+        EVENT_STATE_CHANGED, _domain_key, "switch", _bad_listener
+    )
+
+    hass.states.async_set("light.bowl", "on")
+    hass.states.async_set("switch.fan", "on")
+    hass.states.async_remove("light.bowl")
+    await hass.async_block_till_done()
+
+    assert calls == ["light.bowl"]
+    assert "Error while dispatching event for switch" in caplog.text
+
+    with pytest.raises(HomeAssistantError, match="is not a callback"):
+        hass.bus.async_listen_keyed(
+            EVENT_STATE_CHANGED, lambda event_data: None, "light", _listener
+        )
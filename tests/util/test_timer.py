@@ -0,0 +1,92 @@
+"""Test the timer scheduler."""
+
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+
+from homeassistant.util.timer import TimerScheduler
+
+
+async def test_timers_are_coalesced() -> None:
+    """Test timers with nearby deadlines share an event loop timer."""
+    loop = asyncio.get_running_loop()
+    scheduler = TimerScheduler(loop, 0.05)
+    calls: list[int] = []
+    done = loop.create_future()
+    now = loop.time()
+    scheduled_before = len(getattr(loop, "_scheduled"))
+
+    for idx in reversed(range(5)):
+        scheduler.call_at(now + 0.001 * idx, calls.append, idx)
+    scheduler.call_at(now + 0.01, done.set_result, None)
+
+    assert len(scheduler.buckets) <= 2
+    assert len(getattr(loop, "_scheduled")) - scheduled_before <= 2
+    assert len(scheduler.scheduled()) == 6
+
+    await done
+    # Fired in deadline order even though scheduled in reverse
+    assert calls == [0, 1, 2, 3, 4]
+    assert scheduler.buckets == {}
+    assert scheduler.scheduled() == []
+
+
+async def test_cancel() -> None:
+    """Test cancelling timers drops empty buckets."""
+    loop = asyncio.get_running_loop()
+    scheduler = TimerScheduler(loop, 0.05)
+    action = Mock()
+
+    first = scheduler.call_later(0.01, action, 1)
+    second = scheduler.call_at(first.when(), action, 2)
+    assert len(scheduler.buckets) == 1
+    bucket = next(iter(scheduler.buckets.values()))
+
+    first.cancel()
+    assert first.cancelled()
+    assert not second.cancelled()
+    assert not bucket.timer.cancelled()
+
+    second.cancel()
+    second.cancel()
+    assert scheduler.buckets == {}
+    assert bucket.timer.cancelled()
+
+    await asyncio.sleep(0.1)
+    action.assert_not_called()
+
+
+async def test_cancel_from_callback() -> None:
+    """Test a timer cancelled by an earlier timer in the bucket does not run."""
+    loop = asyncio.get_running_loop()
+    scheduler = TimerScheduler(loop, 0.05)
+    action = Mock()
+    done = loop.create_future()
+    now = loop.time()
+
+    second = scheduler.call_at(now + 0.002, action)
+    scheduler.call_at(now + 0.001, second.cancel)
+    scheduler.call_at(now + 0.003, done.set_result, None)
+
+    await done
+    action.assert_not_called()
+
+
+async def test_exception_in_callback(caplog: pytest.LogCaptureFixture) -> None:
+    """Test an exception does not prevent other timers from running."""
+    loop = asyncio.get_running_loop()
+    scheduler = TimerScheduler(loop, 0.05)
+    done = loop.create_future()
+    now = loop.time()
+
+    def _raise() -> None:
+        raise ValueError("boom")
+
+    handle = scheduler.call_at(now + 0.001, _raise)
+    assert "_raise" in repr(handle)
+    scheduler.call_at(now + 0.002, done.set_result, None)
+
+    await done
+    assert "Exception in callback" in caplog.text
+    assert "boom" in caplog.text